@@ -4,24 +4,44 @@ Modul untuk logika arbitrase cryptocurrency.
 
 import time
 import logging
-from typing import Dict, Any, List, Optional, Union, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Set, Union, Tuple
 from decimal import Decimal
 import json
 from datetime import datetime
 
 import config
+import fixedpoint
+from metrics import observe_scan
+from tracing import span, traced
 from utils import (
+    calculation_value,
     calculate_price_difference_percentage,
     calculate_profit_after_fees,
     is_profitable_opportunity,
-    estimate_gas_cost,
     get_bridge_fee,
     get_token_address,
     is_token_multichain,
-    get_networks_for_token
+    get_networks_for_token,
+    get_token_decimals,
+    split_binance_symbol,
+    BINANCE_QUOTE_ASSETS
 )
-from cex_data import get_cex_data_provider
-from dex_data import dex_screener_api
+from cache import NegativeCache
+from cex_data import get_cex_data_provider, CEXDataProvider
+from cost_model import CostModel
+from dex_data import get_dex_screener_api, DexScreenerAPI, PairFilter
+from gas_oracle import GasOracle
+from market_join import TickerIndex, PoolIndex, join, cex_symbol
+from onchain import OnchainPriceFeed
+from opportunity import Opportunity
+from pair_index import PairIndex
+from pipeline import FetchEvaluatePipeline
+from planner import ScanPlanner
+from scheduler import AdaptiveScheduler, CROSS_CHAIN
+from price_graph import PriceGraph, add_dex_pairs, add_bridge_edges, add_binance_tickers, describe_cycle, known_token_addresses
+from pricing import OrderBookCache, AmmPool, compose_legs, fixed_price_leg, optimal_trade_sizes, route_output, route_price_impact
 
 logger = logging.getLogger("arbitrage.logic")
 
@@ -34,17 +54,273 @@ class ArbitrageScanner:
         """
         Inisialisasi scanner arbitrase.
         """
-        self.binance = get_cex_data_provider("binance")
-        self.dex_screener = dex_screener_api
+        # Provider dibuat saat pertama kali digunakan
+        self._binance: Optional[CEXDataProvider] = None
+        self._dex_screener: Optional[DexScreenerAPI] = None
         self.min_profit_percentage = config.ARBITRAGE_CONFIG["min_profit_percentage"]
-        self.min_liquidity = 10000  # Default likuiditas minimum: $10,000
+        self.min_liquidity = config.PAIR_FILTER["min_liquidity"]  # Default likuiditas minimum: $10,000
+        self.price_graph = PriceGraph()
+        self.orderbook_cache = OrderBookCache(
+            lambda symbol, limit: self.binance.get_orderbook(symbol, limit=limit)
+        )
+        self.gas_oracle = GasOracle(lambda symbol: self.binance.get_price(symbol))
+        self.use_onchain = False  # Harga DEX dari state pool on-chain, bukan priceUsd DEX Screener
+        self._onchain_feed: Optional[OnchainPriceFeed] = None
+        self._pair_index: Optional[PairIndex] = None
+        self._negative_cache: Optional[NegativeCache] = None
+        self.scheduler: Optional[AdaptiveScheduler] = None  # Hanya aktif di mode terus-menerus
+        # Provider lazy bisa diakses pertama kali dari beberapa thread skenario
+        self._provider_lock = threading.Lock()
+
+    @property
+    def binance(self) -> CEXDataProvider:
+        """
+        Penyedia data Binance, dibuat saat pertama kali diakses.
+        """
+        if self._binance is None:
+            with self._provider_lock:
+                if self._binance is None:
+                    self._binance = get_cex_data_provider("binance")
+        return self._binance
+
+    @binance.setter
+    def binance(self, provider: CEXDataProvider):
+        self._binance = provider
+
+    @property
+    def dex_screener(self) -> DexScreenerAPI:
+        """
+        Klien DEX Screener, diambil dari singleton saat pertama kali diakses.
+        """
+        if self._dex_screener is None:
+            with self._provider_lock:
+                if self._dex_screener is None:
+                    self._dex_screener = get_dex_screener_api()
+        return self._dex_screener
+
+    @dex_screener.setter
+    def dex_screener(self, api: DexScreenerAPI):
+        self._dex_screener = api
+
+    @property
+    def onchain_feed(self) -> OnchainPriceFeed:
+        """
+        Sumber harga on-chain, dibuat saat pertama kali diakses.
+        """
+        if self._onchain_feed is None:
+            with self._provider_lock:
+                if self._onchain_feed is None:
+                    self._onchain_feed = OnchainPriceFeed(self.gas_oracle.get_native_price_usd)
+        return self._onchain_feed
+
+    @property
+    def pair_index(self) -> PairIndex:
+        """
+        Indeks pair persisten, dimuat dari file saat pertama kali diakses.
+        """
+        if self._pair_index is None:
+            with self._provider_lock:
+                if self._pair_index is None:
+                    self._pair_index = PairIndex()
+        return self._pair_index
+
+    @pair_index.setter
+    def pair_index(self, index: PairIndex):
+        self._pair_index = index
+
+    @property
+    def negative_cache(self) -> NegativeCache:
+        """
+        Negative cache (token, jaringan) tanpa pool layak, dimuat dari file saat pertama kali diakses.
+        """
+        if self._negative_cache is None:
+            with self._provider_lock:
+                if self._negative_cache is None:
+                    self._negative_cache = NegativeCache()
+        return self._negative_cache
+
+    @negative_cache.setter
+    def negative_cache(self, cache: NegativeCache):
+        self._negative_cache = cache
+
+    @property
+    def pair_filter(self) -> PairFilter:
+        """
+        Filter pool untuk parsing respons DEX Screener, memakai min_liquidity scanner (--min-liquidity).
+        """
+        return PairFilter(min_liquidity=self.min_liquidity)
+
+    def is_suppressed(self, token: str, network: str) -> bool:
+        """
+        Memeriksa apakah (token, jaringan) sedang ditunda karena tidak punya pool layak.
+        """
+        if network == CROSS_CHAIN or not config.NEGATIVE_CACHE["enabled"]:
+            return False
+
+        return self.negative_cache.is_suppressed(token, network, self.min_liquidity)
+
+    def _is_due(self, token: str, network: str) -> bool:
+        """
+        Memeriksa apakah (token, jaringan) perlu dipindai; selalu True tanpa penjadwal,
+        kecuali kombinasi tersebut sedang ditunda oleh negative cache.
+        """
+        if self.is_suppressed(token, network):
+            return False
+
+        return self.scheduler is None or self.scheduler.is_due(token, network)
+
+    def _record_scan(self, token: str, network: str, spread_percentage: float, found_opportunity: bool, uses_cex: bool = False):
+        """
+        Mencatat hasil pemindaian (token, jaringan) ke penjadwal jika aktif.
+
+        Hasil semua skenario digabung dan dicatat sekali di akhir scan_scenarios.
+        """
+        if self.scheduler is not None:
+            self.scheduler.observe(token, network, spread_percentage, found_opportunity, uses_cex)
+
+    def _record_pools(self, token: str, network: str, dex_prices: List[Dict[str, Any]]):
+        """
+        Mencatat ke negative cache apakah (token, jaringan) punya pool yang lolos filter likuiditas.
+        """
+        if not config.NEGATIVE_CACHE["enabled"]:
+            return
+
+        if dex_prices:
+            self.negative_cache.record_found(token, network)
+        else:
+            self.negative_cache.record_empty(token, network, self.min_liquidity)
+
+    def _get_dex_prices(self, network: str, token_address: str) -> List[Dict[str, Any]]:
+        """
+        Mendapatkan harga token di berbagai DEX, dari blockchain jika use_onchain aktif.
+
+        Args:
+            network: Nama jaringan
+            token_address: Alamat token
+
+        Returns:
+            Daftar harga di berbagai DEX
+        """
+        pair_filter = self.pair_filter
+
+        if not self.use_onchain:
+            return self.dex_screener.get_price_across_dexes(network, token_address, pair_filter)
+
+        return self.onchain_feed.get_dex_prices(
+            network, token_address,
+            lambda: self.dex_screener.get_price_across_dexes(network, token_address, pair_filter)
+        )
 
-    def scan_scenario_1(self, top_gainers_limit: int = 20) -> List[Dict[str, Any]]:
+    def _get_chain_prices(self, token: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Mendapatkan harga token per chain dengan harga pool dari blockchain.
+
+        Args:
+            token: Simbol token
+
+        Returns:
+            Dict harga per chain, atau None jika use_onchain tidak aktif
+        """
+        if not self.use_onchain:
+            return None
+
+        chain_prices = self.dex_screener.get_price_across_chains(token, self.pair_filter)
+
+        return {
+            chain_id: self.onchain_feed.apply(chain_id, [dex_info])[0]
+            for chain_id, dex_info in chain_prices.items()
+        }
+
+    def _gas_share_per_token(self, gas_cost_usd: Union[Decimal, int], buy_price: Union[float, Decimal, int]) -> Union[Decimal, int]:
+        """
+        Membagi biaya gas satu trade (USD) ke simulasi 1 token.
+
+        Biaya gas tidak bergantung pada ukuran trade, jadi porsinya per token
+        dihitung dari ukuran trade acuan (reference_trade_usd).
+
+        Args:
+            gas_cost_usd: Total biaya gas trade dalam USD (fixed-point jika dari calculation_value)
+            buy_price: Harga beli token dalam USD (skala sama dengan gas_cost_usd)
+
+        Returns:
+            Porsi biaya gas untuk 1 token dalam USD, dalam skala yang sama
+        """
+        if isinstance(gas_cost_usd, int):
+            reference_trade_usd = fixedpoint.to_fixed(float(config.ARBITRAGE_CONFIG["reference_trade_usd"]))
+            return fixedpoint.Fixed(fixedpoint.div(fixedpoint.mul(gas_cost_usd, buy_price), reference_trade_usd))
+
+        reference_trade_usd = Decimal(str(config.ARBITRAGE_CONFIG["reference_trade_usd"]))
+        return gas_cost_usd * Decimal(str(buy_price)) / reference_trade_usd
+
+    def _dex_route(self, opp: Dict[str, Any], buy_fee_percentage: float, sell_fee_percentage: float,
+                   bridge_fee_percentage: float = 0) -> Tuple[float, float, float]:
+        """
+        Membentuk rute AMM beli-lalu-jual dari dua pool DEX.
+
+        Args:
+            opp: Peluang dari DexScreenerAPI (dengan buy_pool dan sell_pool)
+            buy_fee_percentage: Biaya swap pool beli dalam persen
+            sell_fee_percentage: Biaya swap pool jual dalam persen
+            bridge_fee_percentage: Biaya bridge antar leg dalam persen
+
+        Returns:
+            Tuple (R_in, R_out, gamma), atau nol jika data pool tidak tersedia
+        """
+        buy_pool = AmmPool.from_dex_info(opp.get("buy_pool") or {}, float(buy_fee_percentage))
+        sell_pool = AmmPool.from_dex_info(opp.get("sell_pool") or {}, float(sell_fee_percentage))
+
+        if buy_pool is None or sell_pool is None:
+            return (0.0, 0.0, 0.0)
+
+        return compose_legs(buy_pool.as_buy_leg(), sell_pool.as_sell_leg(), float(bridge_fee_percentage))
+
+    def _apply_trade_sizing(self, opportunities: List[Opportunity], routes: List[Tuple[float, float, float]]):
+        """
+        Menambahkan ukuran trade optimal dan profit yang bisa dieksekusi ke setiap peluang.
+
+        Args:
+            opportunities: Daftar peluang (setiap peluang diganti salinan dengan ukuran trade)
+            routes: Rute AMM untuk setiap peluang, dengan urutan yang sama
+        """
+        sizes = optimal_trade_sizes(routes)
+
+        for i, (opportunity, route, size) in enumerate(zip(opportunities, routes, sizes)):
+            trade_usd = size["trade_usd"]
+            output_usd = size["output_usd"]
+            price_impact = size["price_impact_percentage"]
+
+            # Ukuran di sisi CEX dibatasi kedalaman order book sampai spread tertutup
+            max_notional = opportunity.get("cex_max_notional_usd")
+            if max_notional is not None and trade_usd > max_notional:
+                trade_usd = max_notional
+                output_usd = route_output(route, trade_usd)
+                price_impact = route_price_impact(route, trade_usd)
+
+            opportunities[i] = opportunity.replace(
+                optimal_trade_usd=trade_usd,
+                expected_profit_usd=output_usd - trade_usd - opportunity.gas_cost if trade_usd > 0 else 0.0,
+                price_impact_percentage=price_impact
+            )
+
+    @observe_scan("1")
+    @traced("scenario_1", "scenario")
+    def scan_scenario_1(self, top_gainers_limit: int = 20, tokens_to_check: List[str] = None,
+                        top_gainers: Optional[List[Dict[str, Any]]] = None,
+                        cost_model: Optional[CostModel] = None,
+                        tickers: Optional[List[Dict[str, Any]]] = None) -> List[Opportunity]:
         """
         Mencari peluang arbitrase untuk Skenario 1 (DEX - CEX, Sama Jaringan).
 
+        Jika MARKET_JOIN aktif, semua ticker Binance digabung dengan pool DEX
+        semua token di konfigurasi (lihat market_join.py); jika tidak, hanya
+        top gainers Binance yang dibandingkan.
+
         Args:
             top_gainers_limit: Jumlah top gainers yang akan dipantau
+            tokens_to_check: Hanya periksa token di daftar ini (jika None, semua)
+            top_gainers: Top gainers yang sudah diambil planner (jika None, diambil dari Binance)
+            cost_model: Model biaya pemindaian (jika None, disusun sendiri)
+            tickers: Semua ticker Binance yang sudah diambil planner (jika None, diambil dari Binance)
 
         Returns:
             Daftar peluang arbitrase
@@ -52,162 +328,514 @@ class ArbitrageScanner:
         logger.info("Memulai pemindaian untuk Skenario 1 (DEX - CEX, Sama Jaringan)")
 
         opportunities = []
+        trade_routes = []
+
+        # Order book hanya berlaku untuk satu pemindaian
+        self.orderbook_cache.clear()
+
+        if cost_model is None:
+            cost_model = CostModel(self.gas_oracle)
+
+        if config.MARKET_JOIN["enabled"]:
+            # Dapatkan semua ticker dari Binance (satu permintaan)
+            if tickers is None:
+                try:
+                    with span("fetch", source="binance"):
+                        tickers = self.binance.get_all_tickers_24h()
+                    logger.info(f"Berhasil mendapatkan {len(tickers)} ticker dari Binance")
+                except Exception as e:
+                    logger.error(f"Gagal mendapatkan ticker dari Binance: {str(e)}")
+                    return opportunities
+
+            # Order book diambil di thread fetch hanya untuk token hasil join, peluang dinilai saat data tiba
+            FetchEvaluatePipeline(
+                "scenario_1",
+                lambda market: dict(market, orderbook=self.orderbook_cache.get(market["symbol"])),
+                lambda candidate, market: self._evaluate_gainer(market, opportunities, trade_routes, cost_model),
+                lambda candidate, e: logger.error(f"Error saat memproses {candidate['base_asset']} ({candidate['symbol']}): {str(e)}")
+            ).run(self._join_markets(tickers, tokens_to_check))
+        else:
+            # Dapatkan top gainers dari Binance
+            if top_gainers is None:
+                try:
+                    with span("fetch", source="binance"):
+                        top_gainers = self.binance.get_top_gainers(limit=top_gainers_limit)
+                    logger.info(f"Berhasil mendapatkan {len(top_gainers)} top gainers dari Binance")
+                except Exception as e:
+                    logger.error(f"Gagal mendapatkan top gainers dari Binance: {str(e)}")
+                    return opportunities
+
+            # Data Binance dan DEX per top gainer diambil di thread fetch, peluang dinilai saat data tiba
+            FetchEvaluatePipeline(
+                "scenario_1",
+                lambda gainer: self._fetch_gainer(gainer, tokens_to_check),
+                lambda gainer, market: self._evaluate_gainer(market, opportunities, trade_routes, cost_model),
+                lambda gainer, e: logger.error(f"Error saat memproses top gainer {gainer['symbol']}: {str(e)}")
+            ).run(top_gainers)
+
+        # Ukuran trade optimal dihitung sekaligus untuk semua kandidat
+        self._apply_trade_sizing(opportunities, trade_routes)
 
-        # Dapatkan top gainers dari Binance
-        try:
-            top_gainers = self.binance.get_top_gainers(limit=top_gainers_limit)
-            logger.info(f"Berhasil mendapatkan {len(top_gainers)} top gainers dari Binance")
-        except Exception as e:
-            logger.error(f"Gagal mendapatkan top gainers dari Binance: {str(e)}")
-            return opportunities
+        # Urutkan berdasarkan persentase keuntungan (descending)
+        opportunities.sort(key=lambda x: x.profit_percentage, reverse=True)
 
-        # Periksa setiap top gainer
-        for gainer in top_gainers:
-            try:
-                # Dapatkan simbol dan harga di Binance
-                symbol = gainer["symbol"]
-                base_asset = ""
-                quote_asset = ""
-
-                # Ekstrak base asset dan quote asset dari simbol
-                for quote in ["USDT", "BUSD", "BTC", "ETH", "BNB"]:
-                    if symbol.endswith(quote):
-                        base_asset = symbol[:-len(quote)]
-                        quote_asset = quote
-                        break
-
-                if not base_asset or not quote_asset:
-                    logger.warning(f"Tidak dapat mengekstrak base asset dan quote asset dari simbol {symbol}")
+        logger.info(f"Pemindaian Skenario 1 selesai. Ditemukan {len(opportunities)} peluang arbitrase.")
+
+        return opportunities
+
+    def _join_markets(self, tickers: List[Dict[str, Any]], tokens_to_check: List[str] = None) -> List[Dict[str, Any]]:
+        """
+        Tahap join Skenario 1: menggabungkan semua ticker Binance dengan pool DEX token di konfigurasi.
+
+        Pool DEX diambil dari cache pair yang sudah diisi planner. (Token,
+        jaringan) yang selisih harga terakhirnya di bawah persentase keuntungan
+        minimum langsung dicatat ke penjadwal tanpa mengambil order book.
+
+        Args:
+            tickers: Data ticker 24 jam semua simbol Binance
+            tokens_to_check: Hanya periksa token di daftar ini (jika None, semua)
+
+        Returns:
+            Data pasar per token kandidat (format _fetch_gainer, tanpa order book)
+        """
+        ticker_index = TickerIndex(tickers)
+        pool_index = PoolIndex()
+
+        for token, token_config in config.TOKENS_TO_MONITOR.items():
+            if tokens_to_check is not None and token not in tokens_to_check:
+                continue
+
+            if cex_symbol(token) not in ticker_index:
+                continue
+
+            for network, token_address in token_config["address"].items():
+                if not self._is_due(token, network):
                     continue
 
-                # Dapatkan harga di Binance
-                binance_price = Decimal(gainer["lastPrice"])
+                try:
+                    with span("fetch", token=token, network=network):
+                        pool_index.add(token, network, token_address, self._get_dex_prices(network, token_address))
+                except Exception as e:
+                    logger.error(f"Error saat memeriksa {token} di jaringan {network}: {str(e)}")
+
+        with span("spread", network="binance"):
+            result = join(ticker_index, pool_index)
+            max_spreads = result.max_spreads()
+            candidates = result.candidates(self.min_profit_percentage, config.MARKET_JOIN["max_candidates"])
+
+        markets = []
+        evaluated = set()
+
+        for token, quote, networks in candidates:
+            token_pools = pool_index.pools[token]
+            evaluated.update((token, network) for network in networks)
+
+            markets.append({
+                "symbol": quote.symbol,
+                "base_asset": token,
+                "binance_price_usd": quote.last_price * quote.quote_price_usd,
+                "quote_price_usd": quote.quote_price_usd,
+                "token_networks": {network: token_pools[network][0] for network in networks},
+                # Hanya pool yang masuk join; pool dengan token di sisi quote tidak dinilai
+                "dex_prices": {network: result.pools_for(token, network) for network in networks},
+            })
+
+        # (Token, jaringan) di luar kandidat tetap dicatat ke negative cache dan penjadwal
+        for token, token_pools in pool_index.pools.items():
+            for network, (_, dex_prices) in token_pools.items():
+                if (token, network) not in evaluated:
+                    self._record_pools(token, network, dex_prices)
+                    self._record_scan(token, network, max_spreads.get((token, network), 0), False, uses_cex=True)
+
+        logger.info(
+            f"Join CEX-DEX: {len(ticker_index)} ticker Binance x {len(pool_index)} pool DEX, "
+            f"{len(result)} pasangan harga, {len(markets)} token kandidat"
+        )
+
+        return markets
+
+    def _fetch_gainer(self, gainer: Dict[str, Any], tokens_to_check: List[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Tahap fetch Skenario 1: mengambil order book Binance dan harga DEX untuk satu top gainer.
+
+        Args:
+            gainer: Data ticker 24 jam top gainer
+            tokens_to_check: Hanya periksa base asset di daftar ini (jika None, semua)
+
+        Returns:
+            Data pasar top gainer, atau None jika top gainer dilewati
+        """
+        # Dapatkan simbol dan harga di Binance
+        symbol = gainer["symbol"]
+
+        # Ekstrak base asset dan quote asset dari simbol
+        assets = split_binance_symbol(symbol)
+
+        if assets is None:
+            logger.warning(f"Tidak dapat mengekstrak base asset dan quote asset dari simbol {symbol}")
+            return None
+
+        base_asset, quote_asset = assets
+
+        if tokens_to_check is not None and base_asset not in tokens_to_check:
+            return None
+
+        # Dapatkan harga di Binance
+        binance_price = Decimal(gainer["lastPrice"])
+
+        logger.debug("Memeriksa %s dengan harga Binance %s %s", base_asset, binance_price, quote_asset)
+
+        # Dapatkan alamat token di berbagai jaringan
+        token_networks = {}
+
+        if base_asset in config.TOKENS_TO_MONITOR:
+            token_networks = config.TOKENS_TO_MONITOR[base_asset]["address"]
+
+        if not token_networks:
+            logger.warning(f"Tidak ada alamat token yang dikonfigurasi untuk {base_asset}")
+            return None
+
+        # Jaringan yang belum jatuh tempo menurut penjadwal dilewati
+        token_networks = {
+            network: token_address for network, token_address in token_networks.items()
+            if self._is_due(base_asset, network)
+        }
+
+        if not token_networks:
+            return None
+
+        # Konversi harga Binance ke USD jika perlu (sekali per gainer)
+        with span("fetch", token=base_asset, network="binance"):
+            quote_price_usd = Decimal("1")
+
+            if quote_asset != "USDT" and quote_asset != "BUSD":
+                # Dapatkan harga quote asset dalam USD
+                quote_ticker = self.binance.get_ticker(f"{quote_asset}USDT")
+                quote_price_usd = Decimal(quote_ticker["lastPrice"])
+
+            # Harga eksekusi dari kedalaman order book untuk notional target
+            orderbook = self.orderbook_cache.get(symbol)
 
-                logger.info(f"Memeriksa {base_asset} dengan harga Binance {binance_price} {quote_asset}")
+        # Dapatkan harga di DEX di setiap jaringan
+        dex_prices_by_network = {}
 
-                # Dapatkan alamat token di berbagai jaringan
-                token_networks = {}
+        for network, token_address in token_networks.items():
+            try:
+                with span("fetch", token=base_asset, network=network):
+                    dex_prices_by_network[network] = self._get_dex_prices(network, token_address)
+            except Exception as e:
+                logger.error(f"Error saat memeriksa {base_asset} di jaringan {network}: {str(e)}")
+
+        return {
+            "symbol": symbol,
+            "base_asset": base_asset,
+            "binance_price_usd": binance_price * quote_price_usd,
+            "quote_price_usd": quote_price_usd,
+            "orderbook": orderbook,
+            "token_networks": token_networks,
+            "dex_prices": dex_prices_by_network,
+        }
+
+    def _evaluate_gainer(self, market: Optional[Dict[str, Any]], opportunities: List[Opportunity],
+                         trade_routes: List[Tuple[float, float, float]], cost_model: CostModel):
+        """
+        Tahap evaluasi Skenario 1: menilai peluang DEX-CEX dari data pasar satu top gainer.
+
+        Args:
+            market: Data pasar dari _fetch_gainer (None jika top gainer dilewati)
+            opportunities: Daftar peluang (ditambah langsung)
+            trade_routes: Rute AMM untuk setiap peluang (ditambah langsung)
+            cost_model: Model biaya pemindaian
+        """
+        if market is None:
+            return
+
+        symbol = market["symbol"]
+        base_asset = market["base_asset"]
+        binance_price_usd = market["binance_price_usd"]
+        quote_price_usd = market["quote_price_usd"]
+        orderbook = market["orderbook"]
+
+        cex_fee_percentage = config.ARBITRAGE_CONFIG["transaction_fees"]["binance"]["taker"]
+        cex_fills = {}
+
+        if orderbook is not None:
+            target_notional = float(config.ARBITRAGE_CONFIG["cex_target_notional_usd"]) / float(quote_price_usd)
+            cex_fills = {
+                "buy": orderbook.vwap("buy", target_notional),
+                "sell": orderbook.vwap("sell", target_notional),
+            }
+        else:
+            logger.warning(f"Order book {symbol} tidak tersedia, menggunakan harga terakhir")
 
-                if base_asset in config.TOKENS_TO_MONITOR:
-                    token_networks = config.TOKENS_TO_MONITOR[base_asset]["address"]
+        # Harga eksekusi Binance per sisi (USD) dihitung sekali per pasar, bukan per pool DEX
+        cex_prices = {}
+        for side in ("buy", "sell"):
+            cex_fill = cex_fills.get(side)
+            cex_price_usd = binance_price_usd
 
-                if not token_networks:
-                    logger.warning(f"Tidak ada alamat token yang dikonfigurasi untuk {base_asset}")
+            if cex_fill and cex_fill["price"] > 0:
+                cex_price_usd = Decimal(str(cex_fill["price"])) * quote_price_usd
+
+            cex_prices[side] = (cex_price_usd, calculation_value(cex_price_usd))
+
+        binance_calc_price = calculation_value(binance_price_usd)
+
+        # Periksa harga di DEX di setiap jaringan
+        for network, dex_prices in market["dex_prices"].items():
+            token_address = market["token_networks"][network]
+
+            try:
+                self._record_pools(base_asset, network, dex_prices)
+
+                if not dex_prices:
+                    logger.warning("Tidak ada data harga DEX untuk %s di jaringan %s", base_asset, network)
+                    self._record_scan(base_asset, network, 0, False, uses_cex=True)
                     continue
 
-                # Periksa harga di DEX di setiap jaringan
-                for network, token_address in token_networks.items():
-                    try:
-                        # Dapatkan harga di DEX
-                        dex_prices = self.dex_screener.get_price_across_dexes(network, token_address)
-
-                        if not dex_prices:
-                            logger.warning(f"Tidak ada data harga DEX untuk {base_asset} di jaringan {network}")
-                            continue
-
-                        # Periksa setiap DEX
-                        for dex_info in dex_prices:
-                            dex_id = dex_info["dex_id"]
-                            dex_price_usd = dex_info["price_usd"]
-
-                            # Konversi harga Binance ke USD jika perlu
-                            binance_price_usd = binance_price
-
-                            if quote_asset != "USDT" and quote_asset != "BUSD":
-                                # Dapatkan harga quote asset dalam USD
-                                quote_ticker = self.binance.get_ticker(f"{quote_asset}USDT")
-                                quote_price_usd = Decimal(quote_ticker["lastPrice"])
-                                binance_price_usd = binance_price * quote_price_usd
-
-                            # Hitung perbedaan harga
-                            if binance_price_usd > dex_price_usd:
-                                # Beli di DEX, jual di Binance
-                                price_diff_percentage = calculate_price_difference_percentage(dex_price_usd, binance_price_usd)
-                                buy_platform = f"{dex_id} ({network})"
-                                buy_price = dex_price_usd
-                                sell_platform = "Binance"
-                                sell_price = binance_price_usd
-                            else:
-                                # Beli di Binance, jual di DEX
-                                price_diff_percentage = calculate_price_difference_percentage(binance_price_usd, dex_price_usd)
-                                buy_platform = "Binance"
-                                buy_price = binance_price_usd
-                                sell_platform = f"{dex_id} ({network})"
-                                sell_price = dex_price_usd
-
-                            # Dapatkan biaya transaksi
-                            if buy_platform == "Binance":
-                                buy_fee_percentage = config.ARBITRAGE_CONFIG["transaction_fees"]["binance"]["taker"]
-                            else:
-                                buy_fee_percentage = config.ARBITRAGE_CONFIG["dex_fees"].get(dex_id.lower(), 0.3)
+                opportunity_count = len(opportunities)
+
+                # Periksa setiap DEX
+                for dex_info in dex_prices:
+                    dex_id = dex_info["dex_id"]
+                    dex_price_usd = dex_info["price_usd"]
+                    dex_calc_price = calculation_value(dex_price_usd, dex_info.get("price_usd_fixed"))
+                    dex_fee_percentage = cost_model.dex_fee(dex_id, dex_info.get("labels"))
+
+                    with span("spread", token=base_asset, network=network):
+                        # Arah arbitrase ditentukan dari harga terakhir, harga eksekusi dari order book
+                        cex_side = "sell" if binance_calc_price > dex_calc_price else "buy"
+                        cex_fill = cex_fills.get(cex_side)
+                        cex_price_usd, cex_calc_price = cex_prices[cex_side]
+
+                        # Hitung perbedaan harga
+                        if cex_side == "sell":
+                            # Beli di DEX, jual di Binance
+                            buy_platform = f"{dex_id} ({network})"
+                            buy_price, buy_calc_price = dex_price_usd, dex_calc_price
+                            sell_platform = "Binance"
+                            sell_price, sell_calc_price = cex_price_usd, cex_calc_price
+                        else:
+                            # Beli di Binance, jual di DEX
+                            buy_platform = "Binance"
+                            buy_price, buy_calc_price = cex_price_usd, cex_calc_price
+                            sell_platform = f"{dex_id} ({network})"
+                            sell_price, sell_calc_price = dex_price_usd, dex_calc_price
 
-                            if sell_platform == "Binance":
-                                sell_fee_percentage = config.ARBITRAGE_CONFIG["transaction_fees"]["binance"]["taker"]
+                        price_diff_percentage = calculate_price_difference_percentage(buy_calc_price, sell_calc_price)
+
+                        # Ukuran order di Binance sampai spread terhadap DEX tertutup
+                        spread_closing = None
+
+                        if orderbook is not None:
+                            dex_price_quote = float(dex_price_usd / quote_price_usd)
+                            dex_fee = float(dex_fee_percentage) / 100
+
+                            if cex_side == "buy":
+                                counter_price = dex_price_quote * (1 - dex_fee)
                             else:
-                                sell_fee_percentage = config.ARBITRAGE_CONFIG["dex_fees"].get(dex_id.lower(), 0.3)
-
-                            # Perkiraan biaya gas
-                            gas_cost = estimate_gas_cost(network)
-
-                            # Hitung keuntungan setelah biaya
-                            amount = Decimal("1")  # Jumlah token untuk simulasi
-                            net_profit, profit_percentage = calculate_profit_after_fees(
-                                buy_price=buy_price,
-                                sell_price=sell_price,
-                                amount=amount,
-                                buy_fee_percentage=buy_fee_percentage,
-                                sell_fee_percentage=sell_fee_percentage,
-                                gas_cost=gas_cost
-                            )
-
-                            # Periksa likuiditas
-                            liquidity = float(dex_info["liquidity_usd"]) if "liquidity_usd" in dex_info else 0
-
-                            # Jika menguntungkan dan likuiditas cukup, tambahkan ke daftar peluang
-                            if is_profitable_opportunity(profit_percentage, self.min_profit_percentage) and liquidity >= self.min_liquidity:
-                                opportunity = {
-                                    "scenario": 1,
-                                    "token": base_asset,
-                                    "buy_platform": buy_platform,
-                                    "buy_price": float(buy_price),
-                                    "sell_platform": sell_platform,
-                                    "sell_price": float(sell_price),
-                                    "price_diff_percentage": float(price_diff_percentage),
-                                    "buy_fee_percentage": float(buy_fee_percentage),
-                                    "sell_fee_percentage": float(sell_fee_percentage),
-                                    "gas_cost": float(gas_cost),
-                                    "net_profit": float(net_profit),
-                                    "profit_percentage": float(profit_percentage),
-                                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                                    "network": network,
-                                    "token_address": token_address,
-                                    "liquidity": float(dex_info["liquidity_usd"]) if "liquidity_usd" in dex_info else 0
-                                }
-
-                                opportunities.append(opportunity)
-                                logger.info(f"Peluang arbitrase ditemukan untuk {base_asset}: {buy_platform} -> {sell_platform}, profit {profit_percentage:.2f}%")
-
-                    except Exception as e:
-                        logger.error(f"Error saat memeriksa {base_asset} di jaringan {network}: {str(e)}")
-                        continue
+                                counter_price = dex_price_quote * (1 + dex_fee)
+
+                            spread_closing = orderbook.spread_closing_size(cex_side, counter_price, cex_fee_percentage)
+
+                    with span("fees", token=base_asset, network=network):
+                        # Dapatkan biaya transaksi
+                        if buy_platform == "Binance":
+                            buy_fee_percentage = cex_fee_percentage
+                        else:
+                            buy_fee_percentage = dex_fee_percentage
+
+                        if sell_platform == "Binance":
+                            sell_fee_percentage = cex_fee_percentage
+                        else:
+                            sell_fee_percentage = dex_fee_percentage
+
+                        # Perkiraan biaya gas (USD)
+                        gas_cost = cost_model.gas_cost_usd(network)
+
+                        # Hitung keuntungan setelah biaya
+                        amount = Decimal("1")  # Jumlah token untuk simulasi
+                        net_profit, profit_percentage = calculate_profit_after_fees(
+                            buy_price=buy_calc_price,
+                            sell_price=sell_calc_price,
+                            amount=amount,
+                            buy_fee_percentage=buy_fee_percentage,
+                            sell_fee_percentage=sell_fee_percentage,
+                            gas_cost=self._gas_share_per_token(calculation_value(gas_cost, cost_model.gas_cost_fixed(network)), buy_calc_price),
+                            token_decimals=get_token_decimals(base_asset, network)
+                        )
+
+                    with span("filter", token=base_asset, network=network):
+                        # Periksa likuiditas
+                        liquidity = float(dex_info["liquidity_usd"]) if "liquidity_usd" in dex_info else 0
+                        passes_filter = is_profitable_opportunity(profit_percentage, self.min_profit_percentage) and liquidity >= self.min_liquidity
+
+                    # Jika menguntungkan dan likuiditas cukup, tambahkan ke daftar peluang
+                    if passes_filter:
+                        opportunity = Opportunity(
+                            scenario=1,
+                            token=base_asset,
+                            buy_platform=buy_platform,
+                            buy_price=float(buy_price),
+                            sell_platform=sell_platform,
+                            sell_price=float(sell_price),
+                            price_diff_percentage=float(price_diff_percentage),
+                            buy_fee_percentage=float(buy_fee_percentage),
+                            sell_fee_percentage=float(sell_fee_percentage),
+                            gas_cost=float(gas_cost),
+                            net_profit=float(net_profit),
+                            profit_percentage=float(profit_percentage),
+                            timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                            network=network,
+                            token_address=token_address,
+                            liquidity=liquidity,
+                            cex_last_price=float(binance_price_usd),
+                            cex_fill_complete=bool(cex_fill["complete"]) if cex_fill else False,
+                            cex_max_size=spread_closing["quantity"] if spread_closing is not None else None,
+                            cex_max_notional_usd=spread_closing["notional"] * float(quote_price_usd) if spread_closing is not None else None
+                        )
+
+                        # Rute AMM (pool DEX) vs harga tetap (order book CEX) untuk ukuran trade optimal
+                        pool = AmmPool.from_dex_info(dex_info, float(dex_fee_percentage))
+
+                        if pool is None:
+                            route = (0.0, 0.0, 0.0)
+                        elif cex_side == "sell":
+                            route = compose_legs(pool.as_buy_leg(), fixed_price_leg(float(sell_price), float(cex_fee_percentage), "sell"))
+                        else:
+                            route = compose_legs(fixed_price_leg(float(buy_price), float(cex_fee_percentage), "buy"), pool.as_sell_leg())
+
+                        opportunities.append(opportunity)
+                        trade_routes.append(route)
+                        logger.info("Peluang arbitrase ditemukan untuk %s: %s -> %s, profit %.2f%%", base_asset, buy_platform, sell_platform, profit_percentage)
+
+                # Spread terbesar DEX vs harga terakhir Binance untuk penjadwal
+                max_spread = max(
+                    [abs(float(calculate_price_difference_percentage(binance_calc_price, calculation_value(d["price_usd"], d.get("price_usd_fixed"))))) for d in dex_prices if d["price_usd"] > 0],
+                    default=0
+                )
+                self._record_scan(base_asset, network, max_spread, len(opportunities) > opportunity_count, uses_cex=True)
 
             except Exception as e:
-                logger.error(f"Error saat memproses top gainer {gainer['symbol']}: {str(e)}")
+                logger.error(f"Error saat memeriksa {base_asset} di jaringan {network}: {str(e)}")
                 continue
 
-        # Urutkan berdasarkan persentase keuntungan (descending)
-        opportunities.sort(key=lambda x: x["profit_percentage"], reverse=True)
+    def _evaluate_same_chain(self, token: str, network: str, token_address: str, dex_prices: List[Dict[str, Any]],
+                             cost_model: CostModel) -> Tuple[List[Opportunity], List[Tuple[float, float, float]]]:
+        """
+        Menilai peluang arbitrase DEX-DEX di satu jaringan dari harga pool yang sudah diambil.
 
-        logger.info(f"Pemindaian Skenario 1 selesai. Ditemukan {len(opportunities)} peluang arbitrase.")
+        Dipakai oleh pemindaian penuh Skenario 2 dan refresh cepat pool hot.
 
-        return opportunities
+        Args:
+            token: Simbol token
+            network: Nama jaringan
+            token_address: Alamat token
+            dex_prices: Harga di berbagai DEX (format get_price_across_dexes)
+            cost_model: Model biaya pemindaian
+
+        Returns:
+            Tuple (daftar peluang, rute AMM untuk setiap peluang)
+        """
+        opportunities = []
+        trade_routes = []
+
+        # Cari peluang arbitrase di jaringan yang sama
+        with span("spread", token=token, network=network):
+            same_chain_opportunities = self.dex_screener.find_arbitrage_opportunities_same_chain(
+                chain_id=network,
+                token_address=token_address,
+                min_price_diff_percentage=self.min_profit_percentage,
+                dex_prices=dex_prices
+            )
+
+        if not same_chain_opportunities:
+            logger.debug("Tidak ada peluang arbitrase untuk %s di jaringan %s yang memenuhi minimum profit %s%%", token, network, self.min_profit_percentage)
+            return opportunities, trade_routes
+
+        # Proses setiap peluang
+        for opp in same_chain_opportunities:
+            try:
+                # Dapatkan biaya transaksi
+                buy_dex = opp["buy_dex"]
+                sell_dex = opp["sell_dex"]
+
+                with span("fees", token=token, network=network):
+                    buy_fee_percentage = cost_model.dex_fee(buy_dex, opp["buy_pool"].get("labels"))
+                    sell_fee_percentage = cost_model.dex_fee(sell_dex, opp["sell_pool"].get("labels"))
+
+                    # Perkiraan biaya gas (USD)
+                    gas_cost = cost_model.gas_cost_usd(network)
+
+                    # Hitung keuntungan setelah biaya
+                    amount = Decimal("1")  # Jumlah token untuk simulasi
+                    buy_calc_price = calculation_value(opp["buy_price"], opp["buy_pool"].get("price_usd_fixed"))
+                    net_profit, profit_percentage = calculate_profit_after_fees(
+                        buy_price=buy_calc_price,
+                        sell_price=calculation_value(opp["sell_price"], opp["sell_pool"].get("price_usd_fixed")),
+                        amount=amount,
+                        buy_fee_percentage=buy_fee_percentage,
+                        sell_fee_percentage=sell_fee_percentage,
+                        gas_cost=self._gas_share_per_token(calculation_value(gas_cost, cost_model.gas_cost_fixed(network)), buy_calc_price),
+                        token_decimals=get_token_decimals(token, network)
+                    )
+
+                with span("filter", token=token, network=network):
+                    # Periksa likuiditas
+                    buy_liquidity = float(opp["buy_liquidity"]) if "buy_liquidity" in opp else 0
+                    sell_liquidity = float(opp["sell_liquidity"]) if "sell_liquidity" in opp else 0
+                    min_liquidity = min(buy_liquidity, sell_liquidity)
+                    passes_filter = is_profitable_opportunity(profit_percentage, self.min_profit_percentage) and min_liquidity >= self.min_liquidity
+
+                # Jika menguntungkan dan likuiditas cukup, tambahkan ke daftar peluang
+                if passes_filter:
+                    opportunity = Opportunity(
+                        scenario=2,
+                        token=token,
+                        buy_platform=f"{buy_dex} ({network})",
+                        buy_price=float(opp["buy_price"]),
+                        sell_platform=f"{sell_dex} ({network})",
+                        sell_price=float(opp["sell_price"]),
+                        price_diff_percentage=float(opp["price_diff_percentage"]),
+                        buy_fee_percentage=float(buy_fee_percentage),
+                        sell_fee_percentage=float(sell_fee_percentage),
+                        gas_cost=float(gas_cost),
+                        net_profit=float(net_profit),
+                        profit_percentage=float(profit_percentage),
+                        timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        network=network,
+                        token_address=token_address,
+                        buy_liquidity=buy_liquidity,
+                        sell_liquidity=sell_liquidity,
+                        buy_pair_address=opp["buy_pool"]["pair_address"],
+                        sell_pair_address=opp["sell_pool"]["pair_address"]
+                    )
+
+                    opportunities.append(opportunity)
+                    trade_routes.append(self._dex_route(opp, buy_fee_percentage, sell_fee_percentage))
+                    logger.info("Peluang arbitrase ditemukan untuk %s: %s -> %s, profit %.2f%%", token, buy_dex, sell_dex, profit_percentage)
+
+            except Exception as e:
+                logger.error(f"Error saat memproses peluang arbitrase untuk {token} di {network}: {str(e)}")
+                continue
 
-    def scan_scenario_2(self, tokens_to_check: List[str] = None) -> List[Dict[str, Any]]:
+        # Pool yang menghasilkan peluang masuk tier hot untuk refresh cepat
+        self.pair_index.mark_hot(network, [
+            address for opportunity in opportunities
+            for address in (opportunity["buy_pair_address"], opportunity["sell_pair_address"])
+        ])
+
+        return opportunities, trade_routes
+
+    @observe_scan("2")
+    @traced("scenario_2", "scenario")
+    def scan_scenario_2(self, tokens_to_check: List[str] = None, cost_model: Optional[CostModel] = None) -> List[Opportunity]:
         """
         Mencari peluang arbitrase untuk Skenario 2 (DEX - DEX, Sama Jaringan).
 
         Args:
             tokens_to_check: Daftar token yang akan diperiksa (jika None, gunakan dari konfigurasi)
+            cost_model: Model biaya pemindaian (jika None, disusun sendiri)
 
         Returns:
             Daftar peluang arbitrase
@@ -215,143 +843,172 @@ class ArbitrageScanner:
         logger.info("Memulai pemindaian untuk Skenario 2 (DEX - DEX, Sama Jaringan)")
 
         opportunities = []
+        trade_routes = []
+
+        if cost_model is None:
+            cost_model = CostModel(self.gas_oracle)
 
         # Jika tidak ada daftar token yang diberikan, gunakan dari konfigurasi
         if tokens_to_check is None:
             tokens_to_check = list(config.TOKENS_TO_MONITOR.keys())
 
-        # Periksa setiap token
+        # Item kerja: (token, jaringan, alamat) yang jatuh tempo
+        work_items = []
+
         for token in tokens_to_check:
-            try:
-                logger.info(f"Memeriksa token {token} untuk peluang arbitrase DEX-DEX")
+            logger.debug("Memeriksa token %s untuk peluang arbitrase DEX-DEX", token)
 
-                # Dapatkan alamat token di berbagai jaringan
-                token_networks = {}
+            # Dapatkan alamat token di berbagai jaringan
+            token_networks = {}
 
-                if token in config.TOKENS_TO_MONITOR:
-                    token_networks = config.TOKENS_TO_MONITOR[token]["address"]
+            if token in config.TOKENS_TO_MONITOR:
+                token_networks = config.TOKENS_TO_MONITOR[token]["address"]
 
-                if not token_networks:
-                    logger.warning(f"Tidak ada alamat token yang dikonfigurasi untuk {token}")
-                    continue
+            if not token_networks:
+                logger.warning(f"Tidak ada alamat token yang dikonfigurasi untuk {token}")
+                continue
 
-                # Periksa setiap jaringan
-                for network, token_address in token_networks.items():
-                    try:
-                        # Tambahkan logging untuk melihat data mentah
-                        logger.info(f"Mengambil data harga untuk {token} di jaringan {network}")
-
-                        # Dapatkan data harga dari berbagai DEX
-                        dex_prices = self.dex_screener.get_price_across_dexes(network, token_address)
-
-                        # Log jumlah DEX dan rentang harga
-                        if dex_prices:
-                            min_price = min([p["price_usd"] for p in dex_prices if p["price_usd"] > 0], default=0)
-                            max_price = max([p["price_usd"] for p in dex_prices if p["price_usd"] > 0], default=0)
-                            price_diff_pct = 0
-                            if min_price > 0:
-                                price_diff_pct = ((max_price - min_price) / min_price) * 100
-
-                            logger.info(f"Data {token} di {network}: {len(dex_prices)} DEX, harga min: {min_price}, max: {max_price}, diff: {price_diff_pct:.2f}%")
-
-                            # Log detail DEX dengan harga tertinggi dan terendah
-                            if len(dex_prices) > 1:
-                                min_dex = min(dex_prices, key=lambda x: x["price_usd"] if x["price_usd"] > 0 else float('inf'))
-                                max_dex = max(dex_prices, key=lambda x: x["price_usd"] if x["price_usd"] > 0 else 0)
-                                logger.info(f"DEX dengan harga terendah: {min_dex['dex_id']} ({min_dex['price_usd']}), tertinggi: {max_dex['dex_id']} ({max_dex['price_usd']})")
-                        else:
-                            logger.warning(f"Tidak ada data harga yang ditemukan untuk {token} di jaringan {network}")
+            for network, token_address in token_networks.items():
+                if self._is_due(token, network):
+                    work_items.append((token, network, token_address))
 
-                        # Cari peluang arbitrase di jaringan yang sama
-                        same_chain_opportunities = self.dex_screener.find_arbitrage_opportunities_same_chain(
-                            chain_id=network,
-                            token_address=token_address,
-                            min_price_diff_percentage=self.min_profit_percentage
-                        )
+        def fetch(item: Tuple[str, str, str]) -> List[Dict[str, Any]]:
+            token, network, token_address = item
+
+            # Tambahkan logging untuk melihat data mentah
+            logger.debug("Mengambil data harga untuk %s di jaringan %s", token, network)
+
+            # Dapatkan data harga dari berbagai DEX
+            with span("fetch", token=token, network=network):
+                return self._get_dex_prices(network, token_address)
+
+        def evaluate(item: Tuple[str, str, str], dex_prices: List[Dict[str, Any]]):
+            token, network, token_address = item
 
-                        if not same_chain_opportunities:
-                            logger.info(f"Tidak ada peluang arbitrase untuk {token} di jaringan {network} yang memenuhi minimum profit {self.min_profit_percentage}%")
-                            continue
-
-                        # Proses setiap peluang
-                        for opp in same_chain_opportunities:
-                            try:
-                                # Dapatkan biaya transaksi
-                                buy_dex = opp["buy_dex"]
-                                sell_dex = opp["sell_dex"]
-
-                                buy_fee_percentage = config.ARBITRAGE_CONFIG["dex_fees"].get(buy_dex.lower(), 0.3)
-                                sell_fee_percentage = config.ARBITRAGE_CONFIG["dex_fees"].get(sell_dex.lower(), 0.3)
-
-                                # Perkiraan biaya gas
-                                gas_cost = estimate_gas_cost(network)
-
-                                # Hitung keuntungan setelah biaya
-                                amount = Decimal("1")  # Jumlah token untuk simulasi
-                                net_profit, profit_percentage = calculate_profit_after_fees(
-                                    buy_price=opp["buy_price"],
-                                    sell_price=opp["sell_price"],
-                                    amount=amount,
-                                    buy_fee_percentage=buy_fee_percentage,
-                                    sell_fee_percentage=sell_fee_percentage,
-                                    gas_cost=gas_cost
-                                )
-
-                                # Periksa likuiditas
-                                buy_liquidity = float(opp["buy_liquidity"]) if "buy_liquidity" in opp else 0
-                                sell_liquidity = float(opp["sell_liquidity"]) if "sell_liquidity" in opp else 0
-                                min_liquidity = min(buy_liquidity, sell_liquidity)
-
-                                # Jika menguntungkan dan likuiditas cukup, tambahkan ke daftar peluang
-                                if is_profitable_opportunity(profit_percentage, self.min_profit_percentage) and min_liquidity >= self.min_liquidity:
-                                    opportunity = {
-                                        "scenario": 2,
-                                        "token": token,
-                                        "buy_platform": f"{buy_dex} ({network})",
-                                        "buy_price": float(opp["buy_price"]),
-                                        "sell_platform": f"{sell_dex} ({network})",
-                                        "sell_price": float(opp["sell_price"]),
-                                        "price_diff_percentage": float(opp["price_diff_percentage"]),
-                                        "buy_fee_percentage": float(buy_fee_percentage),
-                                        "sell_fee_percentage": float(sell_fee_percentage),
-                                        "gas_cost": float(gas_cost),
-                                        "net_profit": float(net_profit),
-                                        "profit_percentage": float(profit_percentage),
-                                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                                        "network": network,
-                                        "token_address": token_address,
-                                        "buy_liquidity": float(opp["buy_liquidity"]),
-                                        "sell_liquidity": float(opp["sell_liquidity"])
-                                    }
-
-                                    opportunities.append(opportunity)
-                                    logger.info(f"Peluang arbitrase ditemukan untuk {token}: {buy_dex} -> {sell_dex}, profit {profit_percentage:.2f}%")
-
-                            except Exception as e:
-                                logger.error(f"Error saat memproses peluang arbitrase untuk {token} di {network}: {str(e)}")
-                                continue
-
-                    except Exception as e:
-                        logger.error(f"Error saat memeriksa {token} di jaringan {network}: {str(e)}")
+            # Log jumlah DEX dan rentang harga
+            if dex_prices:
+                min_price = min([p["price_usd"] for p in dex_prices if p["price_usd"] > 0], default=0)
+                max_price = max([p["price_usd"] for p in dex_prices if p["price_usd"] > 0], default=0)
+                price_diff_pct = 0
+                if min_price > 0:
+                    price_diff_pct = ((max_price - min_price) / min_price) * 100
+
+                logger.debug("Data %s di %s: %d DEX, harga min: %s, max: %s, diff: %.2f%%", token, network, len(dex_prices), min_price, max_price, price_diff_pct)
+
+                # Log detail DEX dengan harga tertinggi dan terendah (hanya jika DEBUG aktif)
+                if len(dex_prices) > 1 and logger.isEnabledFor(logging.DEBUG):
+                    min_dex = min(dex_prices, key=lambda x: x["price_usd"] if x["price_usd"] > 0 else float('inf'))
+                    max_dex = max(dex_prices, key=lambda x: x["price_usd"] if x["price_usd"] > 0 else 0)
+                    logger.debug("DEX dengan harga terendah: %s (%s), tertinggi: %s (%s)", min_dex["dex_id"], min_dex["price_usd"], max_dex["dex_id"], max_dex["price_usd"])
+            else:
+                logger.warning("Tidak ada data harga yang ditemukan untuk %s di jaringan %s", token, network)
+
+            # Simpan pool yang lolos filter likuiditas ke indeks pair
+            self.pair_index.add_pools(token, token_address, dex_prices, self.min_liquidity)
+            self._record_pools(token, network, dex_prices)
+
+            token_opportunities, token_routes = self._evaluate_same_chain(token, network, token_address, dex_prices, cost_model)
+            opportunities.extend(token_opportunities)
+            trade_routes.extend(token_routes)
+            self._record_scan(token, network, price_diff_pct if dex_prices else 0, bool(token_opportunities))
+
+        # Harga DEX diambil di thread fetch, peluang dinilai saat data tiba
+        FetchEvaluatePipeline(
+            "scenario_2", fetch, evaluate,
+            lambda item, e: logger.error(f"Error saat memeriksa {item[0]} di jaringan {item[1]}: {str(e)}")
+        ).run(work_items)
+
+        # Ukuran trade optimal dihitung sekaligus untuk semua kandidat
+        self._apply_trade_sizing(opportunities, trade_routes)
+
+        # Urutkan berdasarkan persentase keuntungan (descending)
+        opportunities.sort(key=lambda x: x.profit_percentage, reverse=True)
+
+        # Pemindaian penuh memperbarui indeks pair
+        self.pair_index.prune()
+        self.pair_index.save()
+
+        logger.info(f"Pemindaian Skenario 2 selesai. Ditemukan {len(opportunities)} peluang arbitrase.")
+
+        return opportunities
+
+    @observe_scan("fast_refresh")
+    @traced("fast_refresh", "scenario")
+    def refresh_hot_pairs(self, refreshed: Optional[Set[Tuple[str, str]]] = None) -> List[Opportunity]:
+        """
+        Refresh cepat: menilai ulang peluang Skenario 2 hanya dari pool tier hot.
+
+        Pool hot diambil langsung berdasarkan alamat lewat endpoint multi-pair
+        (maksimal 30 pair per permintaan), tanpa menemukan ulang semua pair token.
+
+        Args:
+            refreshed: Jika diberikan, diisi (jaringan, alamat pool huruf kecil) yang
+                dinilai ulang, untuk menggabungkan hasil dengan pemindaian penuh terakhir
+
+        Returns:
+            Daftar peluang arbitrase
+        """
+        opportunities = []
+        trade_routes = []
+        pair_filter = self.pair_filter
+        cost_model = CostModel(self.gas_oracle)
+
+        for network, entries in self.pair_index.hot_pairs().items():
+            try:
+                pairs = self.dex_screener.get_pairs_by_addresses(network, [entry["pair_address"] for entry in entries])
+                token_by_pair = {entry["pair_address"].lower(): entry for entry in entries}
+
+                # Kelompokkan pool per token
+                pools_by_token: Dict[str, List[Dict[str, Any]]] = {}
+
+                for pair in pairs:
+                    entry = token_by_pair.get(str(pair.get("pairAddress", "")).lower())
+                    if entry is None:
                         continue
 
+                    # Pool yang likuiditasnya turun (atau tidak lagi lolos filter) keluar dari indeks
+                    if not pair_filter.accepts(pair):
+                        self.pair_index.remove(network, entry["pair_address"])
+                        if refreshed is not None:
+                            refreshed.add((network, entry["pair_address"].lower()))
+                        continue
+
+                    pools_by_token.setdefault(entry["token_address"], []).append(self.dex_screener.pair_to_dex_info(pair))
+
+                for token_address, dex_prices in pools_by_token.items():
+                    if len(dex_prices) >= 2:
+                        if self.use_onchain:
+                            dex_prices = self.onchain_feed.apply(network, dex_prices)
+
+                        token = token_by_pair[dex_prices[0]["pair_address"].lower()]["token_symbol"]
+                        token_opportunities, token_routes = self._evaluate_same_chain(token, network, token_address, dex_prices, cost_model)
+                        opportunities.extend(token_opportunities)
+                        trade_routes.extend(token_routes)
+
+                    # Pool tunggal juga dinilai ulang: tidak ada peluang Skenario 2 dari pool hot token ini
+                    if refreshed is not None:
+                        refreshed.update((network, dex_info["pair_address"].lower()) for dex_info in dex_prices)
+
             except Exception as e:
-                logger.error(f"Error saat memproses token {token}: {str(e)}")
+                logger.error(f"Error saat refresh pool hot di jaringan {network}: {str(e)}")
                 continue
 
-        # Urutkan berdasarkan persentase keuntungan (descending)
-        opportunities.sort(key=lambda x: x["profit_percentage"], reverse=True)
+        self._apply_trade_sizing(opportunities, trade_routes)
+        opportunities.sort(key=lambda x: x.profit_percentage, reverse=True)
 
-        logger.info(f"Pemindaian Skenario 2 selesai. Ditemukan {len(opportunities)} peluang arbitrase.")
+        logger.info(f"Refresh cepat selesai. Ditemukan {len(opportunities)} peluang arbitrase dari pool hot.")
 
         return opportunities
 
-    def scan_scenario_3(self, tokens_to_check: List[str] = None) -> List[Dict[str, Any]]:
+    @observe_scan("3")
+    @traced("scenario_3", "scenario")
+    def scan_scenario_3(self, tokens_to_check: List[str] = None, cost_model: Optional[CostModel] = None) -> List[Opportunity]:
         """
         Mencari peluang arbitrase untuk Skenario 3 (DEX - DEX, Beda Jaringan).
 
         Args:
             tokens_to_check: Daftar token yang akan diperiksa (jika None, gunakan dari konfigurasi)
+            cost_model: Model biaya pemindaian (jika None, disusun sendiri)
 
         Returns:
             Daftar peluang arbitrase
@@ -359,6 +1016,10 @@ class ArbitrageScanner:
         logger.info("Memulai pemindaian untuk Skenario 3 (DEX - DEX, Beda Jaringan)")
 
         opportunities = []
+        trade_routes = []
+
+        if cost_model is None:
+            cost_model = CostModel(self.gas_oracle)
 
         # Jika tidak ada daftar token yang diberikan, gunakan dari konfigurasi
         if tokens_to_check is None:
@@ -368,36 +1029,51 @@ class ArbitrageScanner:
                 if is_token_multichain(token)
             ]
 
-        # Periksa setiap token
-        for token in tokens_to_check:
-            try:
-                logger.info(f"Memeriksa token {token} untuk peluang arbitrase DEX-DEX beda jaringan")
+        def fetch(token: str) -> Dict[str, Dict[str, Any]]:
+            logger.debug("Memeriksa token %s untuk peluang arbitrase DEX-DEX beda jaringan", token)
 
-                # Cari peluang arbitrase di berbagai jaringan
-                cross_chain_opportunities = self.dex_screener.find_arbitrage_opportunities_cross_chain(
-                    token_symbol=token,
-                    min_price_diff_percentage=self.min_profit_percentage
-                )
+            # Dapatkan harga token di setiap jaringan
+            with span("fetch", token=token, network=CROSS_CHAIN):
+                chain_prices = self._get_chain_prices(token)
 
-                if not cross_chain_opportunities:
-                    logger.info(f"Tidak ada peluang arbitrase cross-chain untuk {token}")
-                    continue
+                if chain_prices is None:
+                    chain_prices = self.dex_screener.get_price_across_chains(token, self.pair_filter)
 
-                # Proses setiap peluang
-                for opp in cross_chain_opportunities:
-                    try:
-                        # Dapatkan biaya transaksi
-                        buy_dex = opp["buy_dex"]
-                        sell_dex = opp["sell_dex"]
-                        buy_chain = opp["buy_chain"]
-                        sell_chain = opp["sell_chain"]
+            return chain_prices
 
-                        buy_fee_percentage = config.ARBITRAGE_CONFIG["dex_fees"].get(buy_dex.lower(), 0.3)
-                        sell_fee_percentage = config.ARBITRAGE_CONFIG["dex_fees"].get(sell_dex.lower(), 0.3)
+        def evaluate(token: str, chain_prices: Dict[str, Dict[str, Any]]):
+            # Cari peluang arbitrase di berbagai jaringan
+            with span("spread", token=token, network=CROSS_CHAIN):
+                cross_chain_opportunities = self.dex_screener.find_arbitrage_opportunities_cross_chain(
+                    token_symbol=token,
+                    min_price_diff_percentage=self.min_profit_percentage,
+                    chain_prices=chain_prices,
+                    bridge_fees=cost_model.bridge_fees
+                )
 
-                        # Perkiraan biaya gas untuk kedua jaringan
-                        buy_gas_cost = estimate_gas_cost(buy_chain)
-                        sell_gas_cost = estimate_gas_cost(sell_chain)
+            opportunity_count = len(opportunities)
+
+            if not cross_chain_opportunities:
+                logger.debug("Tidak ada peluang arbitrase cross-chain untuk %s", token)
+                self._record_scan(token, CROSS_CHAIN, 0, False)
+                return
+
+            # Proses setiap peluang
+            for opp in cross_chain_opportunities:
+                try:
+                    # Dapatkan biaya transaksi
+                    buy_dex = opp["buy_dex"]
+                    sell_dex = opp["sell_dex"]
+                    buy_chain = opp["buy_chain"]
+                    sell_chain = opp["sell_chain"]
+
+                    with span("fees", token=token, network=CROSS_CHAIN):
+                        buy_fee_percentage = cost_model.dex_fee(buy_dex, opp["buy_pool"].get("labels"))
+                        sell_fee_percentage = cost_model.dex_fee(sell_dex, opp["sell_pool"].get("labels"))
+
+                        # Perkiraan biaya gas (USD) untuk kedua jaringan
+                        buy_gas_cost = cost_model.gas_cost_usd(buy_chain)
+                        sell_gas_cost = cost_model.gas_cost_usd(sell_chain)
                         total_gas_cost = buy_gas_cost + sell_gas_cost
 
                         # Biaya bridge
@@ -410,85 +1086,237 @@ class ArbitrageScanner:
                         bridge_fee = amount * (Decimal(str(bridge_fee_percentage)) / Decimal("100"))
                         amount_after_bridge = amount - bridge_fee
 
+                        buy_calc_price = calculation_value(opp["buy_price"], opp["buy_pool"].get("price_usd_fixed"))
+                        total_gas_calc = calculation_value(
+                            total_gas_cost, cost_model.gas_cost_fixed(buy_chain) + cost_model.gas_cost_fixed(sell_chain)
+                        )
                         net_profit, profit_percentage = calculate_profit_after_fees(
-                            buy_price=opp["buy_price"],
-                            sell_price=opp["sell_price"],
+                            buy_price=buy_calc_price,
+                            sell_price=calculation_value(opp["sell_price"], opp["sell_pool"].get("price_usd_fixed")),
                             amount=amount_after_bridge,  # Jumlah setelah biaya bridge
                             buy_fee_percentage=buy_fee_percentage,
                             sell_fee_percentage=sell_fee_percentage,
-                            gas_cost=total_gas_cost,
-                            other_fees=Decimal("0")  # Biaya bridge sudah diperhitungkan dalam amount_after_bridge
+                            gas_cost=self._gas_share_per_token(total_gas_calc, buy_calc_price),
+                            other_fees=Decimal("0"),  # Biaya bridge sudah diperhitungkan dalam amount_after_bridge
+                            token_decimals=get_token_decimals(token, buy_chain)
                         )
 
+                    with span("filter", token=token, network=CROSS_CHAIN):
                         # Periksa likuiditas
                         buy_liquidity = float(opp["buy_liquidity"]) if "buy_liquidity" in opp else 0
                         sell_liquidity = float(opp["sell_liquidity"]) if "sell_liquidity" in opp else 0
                         min_liquidity = min(buy_liquidity, sell_liquidity)
+                        passes_filter = is_profitable_opportunity(profit_percentage, self.min_profit_percentage) and min_liquidity >= self.min_liquidity
+
+                    # Jika menguntungkan dan likuiditas cukup, tambahkan ke daftar peluang
+                    if passes_filter:
+                        opportunity = Opportunity(
+                            scenario=3,
+                            token=token,
+                            buy_platform=f"{buy_dex} ({buy_chain})",
+                            buy_price=float(opp["buy_price"]),
+                            sell_platform=f"{sell_dex} ({sell_chain})",
+                            sell_price=float(opp["sell_price"]),
+                            price_diff_percentage=float(opp["price_diff_percentage"]),
+                            buy_fee_percentage=float(buy_fee_percentage),
+                            sell_fee_percentage=float(sell_fee_percentage),
+                            bridge_fee_percentage=float(bridge_fee_percentage),
+                            gas_cost=float(total_gas_cost),
+                            net_profit=float(net_profit),
+                            profit_percentage=float(profit_percentage),
+                            timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                            buy_chain=buy_chain,
+                            sell_chain=sell_chain,
+                            buy_liquidity=buy_liquidity,
+                            sell_liquidity=sell_liquidity
+                        )
 
-                        # Jika menguntungkan dan likuiditas cukup, tambahkan ke daftar peluang
-                        if is_profitable_opportunity(profit_percentage, self.min_profit_percentage) and min_liquidity >= self.min_liquidity:
-                            opportunity = {
-                                "scenario": 3,
-                                "token": token,
-                                "buy_platform": f"{buy_dex} ({buy_chain})",
-                                "buy_price": float(opp["buy_price"]),
-                                "sell_platform": f"{sell_dex} ({sell_chain})",
-                                "sell_price": float(opp["sell_price"]),
-                                "price_diff_percentage": float(opp["price_diff_percentage"]),
-                                "buy_fee_percentage": float(buy_fee_percentage),
-                                "sell_fee_percentage": float(sell_fee_percentage),
-                                "bridge_fee_percentage": float(bridge_fee_percentage),
-                                "gas_cost": float(total_gas_cost),
-                                "net_profit": float(net_profit),
-                                "profit_percentage": float(profit_percentage),
-                                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                                "buy_chain": buy_chain,
-                                "sell_chain": sell_chain,
-                                "buy_liquidity": float(opp["buy_liquidity"]),
-                                "sell_liquidity": float(opp["sell_liquidity"])
-                            }
-
-                            opportunities.append(opportunity)
-                            logger.info(f"Peluang arbitrase cross-chain ditemukan untuk {token}: {buy_dex} ({buy_chain}) -> {sell_dex} ({sell_chain}), profit {profit_percentage:.2f}%")
-
-                    except Exception as e:
-                        logger.error(f"Error saat memproses peluang arbitrase cross-chain untuk {token}: {str(e)}")
-                        continue
+                        opportunities.append(opportunity)
+                        trade_routes.append(self._dex_route(opp, buy_fee_percentage, sell_fee_percentage, bridge_fee_percentage))
+                        logger.info("Peluang arbitrase cross-chain ditemukan untuk %s: %s (%s) -> %s (%s), profit %.2f%%", token, buy_dex, buy_chain, sell_dex, sell_chain, profit_percentage)
 
-            except Exception as e:
-                logger.error(f"Error saat memproses token {token} untuk arbitrase cross-chain: {str(e)}")
-                continue
+                except Exception as e:
+                    logger.error(f"Error saat memproses peluang arbitrase cross-chain untuk {token}: {str(e)}")
+
+            self._record_scan(
+                token, CROSS_CHAIN,
+                max(float(opp["price_diff_percentage"]) for opp in cross_chain_opportunities),
+                len(opportunities) > opportunity_count
+            )
+
+        # Harga per chain diambil di thread fetch, peluang dinilai saat data tiba
+        FetchEvaluatePipeline(
+            "scenario_3", fetch, evaluate,
+            lambda token, e: logger.error(f"Error saat memproses token {token} untuk arbitrase cross-chain: {str(e)}")
+        ).run(token for token in tokens_to_check if self._is_due(token, CROSS_CHAIN))
+
+        # Ukuran trade optimal dihitung sekaligus untuk semua kandidat
+        self._apply_trade_sizing(opportunities, trade_routes)
 
         # Urutkan berdasarkan persentase keuntungan (descending)
-        opportunities.sort(key=lambda x: x["profit_percentage"], reverse=True)
+        opportunities.sort(key=lambda x: x.profit_percentage, reverse=True)
 
         logger.info(f"Pemindaian Skenario 3 selesai. Ditemukan {len(opportunities)} peluang arbitrase.")
 
         return opportunities
 
-    def scan_all_scenarios(self) -> Dict[int, List[Dict[str, Any]]]:
+    @observe_scan("multi_hop")
+    @traced("multi_hop", "scenario")
+    def scan_multi_hop(self, tokens_to_check: List[str] = None, max_cycles: int = 20) -> List[Dict[str, Any]]:
+        """
+        Mencari arbitrase multi-hop (triangular dan lebih) di graf harga lintas venue.
+
+        Graf dipertahankan antar pemanggilan sehingga hanya edge yang harganya
+        berubah sejak siklus sebelumnya yang direlaksasi ulang.
+
+        Args:
+            tokens_to_check: Daftar token yang akan diperiksa (jika None, gunakan dari konfigurasi)
+            max_cycles: Jumlah siklus maksimum yang dikembalikan
+
+        Returns:
+            Daftar siklus arbitrase yang memenuhi persentase keuntungan minimum
+        """
+        logger.info("Memulai pemindaian arbitrase multi-hop")
+
+        if tokens_to_check is None:
+            tokens_to_check = list(config.TOKENS_TO_MONITOR.keys())
+
+        # Biaya swap per pool sama seperti skenario; hanya alamat yang diketahui dihubungkan ke bridge dan Binance
+        cost_model = CostModel(self.gas_oracle)
+        known = known_token_addresses(self.dex_screener.token_resolver)
+
+        # Pool DEX untuk setiap token di setiap jaringan
+        for token in tokens_to_check:
+            if token not in config.TOKENS_TO_MONITOR:
+                continue
+
+            for network, token_address in config.TOKENS_TO_MONITOR[token]["address"].items():
+                try:
+                    pairs = self.dex_screener.get_token_pairs(network, token_address)
+                    add_dex_pairs(self.price_graph, pairs, cost_model, self.min_liquidity)
+                except Exception as e:
+                    logger.error(f"Error saat mengambil pair {token} di jaringan {network}: {str(e)}")
+
+        add_bridge_edges(self.price_graph, known)
+
+        # Ticker Binance (satu permintaan untuk semua simbol)
+        try:
+            tickers = self.binance.get_all_tickers_24h()
+            add_binance_tickers(self.price_graph, tickers, BINANCE_QUOTE_ASSETS, known)
+        except Exception as e:
+            logger.error(f"Gagal mendapatkan ticker dari Binance: {str(e)}")
+
+        cycles = [
+            cycle for cycle in self.price_graph.find_negative_cycles(max_cycles)
+            if cycle["profit_percentage"] >= self.min_profit_percentage
+        ]
+
+        for cycle in cycles:
+            logger.info(f"Siklus arbitrase ditemukan: {describe_cycle(cycle)}, profit {cycle['profit_percentage']:.2f}%")
+
+        logger.info(f"Pemindaian multi-hop selesai. Graf {len(self.price_graph)} node, {self.price_graph.edge_count} edge, ditemukan {len(cycles)} siklus.")
+
+        return cycles
+
+    def scan_scenarios(self, scenarios: List[int], tokens_to_check: List[str] = None) -> Dict[int, List[Opportunity]]:
         """
-        Mencari peluang arbitrase untuk semua skenario.
+        Mencari peluang arbitrase untuk skenario yang diminta dengan satu rencana pengambilan data.
+
+        Planner mengambil ticker Binance untuk Skenario 1 (semua ticker untuk
+        join CEX-DEX, atau top gainers jika join nonaktif), lalu semua pair
+        DEX Screener yang dibutuhkan skenario dalam permintaan batch tanpa
+        duplikat. Evaluator setiap skenario memakai data tersebut dari cache.
+
+        Skenario 1 sebagian besar menunggu Binance, sedangkan Skenario 2 dan 3
+        menunggu DEX Screener, sehingga skenario dijalankan bersamaan jika
+        concurrent_scenarios aktif. Rate limiter setiap provider dan cache pair
+        DEX Screener dipakai bersama oleh semua thread.
+
+        Args:
+            scenarios: Skenario yang akan dipindai (1, 2, 3)
+            tokens_to_check: Daftar token yang akan diperiksa (jika None, gunakan dari konfigurasi)
 
         Returns:
             Dict dengan skenario sebagai key dan daftar peluang sebagai value
         """
-        logger.info("Memulai pemindaian untuk semua skenario arbitrase")
+        start_time = time.perf_counter()
+
+        # Data pair dari siklus sebelumnya tidak dipakai ulang
+        self.dex_screener.token_pairs_cache.clear()
 
-        results = {}
+        planner = ScanPlanner(self)
+        market_join = config.MARKET_JOIN["enabled"]
+        top_gainers = planner.fetch_top_gainers() if 1 in scenarios and not market_join else None
+        tickers = planner.fetch_tickers() if 1 in scenarios and market_join else None
 
-        # Skenario 1: DEX - CEX, Sama Jaringan
-        results[1] = self.scan_scenario_1()
+        # Tanpa data Binance, Skenario 1 mengambilnya sendiri sehingga pair-nya tidak direncanakan
+        planned = [scenario for scenario in scenarios if scenario != 1 or top_gainers is not None or tickers is not None]
+        plan = planner.build(planned, tokens_to_check, top_gainers, tickers)
+        planner.execute(plan)
 
-        # Skenario 2: DEX - DEX, Sama Jaringan
-        results[2] = self.scan_scenario_2()
+        # Biaya DEX, gas dan bridge dihitung sekali untuk semua skenario
+        cost_model = CostModel(self.gas_oracle, plan.dex_tokens)
 
-        # Skenario 3: DEX - DEX, Beda Jaringan
-        results[3] = self.scan_scenario_3()
+        scans = {
+            1: lambda: self.scan_scenario_1(tokens_to_check=tokens_to_check, top_gainers=top_gainers, cost_model=cost_model, tickers=tickers),  # DEX - CEX, Sama Jaringan
+            2: lambda: self.scan_scenario_2(tokens_to_check, cost_model),  # DEX - DEX, Sama Jaringan
+            3: lambda: self.scan_scenario_3(tokens_to_check, cost_model),  # DEX - DEX, Beda Jaringan
+        }
+        scans = {scenario: scans[scenario] for scenario in scenarios}
 
-        logger.info("Pemindaian semua skenario selesai")
+        if config.ARBITRAGE_CONFIG["concurrent_scenarios"] and len(scans) > 1:
+            with ThreadPoolExecutor(max_workers=len(scans), thread_name_prefix="scenario") as executor:
+                futures = {scenario: executor.submit(scan) for scenario, scan in scans.items()}
+                results = {scenario: future.result() for scenario, future in futures.items()}
+        else:
+            results = {scenario: scan() for scenario, scan in scans.items()}
+
+        # Satu pengamatan per (token, jaringan) per siklus, apa pun urutan skenario
+        if self.scheduler is not None:
+            self.scheduler.end_cycle()
+
+        # Kombinasi tanpa pool layak tetap ditunda setelah program dijalankan ulang
+        if config.NEGATIVE_CACHE["enabled"]:
+            self.negative_cache.save()
+
+        logger.info(f"Pemindaian skenario {', '.join(str(scenario) for scenario in scans)} selesai dalam {time.perf_counter() - start_time:.1f} detik")
 
         return results
 
-# Singleton instance
-arbitrage_scanner = ArbitrageScanner()
+    def scan_all_scenarios(self, tokens_to_check: List[str] = None) -> Dict[int, List[Opportunity]]:
+        """
+        Mencari peluang arbitrase untuk semua skenario (lihat scan_scenarios).
+
+        Args:
+            tokens_to_check: Daftar token yang akan diperiksa (jika None, gunakan dari konfigurasi)
+
+        Returns:
+            Dict dengan skenario sebagai key dan daftar peluang sebagai value
+        """
+        logger.info("Memulai pemindaian untuk semua skenario arbitrase")
+
+        return self.scan_scenarios([1, 2, 3], tokens_to_check)
+
+# Singleton instance (dibuat saat pertama kali digunakan)
+_arbitrage_scanner: Optional[ArbitrageScanner] = None
+
+def get_arbitrage_scanner() -> ArbitrageScanner:
+    """
+    Mendapatkan instance singleton ArbitrageScanner, dibuat saat pertama kali diminta.
+
+    Returns:
+        Instance ArbitrageScanner
+    """
+    global _arbitrage_scanner
+
+    if _arbitrage_scanner is None:
+        _arbitrage_scanner = ArbitrageScanner()
+
+    return _arbitrage_scanner
+
+def __getattr__(name: str) -> Any:
+    # Kompatibilitas: `from arbitrage import arbitrage_scanner` tetap berfungsi
+    if name == "arbitrage_scanner":
+        return get_arbitrage_scanner()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
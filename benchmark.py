@@ -0,0 +1,170 @@
+"""
+Benchmark perhitungan selisih harga dan profit: jalur Decimal vs fixed-point.
+
+Menjalankan calculate_price_difference_percentage dan
+calculate_profit_after_fees dengan input acak yang menyerupai data pemindaian
+(harga Decimal dari DEX, harga float, biaya persen float, gas Decimal), sekali
+dengan FIXED_POINT dinonaktifkan (Decimal) dan sekali diaktifkan. Jalur
+fixed-point juga diukur dengan harga yang sudah di-parse ke Fixed (seperti
+price_usd_fixed dari pair_to_dex_info), inti fixed-point tanpa konversi (input
+sudah berupa int), serta selisih hasil maksimum antara kedua jalur.
+
+Penggunaan:
+    python benchmark.py [--iterations N] [--repeat R] [--seed S]
+"""
+
+import argparse
+import random
+import time
+from decimal import Decimal
+from typing import Callable, Dict, Any, List, Tuple
+
+import config
+import fixedpoint
+from utils import calculate_price_difference_percentage, calculate_profit_after_fees
+
+def generate_inputs(count: int, seed: int) -> List[Dict[str, Any]]:
+    """
+    Membuat input acak untuk benchmark.
+
+    Args:
+        count: Jumlah kasus
+        seed: Seed generator acak
+
+    Returns:
+        Daftar kasus (argumen calculate_profit_after_fees)
+    """
+    rng = random.Random(seed)
+    cases = []
+
+    for _ in range(count):
+        price = 10 ** rng.uniform(-6, 4)
+        token_decimals = rng.choice((6, 8, 18))
+
+        cases.append({
+            "buy_price": Decimal(str(round(price, 12))),
+            "sell_price": price * (1 + rng.uniform(-0.05, 0.05)),
+            "amount": Decimal("1") - Decimal(str(rng.choice((0, 0.05, 0.1)))) / Decimal("100"),
+            "buy_fee_percentage": rng.choice((0.1, 0.25, 0.3)),
+            "sell_fee_percentage": rng.choice((0.1, 0.25, 0.3)),
+            "gas_cost": Decimal(str(rng.uniform(0.0001, 5))) * Decimal(str(price)) / Decimal("1000"),
+            "token_decimals": token_decimals,
+        })
+
+    return cases
+
+def _evaluate(cases: List[Dict[str, Any]]) -> List[Tuple[Decimal, Decimal, Decimal]]:
+    return [
+        (calculate_price_difference_percentage(case["buy_price"], case["sell_price"]),) + calculate_profit_after_fees(**case)
+        for case in cases
+    ]
+
+def _fixed_core(cases: List[Tuple[int, ...]]) -> List[Tuple[int, int, int]]:
+    price_difference_percentage = fixedpoint.price_difference_percentage
+    profit_after_fees = fixedpoint.profit_after_fees
+
+    return [
+        (price_difference_percentage(case[0], case[1]),) + profit_after_fees(*case)
+        for case in cases
+    ]
+
+def _time(function: Callable[[], Any], repeat: int) -> float:
+    # Waktu terbaik dari beberapa pengulangan (detik)
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+def run_benchmark(iterations: int, repeat: int, seed: int) -> Dict[str, Any]:
+    """
+    Menjalankan benchmark.
+
+    Args:
+        iterations: Jumlah kasus per pengulangan
+        repeat: Jumlah pengulangan (waktu terbaik yang dipakai)
+        seed: Seed generator acak
+
+    Returns:
+        Dict waktu per jalur (detik) dan selisih hasil maksimum
+    """
+    cases = generate_inputs(iterations, seed)
+    to_fixed = fixedpoint.to_fixed
+    fixed_cases = [
+        (
+            to_fixed(case["buy_price"]), to_fixed(case["sell_price"]),
+            to_fixed(case["amount"], case["token_decimals"]),
+            to_fixed(case["buy_fee_percentage"]), to_fixed(case["sell_fee_percentage"]),
+            to_fixed(case["gas_cost"]), 0, case["token_decimals"],
+        )
+        for case in cases
+    ]
+
+    # Harga di-parse sekali saat data diterima dan biaya gas fixed-point dari CostModel, seperti di pemindaian
+    parsed_cases = [
+        dict(case, buy_price=fixedpoint.to_price(case["buy_price"]), sell_price=fixedpoint.to_price(case["sell_price"]),
+             gas_cost=fixedpoint.to_price(case["gas_cost"]))
+        for case in cases
+    ]
+
+    enabled = config.FIXED_POINT["enabled"]
+
+    try:
+        config.FIXED_POINT["enabled"] = False
+        decimal_time = _time(lambda: _evaluate(cases), repeat)
+        decimal_results = _evaluate(cases)
+
+        config.FIXED_POINT["enabled"] = True
+        fixed_time = _time(lambda: _evaluate(cases), repeat)
+        fixed_results = _evaluate(cases)
+        parsed_time = _time(lambda: _evaluate(parsed_cases), repeat)
+    finally:
+        config.FIXED_POINT["enabled"] = enabled
+
+    core_time = _time(lambda: _fixed_core(fixed_cases), repeat)
+
+    max_difference = [Decimal("0")] * 3
+    for decimal_result, fixed_result in zip(decimal_results, fixed_results):
+        for i in range(3):
+            max_difference[i] = max(max_difference[i], abs(decimal_result[i] - fixed_result[i]))
+
+    return {
+        "iterations": iterations,
+        "decimal": decimal_time,
+        "fixed": fixed_time,
+        "parsed": parsed_time,
+        "core": core_time,
+        "max_difference": {
+            "price_diff_percentage": max_difference[0],
+            "net_profit": max_difference[1],
+            "profit_percentage": max_difference[2],
+        },
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark perhitungan Decimal vs fixed-point")
+    parser.add_argument("--iterations", type=int, default=20000, help="Jumlah kasus per pengulangan")
+    parser.add_argument("--repeat", type=int, default=5, help="Jumlah pengulangan (waktu terbaik dipakai)")
+    parser.add_argument("--seed", type=int, default=1, help="Seed generator acak")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.iterations, args.repeat, args.seed)
+    iterations = result["iterations"]
+
+    print(f"{iterations} kasus (selisih harga + profit setelah biaya), waktu terbaik dari {args.repeat} pengulangan")
+    print("")
+
+    for label, key in (("Decimal (utils)", "decimal"), ("Fixed-point (utils)", "fixed"), ("Fixed-point (utils, harga di-parse)", "parsed"), ("Fixed-point (inti, input int)", "core")):
+        seconds = result[key]
+        print(f"  {label:<36} {seconds * 1000:9.1f} ms  {seconds / iterations * 1e6:7.2f} us/kasus  {result['decimal'] / seconds:5.2f}x")
+
+    print("")
+    print("Selisih hasil maksimum (Decimal vs fixed-point):")
+    for name, difference in result["max_difference"].items():
+        print(f"  {name:<36} {difference:.3E}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+Modul cache pengambilan data yang dipakai bersama oleh beberapa thread.
+
+Saat skenario dipindai bersamaan, data yang sama (misalnya pair token di satu
+jaringan) sering diminta oleh lebih dari satu skenario. FetchCache menyimpan
+hasilnya selama TTL dan memastikan hanya satu permintaan yang berjalan per key
+(single-flight); thread lain menunggu dan memakai hasil yang sama.
+
+NegativeCache mencatat (token, jaringan) yang tidak punya pool layak dan
+menunda pemeriksaan ulangnya dengan backoff eksponensial, disimpan ke file
+agar tetap berlaku setelah program dijalankan ulang.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import config
+import metrics
+
+logger = logging.getLogger("arbitrage.cache")
+
+class _Flight:
+    """
+    Pengambilan data yang sedang berjalan untuk satu key.
+    """
+
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+class FetchCache:
+    """
+    Cache hasil pengambilan data dengan TTL dan single-flight.
+    """
+
+    def __init__(self, name: str, ttl: float = config.FETCH_CACHE["ttl"],
+                 max_entries: int = config.FETCH_CACHE["max_entries"]):
+        """
+        Inisialisasi cache.
+
+        Args:
+            name: Nama cache (label metrik)
+            ttl: Masa berlaku data (detik)
+            max_entries: Jumlah entri maksimum sebelum entri kedaluwarsa dibuang
+        """
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def clear(self):
+        """
+        Mengosongkan cache (permintaan yang sedang berjalan tidak terpengaruh).
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Menyimpan data yang sudah diambil di luar get_or_fetch (misalnya hasil permintaan batch).
+
+        Args:
+            key: Key cache
+            value: Data yang disimpan
+        """
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._prune()
+            self._entries[key] = (time.time(), value)
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """
+        Mendapatkan data dari cache, atau mengambilnya sekali jika belum ada.
+
+        Jika thread lain sedang mengambil key yang sama, fungsi ini menunggu
+        dan mengembalikan hasil (atau exception) yang sama.
+
+        Args:
+            key: Key cache
+            fetch: Fungsi tanpa argumen untuk mengambil data
+
+        Returns:
+            Data hasil pengambilan
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and time.time() - entry[0] < self.ttl:
+                metrics.record_cache(self.name, True)
+                return entry[1]
+
+            flight = self._inflight.get(key)
+            leader = flight is None
+
+            if leader:
+                flight = self._inflight[key] = _Flight()
+
+        if not leader:
+            metrics.CACHE_REQUESTS.inc(cache=self.name, result="shared")
+            flight.event.wait()
+
+            if flight.error is not None:
+                raise flight.error
+
+            return flight.value
+
+        metrics.record_cache(self.name, False)
+
+        try:
+            flight.value = fetch()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            self.put(key, flight.value)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.event.set()
+
+        return flight.value
+
+    def _prune(self):
+        # Dipanggil dengan lock: buang entri kedaluwarsa, lalu yang tertua jika masih penuh
+        now = time.time()
+        expired = [key for key, (stored_at, _) in self._entries.items() if now - stored_at >= self.ttl]
+
+        for key in expired:
+            del self._entries[key]
+
+        if len(self._entries) >= self.max_entries:
+            oldest = sorted(self._entries, key=lambda key: self._entries[key][0])
+            for key in oldest[:len(oldest) // 2]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class NegativeCache:
+    """
+    Cache persisten (token, jaringan) tanpa pool yang layak, dengan backoff eksponensial.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Inisialisasi negative cache.
+
+        Args:
+            path: Lokasi file cache (default dari config.NEGATIVE_CACHE)
+        """
+        settings = config.NEGATIVE_CACHE
+        self.path = path if path is not None else settings["path"]
+        self.base_delay = settings["base_delay"]
+        self.max_delay = settings["max_delay"]
+        self.multiplier = settings["multiplier"]
+        self.entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        if self.path:
+            self.load()
+
+    def load(self):
+        """
+        Memuat cache dari file (jika ada).
+        """
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Gagal memuat negative cache dari {self.path}: {str(e)}")
+            return
+
+        with self._lock:
+            for entry in data.get("entries", []):
+                self.entries[(entry["token"], entry["network"])] = entry
+
+        logger.info(f"Memuat {len(self.entries)} kombinasi token/jaringan tanpa pool dari {self.path}")
+
+    def save(self):
+        """
+        Menyimpan cache ke file jika ada perubahan.
+        """
+        if not self.path or not self._dirty:
+            return
+
+        with self._lock:
+            data = {"entries": list(self.entries.values())}
+            self._dirty = False
+
+        # Tulis ke file sementara lalu ganti agar file tidak pernah setengah tertulis
+        temp_path = f"{self.path}.tmp"
+
+        try:
+            with open(temp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error(f"Gagal menyimpan negative cache ke {self.path}: {str(e)}")
+
+    def is_suppressed(self, token: str, network: str, min_liquidity: float) -> bool:
+        """
+        Memeriksa apakah (token, jaringan) masih dalam masa tunda.
+
+        Entri hanya berlaku jika dicatat dengan ambang likuiditas yang sama atau
+        lebih longgar: tanpa pool di atas $50,000 tidak berarti tanpa pool di atas $10,000.
+
+        Args:
+            token: Simbol token
+            network: Nama jaringan
+            min_liquidity: Likuiditas minimum (USD) yang dipakai pemindaian saat ini
+
+        Returns:
+            True jika pemeriksaan ulang belum jatuh tempo
+        """
+        with self._lock:
+            entry = self.entries.get((token, network))
+
+        suppressed = (
+            entry is not None
+            and entry.get("min_liquidity") is not None
+            and entry["min_liquidity"] <= min_liquidity
+            and time.time() < entry["retry_at"]
+        )
+        metrics.record_cache("negative", suppressed)
+        return suppressed
+
+    def record_empty(self, token: str, network: str, min_liquidity: float):
+        """
+        Mencatat bahwa (token, jaringan) tidak punya pool yang layak; masa tunda berlipat setiap kali.
+
+        Jika ambang likuiditas berbeda dari entri sebelumnya, hitungan dimulai ulang.
+
+        Args:
+            token: Simbol token
+            network: Nama jaringan
+            min_liquidity: Likuiditas minimum (USD) yang dipakai filter pool
+        """
+        now = time.time()
+        min_liquidity = float(min_liquidity)
+
+        with self._lock:
+            entry = self.entries.get((token, network))
+
+            if entry is None or entry.get("min_liquidity") != min_liquidity:
+                entry = self.entries[(token, network)] = {"token": token, "network": network, "min_liquidity": min_liquidity, "misses": 0}
+
+            entry["misses"] += 1
+            delay = min(self.max_delay, self.base_delay * self.multiplier ** (entry["misses"] - 1))
+            entry["checked_at"] = now
+            entry["retry_at"] = now + delay
+            self._dirty = True
+
+        logger.debug("%s di %s tanpa pool layak (%d kali), diperiksa lagi dalam %.0f detik", token, network, entry["misses"], delay)
+
+    def record_found(self, token: str, network: str):
+        """
+        Menghapus (token, jaringan) dari cache karena pool yang layak ditemukan lagi.
+
+        Args:
+            token: Simbol token
+            network: Nama jaringan
+        """
+        with self._lock:
+            if self.entries.pop((token, network), None) is not None:
+                self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self.entries)
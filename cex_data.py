@@ -13,7 +13,9 @@ import json
 from urllib.parse import urlencode
 
 import config
-from utils import retry_on_exception, get_current_timestamp
+import metrics
+from tracing import span, traced
+from utils import RateLimiter, retry_on_exception, get_current_timestamp
 
 logger = logging.getLogger("arbitrage.cex")
 
@@ -30,9 +32,13 @@ class CEXDataProvider:
             exchange_name: Nama exchange
         """
         self.exchange_name = exchange_name
-        self.last_request_time = 0
-        self.request_count = 0
+        # Maksimal satu permintaan per detik, aman dipakai bersama oleh beberapa thread
+        self.rate_limiter = RateLimiter(1.0, exchange_name)
         self.rate_limit_reset = 0
+    
+    @property
+    def request_count(self) -> int:
+        return self.rate_limiter.request_count
         
     def get_ticker(self, symbol: str) -> Dict[str, Any]:
         """
@@ -97,15 +103,7 @@ class CEXDataProvider:
         """
         Menangani rate limit dengan menunggu jika diperlukan.
         """
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        
-        # Jika waktu sejak permintaan terakhir kurang dari 1 detik, tunggu
-        if time_since_last_request < 1:
-            time.sleep(1 - time_since_last_request)
-        
-        self.last_request_time = time.time()
-        self.request_count += 1
+        self.rate_limiter.wait()
 
 class BinanceDataProvider(CEXDataProvider):
     """
@@ -139,6 +137,7 @@ class BinanceDataProvider(CEXDataProvider):
         ).hexdigest()
     
     @retry_on_exception()
+    @traced("binance.request", "http", ("endpoint",))
     def _make_request(self, endpoint: str, method: str = "GET", params: Dict = None, signed: bool = False) -> Any:
         """
         Membuat permintaan ke API Binance.
@@ -168,6 +167,9 @@ class BinanceDataProvider(CEXDataProvider):
             query_string = urlencode(params)
             params["signature"] = self._generate_signature(query_string)
         
+        start_time = time.perf_counter()
+        status = "error"
+        
         try:
             if method == "GET":
                 response = requests.get(url, params=params, headers=headers)
@@ -178,13 +180,19 @@ class BinanceDataProvider(CEXDataProvider):
             else:
                 raise ValueError(f"Metode HTTP tidak didukung: {method}")
             
+            status = str(response.status_code)
             response.raise_for_status()
-            return response.json()
+
+            with span("parse", "http"):
+                return response.json()
         except requests.exceptions.RequestException as e:
             logger.error(f"Error saat membuat permintaan ke {url}: {str(e)}")
             raise
+        finally:
+            metrics.observe_request(self.exchange_name, endpoint, status, time.perf_counter() - start_time)
     
     @retry_on_exception()
+    @traced("binance.get_ticker", attributes=("symbol",))
     def get_ticker(self, symbol: str) -> Dict[str, Any]:
         """
         Mendapatkan data ticker untuk simbol tertentu.
@@ -201,6 +209,7 @@ class BinanceDataProvider(CEXDataProvider):
         return self._make_request(endpoint, params=params)
     
     @retry_on_exception()
+    @traced("binance.get_orderbook", attributes=("symbol",))
     def get_orderbook(self, symbol: str, limit: int = 10) -> Dict[str, Any]:
         """
         Mendapatkan data order book untuk simbol tertentu.
@@ -247,6 +256,19 @@ class BinanceDataProvider(CEXDataProvider):
         return self._make_request(endpoint)
     
     @retry_on_exception()
+    def get_all_tickers_24h(self) -> List[Dict[str, Any]]:
+        """
+        Mendapatkan data ticker 24 jam (termasuk bid/ask terbaik) untuk semua simbol.
+        
+        Returns:
+            Daftar data ticker 24 jam
+        """
+        endpoint = "/api/v3/ticker/24hr"
+        
+        return self._make_request(endpoint)
+    
+    @retry_on_exception()
+    @traced("binance.get_top_gainers")
     def get_top_gainers(self, limit: int = 20, quote_asset: str = "USDT") -> List[Dict[str, Any]]:
         """
         Mendapatkan daftar top gainers.
@@ -259,8 +281,7 @@ class BinanceDataProvider(CEXDataProvider):
             Daftar top gainers
         """
         # Dapatkan semua ticker 24 jam
-        endpoint = "/api/v3/ticker/24hr"
-        all_tickers = self._make_request(endpoint)
+        all_tickers = self.get_all_tickers_24h()
         
         # Filter ticker dengan quote asset yang ditentukan
         filtered_tickers = [
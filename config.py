@@ -412,11 +412,55 @@ TOKENS_TO_MONITOR = {
 DEX_SCREENER = {
     "base_url": "https://api.dexscreener.com",
     "rate_limit": 300,  # Permintaan per menit
+    "max_tokens_per_request": 30,  # Batas alamat token per permintaan /tokens/v1
+}
+
+# Filter pool yang diterapkan saat parsing respons DEX Screener (lihat dex_data.PairFilter)
+PAIR_FILTER = {
+    "min_liquidity": 10000,  # Likuiditas minimum (USD), diganti --min-liquidity di scanner
+    "require_price": True,  # Buang pool tanpa priceUsd
+    "dex_ids": None,  # Daftar dexId yang diizinkan (None = semua)
+    "quote_symbols": None,  # Daftar simbol quote token yang diizinkan (None = semua)
+}
+
+# Cache data DEX Screener yang dipakai bersama antar skenario (lihat cache.FetchCache)
+FETCH_CACHE = {
+    "ttl": 20,  # Detik
+    "max_entries": 5000,
+}
+
+# Pipeline fetch/evaluasi per skenario (lihat pipeline.FetchEvaluatePipeline)
+SCAN_PIPELINE = {
+    "enabled": True,
+    "fetch_workers": 4,  # Thread pengambil data per skenario
+    "queue_size": 16,  # Batas data yang menunggu dievaluasi (membatasi memori)
+}
+
+# Aritmetika fixed-point untuk selisih harga dan profit (lihat fixedpoint.py)
+FIXED_POINT = {
+    "enabled": True,  # Harga di-parse ke fixed-point dan selisih harga/profit dihitung dengan int (lihat benchmark.py)
+    "price_decimals": 18,  # Desimal skala harga, nilai USD dan persentase
+}
+
+# Model biaya per pemindaian (lihat cost_model.py)
+COST_MODEL = {
+    "default_dex_fee": 0.3,  # Biaya swap (%) untuk DEX yang tidak ada di dex_fees
+    "default_bridge_fee": 0,  # Biaya bridge (%) untuk rute yang tidak ada di bridge_fees
+}
+
+# Join semua ticker Binance dengan snapshot pool DEX untuk Skenario 1 (lihat market_join.py)
+MARKET_JOIN = {
+    "enabled": True,  # False untuk kembali membandingkan top gainers Binance saja
+    "quote_assets": ["USDT", "BUSD", "BTC", "ETH", "BNB"],  # Quote asset ticker yang diindeks
+    "usd_quote_assets": ["USDT", "BUSD"],  # Quote asset yang dianggap bernilai $1
+    "min_quote_volume_usd": 100000,  # Volume 24 jam minimum ticker dalam USD
+    "max_candidates": 50,  # Token maksimum per pemindaian yang dievaluasi dengan order book
 }
 
 # Parameter arbitrase
 ARBITRAGE_CONFIG = {
     "min_profit_percentage": 0.5,  # Persentase keuntungan minimum (0.5%)
+    "concurrent_scenarios": True,  # Jalankan skenario bersamaan di scan_scenarios
     "gas_price_gwei": {
         "ethereum": 30,
         "bsc": 5,
@@ -437,6 +481,10 @@ ARBITRAGE_CONFIG = {
         },
         # Tambahkan CEX lain jika diperlukan
     },
+    "cex_orderbook_depth": 100,  # Jumlah level order book yang diambil untuk harga eksekusi
+    "cex_target_notional_usd": 1000,  # Ukuran order simulasi di CEX (USD)
+    "amm_concentration_factor": 4,  # Pengali cadangan virtual untuk pool concentrated liquidity (v3)
+    "reference_trade_usd": 1000,  # Ukuran trade acuan untuk membagi biaya gas per token
     "dex_fees": {
         "uniswap_v3": 0.3,  # 0.3%
         "sushiswap": 0.3,  # 0.3%
@@ -454,11 +502,145 @@ ARBITRAGE_CONFIG = {
     },
 }
 
+# Konfigurasi klien JSON-RPC
+RPC_CONFIG = {
+    "request_timeout": 5,  # Detik
+}
+
+# Konfigurasi pembacaan state pool on-chain (Multicall3)
+ONCHAIN = {
+    "multicall_address": "0xcA11bde05977b3631167028862bE2a173976CA11",  # Multicall3, alamat sama di semua jaringan
+    "max_calls_per_request": 500,  # Jumlah panggilan maksimum per eth_call aggregate3
+    "block_poll_interval": 2,  # Detik, interval minimum pemeriksaan nomor blok
+    "discovery_ttl": 300,  # Detik, masa berlaku daftar pool dari DEX Screener
+}
+
+# Konfigurasi indeks pair DEX (tier hot/cold)
+PAIR_INDEX = {
+    "path": "pair_index.json",
+    "hot_ttl": 900,  # Detik, pool tetap di tier hot setelah muncul dalam peluang
+    "max_age": 86400,  # Detik, pool dihapus jika tidak terlihat dalam pemindaian penuh
+    "refresh_interval": 15,  # Detik, interval refresh cepat pool hot dalam mode terus-menerus
+    "max_pairs_per_request": 30,  # Batas alamat per permintaan endpoint multi-pair DEX Screener
+}
+
+# Cache resolusi simbol -> alamat per chain untuk token di luar TOKENS_TO_MONITOR (lihat resolver.TokenResolver)
+TOKEN_RESOLVER = {
+    "path": "token_resolution.json",
+    "refresh_after": 86400,  # Detik, resolusi dicari ulang setelah ini
+    "empty_ttl": 3600,  # Detik, simbol tanpa hasil pencarian dicari ulang setelah ini
+    "min_confidence": 0.6,  # Porsi likuiditas minimum alamat terpilih di antara token dengan simbol sama
+}
+
+# Negative cache (token, jaringan) tanpa pool yang lolos filter likuiditas (lihat cache.NegativeCache)
+NEGATIVE_CACHE = {
+    "enabled": True,
+    "path": "negative_cache.json",
+    "base_delay": 300,  # Detik, masa tunda setelah hasil kosong pertama
+    "multiplier": 2,  # Masa tunda dikalikan setiap hasil kosong berikutnya
+    "max_delay": 86400,  # Detik, masa tunda maksimum
+}
+
+# Konfigurasi penjadwal adaptif (mode terus-menerus)
+SCHEDULER = {
+    "enabled": True,
+    "min_interval_ratio": 0.25,  # Interval tercepat = --interval * rasio
+    "max_interval_ratio": 8,  # Interval terlambat untuk token yang tenang = --interval * rasio
+    "decay_factor": 1.5,  # Pengali interval setiap pemindaian tanpa peluang dengan spread tenang
+    "quiet_spread_stdev": 0.1,  # Standar deviasi spread (%) di bawah nilai ini dianggap tenang
+    "window": 20,  # Jumlah pengamatan spread terakhir yang disimpan
+    "hit_rate_alpha": 0.3,  # Faktor penghalusan (EWMA) hit rate peluang
+    "budget_utilization": 0.8,  # Porsi rate limit yang boleh dipakai pemindaian
+    "binance_weight_per_token": 6,  # Perkiraan weight Binance per token Skenario 1 (order book + ticker)
+    "binance_ticker_weight": 80,  # Weight ticker 24 jam semua simbol (Skenario 1 dan multi-hop)
+}
+
+# Konfigurasi oracle harga gas (eth_gasPrice/eth_feeHistory via RPC)
+GAS_ORACLE = {
+    "enabled": True,
+    "cache_ttl": 15,  # Detik, masa berlaku harga gas di cache
+    "native_price_ttl": 60,  # Detik, masa berlaku harga token native (USD) di cache
+    "fee_history_blocks": 5,  # Jumlah blok untuk eth_feeHistory
+    "priority_fee_percentile": 50,  # Persentil priority fee yang digunakan
+    "default_gas_limit": 200000,
+    # Simbol Binance untuk harga token native (jika berbeda dari <native_token>USDT)
+    "native_price_symbols": {
+        "MATIC": "POLUSDT",
+    },
+    # Harga cadangan (USD) jika harga token native tidak bisa diambil
+    "fallback_native_price_usd": {
+        "ETH": 3000,
+        "BNB": 600,
+        "MATIC": 0.5,
+    },
+}
+
+# Konfigurasi metrik (endpoint /metrics diaktifkan dengan --metrics-port)
+METRICS = {
+    "host": "127.0.0.1",
+    "latency_buckets": [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],  # Detik
+    "scan_buckets": [1, 5, 10, 30, 60, 120, 300, 600],  # Detik
+}
+
+# Konfigurasi tracing (diaktifkan dengan --trace FILE)
+TRACING = {
+    "max_events": 500000,  # Batas span di memori agar mode terus-menerus tidak kehabisan memori
+    "breakdown_limit": 10,  # Jumlah (token, jaringan) paling lambat yang dicatat di log
+}
+
+# Konfigurasi profiler sampling (diaktifkan dengan --profile)
+PROFILING = {
+    "sample_interval": 0.005,  # Detik
+    "report_limit": 20,  # Jumlah fungsi teratas di laporan
+    # Fungsi yang sebagian besar waktunya dipakai untuk aritmetika Decimal
+    "decimal_functions": [
+        "calculate_profit_after_fees",
+        "calculate_price_difference_percentage",
+        "_gas_share_per_token",
+        "pair_to_dex_info",
+    ],
+    # Fungsi yang berarti program sedang menunggu jadwal pemindaian berikutnya
+    "idle_functions": ["run_fast_refresh"],
+}
+
 # Konfigurasi output
 OUTPUT_CONFIG = {
     "console_output": True,
     "log_file": "arbitrage.log",
     "log_level": "INFO",  # DEBUG, INFO, WARNING, ERROR, CRITICAL
+    "log_max_bytes": 10 * 1024 * 1024,  # Rotasi file log setelah 10 MB
+    "log_backup_count": 5,
+    "log_batch_size": 200,  # Record per batch sebelum flush
+    # Sampling pesan DEBUG bervolume tinggi: 1 dari N per template pesan, per modul
+    "log_sampling": {
+        "arbitrage.logic": 10,
+        "arbitrage.dex": 10,
+    },
+}
+
+# Konfigurasi snapshot file peluang (arbitrage_opportunities.*)
+SNAPSHOT = {
+    "format": "json",  # json (ringkas), ndjson, msgpack (butuh paket msgpack)
+    "delta": False,  # True: hanya tulis peluang yang berubah sejak snapshot sebelumnya
+    "full_every": 10,  # Mode delta: snapshot lengkap setiap N snapshot
+}
+
+# Konfigurasi sink output (console, file JSON, file teks, webhook, NDJSON)
+OUTPUT_SINKS = {
+    "async": True,  # False: setiap sink dijalankan langsung di loop pemindaian
+    "json_file": "arbitrage_opportunities.json",
+    "text_file": "arbitrage_whatsapp.txt",
+    "webhook_timeout": 5,  # Detik
+    "close_timeout": 30,  # Detik menunggu antrean sink kosong saat program berhenti
+    # Ukuran antrean per sink; jika penuh, laporan terlama dibuang agar pemindaian tidak menunggu.
+    # Sink yang hanya menampilkan/menulis hasil terbaru cukup memakai antrean 1.
+    "queue_size": {
+        "console": 1,
+        "snapshot": 1,
+        "text": 1,
+        "webhook": 20,
+        "ndjson": 100,
+    },
 }
 
 # Konfigurasi penanganan kesalahan
@@ -0,0 +1,233 @@
+"""
+Modul model biaya per pemindaian: biaya DEX, biaya gas dan biaya bridge.
+
+Sebelumnya setiap iterasi evaluasi mencari biaya DEX di konfigurasi
+(dex_id.lower() lalu dict.get), menghitung biaya gas lewat beberapa operasi
+Decimal, dan menyusun key string "<asal>_to_<tujuan>" untuk biaya bridge.
+CostModel menghitung semuanya sekali di awal pemindaian, sehingga loop
+evaluasi hanya melakukan lookup dict dan indeks list.
+
+Biaya gas dibekukan selama satu pemindaian: semua peluang dalam pemindaian
+yang sama memakai harga gas dan harga token native yang sama.
+"""
+
+import logging
+import re
+import threading
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import config
+import fixedpoint
+
+logger = logging.getLogger("arbitrage.cost_model")
+
+# Label versi pool DEX Screener yang bisa punya biaya sendiri di dex_fees (misalnya uniswap_v3)
+_VERSION_LABELS = ("v2", "v3", "v4", "clmm", "dlmm")
+
+# Label fee tier, misalnya "0.05%" atau "1%"
+_FEE_TIER_LABEL = re.compile(r"^(\d+(?:\.\d+)?)\s*%$")
+
+def parse_fee_tier(labels: Optional[Iterable[str]]) -> Optional[float]:
+    """
+    Mencari fee tier (persen) di label pair.
+
+    Args:
+        labels: Label pair DEX Screener
+
+    Returns:
+        Fee tier dalam persen, atau None jika tidak ada label fee tier
+    """
+    for label in labels or ():
+        match = _FEE_TIER_LABEL.match(str(label).strip())
+        if match:
+            return float(match.group(1))
+
+    return None
+
+class BridgeFeeMatrix:
+    """
+    Matriks biaya bridge (persen) antar jaringan, diindeks dengan nomor jaringan.
+    """
+
+    __slots__ = ("networks", "index", "matrix", "default")
+
+    def __init__(self, bridge_fees: Optional[Dict[str, float]] = None, networks: Optional[Sequence[str]] = None,
+                 default: Optional[Decimal] = None):
+        """
+        Menyusun matriks dari biaya bridge "<asal>_to_<tujuan>".
+
+        Args:
+            bridge_fees: Biaya bridge per rute (default dari konfigurasi)
+            networks: Jaringan yang diindeks (default semua jaringan di konfigurasi
+                dan di bridge_fees)
+            default: Biaya untuk rute yang tidak dikonfigurasi (default dari konfigurasi)
+        """
+        if bridge_fees is None:
+            bridge_fees = config.ARBITRAGE_CONFIG["bridge_fees"]
+
+        if default is None:
+            default = Decimal(str(config.COST_MODEL["default_bridge_fee"]))
+
+        routes = {}
+        for key, fee in bridge_fees.items():
+            source, separator, target = key.partition("_to_")
+            if separator:
+                routes[(source, target)] = Decimal(str(fee))
+
+        if networks is None:
+            networks = list(config.NETWORKS)
+            for route in routes:
+                networks.extend(network for network in route if network not in networks)
+
+        self.networks: Tuple[str, ...] = tuple(networks)
+        self.index: Dict[str, int] = {network: i for i, network in enumerate(self.networks)}
+        self.default = default
+        self.matrix: List[List[Decimal]] = [
+            [
+                Decimal("0") if source == target else routes.get((source, target), default)
+                for target in self.networks
+            ]
+            for source in self.networks
+        ]
+
+    def fee(self, source: str, target: str) -> Decimal:
+        """
+        Biaya bridge dari satu jaringan ke jaringan lain.
+
+        Args:
+            source: Jaringan asal
+            target: Jaringan tujuan
+
+        Returns:
+            Biaya bridge dalam persen (default untuk jaringan yang tidak diindeks)
+        """
+        row = self.index.get(source)
+        column = self.index.get(target)
+
+        if row is None or column is None:
+            return Decimal("0") if source == target else self.default
+
+        return self.matrix[row][column]
+
+class CostModel:
+    """
+    Biaya DEX, gas dan bridge yang dihitung sekali untuk satu pemindaian.
+    """
+
+    def __init__(self, gas_oracle, networks: Iterable[str] = ()):
+        """
+        Menyusun model biaya.
+
+        Args:
+            gas_oracle: Instance GasOracle untuk biaya gas (USD)
+            networks: Jaringan yang biaya gasnya dihitung di awal; jaringan lain
+                dihitung saat pertama kali dibutuhkan lalu disimpan
+        """
+        self.gas_oracle = gas_oracle
+        self.default_dex_fee = config.COST_MODEL["default_dex_fee"]
+        self.dex_fees: Dict[str, float] = {
+            dex_id.lower(): float(fee) for dex_id, fee in config.ARBITRAGE_CONFIG["dex_fees"].items()
+        }
+        self.bridge_fees = BridgeFeeMatrix()
+        self.gas_costs_usd: Dict[str, Decimal] = {}
+        self.gas_costs_fixed: Dict[str, int] = {}
+        # Biaya per (dex_id, label) yang sudah diresolusi
+        self._pool_fees: Dict[Tuple[str, Tuple[str, ...]], float] = {}
+        self._lock = threading.Lock()
+
+        for network in networks:
+            self.gas_costs_usd[network] = gas_oracle.estimate_gas_cost_usd(network)
+
+        logger.debug("Model biaya disusun: biaya gas %d jaringan, matriks bridge %dx%d",
+                     len(self.gas_costs_usd), len(self.bridge_fees.networks), len(self.bridge_fees.networks))
+
+    def dex_fee(self, dex_id: str, labels: Optional[Sequence[str]] = None) -> float:
+        """
+        Biaya swap pool DEX dalam persen.
+
+        Urutan: fee tier di label pair (misalnya "0.05%"), biaya per versi
+        (misalnya uniswap_v3 untuk dex_id uniswap dengan label v3), biaya DEX,
+        lalu biaya default.
+
+        Args:
+            dex_id: ID DEX dari DEX Screener
+            labels: Label pair (misalnya ["v3"])
+
+        Returns:
+            Biaya swap dalam persen
+        """
+        key = (dex_id, tuple(labels) if labels else ())
+        fee = self._pool_fees.get(key)
+
+        if fee is None:
+            fee = self._resolve_dex_fee(dex_id, key[1])
+            self._pool_fees[key] = fee
+
+        return fee
+
+    def _resolve_dex_fee(self, dex_id: str, labels: Tuple[str, ...]) -> float:
+        fee_tier = parse_fee_tier(labels)
+        if fee_tier is not None:
+            return fee_tier
+
+        dex_id = dex_id.lower()
+
+        for label in labels:
+            label = str(label).lower()
+            if label in _VERSION_LABELS and f"{dex_id}_{label}" in self.dex_fees:
+                return self.dex_fees[f"{dex_id}_{label}"]
+
+        return self.dex_fees.get(dex_id, self.default_dex_fee)
+
+    def gas_cost_usd(self, network: str) -> Decimal:
+        """
+        Perkiraan biaya gas satu transaksi dalam USD.
+
+        Args:
+            network: Nama jaringan
+
+        Returns:
+            Biaya gas dalam USD
+        """
+        gas_cost = self.gas_costs_usd.get(network)
+
+        if gas_cost is None:
+            with self._lock:
+                gas_cost = self.gas_costs_usd.get(network)
+
+                if gas_cost is None:
+                    gas_cost = self.gas_oracle.estimate_gas_cost_usd(network)
+                    self.gas_costs_usd[network] = gas_cost
+
+        return gas_cost
+
+    def gas_cost_fixed(self, network: str) -> int:
+        """
+        Biaya gas satu transaksi dalam USD sebagai harga fixed-point (lihat gas_cost_usd).
+
+        Args:
+            network: Nama jaringan
+
+        Returns:
+            Biaya gas dalam skala harga fixedpoint
+        """
+        gas_cost = self.gas_costs_fixed.get(network)
+
+        if gas_cost is None:
+            gas_cost = self.gas_costs_fixed[network] = fixedpoint.to_price(self.gas_cost_usd(network))
+
+        return gas_cost
+
+    def bridge_fee(self, source: str, target: str) -> Decimal:
+        """
+        Biaya bridge antar jaringan dalam persen.
+
+        Args:
+            source: Jaringan asal
+            target: Jaringan tujuan
+
+        Returns:
+            Biaya bridge dalam persen
+        """
+        return self.bridge_fees.fee(source, target)
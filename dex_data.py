@@ -11,10 +11,73 @@ import json
 from urllib.parse import urlencode
 
 import config
-from utils import retry_on_exception, get_current_timestamp
+import fixedpoint
+import metrics
+from tracing import span, traced
+from cache import FetchCache
+from cost_model import BridgeFeeMatrix
+from resolver import TokenResolver
+from utils import RateLimiter, retry_on_exception, get_current_timestamp
 
 logger = logging.getLogger("arbitrage.dex")
 
+class PairFilter:
+    """
+    Filter pool yang diperiksa langsung pada data pair mentah DEX Screener.
+
+    Pool yang ditolak tidak pernah diubah menjadi dex_info, sehingga tidak ada
+    Decimal atau dict yang dibuat untuk pool yang akhirnya dibuang skenario.
+    """
+
+    __slots__ = ("min_liquidity", "require_price", "dex_ids", "quote_symbols")
+
+    def __init__(self, min_liquidity: float = config.PAIR_FILTER["min_liquidity"],
+                 require_price: bool = config.PAIR_FILTER["require_price"],
+                 dex_ids: Optional[List[str]] = config.PAIR_FILTER["dex_ids"],
+                 quote_symbols: Optional[List[str]] = config.PAIR_FILTER["quote_symbols"]):
+        """
+        Inisialisasi filter.
+
+        Args:
+            min_liquidity: Likuiditas minimum (USD); pool tanpa data likuiditas selalu ditolak
+            require_price: True untuk menolak pool tanpa priceUsd (atau priceUsd nol)
+            dex_ids: dexId yang diizinkan (None = semua)
+            quote_symbols: Simbol quote token yang diizinkan (None = semua)
+        """
+        self.min_liquidity = float(min_liquidity)
+        self.require_price = require_price
+        self.dex_ids = frozenset(dex_id.lower() for dex_id in dex_ids) if dex_ids else None
+        self.quote_symbols = frozenset(symbol.upper() for symbol in quote_symbols) if quote_symbols else None
+
+    def accepts(self, pair: Dict[str, Any]) -> bool:
+        """
+        Memeriksa apakah pair lolos filter, tanpa membuat Decimal.
+
+        Args:
+            pair: Data pair mentah dari DEX Screener
+
+        Returns:
+            True jika pair lolos filter
+        """
+        liquidity = (pair.get("liquidity") or {}).get("usd")
+
+        try:
+            if not liquidity or float(liquidity) < self.min_liquidity:
+                return False
+
+            if self.require_price and not float(pair.get("priceUsd") or 0) > 0:
+                return False
+        except (TypeError, ValueError):
+            return False
+
+        if self.dex_ids is not None and str(pair.get("dexId", "")).lower() not in self.dex_ids:
+            return False
+
+        if self.quote_symbols is not None and str((pair.get("quoteToken") or {}).get("symbol", "")).upper() not in self.quote_symbols:
+            return False
+
+        return True
+
 class DexScreenerAPI:
     """
     Kelas untuk berinteraksi dengan DEX Screener API.
@@ -26,25 +89,26 @@ class DexScreenerAPI:
         """
         self.base_url = config.DEX_SCREENER["base_url"]
         self.rate_limit = config.DEX_SCREENER["rate_limit"]
-        self.last_request_time = 0
-        self.request_count = 0
+        # Jarak minimum antar permintaan (0.2 detik untuk 300 permintaan per menit),
+        # dipakai bersama oleh semua skenario yang berjalan bersamaan
+        self.rate_limiter = RateLimiter(60 / self.rate_limit, "dexscreener")
+        # Pair per token dipakai bersama antar skenario dalam satu siklus
+        self.token_pairs_cache = FetchCache("token_pairs")
+        # Alamat token di luar TOKENS_TO_MONITOR, hasil pencarian yang disimpan antar pemindaian
+        self.token_resolver = TokenResolver()
+    
+    @property
+    def request_count(self) -> int:
+        return self.rate_limiter.request_count
         
     def _handle_rate_limit(self):
         """
         Menangani rate limit dengan menunggu jika diperlukan.
         """
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        
-        # Jika waktu sejak permintaan terakhir kurang dari 0.2 detik, tunggu
-        # Ini memastikan kita tidak melebihi 300 permintaan per menit
-        if time_since_last_request < 0.2:
-            time.sleep(0.2 - time_since_last_request)
-        
-        self.last_request_time = time.time()
-        self.request_count += 1
+        self.rate_limiter.wait()
     
     @retry_on_exception()
+    @traced("dexscreener.request", "http", ("endpoint",))
     def _make_request(self, endpoint: str, params: Dict = None) -> Any:
         """
         Membuat permintaan ke DEX Screener API.
@@ -59,14 +123,21 @@ class DexScreenerAPI:
         self._handle_rate_limit()
         
         url = f"{self.base_url}{endpoint}"
+        start_time = time.perf_counter()
+        status = "error"
         
         try:
             response = requests.get(url, params=params)
+            status = str(response.status_code)
             response.raise_for_status()
-            return response.json()
+
+            with span("parse", "http"):
+                return response.json()
         except requests.exceptions.RequestException as e:
             logger.error(f"Error saat membuat permintaan ke {url}: {str(e)}")
             raise
+        finally:
+            metrics.observe_request("dexscreener", endpoint, status, time.perf_counter() - start_time)
     
     @retry_on_exception()
     def search_pairs(self, query: str) -> List[Dict[str, Any]]:
@@ -110,11 +181,46 @@ class DexScreenerAPI:
         
         return None
     
+    @traced("dex.get_pairs_by_addresses", attributes=("chain_id",))
+    def get_pairs_by_addresses(self, chain_id: str, pair_addresses: List[str]) -> List[Dict[str, Any]]:
+        """
+        Mendapatkan informasi beberapa pair sekaligus berdasarkan alamat.
+        
+        Endpoint multi-pair menerima maksimal 30 alamat per permintaan, jadi
+        daftar alamat dipecah sesuai batas tersebut.
+        
+        Args:
+            chain_id: ID chain (misalnya ethereum, bsc)
+            pair_addresses: Daftar alamat pair
+            
+        Returns:
+            Daftar pair yang ditemukan
+        """
+        chunk_size = config.PAIR_INDEX["max_pairs_per_request"]
+        pairs = []
+        
+        for i in range(0, len(pair_addresses), chunk_size):
+            chunk = pair_addresses[i:i + chunk_size]
+            
+            try:
+                response = self._make_request(f"/latest/dex/pairs/{chain_id}/{','.join(chunk)}")
+            except Exception as e:
+                logger.error(f"Error saat mengambil {len(chunk)} pair di {chain_id}: {str(e)}")
+                continue
+            
+            if response and response.get("pairs"):
+                pairs.extend(response["pairs"])
+        
+        return pairs
+    
     @retry_on_exception()
     def get_token_pairs(self, chain_id: str, token_address: str) -> List[Dict[str, Any]]:
         """
         Mendapatkan semua pair untuk token tertentu.
         
+        Hasil disimpan di token_pairs_cache, sehingga skenario lain yang meminta
+        token yang sama dalam masa TTL tidak mengirim permintaan baru.
+        
         Args:
             chain_id: ID chain (misalnya ethereum, bsc)
             token_address: Alamat token
@@ -124,13 +230,60 @@ class DexScreenerAPI:
         """
         endpoint = f"/token-pairs/v1/{chain_id}/{token_address}"
         
-        response = self._make_request(endpoint)
+        response = self.token_pairs_cache.get_or_fetch(
+            (chain_id, token_address.lower()),
+            lambda: self._make_request(endpoint)
+        )
         
         if isinstance(response, list):
             return response
         
         return []
     
+    def get_pairs_by_tokens(self, chain_id: str, token_addresses: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Mendapatkan pair untuk beberapa token sekaligus, dikelompokkan per alamat token.
+        
+        Endpoint token menerima maksimal 30 alamat per permintaan, jadi daftar
+        alamat dipecah sesuai batas tersebut. Token di batch yang gagal tidak
+        ada di hasil, sehingga pemanggil bisa mengambilnya satu per satu.
+        
+        Args:
+            chain_id: ID chain (misalnya ethereum, bsc)
+            token_addresses: Daftar alamat token
+            
+        Returns:
+            Dict dengan alamat token (huruf kecil) sebagai key dan daftar pair sebagai value
+        """
+        chunk_size = config.DEX_SCREENER["max_tokens_per_request"]
+        pairs_by_token: Dict[str, List[Dict[str, Any]]] = {}
+        
+        for i in range(0, len(token_addresses), chunk_size):
+            chunk = [address.lower() for address in token_addresses[i:i + chunk_size]]
+            
+            try:
+                response = self._make_request(f"/tokens/v1/{chain_id}/{','.join(chunk)}")
+            except Exception as e:
+                logger.error(f"Error saat mengambil pair untuk {len(chunk)} token di {chain_id}: {str(e)}")
+                continue
+            
+            chunk_pairs = {address: [] for address in chunk}
+            
+            # Pair dimasukkan ke token base dan token quote jika keduanya diminta
+            for pair in response if isinstance(response, list) else []:
+                addresses = {
+                    pair.get("baseToken", {}).get("address", "").lower(),
+                    pair.get("quoteToken", {}).get("address", "").lower(),
+                }
+                
+                for address in addresses:
+                    if address in chunk_pairs:
+                        chunk_pairs[address].append(pair)
+            
+            pairs_by_token.update(chunk_pairs)
+        
+        return pairs_by_token
+    
     @retry_on_exception()
     def get_token_info(self, chain_id: str, token_address: str) -> List[Dict[str, Any]]:
         """
@@ -214,19 +367,24 @@ class DexScreenerAPI:
         
         return total_liquidity if total_liquidity > 0 else None
     
-    def get_best_dex_for_token(self, chain_id: str, token_address: str) -> Optional[Dict[str, Any]]:
+    def get_best_dex_for_token(self, chain_id: str, token_address: str,
+                               pair_filter: Optional[PairFilter] = None) -> Optional[Dict[str, Any]]:
         """
         Mendapatkan DEX terbaik untuk token berdasarkan likuiditas.
         
         Args:
             chain_id: ID chain (misalnya ethereum, bsc)
             token_address: Alamat token
+            pair_filter: Filter pool sebelum memilih (jika None, semua pool)
             
         Returns:
             Informasi DEX terbaik atau None jika tidak ditemukan
         """
         pairs = self.get_token_pairs(chain_id, token_address)
         
+        if pairs and pair_filter is not None:
+            pairs = [pair for pair in pairs if pair_filter.accepts(pair)]
+        
         if not pairs:
             return None
         
@@ -240,25 +398,50 @@ class DexScreenerAPI:
         if not sorted_pairs:
             return None
         
-        best_pair = sorted_pairs[0]
+        return self.pair_to_dex_info(sorted_pairs[0])
+    
+    @staticmethod
+    def pair_to_dex_info(pair: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Mengubah data pair DEX Screener menjadi format harga DEX yang dipakai scanner.
         
-        return {
-            "dex_id": best_pair.get("dexId", ""),
-            "chain_id": best_pair.get("chainId", ""),
-            "pair_address": best_pair.get("pairAddress", ""),
-            "liquidity_usd": Decimal(str(best_pair["liquidity"]["usd"])) if "liquidity" in best_pair and "usd" in best_pair["liquidity"] and best_pair["liquidity"]["usd"] else Decimal("0"),
-            "price_usd": Decimal(best_pair["priceUsd"]) if "priceUsd" in best_pair and best_pair["priceUsd"] else Decimal("0"),
-            "base_token": best_pair.get("baseToken", {}),
-            "quote_token": best_pair.get("quoteToken", {})
+        Args:
+            pair: Data pair dari DEX Screener
+            
+        Returns:
+            Informasi harga DEX
+        """
+        liquidity = pair.get("liquidity") or {}
+        
+        dex_info = {
+            "dex_id": pair.get("dexId", ""),
+            "chain_id": pair.get("chainId", ""),
+            "pair_address": pair.get("pairAddress", ""),
+            "liquidity_usd": Decimal(str(liquidity["usd"])) if liquidity.get("usd") else Decimal("0"),
+            "liquidity_base": Decimal(str(liquidity["base"])) if liquidity.get("base") else Decimal("0"),
+            "price_usd": Decimal(pair["priceUsd"]) if pair.get("priceUsd") else Decimal("0"),
+            "price_native": Decimal(pair["priceNative"]) if pair.get("priceNative") else Decimal("0"),
+            "base_token": pair.get("baseToken", {}),
+            "quote_token": pair.get("quoteToken", {}),
+            "labels": pair.get("labels", [])
         }
+        
+        # Harga fixed-point di-parse sekali di sini, bukan di setiap perhitungan selisih dan profit
+        if config.FIXED_POINT["enabled"]:
+            dex_info["price_usd_fixed"] = fixedpoint.parse_price(str(pair["priceUsd"]) if pair.get("priceUsd") else "0")
+        
+        return dex_info
     
-    def get_price_across_dexes(self, chain_id: str, token_address: str) -> List[Dict[str, Any]]:
+    @traced("dex.get_price_across_dexes", attributes=("chain_id", "token_address"))
+    def get_price_across_dexes(self, chain_id: str, token_address: str,
+                               pair_filter: Optional[PairFilter] = None) -> List[Dict[str, Any]]:
         """
         Mendapatkan harga token di berbagai DEX.
         
         Args:
             chain_id: ID chain (misalnya ethereum, bsc)
             token_address: Alamat token
+            pair_filter: Filter pool (jika None, dari config.PAIR_FILTER)
             
         Returns:
             Daftar harga di berbagai DEX
@@ -268,36 +451,25 @@ class DexScreenerAPI:
         if not pairs:
             return []
         
-        # Filter pair dengan likuiditas yang cukup (> $10,000)
-        filtered_pairs = [
-            pair for pair in pairs
-            if "liquidity" in pair and "usd" in pair["liquidity"] and pair["liquidity"]["usd"] and Decimal(str(pair["liquidity"]["usd"])) > 10000
-        ]
-        
-        # Buat daftar harga di berbagai DEX
-        dex_prices = []
-        
-        for pair in filtered_pairs:
-            dex_info = {
-                "dex_id": pair.get("dexId", ""),
-                "chain_id": pair.get("chainId", ""),
-                "pair_address": pair.get("pairAddress", ""),
-                "liquidity_usd": Decimal(str(pair["liquidity"]["usd"])) if "liquidity" in pair and "usd" in pair["liquidity"] and pair["liquidity"]["usd"] else Decimal("0"),
-                "price_usd": Decimal(pair["priceUsd"]) if "priceUsd" in pair and pair["priceUsd"] else Decimal("0"),
-                "base_token": pair.get("baseToken", {}),
-                "quote_token": pair.get("quoteToken", {})
-            }
-            
-            dex_prices.append(dex_info)
+        if pair_filter is None:
+            pair_filter = PairFilter()
+        
+        with span("parse", "provider", pairs=len(pairs)):
+            # Filter diperiksa pada data mentah; hanya pool yang lolos diubah menjadi dex_info
+            dex_prices = [self.pair_to_dex_info(pair) for pair in pairs if pair_filter.accepts(pair)]
+        
+        metrics.PAIRS_FILTERED.inc(len(pairs) - len(dex_prices))
         
         return dex_prices
     
-    def get_price_across_chains(self, token_symbol: str) -> Dict[str, Dict[str, Any]]:
+    @traced("dex.get_price_across_chains", attributes=("token_symbol",))
+    def get_price_across_chains(self, token_symbol: str, pair_filter: Optional[PairFilter] = None) -> Dict[str, Dict[str, Any]]:
         """
         Mendapatkan harga token di berbagai chain.
         
         Args:
             token_symbol: Simbol token
+            pair_filter: Filter pool sebelum memilih DEX terbaik per chain (jika None, semua pool)
             
         Returns:
             Dict dengan chain_id sebagai key dan informasi harga sebagai value
@@ -308,13 +480,8 @@ class DexScreenerAPI:
         if token_symbol in config.TOKENS_TO_MONITOR:
             token_addresses = config.TOKENS_TO_MONITOR[token_symbol]["address"]
         else:
-            # Cari token dengan pencarian
-            search_results = self.search_pairs(token_symbol)
-            
-            for pair in search_results:
-                if "baseToken" in pair and "symbol" in pair["baseToken"] and pair["baseToken"]["symbol"].upper() == token_symbol.upper():
-                    chain_id = pair.get("chainId", "")
-                    token_addresses[chain_id] = pair["baseToken"]["address"]
+            # Cari token dengan pencarian (sekali, lalu dari cache resolusi)
+            token_addresses = self.token_resolver.resolve(token_symbol, self.search_pairs)
         
         if not token_addresses:
             return {}
@@ -323,14 +490,38 @@ class DexScreenerAPI:
         chain_prices = {}
         
         for chain_id, token_address in token_addresses.items():
-            best_dex = self.get_best_dex_for_token(chain_id, token_address)
+            best_dex = self.get_best_dex_for_token(chain_id, token_address, pair_filter)
             
             if best_dex:
                 chain_prices[chain_id] = best_dex
         
         return chain_prices
     
-    def find_arbitrage_opportunities_same_chain(self, chain_id: str, token_address: str, min_price_diff_percentage: float = 0.5) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _spread_math(dex_prices: List[Dict[str, Any]], min_price_diff_percentage: float):
+        """
+        Memilih aritmetika selisih harga untuk pencarian peluang.
+
+        Jika semua pool punya harga fixed-point (FIXED_POINT aktif saat parse),
+        selisih dihitung dengan int dan hanya peluang yang lolos dikonversi ke
+        Decimal; selain itu dengan Decimal seperti biasa.
+
+        Args:
+            dex_prices: Harga pool yang dibandingkan
+            min_price_diff_percentage: Persentase perbedaan harga minimum
+
+        Returns:
+            Tuple (key harga, fungsi selisih (beli, jual) -> persen, konversi persen ke Decimal, minimum dalam skala yang sama)
+        """
+        if dex_prices and all("price_usd_fixed" in dex for dex in dex_prices):
+            return ("price_usd_fixed", fixedpoint.price_difference_percentage, fixedpoint.to_decimal,
+                    fixedpoint.to_fixed(min_price_diff_percentage))
+
+        return ("price_usd", lambda buy, sell: (sell - buy) / buy * 100, lambda percentage: percentage,
+                min_price_diff_percentage)
+    
+    def find_arbitrage_opportunities_same_chain(self, chain_id: str, token_address: str, min_price_diff_percentage: float = 0.5,
+                                               dex_prices: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
         """
         Mencari peluang arbitrase di chain yang sama.
         
@@ -338,41 +529,46 @@ class DexScreenerAPI:
             chain_id: ID chain (misalnya ethereum, bsc)
             token_address: Alamat token
             min_price_diff_percentage: Persentase perbedaan harga minimum
+            dex_prices: Harga di berbagai DEX yang sudah diambil (misalnya dari blockchain);
+                jika None, diambil dari DEX Screener
             
         Returns:
             Daftar peluang arbitrase
         """
-        dex_prices = self.get_price_across_dexes(chain_id, token_address)
+        if dex_prices is None:
+            dex_prices = self.get_price_across_dexes(chain_id, token_address)
         
         if len(dex_prices) < 2:
             return []
         
         # Cari peluang arbitrase
         opportunities = []
+        price_key, spread, to_percentage, min_price_diff_percentage = self._spread_math(dex_prices, min_price_diff_percentage)
         
         for i in range(len(dex_prices)):
             for j in range(i + 1, len(dex_prices)):
                 dex1 = dex_prices[i]
                 dex2 = dex_prices[j]
                 
-                price1 = dex1["price_usd"]
-                price2 = dex2["price_usd"]
+                price1 = dex1[price_key]
+                price2 = dex2[price_key]
                 
                 if price1 == 0 or price2 == 0:
                     continue
                 
                 # Hitung persentase perbedaan harga
                 if price1 > price2:
-                    price_diff_percentage = (price1 - price2) / price2 * 100
+                    price_diff_percentage = spread(price2, price1)
                     buy_dex = dex2
                     sell_dex = dex1
                 else:
-                    price_diff_percentage = (price2 - price1) / price1 * 100
+                    price_diff_percentage = spread(price1, price2)
                     buy_dex = dex1
                     sell_dex = dex2
                 
                 # Jika perbedaan harga cukup besar, tambahkan ke peluang arbitrase
                 if price_diff_percentage >= min_price_diff_percentage:
+                    price_diff_percentage = to_percentage(price_diff_percentage)
                     opportunity = {
                         "type": "same_chain",
                         "chain_id": chain_id,
@@ -385,6 +581,8 @@ class DexScreenerAPI:
                         "price_diff_percentage": price_diff_percentage,
                         "buy_liquidity": buy_dex["liquidity_usd"],
                         "sell_liquidity": sell_dex["liquidity_usd"],
+                        "buy_pool": buy_dex,
+                        "sell_pool": sell_dex,
                         "timestamp": get_current_timestamp()
                     }
                     
@@ -393,24 +591,35 @@ class DexScreenerAPI:
         # Urutkan berdasarkan persentase perbedaan harga (descending)
         return sorted(opportunities, key=lambda x: x["price_diff_percentage"], reverse=True)
     
-    def find_arbitrage_opportunities_cross_chain(self, token_symbol: str, min_price_diff_percentage: float = 1.0) -> List[Dict[str, Any]]:
+    def find_arbitrage_opportunities_cross_chain(self, token_symbol: str, min_price_diff_percentage: float = 1.0,
+                                                chain_prices: Optional[Dict[str, Dict[str, Any]]] = None,
+                                                bridge_fees: Optional[BridgeFeeMatrix] = None) -> List[Dict[str, Any]]:
         """
         Mencari peluang arbitrase di berbagai chain.
         
         Args:
             token_symbol: Simbol token
             min_price_diff_percentage: Persentase perbedaan harga minimum
+            chain_prices: Harga per chain yang sudah diambil; jika None, diambil dari DEX Screener
+            bridge_fees: Matriks biaya bridge; jika None, disusun dari konfigurasi
             
         Returns:
             Daftar peluang arbitrase
         """
-        chain_prices = self.get_price_across_chains(token_symbol)
+        if chain_prices is None:
+            chain_prices = self.get_price_across_chains(token_symbol)
         
         if len(chain_prices) < 2:
             return []
         
+        if bridge_fees is None:
+            bridge_fees = BridgeFeeMatrix()
+        
         # Cari peluang arbitrase
         opportunities = []
+        price_key, spread, to_percentage, min_price_diff_percentage = self._spread_math(
+            list(chain_prices.values()), min_price_diff_percentage
+        )
         
         chains = list(chain_prices.keys())
         
@@ -422,21 +631,21 @@ class DexScreenerAPI:
                 dex1 = chain_prices[chain1]
                 dex2 = chain_prices[chain2]
                 
-                price1 = dex1["price_usd"]
-                price2 = dex2["price_usd"]
+                price1 = dex1[price_key]
+                price2 = dex2[price_key]
                 
                 if price1 == 0 or price2 == 0:
                     continue
                 
                 # Hitung persentase perbedaan harga
                 if price1 > price2:
-                    price_diff_percentage = (price1 - price2) / price2 * 100
+                    price_diff_percentage = spread(price2, price1)
                     buy_chain = chain2
                     buy_dex = dex2
                     sell_chain = chain1
                     sell_dex = dex1
                 else:
-                    price_diff_percentage = (price2 - price1) / price1 * 100
+                    price_diff_percentage = spread(price1, price2)
                     buy_chain = chain1
                     buy_dex = dex1
                     sell_chain = chain2
@@ -445,16 +654,16 @@ class DexScreenerAPI:
                 # Jika perbedaan harga cukup besar, tambahkan ke peluang arbitrase
                 if price_diff_percentage >= min_price_diff_percentage:
                     # Dapatkan biaya bridge
-                    bridge_fee_percentage = 0
-                    
-                    bridge_key = f"{buy_chain}_to_{sell_chain}"
-                    if bridge_key in config.ARBITRAGE_CONFIG["bridge_fees"]:
-                        bridge_fee_percentage = config.ARBITRAGE_CONFIG["bridge_fees"][bridge_key]
+                    bridge_fee_percentage = bridge_fees.fee(buy_chain, sell_chain)
                     
                     # Hitung keuntungan setelah biaya bridge
-                    net_profit_percentage = price_diff_percentage - bridge_fee_percentage
+                    net_profit_percentage = price_diff_percentage - (
+                        fixedpoint.to_fixed(bridge_fee_percentage) if price_key == "price_usd_fixed" else bridge_fee_percentage
+                    )
                     
                     if net_profit_percentage > min_price_diff_percentage:
+                        price_diff_percentage = to_percentage(price_diff_percentage)
+                        net_profit_percentage = to_percentage(net_profit_percentage)
                         opportunity = {
                             "type": "cross_chain",
                             "token_symbol": token_symbol,
@@ -469,6 +678,8 @@ class DexScreenerAPI:
                             "net_profit_percentage": net_profit_percentage,
                             "buy_liquidity": buy_dex["liquidity_usd"],
                             "sell_liquidity": sell_dex["liquidity_usd"],
+                            "buy_pool": buy_dex,
+                            "sell_pool": sell_dex,
                             "timestamp": get_current_timestamp()
                         }
                         
@@ -527,5 +738,26 @@ class DexScreenerAPI:
         # Ambil top N
         return sorted_results[:limit]
 
-# Singleton instance
-dex_screener_api = DexScreenerAPI()
+# Singleton instance (dibuat saat pertama kali digunakan)
+_dex_screener_api: Optional[DexScreenerAPI] = None
+
+def get_dex_screener_api() -> DexScreenerAPI:
+    """
+    Mendapatkan instance singleton DexScreenerAPI, dibuat saat pertama kali diminta.
+
+    Returns:
+        Instance DexScreenerAPI
+    """
+    global _dex_screener_api
+
+    if _dex_screener_api is None:
+        _dex_screener_api = DexScreenerAPI()
+
+    return _dex_screener_api
+
+def __getattr__(name: str) -> Any:
+    # Kompatibilitas: `from dex_data import dex_screener_api` tetap berfungsi
+    if name == "dex_screener_api":
+        return get_dex_screener_api()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
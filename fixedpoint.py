@@ -0,0 +1,243 @@
+"""
+Modul aritmetika fixed-point untuk harga, jumlah token dan biaya.
+
+Nilai disimpan sebagai int Python yang diskalakan: harga, nilai USD dan
+persentase memakai 10^PRICE_DECIMALS (18 desimal), jumlah token memakai
+desimal token itu sendiri (TOKENS_TO_MONITOR[...]["decimals"]). Operasi
+tambah/kurang adalah operasi int biasa; kali dan bagi membulatkan sekali ke
+skala hasil (round half even, sama dengan default Decimal), sehingga hasilnya
+eksak sampai 1 unit terkecil skala dan tidak bergantung pada presisi konteks
+Decimal. profit_after_fees menghitung seluruh rumus dengan int eksak dan
+hanya membulatkan hasil akhirnya.
+
+Float dikalikan skala lalu dibulatkan, tanpa bolak-balik melalui str().
+Decimal dan string dikonversi eksak dengan konteks berpresisi maksimum,
+bukan konteks global (prec 28) yang memotong angka panjang.
+
+Harga dari DEX Screener dan ticker Binance di-parse langsung menjadi Fixed
+(parse_price) saat FIXED_POINT aktif, sehingga selisih harga dan profit di
+jalur evaluasi dihitung dengan int tanpa konversi Decimal per perbandingan.
+"""
+
+from decimal import Context, Decimal, MAX_EMAX, MAX_PREC, MIN_EMIN, ROUND_HALF_EVEN
+from typing import Tuple, Union
+
+import config
+
+PRICE_DECIMALS = config.FIXED_POINT["price_decimals"]
+
+# Pangkat 10 yang sudah dihitung untuk semua skala yang dipakai (desimal token <= 36)
+_SCALES = tuple(10 ** decimals for decimals in range(37))
+
+PRICE_SCALE = _SCALES[PRICE_DECIMALS]
+
+# 100% dalam skala harga
+_HUNDRED_PERCENT = 100 * PRICE_SCALE
+
+# Konteks untuk konversi Decimal tanpa pembulatan presisi (hanya pembulatan ke skala)
+_EXACT = Context(prec=MAX_PREC, rounding=ROUND_HALF_EVEN, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+class Fixed(int):
+    """
+    Int fixed-point yang sudah dalam skala harga (hasil parse_price).
+
+    to_fixed mengembalikan nilai ini apa adanya, sehingga harga yang di-parse
+    sekali tidak dikonversi ulang di setiap perhitungan.
+    """
+
+    __slots__ = ()
+
+Number = Union[int, float, Decimal, str]
+
+def _div_round(numerator: int, denominator: int) -> int:
+    # Pembagian int dengan pembulatan half even; penyebut boleh negatif
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+
+    quotient, remainder = divmod(numerator, denominator)
+    twice = remainder * 2
+
+    if twice > denominator or (twice == denominator and quotient & 1):
+        quotient += 1
+
+    return quotient
+
+def to_fixed(value: Number, decimals: int = PRICE_DECIMALS) -> int:
+    """
+    Mengubah angka menjadi int fixed-point.
+
+    Args:
+        value: Angka (int, float, Decimal atau string desimal)
+        decimals: Jumlah desimal skala
+
+    Returns:
+        Nilai yang diskalakan 10^decimals
+    """
+    kind = type(value)
+
+    if kind is Fixed and decimals == PRICE_DECIMALS:
+        return value
+
+    if kind is float:
+        # Galat pembulatan hasil kali setara presisi float itu sendiri (relatif 2^-53)
+        return round(value * _SCALES[decimals])
+
+    if kind is Decimal:
+        # Menggeser eksponen lebih murah daripada as_integer_ratio (yang menghitung FPB)
+        return int(value.scaleb(decimals, _EXACT).to_integral_value(context=_EXACT))
+
+    if isinstance(value, str):
+        return to_fixed(Decimal(value), decimals)
+
+    if isinstance(value, int):
+        return value * _SCALES[decimals]
+
+    # Subclass float atau Decimal
+    return to_fixed(float(value) if isinstance(value, float) else Decimal(value), decimals)
+
+def parse_price(text: str) -> Fixed:
+    """
+    Mem-parse string desimal (priceUsd DEX Screener, lastPrice Binance) menjadi harga fixed-point.
+
+    String biasa seperti "1234.5678" diubah langsung menjadi int; notasi
+    eksponen atau desimal lebih dari skala harga melalui Decimal (tetap eksak).
+
+    Args:
+        text: Harga dalam bentuk string desimal
+
+    Returns:
+        Harga dalam skala harga
+    """
+    whole, _, fraction = text.partition(".")
+    digits = whole[1:] if whole[:1] == "-" else whole
+
+    if digits.isdigit() and (not fraction or fraction.isdigit()) and len(fraction) <= PRICE_DECIMALS:
+        return Fixed(whole + fraction + "0" * (PRICE_DECIMALS - len(fraction)))
+
+    return to_price(Decimal(text))
+
+def to_price(value: Number) -> Fixed:
+    """
+    Mengubah harga hasil perhitungan (misalnya harga on-chain) menjadi harga fixed-point.
+
+    Args:
+        value: Harga (int, float, Decimal atau string desimal)
+
+    Returns:
+        Harga dalam skala harga
+    """
+    return Fixed(to_fixed(value))
+
+def to_float(value: int, decimals: int = PRICE_DECIMALS) -> float:
+    """
+    Mengubah int fixed-point menjadi float (dibulatkan sekali).
+
+    Args:
+        value: Nilai fixed-point
+        decimals: Jumlah desimal skala
+
+    Returns:
+        Nilai float
+    """
+    return value / _SCALES[decimals]
+
+def to_decimal(value: int, decimals: int = PRICE_DECIMALS) -> Decimal:
+    """
+    Mengubah int fixed-point menjadi Decimal.
+
+    Args:
+        value: Nilai fixed-point
+        decimals: Jumlah desimal skala
+
+    Returns:
+        Nilai Decimal
+    """
+    return Decimal(value).scaleb(-decimals)
+
+def mul(a: int, b: int, b_decimals: int = PRICE_DECIMALS) -> int:
+    """
+    Mengalikan dua nilai fixed-point; hasil memakai skala a.
+
+    Args:
+        a: Nilai pertama
+        b: Nilai kedua
+        b_decimals: Jumlah desimal skala b (misalnya desimal token untuk jumlah token)
+
+    Returns:
+        a * b dalam skala a
+    """
+    return _div_round(a * b, _SCALES[b_decimals])
+
+def div(a: int, b: int, b_decimals: int = PRICE_DECIMALS) -> int:
+    """
+    Membagi dua nilai fixed-point; hasil memakai skala a.
+
+    Args:
+        a: Pembilang
+        b: Penyebut (tidak boleh nol)
+        b_decimals: Jumlah desimal skala b
+
+    Returns:
+        a / b dalam skala a
+    """
+    return _div_round(a * _SCALES[b_decimals], b)
+
+def percent(value: int, percentage: int) -> int:
+    """
+    Menghitung persentase dari sebuah nilai.
+
+    Args:
+        value: Nilai fixed-point
+        percentage: Persentase dalam skala harga (0.3% = to_fixed(0.3))
+
+    Returns:
+        value * percentage / 100 dalam skala value
+    """
+    return _div_round(value * percentage, _HUNDRED_PERCENT)
+
+def price_difference_percentage(price1: int, price2: int) -> int:
+    """
+    Persentase perbedaan harga |price2 - price1| / price1 * 100.
+
+    Args:
+        price1: Harga acuan (skala harga)
+        price2: Harga pembanding (skala harga)
+
+    Returns:
+        Persentase dalam skala harga (0 jika price1 nol)
+    """
+    if price1 == 0:
+        return 0
+
+    return _div_round(abs(price2 - price1) * _HUNDRED_PERCENT, abs(price1))
+
+def profit_after_fees(buy_price: int, sell_price: int, amount: int, buy_fee_percentage: int, sell_fee_percentage: int,
+                      gas_cost: int = 0, other_fees: int = 0, amount_decimals: int = PRICE_DECIMALS) -> Tuple[int, int]:
+    """
+    Menghitung keuntungan bersih setelah biaya beli, biaya jual, gas dan biaya lain.
+
+    Args:
+        buy_price: Harga beli (skala harga)
+        sell_price: Harga jual (skala harga)
+        amount: Jumlah token (skala amount_decimals)
+        buy_fee_percentage: Persentase biaya beli (skala harga)
+        sell_fee_percentage: Persentase biaya jual (skala harga)
+        gas_cost: Biaya gas (skala harga)
+        other_fees: Biaya lainnya (skala harga)
+        amount_decimals: Desimal token untuk jumlah
+
+    Returns:
+        Tuple (keuntungan bersih, persentase keuntungan), keduanya dalam skala harga
+    """
+    # Semua suku dihitung eksak pada skala harga * 10^amount_decimals * 100%,
+    # lalu dibulatkan sekali untuk setiap hasil
+    total_buy_cost = buy_price * amount * (_HUNDRED_PERCENT + buy_fee_percentage)
+    total_sell_revenue = sell_price * amount * (_HUNDRED_PERCENT - sell_fee_percentage)
+    scale = _SCALES[amount_decimals] * _HUNDRED_PERCENT
+
+    net_profit = total_sell_revenue - total_buy_cost - (gas_cost + other_fees) * scale
+
+    if total_buy_cost == 0:
+        return _div_round(net_profit, scale), 0
+
+    return _div_round(net_profit, scale), _div_round(net_profit * _HUNDRED_PERCENT, total_buy_cost)
@@ -0,0 +1,232 @@
+"""
+Modul oracle harga gas untuk jaringan EVM.
+
+Harga gas diambil langsung dari node RPC setiap jaringan (eth_gasPrice dan
+eth_feeHistory dalam satu permintaan batch), disimpan di cache dengan TTL
+pendek, lalu dikonversi ke USD menggunakan harga token native dari Binance.
+"""
+
+import logging
+from decimal import Decimal
+from typing import Dict, Any, Callable, List, Optional
+
+import config
+from cache import FetchCache
+from rpc import JsonRpcError, get_rpc_client, is_rpc_configured
+from utils import estimate_gas_cost
+
+logger = logging.getLogger("arbitrage.gas")
+
+GWEI = Decimal("1000000000")
+
+def _hex_to_int(value: Any) -> int:
+    """
+    Konversi nilai kuantitas JSON-RPC (string hex) ke integer.
+    """
+    if isinstance(value, int):
+        return value
+    return int(value, 16)
+
+def _median(values: List[int]) -> int:
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2]
+
+class GasOracle:
+    """
+    Oracle harga gas dengan cache per jaringan dan fallback ke konfigurasi statis.
+    """
+
+    def __init__(self, price_fetcher: Optional[Callable[[str], Decimal]] = None):
+        """
+        Inisialisasi oracle harga gas.
+
+        Args:
+            price_fetcher: Fungsi yang menerima simbol Binance (misalnya ETHUSDT) dan
+                mengembalikan harga terakhir; default menggunakan penyedia data Binance
+        """
+        self._price_fetcher = price_fetcher
+        self.enabled = config.GAS_ORACLE["enabled"]
+        self.cache_ttl = config.GAS_ORACLE["cache_ttl"]
+        self.native_price_ttl = config.GAS_ORACLE["native_price_ttl"]
+        # Cache single-flight: skenario yang berjalan bersamaan tidak mengambil harga yang sama dua kali
+        self._gas_cache = FetchCache("gas_price", self.cache_ttl)
+        self._native_price_cache = FetchCache("native_price", self.native_price_ttl)
+
+    @property
+    def price_fetcher(self) -> Callable[[str], Decimal]:
+        """
+        Fungsi pengambil harga token native, dibuat saat pertama kali diakses.
+        """
+        if self._price_fetcher is None:
+            from cex_data import get_cex_data_provider
+            self._price_fetcher = get_cex_data_provider("binance").get_price
+        return self._price_fetcher
+
+    @price_fetcher.setter
+    def price_fetcher(self, fetcher: Callable[[str], Decimal]):
+        self._price_fetcher = fetcher
+
+    def clear(self):
+        """
+        Mengosongkan semua cache.
+        """
+        self._gas_cache.clear()
+        self._native_price_cache.clear()
+
+    def _static_gas_price(self, network: str) -> Dict[str, Any]:
+        gas_price_gwei = config.ARBITRAGE_CONFIG["gas_price_gwei"].get(network)
+
+        return {
+            "gas_price_gwei": Decimal(str(gas_price_gwei)) if gas_price_gwei is not None else None,
+            "base_fee_gwei": None,
+            "priority_fee_gwei": None,
+            "source": "static",
+        }
+
+    def _fetch_gas_price(self, network: str) -> Dict[str, Any]:
+        """
+        Mengambil harga gas dari node RPC jaringan.
+
+        Args:
+            network: Nama jaringan
+
+        Returns:
+            Dict berisi gas_price_gwei, base_fee_gwei, priority_fee_gwei dan source
+        """
+        if not self.enabled or not is_rpc_configured(network):
+            return self._static_gas_price(network)
+
+        blocks = config.GAS_ORACLE["fee_history_blocks"]
+        percentile = config.GAS_ORACLE["priority_fee_percentile"]
+
+        try:
+            gas_price, fee_history = get_rpc_client(network).batch([
+                ("eth_gasPrice", []),
+                ("eth_feeHistory", [hex(blocks), "latest", [percentile]]),
+            ])
+        except Exception as e:
+            logger.warning(f"Gagal mengambil harga gas untuk {network}, menggunakan nilai statis: {str(e)}")
+            return self._static_gas_price(network)
+
+        result = {"gas_price_gwei": None, "base_fee_gwei": None, "priority_fee_gwei": None, "source": "rpc"}
+
+        # EIP-1559: base fee blok berikutnya + median priority fee beberapa blok terakhir
+        if not isinstance(fee_history, JsonRpcError) and fee_history and fee_history.get("baseFeePerGas"):
+            base_fee = _hex_to_int(fee_history["baseFeePerGas"][-1])
+            rewards = [_hex_to_int(reward[0]) for reward in fee_history.get("reward") or [] if reward]
+            priority_fee = _median(rewards) if rewards else 0
+
+            result["base_fee_gwei"] = Decimal(base_fee) / GWEI
+            result["priority_fee_gwei"] = Decimal(priority_fee) / GWEI
+            result["gas_price_gwei"] = Decimal(base_fee + priority_fee) / GWEI
+
+        # Jaringan tanpa eth_feeHistory cukup menggunakan eth_gasPrice
+        if result["gas_price_gwei"] is None and not isinstance(gas_price, JsonRpcError) and gas_price:
+            result["gas_price_gwei"] = Decimal(_hex_to_int(gas_price)) / GWEI
+
+        if result["gas_price_gwei"] is None:
+            logger.warning(f"Node {network} tidak mengembalikan harga gas, menggunakan nilai statis")
+            return self._static_gas_price(network)
+
+        logger.debug(f"Harga gas {network}: {result['gas_price_gwei']:.4f} gwei")
+
+        return result
+
+    def get_gas_info(self, network: str) -> Dict[str, Any]:
+        """
+        Mendapatkan informasi harga gas untuk jaringan (dari cache jika masih berlaku).
+
+        Args:
+            network: Nama jaringan
+
+        Returns:
+            Dict berisi gas_price_gwei, base_fee_gwei, priority_fee_gwei dan source
+        """
+        # Hasil fallback juga disimpan agar node yang bermasalah tidak dipanggil terus-menerus
+        if network in config.NETWORKS:
+            return self._gas_cache.get_or_fetch(network, lambda: self._fetch_gas_price(network))
+
+        return self._gas_cache.get_or_fetch(network, lambda: self._static_gas_price(network))
+
+    def get_gas_price_gwei(self, network: str) -> Optional[Decimal]:
+        """
+        Mendapatkan harga gas (gwei) untuk jaringan.
+
+        Args:
+            network: Nama jaringan
+
+        Returns:
+            Harga gas dalam gwei, atau None jika jaringan tidak dikenal
+        """
+        return self.get_gas_info(network)["gas_price_gwei"]
+
+    def get_native_price_usd(self, network: str) -> Decimal:
+        """
+        Mendapatkan harga token native jaringan dalam USD (dari cache jika masih berlaku).
+
+        Args:
+            network: Nama jaringan
+
+        Returns:
+            Harga token native dalam USD
+        """
+        native_token = config.NETWORKS.get(network, {}).get("native_token", "ETH")
+
+        return self._native_price_cache.get_or_fetch(native_token, lambda: self._fetch_native_price(native_token))
+
+    def _fetch_native_price(self, native_token: str) -> Decimal:
+        symbol = config.GAS_ORACLE["native_price_symbols"].get(native_token, f"{native_token}USDT")
+
+        try:
+            price = Decimal(str(self.price_fetcher(symbol)))
+        except Exception as e:
+            logger.warning(f"Gagal mendapatkan harga {symbol}, menggunakan harga cadangan: {str(e)}")
+            price = Decimal(str(config.GAS_ORACLE["fallback_native_price_usd"].get(native_token, 0)))
+
+        return price
+
+    def estimate_gas_cost_native(self, network: str, gas_limit: Optional[int] = None) -> Decimal:
+        """
+        Memperkirakan biaya gas dalam token native jaringan.
+
+        Args:
+            network: Nama jaringan
+            gas_limit: Batas gas untuk transaksi
+
+        Returns:
+            Biaya gas dalam token native (ETH/BNB/MATIC)
+        """
+        if gas_limit is None:
+            gas_limit = config.GAS_ORACLE["default_gas_limit"]
+
+        return estimate_gas_cost(network, gas_limit, self.get_gas_price_gwei(network))
+
+    def estimate_gas_cost_usd(self, network: str, gas_limit: Optional[int] = None) -> Decimal:
+        """
+        Memperkirakan biaya gas dalam USD.
+
+        Args:
+            network: Nama jaringan
+            gas_limit: Batas gas untuk transaksi
+
+        Returns:
+            Biaya gas dalam USD
+        """
+        return self.estimate_gas_cost_native(network, gas_limit) * self.get_native_price_usd(network)
+
+# Instance global oracle harga gas, dibuat saat pertama kali digunakan
+_gas_oracle: Optional[GasOracle] = None
+
+def get_gas_oracle() -> GasOracle:
+    """
+    Mendapatkan instance global GasOracle.
+
+    Returns:
+        Instance GasOracle
+    """
+    global _gas_oracle
+
+    if _gas_oracle is None:
+        _gas_oracle = GasOracle()
+
+    return _gas_oracle
@@ -6,13 +6,14 @@ import argparse
 import logging
 import time
 import sys
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import re
 
 import config
-from arbitrage import arbitrage_scanner
-from output import display_results
-from utils import logger
+from profiling import ImportProfiler, SamplingProfiler
+
+# Modul berat (arbitrage, output, requests, rich) diimport saat dibutuhkan
+logger = logging.getLogger("arbitrage")
 
 def get_tokens_by_category(category: str) -> List[str]:
     """
@@ -112,24 +113,105 @@ def parse_arguments():
         help="Likuiditas minimum dalam USD"
     )
 
+    parser.add_argument(
+        "--multi-hop",
+        action="store_true",
+        help="Cari juga arbitrase multi-hop (triangular) di graf harga lintas venue"
+    )
+
+    parser.add_argument(
+        "--no-adaptive",
+        action="store_true",
+        help="Nonaktifkan penjadwal adaptif; semua token dipindai setiap --interval dalam mode terus-menerus"
+    )
+
+    parser.add_argument(
+        "--fast-refresh",
+        type=int,
+        default=config.PAIR_INDEX["refresh_interval"],
+        help="Interval refresh cepat pool hot (detik) di antara pemindaian penuh dalam mode terus-menerus (0: nonaktif)"
+    )
+
+    parser.add_argument(
+        "--onchain",
+        action="store_true",
+        help="Baca harga pool DEX langsung dari blockchain (Multicall3 via rpc_url) setiap blok"
+    )
+
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Jalankan endpoint metrik Prometheus di http://127.0.0.1:PORT/metrics"
+    )
+
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="Catat span per token/jaringan/tahap dan simpan sebagai trace JSON (chrome://tracing, Perfetto)"
+    )
+
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profile",
+        metavar="PREFIX",
+        help="Profil pemindaian dengan sampling; laporan ke PREFIX.txt dan stack collapsed (flamegraph) ke PREFIX.collapsed"
+    )
+
+    parser.add_argument(
+        "--snapshot-format",
+        choices=["json", "ndjson", "msgpack"],
+        help="Format snapshot peluang: json (ringkas), ndjson, atau msgpack (butuh paket msgpack)"
+    )
+
+    parser.add_argument(
+        "--snapshot-delta",
+        action="store_true",
+        help="Tulis hanya peluang yang berubah sejak snapshot sebelumnya (snapshot lengkap berkala)"
+    )
+
+    parser.add_argument(
+        "--webhook",
+        metavar="URL",
+        help="Kirim hasil setiap pemindaian sebagai JSON (HTTP POST) ke URL webhook"
+    )
+
+    parser.add_argument(
+        "--ndjson",
+        metavar="FILE",
+        help="Tambahkan setiap peluang sebagai satu baris JSON (NDJSON) ke FILE"
+    )
+
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Cetak rencana pengambilan data (jumlah permintaan dan perkiraan waktu rate limit) tanpa memindai"
+    )
+
+    parser.add_argument(
+        "--no-console",
+        action="store_true",
+        help="Jangan tampilkan hasil di console, hanya tulis file output"
+    )
+
+    parser.add_argument(
+        "--print-startup-profile",
+        action="store_true",
+        help="Cetak waktu import per modul ke stderr setelah program selesai"
+    )
+
     return parser.parse_args()
 
-def run_scan(args):
+def get_tokens_to_check(args) -> Optional[List[str]]:
     """
-    Menjalankan pemindaian arbitrase.
+    Menentukan daftar token yang akan dipindai dari argumen --category atau --tokens.
 
     Args:
         args: Argumen command line
 
     Returns:
-        Hasil pemindaian
+        Daftar token, atau None untuk memakai token dari konfigurasi
     """
-    # Set persentase keuntungan minimum jika diberikan
-    if args.min_profit is not None:
-        arbitrage_scanner.min_profit_percentage = args.min_profit
-        logger.info(f"Persentase keuntungan minimum diatur ke {args.min_profit}%")
-
-    # Parse daftar token jika diberikan
     tokens_to_check = None
 
     # Jika kategori diberikan, ambil token berdasarkan kategori
@@ -141,6 +223,75 @@ def run_scan(args):
         tokens_to_check = [token.strip().upper() for token in args.tokens.split(",")]
         logger.info(f"Memindai token: {', '.join(tokens_to_check)}")
 
+    return tokens_to_check
+
+def run_multi_hop_scan(args) -> List[Dict[str, Any]]:
+    """
+    Menjalankan pemindaian arbitrase multi-hop di graf harga lintas venue.
+
+    Args:
+        args: Argumen command line
+
+    Returns:
+        Daftar siklus arbitrase
+    """
+    from arbitrage import get_arbitrage_scanner
+
+    logger.info("Menjalankan pemindaian arbitrase multi-hop")
+
+    return get_arbitrage_scanner().scan_multi_hop(get_tokens_to_check(args))
+
+def scan_reserve(args, multi_hop: bool) -> Tuple[float, float]:
+    """
+    Perkiraan biaya permintaan di luar pasangan (token, jaringan) penjadwal pada satu siklus.
+
+    Skenario 1 mengambil ticker 24 jam semua simbol Binance setiap siklus;
+    pemindaian multi-hop mengambil ticker yang sama dan pair DEX Screener
+    untuk setiap (token, jaringan) di konfigurasi.
+
+    Args:
+        args: Argumen command line
+        multi_hop: Apakah pemindaian multi-hop dijalankan pada siklus ini
+
+    Returns:
+        Tuple (permintaan DEX Screener, weight Binance)
+    """
+    ticker_weight = config.SCHEDULER["binance_ticker_weight"]
+    dex_requests = 0.0
+    binance_weight = ticker_weight if args.scenario in (None, 1) else 0.0
+
+    if multi_hop:
+        tokens = get_tokens_to_check(args) or list(config.TOKENS_TO_MONITOR.keys())
+        dex_requests += sum(
+            len(config.TOKENS_TO_MONITOR[token]["address"])
+            for token in tokens if token in config.TOKENS_TO_MONITOR
+        )
+        binance_weight += ticker_weight
+
+    return dex_requests, binance_weight
+
+def run_scan(args):
+    """
+    Menjalankan pemindaian arbitrase.
+
+    Args:
+        args: Argumen command line
+
+    Returns:
+        Hasil pemindaian
+    """
+    from arbitrage import get_arbitrage_scanner
+
+    arbitrage_scanner = get_arbitrage_scanner()
+
+    # Set persentase keuntungan minimum jika diberikan
+    if args.min_profit is not None:
+        arbitrage_scanner.min_profit_percentage = args.min_profit
+        logger.info(f"Persentase keuntungan minimum diatur ke {args.min_profit}%")
+
+    # Parse daftar token jika diberikan
+    tokens_to_check = get_tokens_to_check(args)
+
     # Set likuiditas minimum
     if args.min_liquidity is not None:
         # Tambahkan atribut min_liquidity ke arbitrage_scanner jika belum ada
@@ -150,44 +301,260 @@ def run_scan(args):
             arbitrage_scanner.min_liquidity = args.min_liquidity
         logger.info(f"Likuiditas minimum diatur ke ${args.min_liquidity:,.2f}")
 
+    # Harga DEX dari state pool on-chain
+    if args.onchain:
+        arbitrage_scanner.use_onchain = True
+        logger.info("Harga DEX dibaca langsung dari blockchain")
+
     # Jalankan pemindaian berdasarkan skenario
     if args.scenario == 1:
         logger.info("Menjalankan pemindaian untuk Skenario 1 (DEX-CEX, Sama Jaringan)")
-        results = {1: arbitrage_scanner.scan_scenario_1()}
+        results = arbitrage_scanner.scan_scenarios([1], tokens_to_check)
     elif args.scenario == 2:
         logger.info("Menjalankan pemindaian untuk Skenario 2 (DEX-DEX, Sama Jaringan)")
-        results = {2: arbitrage_scanner.scan_scenario_2(tokens_to_check)}
+        results = arbitrage_scanner.scan_scenarios([2], tokens_to_check)
     elif args.scenario == 3:
         logger.info("Menjalankan pemindaian untuk Skenario 3 (DEX-DEX, Beda Jaringan)")
-        results = {3: arbitrage_scanner.scan_scenario_3(tokens_to_check)}
+        results = arbitrage_scanner.scan_scenarios([3], tokens_to_check)
     else:
         logger.info("Menjalankan pemindaian untuk semua skenario")
-        results = arbitrage_scanner.scan_all_scenarios()
+        results = arbitrage_scanner.scan_all_scenarios(tokens_to_check)
 
     return results
 
-def main():
+def print_scan_plan(args) -> int:
     """
-    Fungsi utama program.
+    Mencetak rencana pengambilan data pemindaian tanpa mengirim permintaan API.
+
+    Args:
+        args: Argumen command line
+
+    Returns:
+        Kode keluar program
     """
-    # Parse argumen
-    args = parse_arguments()
+    from arbitrage import get_arbitrage_scanner
+    from planner import ScanPlanner
+
+    arbitrage_scanner = get_arbitrage_scanner()
+    scenarios = [args.scenario] if args.scenario else [1, 2, 3]
+
+    plan = ScanPlanner(arbitrage_scanner).build(scenarios, get_tokens_to_check(args))
+    print(plan.describe(
+        arbitrage_scanner.dex_screener.rate_limiter.min_interval,
+        arbitrage_scanner.binance.rate_limiter.min_interval
+    ))
+
+    return 0
+
+def run_fast_refresh(args, pipeline, deadline: float, store, interval: float):
+    """
+    Menjalankan refresh cepat pool hot sampai waktu pemindaian penuh berikutnya.
+
+    Hanya berlaku untuk Skenario 2 (DEX-DEX, Sama Jaringan); jika nonaktif,
+    fungsi ini hanya menunggu sampai deadline. Hasil refresh menggantikan
+    peluang lama dari pool yang dinilai ulang, lalu seluruh hasil gabungan
+    dikirim ke sink.
+
+    Args:
+        args: Argumen command line
+        pipeline: Pipeline output (sinks.OutputPipeline)
+        deadline: Waktu (epoch) pemindaian penuh berikutnya
+        store: Peluang terakhir yang diketahui (sinks.ResultStore)
+        interval: Jeda antar refresh cepat (detik, 0 = nonaktif)
+    """
+    from arbitrage import get_arbitrage_scanner
+
+    enabled = interval > 0 and args.scenario in (None, 2)
+
+    while True:
+        remaining = deadline - time.time()
+
+        if remaining <= 0:
+            return
+
+        if not enabled or remaining <= interval:
+            time.sleep(remaining)
+            return
+
+        time.sleep(interval)
+
+        refreshed = set()
+        opportunities = get_arbitrage_scanner().refresh_hot_pairs(refreshed)
+
+        if not opportunities and not refreshed:
+            continue
+
+        # Peluang lama diganti jika kedua pool-nya dinilai ulang pada refresh ini
+        def covered(scenario, opp):
+            network = opp.get("network")
+            return (
+                scenario == 2
+                and (network, str(opp.get("buy_pair_address", "")).lower()) in refreshed
+                and (network, str(opp.get("sell_pair_address", "")).lower()) in refreshed
+            )
+
+        previous = store.results
+        results = store.update({2: opportunities}, covered)
+
+        if opportunities or results != previous:
+            pipeline.publish(results, store.cycles, updates={2: opportunities})
+
+def export_trace(path: str):
+    """
+    Menyimpan trace ke file dan mencatat (token, jaringan) yang paling lambat.
+
+    Args:
+        path: Lokasi file trace
+    """
+    from tracing import tracer
+
+    tracer.stop()
+
+    try:
+        tracer.export(path)
+    except OSError as e:
+        logger.error(f"Gagal menyimpan trace ke {path}: {str(e)}")
+
+    for item in tracer.get_breakdown(config.TRACING["breakdown_limit"]):
+        stages = ", ".join(f"{name} {duration:.1f} ms" for name, duration in sorted(item["stages"].items(), key=lambda x: -x[1]))
+        logger.info(f"Waktu {item['token']} ({item['network']}): {item['total_ms']:.1f} ms [{stages}]")
+
+def write_profile(profiler: SamplingProfiler, prefix: str):
+    """
+    Menghentikan profiler dan menulis laporan serta file stack collapsed.
+
+    Args:
+        profiler: Profiler sampling yang sedang berjalan
+        prefix: Awalan nama file laporan
+    """
+    profiler.stop()
+
+    report_path = f"{prefix}.txt"
+    collapsed_path = f"{prefix}.collapsed"
+
+    try:
+        with open(report_path, "w") as f:
+            profiler.write_report(f, config.PROFILING["report_limit"])
+        profiler.write_collapsed(collapsed_path)
+    except OSError as e:
+        logger.error(f"Gagal menyimpan profil ke {report_path}: {str(e)}")
+        return
+
+    profiler.write_report(sys.stderr, config.PROFILING["report_limit"])
+    logger.info(f"Profil disimpan ke {report_path} dan {collapsed_path}")
+
+def run(args) -> int:
+    """
+    Menjalankan program sesuai argumen command line.
+
+    Args:
+        args: Argumen command line
+
+    Returns:
+        Kode keluar program
+    """
+    from utils import setup_logging
+    from sinks import ResultStore, create_output_pipeline
+
+    setup_logging()
+
+    if args.no_console:
+        config.OUTPUT_CONFIG["console_output"] = False
+
+    if args.snapshot_format:
+        config.SNAPSHOT["format"] = args.snapshot_format
+
+    if args.snapshot_delta:
+        config.SNAPSHOT["delta"] = True
+
+    if args.dry_run:
+        return print_scan_plan(args)
+
+    if args.metrics_port is not None:
+        import metrics
+
+        try:
+            metrics.start_http_server(args.metrics_port)
+        except OSError as e:
+            logger.error(f"Gagal menjalankan endpoint metrik di port {args.metrics_port}: {str(e)}")
+            return 1
+
+    if args.trace:
+        from tracing import tracer
+        tracer.start()
+
+    profiler = None
+    if args.profile:
+        profiler = SamplingProfiler()
+        profiler.start()
+
+    # Hasil dikirim ke sink (console, file, webhook, NDJSON) yang berjalan di thread sendiri
+    pipeline = create_output_pipeline(webhook_url=args.webhook, ndjson_path=args.ndjson)
 
     try:
         if args.continuous:
             logger.info(f"Memulai pemindaian terus-menerus dengan interval {args.interval} detik")
 
+            scheduler = None
+            cycle_interval = args.interval
+            refresh_interval = args.fast_refresh
+            max_age = None
+
+            if config.SCHEDULER["enabled"] and not args.no_adaptive:
+                from arbitrage import get_arbitrage_scanner
+                from scheduler import AdaptiveScheduler, opportunity_pair
+
+                # Siklus berjalan pada interval tercepat; penjadwal memilih token yang dipindai
+                scheduler = AdaptiveScheduler(args.interval)
+                get_arbitrage_scanner().scheduler = scheduler
+                cycle_interval = scheduler.tick_interval
+                max_age = scheduler.max_interval
+                logger.info(f"Penjadwal adaptif aktif: interval per token {scheduler.min_interval:.0f}-{scheduler.max_interval:.0f} detik")
+
+                # Refresh cepat hanya berjalan di antara siklus; jeda yang tidak lebih pendek dari siklus tidak pernah tercapai
+                if 0 < refresh_interval and cycle_interval <= refresh_interval:
+                    refresh_interval = cycle_interval / 2
+                    logger.info(f"--fast-refresh {args.fast_refresh} detik tidak lebih pendek dari siklus penjadwal "
+                                f"({cycle_interval:.0f} detik), refresh cepat dijalankan setiap {refresh_interval:.1f} detik")
+
+            # Hasil terakhir per skenario, digabung dengan hasil siklus dan refresh cepat berikutnya
+            store = ResultStore(max_age)
+
+            # Multi-hop memindai semua token sehingga biayanya hampir sama dengan anggaran satu
+            # siklus penjadwal; dijalankan sekali per --interval, mulai setelah siklus pertama
+            last_multi_hop = time.time()
+            if scheduler is not None and args.multi_hop:
+                logger.info(f"Pemindaian multi-hop dijalankan setiap {args.interval} detik")
+
             while True:
                 try:
+                    multi_hop = args.multi_hop and (scheduler is None or time.time() - last_multi_hop >= args.interval)
+
+                    if scheduler is not None:
+                        scheduler.plan_cycle(get_arbitrage_scanner().is_suppressed, scan_reserve(args, multi_hop))
+
                     # Jalankan pemindaian
                     results = run_scan(args)
+                    covered = None
+
+                    # Siklus penjadwal hanya memindai pasangan yang jatuh tempo; peluang pasangan lain tetap dipakai
+                    if scheduler is not None:
+                        scanned = scheduler.planned
+                        covered = lambda scenario, opp: opportunity_pair(scenario, opp) in scanned
+
+                    if multi_hop:
+                        store.cycles = run_multi_hop_scan(args)
+                        last_multi_hop = time.time()
 
-                    # Tampilkan hasil
-                    display_results(results)
+                    # Tampilkan hasil tanpa menunggu sink selesai
+                    pipeline.publish(store.update(results, covered), store.cycles, updates=results)
 
-                    # Tunggu interval
-                    logger.info(f"Menunggu {args.interval} detik sebelum pemindaian berikutnya...")
-                    time.sleep(args.interval)
+                    from metrics import SCAN_CYCLES
+                    SCAN_CYCLES.inc()
+
+                    # Tunggu interval, sambil refresh cepat pool hot jika aktif
+                    logger.info(f"Menunggu {cycle_interval:.0f} detik sebelum pemindaian berikutnya...")
+                    run_fast_refresh(args, pipeline, time.time() + cycle_interval, store, refresh_interval)
 
                 except KeyboardInterrupt:
                     logger.info("Pemindaian dihentikan oleh pengguna")
@@ -201,9 +568,10 @@ def main():
         else:
             # Jalankan pemindaian sekali
             results = run_scan(args)
+            cycles = run_multi_hop_scan(args) if args.multi_hop else None
 
             # Tampilkan hasil
-            display_results(results)
+            pipeline.publish(results, cycles)
 
     except KeyboardInterrupt:
         logger.info("Program dihentikan oleh pengguna")
@@ -212,7 +580,36 @@ def main():
         logger.error(f"Error tidak terduga: {str(e)}")
         return 1
 
+    finally:
+        # Tunggu sink menyelesaikan hasil yang masih di antrean
+        pipeline.close()
+
+        if args.trace:
+            export_trace(args.trace)
+
+        if profiler is not None:
+            write_profile(profiler, args.profile)
+
     return 0
 
+def main():
+    """
+    Fungsi utama program.
+    """
+    # Parse argumen
+    args = parse_arguments()
+
+    import_profiler = None
+    if args.print_startup_profile:
+        import_profiler = ImportProfiler()
+        import_profiler.start()
+
+    try:
+        return run(args)
+    finally:
+        if import_profiler is not None:
+            import_profiler.stop()
+            import_profiler.print_report()
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,290 @@
+"""
+Modul hash join harga CEX (Binance) dengan snapshot pool DEX untuk Skenario 1.
+
+Skenario 1 semula hanya membandingkan top gainers Binance yang kebetulan ada
+di TOKENS_TO_MONITOR. Join ini mengindeks semua ticker Binance (quote USDT,
+BUSD, BTC, ETH, BNB) per base asset dan snapshot pool DEX per simbol dan
+alamat, lalu menggabungkan keduanya dalam satu lintasan: sisi pool memeriksa
+dict ticker, sehingga biayanya linear terhadap jumlah ticker + pool.
+
+Harga hasil join disimpan per kolom (array float) dan selisih harga dihitung
+untuk semua baris sekaligus. Hanya (token, jaringan) yang selisihnya melewati
+ambang yang dilanjutkan ke evaluasi penuh (order book, biaya, gas).
+"""
+
+import logging
+from array import array
+from decimal import Decimal
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+import config
+from price_graph import CEX_SYMBOL_ALIASES
+from utils import split_binance_symbol
+
+logger = logging.getLogger("arbitrage.join")
+
+def cex_symbol(token: str) -> str:
+    """
+    Base asset Binance untuk simbol token DEX (misalnya WETH -> ETH).
+
+    Args:
+        token: Simbol token DEX
+
+    Returns:
+        Base asset Binance
+    """
+    return CEX_SYMBOL_ALIASES.get(token, token)
+
+class CexQuote:
+    """
+    Harga satu ticker Binance dalam USD.
+    """
+
+    __slots__ = ("symbol", "base_asset", "quote_asset", "last_price", "quote_price_usd", "price_usd", "volume_usd")
+
+    def __init__(self, symbol: str, base_asset: str, quote_asset: str, last_price: Decimal,
+                 quote_price_usd: Decimal, volume_usd: float):
+        self.symbol = symbol
+        self.base_asset = base_asset
+        self.quote_asset = quote_asset
+        self.last_price = last_price
+        self.quote_price_usd = quote_price_usd
+        self.price_usd = float(last_price * quote_price_usd)
+        self.volume_usd = volume_usd
+
+class TickerIndex:
+    """
+    Ticker Binance per base asset; satu ticker (volume USD terbesar) per base asset.
+    """
+
+    def __init__(self, tickers: Iterable[Dict[str, Any]], quote_assets: Optional[Iterable[str]] = None,
+                 min_quote_volume_usd: Optional[float] = None):
+        """
+        Mengindeks ticker 24 jam Binance.
+
+        Harga quote asset non-stablecoin (BTC, ETH, BNB) diambil dari ticker
+        <quote>USDT di daftar yang sama, tanpa permintaan tambahan.
+
+        Args:
+            tickers: Data ticker 24 jam dari Binance
+            quote_assets: Quote asset yang diindeks (default dari konfigurasi)
+            min_quote_volume_usd: Volume 24 jam minimum dalam USD (default dari konfigurasi)
+        """
+        if quote_assets is None:
+            quote_assets = config.MARKET_JOIN["quote_assets"]
+        if min_quote_volume_usd is None:
+            min_quote_volume_usd = config.MARKET_JOIN["min_quote_volume_usd"]
+
+        quote_assets = set(quote_assets)
+        tickers = list(tickers)
+
+        quote_prices = {quote: Decimal("1") for quote in config.MARKET_JOIN["usd_quote_assets"]}
+        for ticker in tickers:
+            assets = split_binance_symbol(ticker.get("symbol", ""))
+            if assets is not None and assets[1] == "USDT" and assets[0] in quote_assets and assets[0] not in quote_prices:
+                quote_prices[assets[0]] = Decimal(ticker["lastPrice"])
+
+        self.quotes: Dict[str, CexQuote] = {}
+
+        for ticker in tickers:
+            assets = split_binance_symbol(ticker.get("symbol", ""))
+            if assets is None or assets[1] not in quote_assets or assets[1] not in quote_prices:
+                continue
+
+            base_asset, quote_asset = assets
+            last_price = Decimal(ticker.get("lastPrice") or "0")
+            quote_price_usd = quote_prices[quote_asset]
+
+            if last_price <= 0 or quote_price_usd <= 0:
+                continue
+
+            volume_usd = float(ticker.get("quoteVolume") or 0) * float(quote_price_usd)
+            if volume_usd < min_quote_volume_usd:
+                continue
+
+            current = self.quotes.get(base_asset)
+            if current is None or volume_usd > current.volume_usd:
+                self.quotes[base_asset] = CexQuote(ticker["symbol"], base_asset, quote_asset, last_price, quote_price_usd, volume_usd)
+
+    def __contains__(self, base_asset: str) -> bool:
+        return base_asset in self.quotes
+
+    def __len__(self) -> int:
+        return len(self.quotes)
+
+    def get(self, base_asset: str) -> Optional[CexQuote]:
+        return self.quotes.get(base_asset)
+
+class PoolIndex:
+    """
+    Snapshot pool DEX per simbol (base asset Binance) dan per alamat token.
+    """
+
+    def __init__(self):
+        self.by_symbol: Dict[str, List[str]] = {}  # base asset Binance -> token DEX
+        self.by_address: Dict[Tuple[str, str], str] = {}  # (jaringan, alamat token) -> token DEX
+        self.pools: Dict[str, Dict[str, Tuple[str, List[Dict[str, Any]]]]] = {}  # token -> jaringan -> (alamat, pool)
+
+    def add(self, token: str, network: str, token_address: str, dex_prices: List[Dict[str, Any]]):
+        """
+        Menambahkan pool satu (token, jaringan) ke snapshot.
+
+        Args:
+            token: Simbol token DEX
+            network: Nama jaringan
+            token_address: Alamat token
+            dex_prices: Harga di berbagai DEX (format get_price_across_dexes)
+        """
+        if token not in self.pools:
+            self.pools[token] = {}
+            self.by_symbol.setdefault(cex_symbol(token), []).append(token)
+
+        self.pools[token][network] = (token_address, dex_prices)
+        self.by_address[(network, token_address.lower())] = token
+
+    def __len__(self) -> int:
+        return sum(len(dex_prices) for networks in self.pools.values() for _, dex_prices in networks.values())
+
+    def token_for(self, network: str, token_address: str) -> Optional[str]:
+        """
+        Token DEX untuk alamat token di satu jaringan.
+
+        Args:
+            network: Nama jaringan
+            token_address: Alamat token
+
+        Returns:
+            Simbol token, atau None jika alamat tidak ada di snapshot
+        """
+        return self.by_address.get((network, token_address.lower()))
+
+class JoinResult:
+    """
+    Hasil join per baris (satu baris per pool DEX yang punya ticker Binance), disimpan per kolom.
+    """
+
+    def __init__(self):
+        self.tokens: List[str] = []
+        self.networks: List[str] = []
+        self.quotes: List[CexQuote] = []
+        self.cex_prices = array("d")
+        self.dex_prices = array("d")
+        self.spreads = array("d")
+        self.pools: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}  # (token, jaringan) -> pool yang di-join
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def pools_for(self, token: str, network: str) -> List[Dict[str, Any]]:
+        """
+        Pool DEX (token, jaringan) yang masuk join, yaitu pool dengan token di sisi base.
+
+        Args:
+            token: Simbol token DEX
+            network: Nama jaringan
+
+        Returns:
+            Daftar pool (format get_price_across_dexes)
+        """
+        return self.pools.get((token, network), [])
+
+    def max_spreads(self) -> Dict[Tuple[str, str], float]:
+        """
+        Selisih harga absolut terbesar per (token, jaringan).
+
+        Returns:
+            Dict (token, jaringan) -> selisih harga dalam persen
+        """
+        result: Dict[Tuple[str, str], float] = {}
+
+        for token, network, spread in zip(self.tokens, self.networks, self.spreads):
+            spread = abs(spread)
+            key = (token, network)
+            if spread > result.get(key, -1.0):
+                result[key] = spread
+
+        return result
+
+    def candidates(self, min_spread_percentage: float, limit: Optional[int] = None) -> List[Tuple[str, CexQuote, List[str]]]:
+        """
+        (token, jaringan) dengan selisih harga di atas ambang, dikelompokkan per token.
+
+        Args:
+            min_spread_percentage: Selisih harga absolut minimum (persen)
+            limit: Jumlah token maksimum (selisih terbesar lebih dulu)
+
+        Returns:
+            Daftar tuple (token, ticker Binance, daftar jaringan)
+        """
+        best: Dict[str, float] = {}
+        networks: Dict[str, List[str]] = {}
+        quotes: Dict[str, CexQuote] = {}
+
+        for (token, network), spread in self.max_spreads().items():
+            if spread < min_spread_percentage:
+                continue
+
+            networks.setdefault(token, []).append(network)
+            best[token] = max(best.get(token, 0.0), spread)
+
+        for token, quote in zip(self.tokens, self.quotes):
+            if token in networks:
+                quotes[token] = quote
+
+        ordered = sorted(best, key=best.get, reverse=True)
+        if limit is not None:
+            ordered = ordered[:limit]
+
+        return [(token, quotes[token], networks[token]) for token in ordered]
+
+def join(tickers: TickerIndex, pools: PoolIndex) -> JoinResult:
+    """
+    Menggabungkan ticker Binance dengan snapshot pool DEX berdasarkan simbol.
+
+    Pool yang base token-nya bukan token yang diindeks (token berada di sisi
+    quote pair, sehingga priceUsd adalah harga token lain) dilewati.
+
+    Args:
+        tickers: Indeks ticker Binance
+        pools: Indeks pool DEX
+
+    Returns:
+        Hasil join dengan selisih harga DEX terhadap Binance (persen) per baris
+    """
+    result = JoinResult()
+    tokens = result.tokens
+    networks = result.networks
+    quotes = result.quotes
+    cex_prices = result.cex_prices
+    dex_prices = result.dex_prices
+    joined_pools = result.pools
+
+    for base_asset, symbol_tokens in pools.by_symbol.items():
+        quote = tickers.get(base_asset)
+        if quote is None:
+            continue
+
+        for token in symbol_tokens:
+            for network, (token_address, token_pools) in pools.pools[token].items():
+                for dex_info in token_pools:
+                    base_address = (dex_info.get("base_token") or {}).get("address")
+                    if base_address and pools.token_for(network, base_address) != token:
+                        continue
+
+                    price_usd = float(dex_info["price_usd"])
+                    if price_usd <= 0:
+                        continue
+
+                    tokens.append(token)
+                    networks.append(network)
+                    quotes.append(quote)
+                    cex_prices.append(quote.price_usd)
+                    dex_prices.append(price_usd)
+                    joined_pools.setdefault((token, network), []).append(dex_info)
+
+    # Selisih harga DEX terhadap Binance untuk semua baris sekaligus
+    result.spreads = array("d", [(dex - cex) / cex * 100 for cex, dex in zip(cex_prices, dex_prices)])
+
+    logger.debug("Join CEX-DEX: %d ticker x %d pool -> %d baris", len(tickers), len(pools), len(result))
+
+    return result
@@ -0,0 +1,365 @@
+"""
+Modul metrik internal scanner dalam format teks Prometheus.
+
+Registry disimpan di memori proses. Endpoint HTTP /metrics hanya dijalankan
+jika diminta (opsi --metrics-port).
+"""
+
+import bisect
+import logging
+import re
+import threading
+import time
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+
+import config
+
+logger = logging.getLogger("arbitrage.metrics")
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class Metric:
+    """
+    Kelas dasar metrik dengan label.
+    """
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Label untuk {self.name} harus {self.labelnames}, bukan {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _label_string(self, key: Tuple[str, ...], extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra is not None:
+            pairs.append(f'{extra[0]}="{extra[1]}"')
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def get(self, **labels) -> Any:
+        """
+        Nilai metrik untuk kombinasi label tertentu (untuk logging atau pengujian).
+        """
+        with self._lock:
+            return self._values.get(self._key(labels))
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{self._label_string(key)} {_format_value(value)}")
+
+        return lines
+
+class Counter(Metric):
+    """
+    Metrik yang hanya bisa bertambah.
+    """
+
+    metric_type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+class Gauge(Metric):
+    """
+    Metrik yang nilainya bisa naik dan turun.
+    """
+
+    metric_type = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+class Histogram(Metric):
+    """
+    Distribusi nilai (misalnya latensi) dalam bucket kumulatif.
+    """
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Optional[Sequence[float]] = None):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets or config.METRICS["latency_buckets"]))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+
+            state["counts"][index] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    def time(self, **labels) -> "_Timer":
+        """
+        Context manager untuk mengukur durasi blok kode.
+        """
+        return _Timer(self, labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), state["counts"]):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{self._label_string(key, ('le', _format_value(bound)))} {cumulative}")
+                lines.append(f"{self.name}_sum{self._label_string(key)} {_format_value(state['sum'])}")
+                lines.append(f"{self.name}_count{self._label_string(key)} {state['count']}")
+
+        return lines
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: Dict[str, Any]):
+        self.histogram = histogram
+        self.labels = labels
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+class MetricsRegistry:
+    """
+    Kumpulan metrik yang dirender bersama untuk endpoint /metrics.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metrik {metric.name} sudah terdaftar")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Optional[Sequence[float]] = None) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        Merender semua metrik dalam format teks Prometheus (versi 0.0.4).
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+
+        return "\n".join(lines) + "\n"
+
+# Registry global dan metrik scanner
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "arbitrage_http_requests_total", "Jumlah permintaan HTTP ke API eksternal",
+    ("client", "endpoint", "status")
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "arbitrage_http_request_duration_seconds", "Latensi permintaan HTTP ke API eksternal",
+    ("client", "endpoint")
+)
+RATE_LIMIT_WAIT = REGISTRY.counter(
+    "arbitrage_rate_limit_wait_seconds_total", "Total waktu menunggu rate limiter",
+    ("client",)
+)
+RETRIES = REGISTRY.counter(
+    "arbitrage_retries_total", "Jumlah percobaan ulang setelah exception",
+    ("function",)
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "arbitrage_cache_requests_total", "Jumlah akses cache berdasarkan hasil (hit/miss/shared)",
+    ("cache", "result")
+)
+SCAN_DURATION = REGISTRY.histogram(
+    "arbitrage_scan_duration_seconds", "Durasi pemindaian per skenario",
+    ("scenario",), buckets=config.METRICS["scan_buckets"]
+)
+OPPORTUNITIES_FOUND = REGISTRY.gauge(
+    "arbitrage_opportunities_found", "Jumlah peluang pada pemindaian terakhir per skenario",
+    ("scenario",)
+)
+OPPORTUNITIES_TOTAL = REGISTRY.counter(
+    "arbitrage_opportunities_total", "Jumlah kumulatif peluang yang ditemukan per skenario",
+    ("scenario",)
+)
+SCAN_CYCLES = REGISTRY.counter(
+    "arbitrage_scan_cycles_total", "Jumlah siklus pemindaian yang selesai"
+)
+SINK_QUEUE_DEPTH = REGISTRY.gauge(
+    "arbitrage_sink_queue_depth", "Jumlah laporan yang menunggu di antrean sink output",
+    ("sink",)
+)
+SINK_DROPPED = REGISTRY.counter(
+    "arbitrage_sink_dropped_total", "Jumlah laporan yang dibuang karena antrean sink penuh",
+    ("sink",)
+)
+SINK_DURATION = REGISTRY.histogram(
+    "arbitrage_sink_duration_seconds", "Durasi pemrosesan satu laporan oleh sink output",
+    ("sink",)
+)
+PIPELINE_UTILIZATION = REGISTRY.gauge(
+    "arbitrage_pipeline_stage_utilization", "Porsi waktu tahap pipeline sibuk pada pemindaian terakhir (0-1)",
+    ("pipeline", "stage")
+)
+PIPELINE_STALL = REGISTRY.counter(
+    "arbitrage_pipeline_stage_stall_seconds_total", "Total waktu tahap pipeline tertahan antrean (fetch: antrean penuh, evaluate: antrean kosong)",
+    ("pipeline", "stage")
+)
+PIPELINE_QUEUE_DEPTH = REGISTRY.gauge(
+    "arbitrage_pipeline_queue_depth", "Jumlah data hasil fetch yang menunggu dievaluasi",
+    ("pipeline",)
+)
+PAIRS_FILTERED = REGISTRY.counter(
+    "arbitrage_pairs_filtered_total", "Jumlah pool DEX Screener yang ditolak PairFilter sebelum diparse"
+)
+
+_ADDRESS_PATTERN = re.compile(r"0x[0-9a-fA-F]+(,0x[0-9a-fA-F]+)*")
+
+def normalize_endpoint(endpoint: str) -> str:
+    """
+    Mengganti alamat kontrak di path endpoint agar jumlah label tetap kecil.
+
+    Args:
+        endpoint: Path endpoint (misalnya /token-pairs/v1/bsc/0xabc...)
+
+    Returns:
+        Path dengan alamat diganti :address
+    """
+    return _ADDRESS_PATTERN.sub(":address", endpoint)
+
+def observe_request(client: str, endpoint: str, status: str, duration: float):
+    """
+    Mencatat satu permintaan HTTP beserta latensinya.
+
+    Args:
+        client: Nama klien API (misalnya dexscreener, binance, rpc)
+        endpoint: Path endpoint atau metode RPC
+        status: Kode status HTTP atau "error" jika tidak ada respons
+        duration: Durasi permintaan (detik)
+    """
+    endpoint = normalize_endpoint(endpoint)
+    HTTP_REQUESTS.inc(client=client, endpoint=endpoint, status=status)
+    HTTP_REQUEST_DURATION.observe(duration, client=client, endpoint=endpoint)
+
+def record_cache(cache: str, hit: bool):
+    """
+    Mencatat akses cache.
+
+    Args:
+        cache: Nama cache
+        hit: True jika data ditemukan di cache
+    """
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+def observe_scan(scenario: str) -> Callable:
+    """
+    Decorator untuk mencatat durasi pemindaian dan jumlah peluang yang ditemukan.
+
+    Args:
+        scenario: Label skenario
+
+    Returns:
+        Decorator function
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with SCAN_DURATION.time(scenario=scenario):
+                result = func(*args, **kwargs)
+
+            OPPORTUNITIES_FOUND.set(len(result), scenario=scenario)
+            OPPORTUNITIES_TOTAL.inc(len(result), scenario=scenario)
+
+            return result
+        return wrapper
+    return decorator
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+def start_http_server(port: int, host: Optional[str] = None) -> HTTPServer:
+    """
+    Menjalankan endpoint HTTP /metrics di thread latar belakang.
+
+    Args:
+        port: Port HTTP
+        host: Alamat bind (default dari config.METRICS)
+
+    Returns:
+        Instance server (panggil shutdown() untuk menghentikan)
+    """
+    server = _ThreadingHTTPServer((host or config.METRICS["host"], port), _MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+
+    logger.info(f"Endpoint metrik tersedia di http://{server.server_address[0]}:{server.server_address[1]}/metrics")
+
+    return server
@@ -0,0 +1,485 @@
+"""
+Modul untuk membaca state pool DEX langsung dari blockchain.
+
+Cadangan pool (getReserves untuk pool v2, slot0 untuk pool v3) dibaca lewat
+Multicall3 aggregate3, sehingga ratusan pool dalam satu jaringan cukup
+dibaca dengan satu permintaan eth_call per blok.
+"""
+
+import logging
+import threading
+import time
+from decimal import Decimal
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+import config
+import fixedpoint
+import metrics
+from rpc import JsonRpcClient, JsonRpcError, get_rpc_client, is_rpc_configured
+
+logger = logging.getLogger("arbitrage.onchain")
+
+# Selector fungsi (4 byte pertama keccak256 dari signature)
+AGGREGATE3_SELECTOR = bytes.fromhex("82ad56cb")  # aggregate3((address,bool,bytes)[])
+GET_RESERVES_SELECTOR = bytes.fromhex("0902f1ac")  # getReserves()
+SLOT0_SELECTOR = bytes.fromhex("3850c7bd")  # slot0()
+TOKEN0_SELECTOR = bytes.fromhex("0dfe1681")  # token0()
+TOKEN1_SELECTOR = bytes.fromhex("d21220a7")  # token1()
+DECIMALS_SELECTOR = bytes.fromhex("313ce567")  # decimals()
+
+Q96 = Decimal(2 ** 96)
+
+def _word(value: int) -> bytes:
+    return value.to_bytes(32, "big")
+
+def _read_word(data: bytes, offset: int) -> int:
+    return int.from_bytes(data[offset:offset + 32], "big")
+
+def _read_address(data: bytes, offset: int = 0) -> str:
+    return "0x" + data[offset + 12:offset + 32].hex()
+
+def encode_aggregate3(calls: List[Tuple[str, bytes]]) -> bytes:
+    """
+    Encode calldata Multicall3 aggregate3 dengan allowFailure=true untuk setiap panggilan.
+
+    Args:
+        calls: Daftar tuple (alamat kontrak target, calldata)
+
+    Returns:
+        Calldata lengkap termasuk selector
+    """
+    encoded_calls = []
+
+    for target, call_data in calls:
+        padding = bytes(-len(call_data) % 32)
+        encoded_calls.append(
+            bytes(12) + bytes.fromhex(target[2:])  # address target
+            + _word(1)  # bool allowFailure
+            + _word(0x60)  # offset bytes callData di dalam tuple
+            + _word(len(call_data))
+            + call_data + padding
+        )
+
+    # Elemen tuple bersifat dinamis, jadi array diawali offset setiap elemen
+    offsets = []
+    position = 32 * len(encoded_calls)
+
+    for encoded in encoded_calls:
+        offsets.append(_word(position))
+        position += len(encoded)
+
+    return (
+        AGGREGATE3_SELECTOR
+        + _word(0x20)
+        + _word(len(encoded_calls))
+        + b"".join(offsets)
+        + b"".join(encoded_calls)
+    )
+
+def decode_aggregate3(data: bytes) -> List[Tuple[bool, bytes]]:
+    """
+    Decode hasil aggregate3 (Result[] berisi success dan returnData).
+
+    Args:
+        data: Data hasil eth_call
+
+    Returns:
+        Daftar tuple (success, returnData)
+    """
+    array_offset = _read_word(data, 0)
+    count = _read_word(data, array_offset)
+    heads = array_offset + 32
+    results = []
+
+    for i in range(count):
+        tuple_offset = heads + _read_word(data, heads + 32 * i)
+        success = _read_word(data, tuple_offset) != 0
+        bytes_offset = tuple_offset + _read_word(data, tuple_offset + 32)
+        length = _read_word(data, bytes_offset)
+        results.append((success, data[bytes_offset + 32:bytes_offset + 32 + length]))
+
+    return results
+
+def _hex_to_bytes(value: str) -> bytes:
+    return bytes.fromhex(value[2:] if value.startswith("0x") else value)
+
+class OnchainPoolReader:
+    """
+    Pembaca state pool untuk satu jaringan dengan cache per blok.
+
+    Metadata pool (token0, token1, jenis pool dan desimal token) hanya dibaca
+    sekali. State pool dibaca ulang hanya jika nomor blok berubah, dan semua
+    pool yang sudah dikenal di jaringan dibaca bersama dalam satu batch.
+    """
+
+    def __init__(self, network: str, client: Optional[JsonRpcClient] = None):
+        """
+        Inisialisasi pembaca pool.
+
+        Args:
+            network: Nama jaringan (misalnya ethereum, bsc)
+            client: Klien JSON-RPC; default menggunakan rpc_url dari konfigurasi
+        """
+        self.network = network
+        self._client = client
+        self.multicall_address = config.ONCHAIN["multicall_address"]
+        self.max_calls_per_request = config.ONCHAIN["max_calls_per_request"]
+        self.block_poll_interval = config.ONCHAIN["block_poll_interval"]
+
+        # Metadata pool: {alamat: {"kind", "token0", "token1"}}; kind None = tidak didukung
+        self.pools: Dict[str, Dict[str, Any]] = {}
+        self.token_decimals: Dict[str, int] = {}
+
+        self._block_number: Optional[int] = None
+        self._block_checked_at = 0.0
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> JsonRpcClient:
+        if self._client is None:
+            self._client = get_rpc_client(self.network)
+        return self._client
+
+    def current_block(self) -> int:
+        """
+        Mendapatkan nomor blok terbaru (diperiksa paling sering sekali per block_poll_interval).
+
+        Returns:
+            Nomor blok
+        """
+        now = time.time()
+
+        if self._block_number is None or now - self._block_checked_at >= self.block_poll_interval:
+            self._block_number = int(self.client.call("eth_blockNumber"), 16)
+            self._block_checked_at = now
+
+        return self._block_number
+
+    def _multicall(self, calls: List[Tuple[str, bytes]], block: Any = "latest") -> List[Tuple[bool, bytes]]:
+        """
+        Menjalankan panggilan kontrak lewat Multicall3.
+
+        Panggilan dipecah per max_calls_per_request, dan semua potongan dikirim
+        sebagai satu batch JSON-RPC.
+
+        Args:
+            calls: Daftar tuple (alamat kontrak, calldata)
+            block: Nomor blok (int) atau tag blok
+
+        Returns:
+            Daftar tuple (success, returnData) sesuai urutan calls
+        """
+        if not calls:
+            return []
+
+        block_tag = hex(block) if isinstance(block, int) else block
+        chunks = [calls[i:i + self.max_calls_per_request] for i in range(0, len(calls), self.max_calls_per_request)]
+
+        responses = self.client.batch([
+            ("eth_call", [{"to": self.multicall_address, "data": "0x" + encode_aggregate3(chunk).hex()}, block_tag])
+            for chunk in chunks
+        ])
+
+        results = []
+
+        for response in responses:
+            if isinstance(response, JsonRpcError):
+                raise response
+            results.extend(decode_aggregate3(_hex_to_bytes(response)))
+
+        return results
+
+    def _load_metadata(self, addresses: List[str]):
+        """
+        Membaca metadata untuk pool yang belum dikenal.
+
+        Jenis pool ditentukan dari fungsi yang berhasil dipanggil: getReserves (v2)
+        atau slot0 (v3).
+
+        Args:
+            addresses: Daftar alamat pool (huruf kecil)
+        """
+        new_pools = [address for address in addresses if address not in self.pools]
+
+        if not new_pools:
+            return
+
+        calls = []
+        for address in new_pools:
+            calls.extend([
+                (address, TOKEN0_SELECTOR),
+                (address, TOKEN1_SELECTOR),
+                (address, GET_RESERVES_SELECTOR),
+                (address, SLOT0_SELECTOR),
+            ])
+
+        results = self._multicall(calls)
+
+        for i, address in enumerate(new_pools):
+            token0, token1, reserves, slot0 = results[4 * i:4 * i + 4]
+            kind = None
+
+            if token0[0] and token1[0] and len(token0[1]) >= 32 and len(token1[1]) >= 32:
+                if reserves[0] and len(reserves[1]) >= 64:
+                    kind = "v2"
+                elif slot0[0] and len(slot0[1]) >= 32:
+                    kind = "v3"
+
+            if kind is None:
+                logger.debug(f"Pool {address} di {self.network} tidak didukung untuk pembacaan on-chain")
+                self.pools[address] = {"kind": None}
+                continue
+
+            self.pools[address] = {
+                "kind": kind,
+                "token0": _read_address(token0[1]),
+                "token1": _read_address(token1[1]),
+            }
+
+        # Desimal token yang belum diketahui
+        tokens = []
+        for address in new_pools:
+            pool = self.pools[address]
+            if pool["kind"] is None:
+                continue
+            for token in (pool["token0"], pool["token1"]):
+                if token not in self.token_decimals and token not in tokens:
+                    tokens.append(token)
+
+        for token, (success, data) in zip(tokens, self._multicall([(token, DECIMALS_SELECTOR) for token in tokens])):
+            self.token_decimals[token] = _read_word(data, 0) if success and len(data) >= 32 else 18
+
+    def read_pools(self, addresses: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Membaca state pool pada blok terbaru.
+
+        Args:
+            addresses: Daftar alamat pool
+
+        Returns:
+            Dict dengan alamat pool (huruf kecil) sebagai key dan state pool sebagai value
+        """
+        addresses = [address.lower() for address in addresses]
+
+        with self._lock:
+            self._load_metadata(addresses)
+            block = self.current_block()
+
+            if self._states and next(iter(self._states.values()))["block_number"] != block:
+                self._states = {}
+
+            known = [address for address in addresses if self.pools.get(address, {}).get("kind") is not None]
+            hits = sum(1 for address in known if address in self._states)
+            metrics.CACHE_REQUESTS.inc(hits, cache="pool_state", result="hit")
+            metrics.CACHE_REQUESTS.inc(len(known) - hits, cache="pool_state", result="miss")
+
+            # Semua pool yang dikenal di jaringan ini dibaca sekaligus untuk blok ini
+            pending = [
+                address for address, pool in self.pools.items()
+                if pool["kind"] is not None and address not in self._states
+            ]
+
+            if pending:
+                calls = [
+                    (address, GET_RESERVES_SELECTOR if self.pools[address]["kind"] == "v2" else SLOT0_SELECTOR)
+                    for address in pending
+                ]
+
+                for address, (success, data) in zip(pending, self._multicall(calls, block)):
+                    if not success:
+                        continue
+
+                    pool = self.pools[address]
+                    state = {
+                        "block_number": block,
+                        "kind": pool["kind"],
+                        "token0": pool["token0"],
+                        "token1": pool["token1"],
+                        "decimals0": self.token_decimals.get(pool["token0"], 18),
+                        "decimals1": self.token_decimals.get(pool["token1"], 18),
+                    }
+
+                    if pool["kind"] == "v2":
+                        state["reserve0"] = _read_word(data, 0)
+                        state["reserve1"] = _read_word(data, 32)
+                    else:
+                        state["sqrt_price_x96"] = _read_word(data, 0)
+
+                    self._states[address] = state
+
+                logger.debug(f"Membaca {len(pending)} pool di {self.network} pada blok {block}")
+
+            return {address: self._states[address] for address in addresses if address in self._states}
+
+def price_token0_in_token1(state: Dict[str, Any]) -> Decimal:
+    """
+    Menghitung harga token0 dalam satuan token1 dari state pool.
+
+    Args:
+        state: State pool dari OnchainPoolReader.read_pools
+
+    Returns:
+        Harga token0 dalam token1 (sudah disesuaikan dengan desimal), atau 0
+    """
+    decimals_adjustment = Decimal(10) ** (state["decimals0"] - state["decimals1"])
+
+    if state["kind"] == "v2":
+        if state["reserve0"] == 0:
+            return Decimal("0")
+        return Decimal(state["reserve1"]) / Decimal(state["reserve0"]) * decimals_adjustment
+
+    sqrt_price = Decimal(state["sqrt_price_x96"]) / Q96
+    return sqrt_price * sqrt_price * decimals_adjustment
+
+class OnchainPriceFeed:
+    """
+    Sumber harga DEX dari state pool on-chain.
+
+    DEX Screener tetap dipakai untuk menemukan pool (dengan cache discovery_ttl),
+    sedangkan harga dan cadangan diperbarui dari blockchain setiap blok.
+    """
+
+    def __init__(self, native_price_fetcher: Callable[[str], Decimal]):
+        """
+        Inisialisasi sumber harga on-chain.
+
+        Args:
+            native_price_fetcher: Fungsi yang menerima nama jaringan dan mengembalikan
+                harga token native dalam USD
+        """
+        self.native_price_fetcher = native_price_fetcher
+        self.discovery_ttl = config.ONCHAIN["discovery_ttl"]
+        self.readers: Dict[str, OnchainPoolReader] = {}
+        self._discovered: Dict[Tuple[str, str], Tuple[float, List[Dict[str, Any]]]] = {}
+
+    def get_reader(self, network: str) -> OnchainPoolReader:
+        """
+        Mendapatkan pembaca pool untuk jaringan.
+
+        Args:
+            network: Nama jaringan
+
+        Returns:
+            Instance OnchainPoolReader
+        """
+        if network not in self.readers:
+            self.readers[network] = OnchainPoolReader(network)
+        return self.readers[network]
+
+    def get_dex_prices(self, network: str, token_address: str,
+                       discover: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Mendapatkan harga token di berbagai DEX dengan harga dari blockchain.
+
+        Args:
+            network: Nama jaringan
+            token_address: Alamat token
+            discover: Fungsi untuk menemukan pool (format get_price_across_dexes)
+
+        Returns:
+            Daftar harga di berbagai DEX
+        """
+        key = (network, token_address.lower())
+        cached = self._discovered.get(key)
+
+        if cached is None or time.time() - cached[0] >= self.discovery_ttl:
+            metrics.record_cache("pool_discovery", False)
+            cached = (time.time(), discover())
+            self._discovered[key] = cached
+        else:
+            metrics.record_cache("pool_discovery", True)
+
+        return self.apply(network, cached[1])
+
+    def apply(self, network: str, dex_prices: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Memperbarui harga dan cadangan dex_info dengan state pool on-chain.
+
+        Pool yang tidak bisa dibaca tetap menggunakan data DEX Screener.
+
+        Args:
+            network: Nama jaringan
+            dex_prices: Daftar dex_info (tidak dimodifikasi)
+
+        Returns:
+            Daftar dex_info baru
+        """
+        if not dex_prices or network not in config.NETWORKS or not is_rpc_configured(network):
+            return dex_prices
+
+        try:
+            states = self.get_reader(network).read_pools([dex_info["pair_address"] for dex_info in dex_prices if dex_info.get("pair_address")])
+        except Exception as e:
+            logger.warning(f"Gagal membaca state pool on-chain di {network}, menggunakan data DEX Screener: {str(e)}")
+            return dex_prices
+
+        updated = []
+
+        for dex_info in dex_prices:
+            state = states.get(str(dex_info.get("pair_address", "")).lower())
+            onchain_info = self._apply_state(network, dex_info, state) if state else None
+            updated.append(onchain_info or dex_info)
+
+        return updated
+
+    def _quote_price_usd(self, network: str, dex_info: Dict[str, Any]) -> Optional[Decimal]:
+        """
+        Harga token quote pool dalam USD.
+        """
+        quote_address = str(dex_info.get("quote_token", {}).get("address", "")).lower()
+        network_config = config.NETWORKS[network]
+
+        if quote_address in [address.lower() for address in network_config["stable_coins"]]:
+            return Decimal("1")
+
+        if quote_address == network_config["wrapped_native"].lower():
+            return Decimal(str(self.native_price_fetcher(network)))
+
+        # Token quote lain: turunkan dari harga DEX Screener saat pool ditemukan
+        price_native = dex_info.get("price_native")
+        if price_native:
+            return dex_info["price_usd"] / price_native
+
+        return None
+
+    def _apply_state(self, network: str, dex_info: Dict[str, Any], state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Membuat dex_info baru dari state pool, atau None jika harga tidak bisa dihitung.
+        """
+        base_address = str(dex_info.get("base_token", {}).get("address", "")).lower()
+
+        if base_address == state["token0"]:
+            base_is_token0 = True
+        elif base_address == state["token1"]:
+            base_is_token0 = False
+        else:
+            return None
+
+        quote_price_usd = self._quote_price_usd(network, dex_info)
+        price0 = price_token0_in_token1(state)
+
+        if not quote_price_usd or price0 <= 0:
+            return None
+
+        # Harga token base (sama seperti priceUsd di DEX Screener) dalam token quote
+        price_native = price0 if base_is_token0 else 1 / price0
+
+        onchain_info = dict(dex_info)
+        onchain_info["price_native"] = price_native
+        onchain_info["price_usd"] = price_native * quote_price_usd
+        if "price_usd_fixed" in onchain_info:
+            onchain_info["price_usd_fixed"] = fixedpoint.to_price(onchain_info["price_usd"])
+        onchain_info["block_number"] = state["block_number"]
+        onchain_info["price_source"] = "onchain"
+
+        # Cadangan pool v2 menggantikan likuiditas dari DEX Screener
+        if state["kind"] == "v2":
+            reserve0 = Decimal(state["reserve0"]) / Decimal(10) ** state["decimals0"]
+            reserve1 = Decimal(state["reserve1"]) / Decimal(10) ** state["decimals1"]
+            reserve_base, reserve_quote = (reserve0, reserve1) if base_is_token0 else (reserve1, reserve0)
+
+            onchain_info["liquidity_base"] = reserve_base
+            onchain_info["liquidity_usd"] = reserve_base * onchain_info["price_usd"] + reserve_quote * quote_price_usd
+
+        return onchain_info
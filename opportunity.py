@@ -0,0 +1,221 @@
+"""
+Modul tipe data peluang arbitrase.
+
+Setiap peluang dari Skenario 1-3 disimpan sebagai Opportunity: objek
+__slots__ yang tidak dapat diubah dengan kumpulan field tetap per skenario.
+Dibanding dict dengan ~18 key, objek ini jauh lebih kecil di memori dan
+pengurutan berdasarkan atribut (misalnya profit_percentage) lebih murah.
+
+Opportunity tetap bisa dibaca seperti dict (opp["token"], opp.get(...),
+"liquidity" in opp, dict(opp)), sehingga lapisan output dan sink tidak perlu
+tahu perbedaannya. Field opsional yang tidak diisi tidak muncul sebagai key.
+"""
+
+import json
+from collections.abc import Mapping
+from typing import Dict, Any, Iterator, Tuple, Union
+
+# Field yang dimiliki semua skenario
+COMMON_FIELDS = (
+    "scenario",
+    "token",
+    "buy_platform",
+    "buy_price",
+    "sell_platform",
+    "sell_price",
+    "price_diff_percentage",
+    "buy_fee_percentage",
+    "sell_fee_percentage",
+    "gas_cost",
+    "net_profit",
+    "profit_percentage",
+    "timestamp",
+)
+
+# Field wajib tambahan per skenario
+SCENARIO_FIELDS = {
+    1: COMMON_FIELDS + ("network", "token_address", "liquidity", "cex_last_price", "cex_fill_complete"),
+    2: COMMON_FIELDS + ("network", "token_address", "buy_liquidity", "sell_liquidity", "buy_pair_address", "sell_pair_address"),
+    3: COMMON_FIELDS + ("bridge_fee_percentage", "buy_chain", "sell_chain", "buy_liquidity", "sell_liquidity"),
+}
+
+# Field opsional: kedalaman order book (Skenario 1) dan ukuran trade optimal (diisi setelah sizing)
+OPTIONAL_FIELDS = {
+    1: ("cex_max_size", "cex_max_notional_usd", "optimal_trade_usd", "expected_profit_usd", "price_impact_percentage"),
+    2: ("optimal_trade_usd", "expected_profit_usd", "price_impact_percentage"),
+    3: ("optimal_trade_usd", "expected_profit_usd", "price_impact_percentage"),
+}
+
+# Urutan field untuk iterasi dan serialisasi
+_FIELD_ORDER = {scenario: SCENARIO_FIELDS[scenario] + OPTIONAL_FIELDS[scenario] for scenario in SCENARIO_FIELDS}
+
+_ALL_FIELDS = tuple(sorted({field for fields in _FIELD_ORDER.values() for field in fields}))
+
+class Opportunity(Mapping):
+    """
+    Peluang arbitrase yang tidak dapat diubah, dengan akses baca seperti dict.
+    """
+
+    __slots__ = _ALL_FIELDS
+
+    def __init__(self, **fields: Any):
+        """
+        Membuat peluang dari field-fieldnya.
+
+        Field opsional bernilai None dianggap tidak diisi.
+
+        Args:
+            **fields: Field peluang (scenario wajib ada)
+
+        Raises:
+            ValueError: Jika skenario tidak dikenal
+            TypeError: Jika field wajib tidak ada atau ada field yang tidak dikenal
+        """
+        scenario = fields.get("scenario")
+
+        if scenario not in SCENARIO_FIELDS:
+            raise ValueError(f"Skenario peluang tidak dikenal: {scenario}")
+
+        required = SCENARIO_FIELDS[scenario]
+        optional = OPTIONAL_FIELDS[scenario]
+
+        missing = [field for field in required if field not in fields]
+        if missing:
+            raise TypeError(f"Field peluang Skenario {scenario} tidak lengkap: {', '.join(missing)}")
+
+        for field, value in fields.items():
+            if field in optional:
+                if value is None:
+                    continue
+            elif field not in required:
+                raise TypeError(f"Field tidak dikenal untuk peluang Skenario {scenario}: {field}")
+
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("Opportunity tidak dapat diubah, gunakan replace()")
+
+    def __delattr__(self, name: str):
+        raise AttributeError("Opportunity tidak dapat diubah, gunakan replace()")
+
+    def _fields(self) -> Tuple[str, ...]:
+        return _FIELD_ORDER[self.scenario]
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _FIELD_ORDER[self.scenario]:
+            raise KeyError(key)
+
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        for field in self._fields():
+            if hasattr(self, field):
+                yield field
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and key in _FIELD_ORDER[self.scenario] and hasattr(self, key)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Opportunity):
+            return self.to_dict() == other.to_dict()
+
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Opportunity({', '.join(f'{key}={value!r}' for key, value in self.items())})"
+
+    def __reduce__(self):
+        return (_from_fields, (self.to_dict(),))
+
+    def replace(self, **changes: Any) -> "Opportunity":
+        """
+        Membuat salinan peluang dengan sebagian field diganti.
+
+        Args:
+            **changes: Field yang diganti atau ditambahkan
+
+        Returns:
+            Instance Opportunity baru
+        """
+        fields = self.to_dict()
+        fields.update(changes)
+        return Opportunity(**fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Mengubah peluang menjadi dict (hanya field yang diisi).
+
+        Returns:
+            Dict field peluang
+        """
+        return {field: getattr(self, field) for field in self._fields() if hasattr(self, field)}
+
+    def to_json(self) -> str:
+        """
+        Serialisasi peluang sebagai JSON ringkas.
+
+        Returns:
+            String JSON
+        """
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Opportunity":
+        """
+        Membuat peluang dari dict (misalnya baris snapshot NDJSON).
+
+        Key yang bukan field peluang skenario tersebut (misalnya op pada
+        snapshot delta) diabaikan.
+
+        Args:
+            data: Dict field peluang
+
+        Returns:
+            Instance Opportunity
+        """
+        scenario = int(data.get("scenario", 0))
+        fields = _FIELD_ORDER.get(scenario, ())
+        return cls(scenario=scenario, **{key: value for key, value in data.items() if key in fields and key != "scenario"})
+
+    @classmethod
+    def from_json(cls, data: Union[str, bytes]) -> "Opportunity":
+        """
+        Membuat peluang dari JSON hasil to_json.
+
+        Args:
+            data: String atau bytes JSON
+
+        Returns:
+            Instance Opportunity
+        """
+        return cls.from_dict(json.loads(data))
+
+def _from_fields(fields: Dict[str, Any]) -> Opportunity:
+    # Dipakai pickle/copy karena __setattr__ diblokir
+    return Opportunity(**fields)
+
+def to_serializable(obj: Any) -> Any:
+    """
+    Hook default untuk json.dumps/msgpack.packb agar Opportunity bisa diserialisasi.
+
+    Args:
+        obj: Objek yang tidak dikenal encoder
+
+    Returns:
+        Dict field peluang
+
+    Raises:
+        TypeError: Jika objek bukan Opportunity
+    """
+    if isinstance(obj, Opportunity):
+        return obj.to_dict()
+
+    raise TypeError(f"Objek bertipe {type(obj).__name__} tidak dapat diserialisasi")
@@ -1,22 +1,23 @@
 """
 Modul untuk output dan pelaporan menggunakan rich.
+
+rich hanya diimport saat output console benar-benar dirender.
 """
 
+import heapq
+import io
 import logging
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from datetime import datetime
-import json
 
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.box import ROUNDED
-from rich.theme import Theme
+import config
+from opportunity import Opportunity
 
 logger = logging.getLogger("arbitrage.output")
 
-# Tema kustom untuk output
-custom_theme = Theme({
+# Tema kustom untuk output (objek Theme dibuat bersama console)
+CUSTOM_THEME_STYLES = {
     "info": "dim cyan",
     "warning": "yellow",
     "error": "bold red",
@@ -29,15 +30,44 @@ custom_theme = Theme({
     "subtitle": "italic cyan",
     "header": "bold magenta",
     "timestamp": "dim yellow",
-})
+}
+
+# Console rich dibuat saat pertama kali dibutuhkan
+_console = None
+
+def get_console():
+    """
+    Mendapatkan console rich, dibuat (dan rich diimport) saat pertama kali diminta.
+
+    Returns:
+        Instance rich.console.Console
+    """
+    global _console
+
+    if _console is None:
+        from rich.console import Console
+        from rich.theme import Theme
 
-# Inisialisasi console
-console = Console(theme=custom_theme)
+        _console = Console(theme=Theme(CUSTOM_THEME_STYLES))
+
+    return _console
+
+def __getattr__(name: str) -> Any:
+    # Kompatibilitas: `output.console` tetap berfungsi
+    if name == "console":
+        return get_console()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def print_header():
     """
     Mencetak header program.
     """
+    from rich.panel import Panel
+    from rich.box import ROUNDED
+
+    console = get_console()
+
     console.print("\n")
     console.print(Panel.fit(
         "[title]CRYPTO ARBITRAGE SCANNER[/title]\n"
@@ -54,6 +84,8 @@ def print_scenario_description(scenario: int):
     Args:
         scenario: Nomor skenario
     """
+    console = get_console()
+
     if scenario == 1:
         description = "DEX - CEX, Sama Jaringan"
     elif scenario == 2:
@@ -66,7 +98,7 @@ def print_scenario_description(scenario: int):
     console.print(f"[header]Skenario {scenario}: {description}[/header]")
     console.print("\n")
 
-def print_opportunities(opportunities: List[Dict[str, Any]], scenario: int):
+def print_opportunities(opportunities: List[Opportunity], scenario: int):
     """
     Mencetak daftar peluang arbitrase.
 
@@ -74,6 +106,11 @@ def print_opportunities(opportunities: List[Dict[str, Any]], scenario: int):
         opportunities: Daftar peluang arbitrase
         scenario: Nomor skenario
     """
+    from rich.table import Table
+    from rich.box import ROUNDED
+
+    console = get_console()
+
     if not opportunities:
         console.print("[warning]Tidak ada peluang arbitrase yang ditemukan.[/warning]")
         console.print("\n")
@@ -139,7 +176,7 @@ def print_opportunities(opportunities: List[Dict[str, Any]], scenario: int):
     console.print(table)
     console.print("\n")
 
-def generate_verification_links(opportunity: Dict[str, Any], scenario: int) -> str:
+def generate_verification_links(opportunity: Opportunity, scenario: int) -> str:
     """
     Menghasilkan link untuk verifikasi manual peluang arbitrase.
 
@@ -226,13 +263,19 @@ def generate_verification_links(opportunity: Dict[str, Any], scenario: int) -> s
     return " | ".join(links)
 
 
-def print_opportunity_details(opportunity: Dict[str, Any]):
+def print_opportunity_details(opportunity: Opportunity):
     """
     Mencetak detail peluang arbitrase.
 
     Args:
         opportunity: Detail peluang arbitrase
     """
+    from rich.table import Table
+    from rich.panel import Panel
+    from rich.box import ROUNDED
+
+    console = get_console()
+
     scenario = opportunity["scenario"]
 
     console.print(Panel.fit(
@@ -270,8 +313,13 @@ def print_opportunity_details(opportunity: Dict[str, Any]):
     table.add_row("Biaya Beli", f"{opportunity['buy_fee_percentage']:.2f}%", "")
     table.add_row("Biaya Jual", f"{opportunity['sell_fee_percentage']:.2f}%", "")
     table.add_row("Biaya Gas", f"{opportunity['gas_cost']:.6f} USD", "")
-    table.add_row("Keuntungan Bersih", f"{opportunity['net_profit']:.6f} USD (untuk 1 token)", "")
+    table.add_row("Keuntungan Bersih", f"{opportunity['net_profit']:.6f} USD (untuk 1 token, termasuk porsi gas)", "")
     table.add_row("Persentase Keuntungan", f"{opportunity['profit_percentage']:.2f}%", "")
+
+    if "optimal_trade_usd" in opportunity:
+        table.add_row("Ukuran Trade Optimal", f"{opportunity['optimal_trade_usd']:,.2f} USD", "")
+        table.add_row("Profit Dapat Dieksekusi", f"{opportunity['expected_profit_usd']:,.2f} USD", "")
+        table.add_row("Dampak Harga", f"{opportunity['price_impact_percentage']:.2f}%", "")
     table.add_row("Timestamp", opportunity["timestamp"], "")
 
     if "network" in opportunity:
@@ -306,13 +354,19 @@ def print_opportunity_details(opportunity: Dict[str, Any]):
     console.print(table)
     console.print("\n")
 
-def print_summary(results: Dict[int, List[Dict[str, Any]]]):
+def print_summary(results: Dict[int, List[Opportunity]]):
     """
     Mencetak ringkasan hasil pemindaian.
 
     Args:
         results: Dict dengan skenario sebagai key dan daftar peluang sebagai value
     """
+    from rich.table import Table
+    from rich.panel import Panel
+    from rich.box import ROUNDED
+
+    console = get_console()
+
     console.print(Panel.fit(
         "[title]RINGKASAN HASIL PEMINDAIAN[/title]",
         border_style="blue",
@@ -346,8 +400,8 @@ def print_summary(results: Dict[int, List[Dict[str, Any]]]):
 
         if count > 0:
             # Urutkan berdasarkan profit_percentage (descending)
-            sorted_opps = sorted(opportunities, key=lambda x: x["profit_percentage"], reverse=True)
-            highest_profit = f"{sorted_opps[0]['profit_percentage']:.2f}%"
+            sorted_opps = sorted(opportunities, key=lambda x: x.profit_percentage, reverse=True)
+            highest_profit = f"{sorted_opps[0].profit_percentage:.2f}%"
         else:
             highest_profit = "N/A"
 
@@ -366,44 +420,78 @@ def print_summary(results: Dict[int, List[Dict[str, Any]]]):
     console.print(f"[timestamp]Pemindaian selesai pada: {timestamp}[/timestamp]")
     console.print("\n")
 
-def save_opportunities_to_file(results: Dict[int, List[Dict[str, Any]]], filename: str = "arbitrage_opportunities.json"):
+def write_opportunities_json(results: Dict[int, List[Opportunity]], filename: str):
     """
-    Menyimpan peluang arbitrase ke file.
+    Menulis peluang arbitrase ke file JSON (ringkas, atomik).
 
     Args:
         results: Dict dengan skenario sebagai key dan daftar peluang sebagai value
         filename: Nama file
     """
-    try:
-        # Konversi Decimal ke float untuk JSON serialization
-        data = {}
+    from snapshot import atomic_write, encode_json
 
-        for scenario, opportunities in results.items():
-            data[str(scenario)] = opportunities
+    # Konversi Decimal ke float untuk JSON serialization
+    data = {}
+
+    for scenario, opportunities in results.items():
+        data[str(scenario)] = opportunities
+
+    atomic_write(filename, encode_json(data))
+
+def write_whatsapp_text(message: str, filename: str):
+    """
+    Menulis pesan WhatsApp ke file teks.
+
+    Args:
+        message: Pesan WhatsApp yang sudah dirender
+        filename: Nama file
+    """
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(message)
+
+def save_opportunities_to_file(results: Dict[int, List[Opportunity]], filename: str = "arbitrage_opportunities.json",
+                               whatsapp_message: Optional[str] = None):
+    """
+    Menyimpan peluang arbitrase ke file.
 
-        with open(filename, "w") as f:
-            json.dump(data, f, indent=4)
+    Args:
+        results: Dict dengan skenario sebagai key dan daftar peluang sebagai value
+        filename: Nama file
+        whatsapp_message: Pesan WhatsApp yang sudah dirender (dirender ulang jika None)
+    """
+    try:
+        write_opportunities_json(results, filename)
 
         # Simpan juga format WhatsApp ke file teks
-        whatsapp_message = format_whatsapp_message(results)
-        whatsapp_filename = "arbitrage_whatsapp.txt"
+        if whatsapp_message is None:
+            whatsapp_message = format_whatsapp_message(results)
+        whatsapp_filename = config.OUTPUT_SINKS["text_file"]
 
-        with open(whatsapp_filename, "w", encoding="utf-8") as f:
-            f.write(whatsapp_message)
+        write_whatsapp_text(whatsapp_message, whatsapp_filename)
 
         logger.info(f"Peluang arbitrase berhasil disimpan ke {filename}")
         logger.info(f"Format WhatsApp berhasil disimpan ke {whatsapp_filename}")
-        console.print(f"[success]Peluang arbitrase berhasil disimpan ke {filename}[/success]")
-        console.print(f"[success]Format WhatsApp berhasil disimpan ke {whatsapp_filename}[/success]")
+
+        if config.OUTPUT_CONFIG["console_output"]:
+            console = get_console()
+            console.print(f"[success]Peluang arbitrase berhasil disimpan ke {filename}[/success]")
+            console.print(f"[success]Format WhatsApp berhasil disimpan ke {whatsapp_filename}[/success]")
 
     except Exception as e:
         logger.error(f"Gagal menyimpan peluang arbitrase ke file: {str(e)}")
-        console.print(f"[error]Gagal menyimpan peluang arbitrase ke file: {str(e)}[/error]")
+
+        if config.OUTPUT_CONFIG["console_output"]:
+            get_console().print(f"[error]Gagal menyimpan peluang arbitrase ke file: {str(e)}[/error]")
 
 def add_validation_warning():
     """
     Menambahkan peringatan validasi untuk hasil arbitrase.
     """
+    from rich.panel import Panel
+    from rich.box import ROUNDED
+
+    console = get_console()
+
     console.print(Panel.fit(
         "[warning]⚠️ PERINGATAN VALIDASI ⚠️[/warning]\n\n"
         "Hasil yang ditampilkan mungkin tidak mencerminkan peluang arbitrase yang valid karena:\n"
@@ -417,364 +505,433 @@ def add_validation_warning():
     ))
     console.print("\n")
 
-def format_whatsapp_message(results: Dict[int, List[Dict[str, Any]]]) -> str:
+# Stablecoin yang memakai kriteria validasi khusus di pesan WhatsApp
+WHATSAPP_STABLECOINS = ("USDT", "USDC", "DAI", "BUSD")
+
+# Template link swap per (dex, jaringan, sisi); jaringan "*" berlaku untuk semua jaringan
+DEX_LINK_TEMPLATES = {
+    ("uniswap", "ethereum", "buy"): "https://app.uniswap.org/#/swap?inputCurrency=ETH&outputCurrency={token_address}",
+    ("uniswap", "polygon", "buy"): "https://app.uniswap.org/#/swap?chain=polygon&inputCurrency=MATIC&outputCurrency={token_address}",
+    ("uniswap", "*", "buy"): "https://app.uniswap.org/#/swap",
+    ("sushiswap", "*", "buy"): "https://www.sushi.com/swap?inputCurrency=ETH&outputCurrency={token_address}",
+    ("pancakeswap", "bsc", "buy"): "https://pancakeswap.finance/swap?inputCurrency=BNB&outputCurrency={token_address}",
+    ("pancakeswap", "*", "buy"): "https://pancakeswap.finance/swap",
+    ("quickswap", "polygon", "buy"): "https://quickswap.exchange/#/swap?inputCurrency=MATIC&outputCurrency={token_address}",
+    ("balancer", "*", "buy"): "https://app.balancer.fi/#/trade",
+    ("curve", "*", "buy"): "https://curve.fi/#/ethereum/swap",
+    ("uniswap", "ethereum", "sell"): "https://app.uniswap.org/#/swap?inputCurrency={token_address}&outputCurrency=ETH",
+    ("uniswap", "polygon", "sell"): "https://app.uniswap.org/#/swap?chain=polygon&inputCurrency={token_address}&outputCurrency=MATIC",
+    ("uniswap", "*", "sell"): "https://app.uniswap.org/#/swap",
+    ("sushiswap", "*", "sell"): "https://www.sushi.com/swap?inputCurrency={token_address}&outputCurrency=ETH",
+    ("pancakeswap", "bsc", "sell"): "https://pancakeswap.finance/swap?inputCurrency={token_address}&outputCurrency=BNB",
+    ("pancakeswap", "*", "sell"): "https://pancakeswap.finance/swap",
+    ("quickswap", "polygon", "sell"): "https://quickswap.exchange/#/swap?inputCurrency={token_address}&outputCurrency=MATIC",
+    ("balancer", "*", "sell"): "https://app.balancer.fi/#/trade",
+    ("curve", "*", "sell"): "https://curve.fi/#/ethereum/swap",
+    ("apeswap", "bsc", "sell"): "https://apeswap.finance/swap?inputCurrency={token_address}&outputCurrency=BNB",
+    ("biswap", "bsc", "sell"): "https://exchange.biswap.org/#/swap?inputCurrency={token_address}&outputCurrency=BNB",
+    ("bakeryswap", "bsc", "sell"): "https://www.bakeryswap.org/#/swap?inputCurrency={token_address}&outputCurrency=BNB",
+    ("knightswap", "bsc", "sell"): "https://knight.knightswap.financial/#/swap?inputCurrency={token_address}&outputCurrency=BNB",
+    ("dooar", "polygon", "sell"): "https://app.dooar.com/swap?inputCurrency={token_address}&outputCurrency=MATIC",
+}
+
+# Link jika DEX tidak ada di tabel
+DEFAULT_LINK_TEMPLATES = {
+    "buy": "https://dexscreener.com/search?q={token}",
+    "sell": "https://dexscreener.com/{network}/{token_address} ⚠️ *Verifikasi manual diperlukan*",
+}
+
+# Explorer token per jaringan: (nama, URL dasar)
+EXPLORER_LINKS = {
+    "ethereum": ("Etherscan", "https://etherscan.io/token/"),
+    "bsc": ("BSCScan", "https://bscscan.com/token/"),
+    "polygon": ("PolygonScan", "https://polygonscan.com/token/"),
+}
+
+# Tips per DEX, dipilih yang pertama cocok dengan DEX beli atau jual
+DEX_TIPS = (
+    ("uniswap", "      • Set gas ke 'High' di Uniswap untuk eksekusi cepat\n"
+                "      • Gunakan fitur 'Infinite Approval' untuk transaksi cepat\n"),
+    ("pancakeswap", "      • Set slippage 1% di PancakeSwap untuk token stablecoin\n"
+                    "      • Gunakan BNB Smart Chain untuk biaya gas rendah\n"),
+    ("quickswap", "      • Polygon memiliki gas fee rendah, tapi pastikan ada MATIC untuk gas\n"
+                  "      • QuickSwap memiliki likuiditas tinggi untuk stablecoin\n"),
+)
+
+# Bagian statis di akhir pesan (peringatan, panduan DEX, simulasi), dibuat sekali saat import
+WHATSAPP_FOOTER = (
+    "⚠️ *PERINGATAN & TIPS VERIFIKASI* ⚠️\n"
+    "1. Selalu verifikasi harga dan likuiditas secara manual sebelum melakukan transaksi\n"
+    "2. Periksa slippage dan biaya gas untuk memastikan transaksi tetap menguntungkan\n"
+    "3. Gunakan link BELI dan JUAL untuk memeriksa harga real-time di DEX\n"
+    "4. Peluang arbitrase biasanya hanya bertahan dalam hitungan detik\n"
+    "5. Pastikan token memiliki likuiditas yang cukup untuk masuk dan keluar posisi\n"
+    "6. Untuk DEX yang tidak memiliki link langsung, gunakan DEX Screener untuk verifikasi\n"
+    "7. Periksa riwayat harga token untuk memastikan bukan manipulasi harga sementara\n"
+
+    # Panduan cara beli dan jual di berbagai DEX
+    "\n💳 *PANDUAN TRANSAKSI DI BERBAGAI DEX* 💳\n"
+    "*Uniswap (Ethereum/Polygon):*\n"
+    "- Beli: Connect wallet → Pilih token → Input jumlah → Set slippage (0.5-1%) → Swap\n"
+    "- Jual: Connect wallet → Pilih token → Reverse pair → Set slippage → Swap\n"
+    "- Gas fee: ~$5-20 (Ethereum), ~$0.01-0.1 (Polygon)\n\n"
+
+    "*PancakeSwap (BSC):*\n"
+    "- Beli: Connect wallet → Pilih token → Input jumlah → Set slippage (0.5-1%) → Swap\n"
+    "- Jual: Connect wallet → Pilih token → Reverse pair → Set slippage → Swap\n"
+    "- Gas fee: ~$0.10-0.30\n\n"
+
+    "*SushiSwap (Multi-chain):*\n"
+    "- Beli: Connect wallet → Pilih token → Input jumlah → Set slippage (0.5-1%) → Swap\n"
+    "- Jual: Connect wallet → Pilih token → Reverse pair → Set slippage → Swap\n"
+    "- Gas fee: Bervariasi berdasarkan chain\n\n"
+
+    "*QuickSwap (Polygon):*\n"
+    "- Beli: Connect wallet → Pilih token → Input jumlah → Set slippage (0.5-1%) → Swap\n"
+    "- Jual: Connect wallet → Pilih token → Reverse pair → Set slippage → Swap\n"
+    "- Gas fee: ~$0.01-0.1\n\n"
+
+    "*Curve (Ethereum):*\n"
+    "- Beli: Connect wallet → Pilih pool → Input jumlah → Set slippage → Swap\n"
+    "- Jual: Connect wallet → Pilih pool → Reverse pair → Set slippage → Swap\n"
+    "- Gas fee: ~$5-20\n\n"
+
+    # Simulasi modal dan keuntungan
+    "\n💰 *SIMULASI MODAL & KEUNTUNGAN* 💰\n"
+    "*Modal Optimal:*\n"
+    "- Dihitung per peluang dari likuiditas pool (model AMM)\n"
+    "- Rp 5.000.000 (stablecoin) / Rp 10.000.000 (token lainnya) jika data pool tidak tersedia\n\n"
+
+    "*Estimasi Keuntungan per Transaksi:*\n"
+    "- Stablecoin: 0.5-3% (Rp 25.000 - Rp 150.000)\n"
+    "- Token lainnya: 1-15% (Rp 100.000 - Rp 1.500.000)\n\n"
+
+    "*Biaya yang Perlu Diperhitungkan:*\n"
+    "- Gas fee: Rp 75.000 - Rp 300.000 (Ethereum), Rp 1.500 - Rp 4.500 (BSC/Polygon)\n"
+    "- Slippage: sesuai dampak harga di pool (model AMM), default 0.5-1% dari nilai transaksi\n"
+    "- Trading fee: 0.3-1% dari nilai transaksi (Rp 15.000 - Rp 100.000)\n\n"
+
+    "*Keuntungan Bersih Estimasi:*\n"
+    "- Stablecoin: Rp 0 - Rp 50.000 per transaksi (setelah fee)\n"
+    "- Token lainnya: Rp 50.000 - Rp 1.000.000 per transaksi (setelah fee)\n"
+)
+
+def dex_link(dex: str, network: str, side: str, token: str, token_address: str) -> str:
+    """
+    Mendapatkan link swap DEX dari tabel template.
+
+    Args:
+        dex: Nama DEX (huruf kecil)
+        network: Nama jaringan
+        side: "buy" atau "sell"
+        token: Simbol token
+        token_address: Alamat token
+
+    Returns:
+        URL swap (atau link DEX Screener jika DEX tidak dikenal)
+    """
+    template = DEX_LINK_TEMPLATES.get((dex, network, side)) or DEX_LINK_TEMPLATES.get((dex, "*", side)) or DEFAULT_LINK_TEMPLATES[side]
+    return template.format(token=token, token_address=token_address, network=network)
+
+def classify_whatsapp_opportunity(opp: Opportunity) -> Tuple[bool, bool]:
+    """
+    Memeriksa apakah peluang cukup realistis untuk dimasukkan ke pesan WhatsApp.
+
+    Args:
+        opp: Detail peluang arbitrase
+
+    Returns:
+        Tuple (valid, stablecoin terverifikasi)
+    """
+    # Filter peluang dengan kriteria yang lebih ketat untuk memastikan validitas
+    buy_price = opp.get("buy_price", 1.0)
+    sell_price = opp.get("sell_price", 1.0)
+    profit_percentage = opp["profit_percentage"]
+
+    # Kriteria filter yang lebih ketat dan realistis untuk stablecoin
+    if opp.get("token", "").upper() in WHATSAPP_STABLECOINS:
+        # Untuk stablecoin, harga seharusnya mendekati $1
+        # Hanya terima peluang jika harga beli > 0.95 dan harga jual < 1.05
+        valid_stablecoin = (buy_price > 0.95 and sell_price < 1.05 and
+                            # Profit untuk stablecoin biasanya kecil (0.5% - 3%)
+                            0.5 <= profit_percentage <= 3.0 and
+                            # Pastikan likuiditas sangat tinggi untuk stablecoin
+                            (opp.get("liquidity", 0) > 100000 or
+                             (opp.get("buy_liquidity", 0) > 100000 and opp.get("sell_liquidity", 0) > 100000)) and
+                            # Pastikan token memiliki alamat yang valid
+                            opp.get("token_address", "") != "" and
+                            # Pastikan platform beli dan jual dikenal
+                            opp.get("buy_platform", "") != "unknown" and
+                            opp.get("sell_platform", "") != "unknown")
+
+        return valid_stablecoin, valid_stablecoin
+
+    # Untuk token non-stablecoin
+    valid_opportunity = (
+        # Profit harus realistis (antara 0.5% dan 15%)
+        0.5 <= profit_percentage <= 15.0 and
+        # Harga beli harus cukup signifikan untuk menghindari token sampah
+        buy_price > 0.01 and
+        # Pastikan rasio harga jual/beli tidak terlalu ekstrim (max 20% perbedaan)
+        (sell_price / buy_price) < 1.2 and
+        # Pastikan likuiditas cukup untuk transaksi yang menguntungkan
+        (opp.get("liquidity", 0) > 50000 or
+         (opp.get("buy_liquidity", 0) > 50000 and opp.get("sell_liquidity", 0) > 50000)) and
+        # Pastikan token memiliki alamat yang valid
+        opp.get("token_address", "") != "" and
+        # Pastikan platform beli dan jual dikenal
+        opp.get("buy_platform", "") != "unknown" and
+        opp.get("sell_platform", "") != "unknown")
+
+    return valid_opportunity, False
+
+class WhatsAppRenderer:
+    """
+    Perender pesan WhatsApp dengan buffer yang dipakai ulang setiap siklus.
+
+    Peluang hasil pemindaian tidak diubah; hanya 5 peluang teratas yang
+    disimpan selama render sehingga memori tidak bergantung pada jumlah peluang.
+    Render dilindungi lock karena buffer dipakai bersama oleh thread sink.
+    """
+
+    def __init__(self, top_limit: int = 5):
+        """
+        Inisialisasi perender.
+
+        Args:
+            top_limit: Jumlah peluang teratas yang ditampilkan
+        """
+        self.top_limit = top_limit
+        self.usd_to_idr_rate = 15500  # Kurs USD ke IDR
+        self._buffer = io.StringIO()
+        self._lock = threading.Lock()
+
+    def render(self, results: Dict[int, List[Opportunity]], timestamp: Optional[datetime] = None) -> str:
+        """
+        Format hasil pemindaian untuk WhatsApp.
+
+        Args:
+            results: Dict dengan skenario sebagai key dan daftar peluang sebagai value
+            timestamp: Waktu pemindaian (default: sekarang)
+
+        Returns:
+            Pesan yang diformat untuk WhatsApp
+        """
+        with self._lock:
+            return self._render(results, timestamp or datetime.now())
+
+    def _render(self, results: Dict[int, List[Opportunity]], timestamp: datetime) -> str:
+        buffer = self._buffer
+        buffer.seek(0)
+        buffer.truncate()
+        write = buffer.write
+
+        write("🚀 *CRYPTO ARBITRAGE ALERT* 🚀\n\n")
+        write("⏰ *" + timestamp.strftime("%Y-%m-%d %H:%M:%S") + "*\n\n")
+
+        # Filter peluang yang tidak realistis; hanya peluang teratas yang disimpan
+        total_original = 0
+        total_filtered = 0
+        valid_opportunities = []
+
+        for scenario, opportunities in results.items():
+            total_original += len(opportunities)
+
+            for opp in opportunities:
+                valid, verified = classify_whatsapp_opportunity(opp)
+
+                if valid:
+                    total_filtered += 1
+                    valid_opportunities.append((scenario, opp, verified))
+
+                    # Buang kandidat di luar peringkat teratas agar daftar tetap kecil
+                    if len(valid_opportunities) > self.top_limit * 4:
+                        valid_opportunities = heapq.nlargest(self.top_limit, valid_opportunities, key=lambda x: x[1].profit_percentage)
+
+        # Tambahkan ringkasan
+        write(f"📊 *Ringkasan:* {total_filtered} peluang arbitrase valid ditemukan dari total {total_original}\n\n")
+
+        # Urutkan berdasarkan profit_percentage (descending), urutan asli dipertahankan untuk nilai sama
+        top_opportunities = heapq.nlargest(self.top_limit, valid_opportunities, key=lambda x: x[1].profit_percentage)
+
+        if top_opportunities:
+            write("🔥 *TOP 5 PELUANG ARBITRASE* 🔥\n\n")
+
+            for i, (scenario, opp, verified) in enumerate(top_opportunities, 1):
+                self._write_opportunity(write, i, scenario, opp, verified)
+
+        # Tambahkan peringatan, panduan dan simulasi (statis)
+        write(WHATSAPP_FOOTER)
+
+        return buffer.getvalue()
+
+    def _write_opportunity(self, write: Callable[[str], Any], i: int, scenario: int, opp: Opportunity, verified: bool):
+        token = opp["token"]
+        buy_platform = opp["buy_platform"]
+        sell_platform = opp["sell_platform"]
+        buy_price = opp["buy_price"]
+        sell_price = opp["sell_price"]
+        profit_percentage = opp["profit_percentage"]
+
+        # Tambahkan emoji berdasarkan profit dan status verifikasi
+        if verified:
+            emoji = "💰 ✅ *TERVERIFIKASI*"
+        elif profit_percentage > 5.0:
+            emoji = "💰💰💰 ⚠️ *VERIFIKASI DIPERLUKAN*"
+        elif profit_percentage > 2.0:
+            emoji = "💰💰 ⚠️ *VERIFIKASI DIPERLUKAN*"
+        elif profit_percentage > 1.0:
+            emoji = "💰 ⚠️ *VERIFIKASI DIPERLUKAN*"
+        else:
+            emoji = "💸 ⚠️ *VERIFIKASI DIPERLUKAN*"
+
+        # Hitung simulasi keuntungan dalam Rupiah
+        usd_to_idr_rate = self.usd_to_idr_rate
+
+        if opp.get("optimal_trade_usd", 0) > 0:
+            # Modal optimal dari model AMM (berdasarkan likuiditas pool)
+            modal_optimal_usd = opp["optimal_trade_usd"]
+            modal_optimal_idr = modal_optimal_usd * usd_to_idr_rate
+        elif token.upper() in WHATSAPP_STABLECOINS:
+            modal_optimal_idr = 5000000  # Rp 5 juta untuk stablecoin
+            modal_optimal_usd = modal_optimal_idr / usd_to_idr_rate
+        else:
+            modal_optimal_idr = 10000000  # Rp 10 juta untuk token lainnya
+            modal_optimal_usd = modal_optimal_idr / usd_to_idr_rate
+
+        # Hitung jumlah token yang bisa dibeli dan nilai jual kotor
+        token_amount = modal_optimal_usd / buy_price if buy_price > 0 else 0
+        sell_value_usd = token_amount * sell_price
+
+        # Biaya gas (USD) dari oracle gas; perkiraan kasar jika peluang tidak menyimpannya
+        if "gas_cost" in opp:
+            gas_fee_usd = opp["gas_cost"]
+        elif (opp.get("network") or "ethereum") == "ethereum":
+            gas_fee_usd = 10  # $10 untuk Ethereum
+        else:  # BSC atau Polygon
+            gas_fee_usd = 0.2  # $0.2 untuk BSC/Polygon
+
+        # Trading fee (0.3% untuk setiap transaksi)
+        trading_fee_buy = modal_optimal_usd * 0.003
+        trading_fee_sell = sell_value_usd * 0.003
+
+        # Slippage dari dampak harga model AMM, atau 0.5% per transaksi jika tidak tersedia
+        if "price_impact_percentage" in opp:
+            slippage_usd = sell_value_usd * opp["price_impact_percentage"] / 100
+        else:
+            slippage_usd = modal_optimal_usd * 0.005 + sell_value_usd * 0.005
+
+        # Total biaya dan keuntungan bersih
+        total_fee_usd = gas_fee_usd + trading_fee_buy + trading_fee_sell + slippage_usd
+        profit_gross_usd = sell_value_usd - modal_optimal_usd
+        profit_net_usd = profit_gross_usd - total_fee_usd
+        profit_net_idr = profit_net_usd * usd_to_idr_rate
+
+        # Format untuk output
+        modal_optimal_idr_str = f"Rp {modal_optimal_idr:,.0f}"
+        profit_net_idr_str = f"Rp {profit_net_idr:,.0f}"
+
+        # Format pesan untuk setiap peluang
+        write(f"*{i}. {token}* {emoji}\n"
+              f"   Skenario: {scenario}\n"
+              f"   Beli: {buy_platform} (${buy_price:.6f})\n"
+              f"   Jual: {sell_platform} (${sell_price:.6f})\n"
+              f"   *Profit: {profit_percentage:.2f}%*\n")
+
+        # Tambahkan simulasi keuntungan
+        write(f"   💵 *Simulasi ({modal_optimal_idr_str}):*\n"
+              f"      Keuntungan Kotor: Rp {profit_gross_usd * usd_to_idr_rate:,.0f}\n"
+              f"      Total Biaya: Rp {total_fee_usd * usd_to_idr_rate:,.0f}\n"
+              f"      Keuntungan Bersih: {profit_net_idr_str}\n")
+
+        # Tambahkan likuiditas
+        if "buy_liquidity" in opp and "sell_liquidity" in opp:
+            write(f"   Likuiditas: ${min(opp['buy_liquidity'], opp['sell_liquidity']):,.2f}\n")
+        elif "liquidity" in opp:
+            write(f"   Likuiditas: ${opp['liquidity']:,.2f}\n")
+
+        # Pastikan network memiliki nilai default jika tidak tersedia
+        network = opp.get("network", "ethereum")
+        link_network = network if network else "ethereum"
+        token_address = opp.get("token_address", "")
+
+        # Tambahkan link explorer dan DEX Screener
+        if "token_address" in opp and link_network in EXPLORER_LINKS:
+            explorer_name, explorer_url = EXPLORER_LINKS[link_network]
+            write(f"   {explorer_name}: {explorer_url}{token_address}\n")
+
+        write(f"   DEX Screener: https://dexscreener.com/search?q={token}\n")
+
+        # Tambahkan link langsung ke DEX untuk BELI dan JUAL
+        buy_platform_name = buy_platform.split(" (")[0].lower()
+        sell_platform_name = sell_platform.split(" (")[0].lower()
+
+        write(f"   🟢 *BELI di {buy_platform_name.capitalize()}*: {dex_link(buy_platform_name, link_network, 'buy', token, token_address)}\n")
+        write(f"   🔴 *JUAL di {sell_platform_name.capitalize()}*: {dex_link(sell_platform_name, link_network, 'sell', token, token_address)}\n")
+
+        # Tambahkan langkah-langkah detail untuk melakukan arbitrase
+        write("\n   📍 *Langkah-langkah Arbitrase:*\n"
+              f"      1. Siapkan modal {modal_optimal_idr_str} di wallet {(network if network else 'unknown').upper()}\n"
+              f"      2. Buka link BELI di {buy_platform_name.capitalize()}\n"
+              f"      3. Connect wallet dan swap {modal_optimal_usd:.2f} USD ke {token}\n"
+              f"      4. Setelah transaksi selesai, buka link JUAL di {sell_platform_name.capitalize()}\n"
+              f"      5. Connect wallet dan swap {token_amount:.6f} {token} ke USD\n"
+              f"      6. Profit bersih estimasi: {profit_net_idr_str}\n")
+
+        # Tambahkan tips khusus berdasarkan DEX
+        write("\n   💡 *Tips Khusus:*\n")
+        for dex, tips in DEX_TIPS:
+            if buy_platform_name == dex or sell_platform_name == dex:
+                write(tips)
+                break
+
+        write("\n")
+
+# Perender dibuat saat pertama kali dibutuhkan
+_whatsapp_renderer = None
+
+def get_whatsapp_renderer() -> WhatsAppRenderer:
+    """
+    Mendapatkan instance WhatsAppRenderer bersama.
+
+    Returns:
+        Instance WhatsAppRenderer
+    """
+    global _whatsapp_renderer
+
+    if _whatsapp_renderer is None:
+        _whatsapp_renderer = WhatsAppRenderer()
+
+    return _whatsapp_renderer
+
+def format_whatsapp_message(results: Dict[int, List[Opportunity]], timestamp: Optional[datetime] = None) -> str:
     """
     Format hasil pemindaian untuk WhatsApp.
 
     Args:
         results: Dict dengan skenario sebagai key dan daftar peluang sebagai value
+        timestamp: Waktu pemindaian (default: sekarang)
 
     Returns:
         Pesan yang diformat untuk WhatsApp
     """
-    message = "🚀 *CRYPTO ARBITRAGE ALERT* 🚀\n\n"
-    message += "⏰ *" + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + "*\n\n"
+    return get_whatsapp_renderer().render(results, timestamp)
 
-    # Filter peluang yang tidak realistis
-    filtered_results = {}
-    for scenario, opportunities in results.items():
-        filtered_opps = []
-        for opp in opportunities:
-            # Filter peluang dengan kriteria yang lebih ketat untuk memastikan validitas
-            buy_price = opp.get("buy_price", 1.0)
-            sell_price = opp.get("sell_price", 1.0)
-            profit_percentage = opp["profit_percentage"]
-
-            # Kriteria filter yang lebih ketat dan realistis untuk stablecoin
-            token_name = opp.get("token", "")
-            is_stablecoin = token_name.upper() in ["USDT", "USDC", "DAI", "BUSD"]
-
-            # Jika token adalah stablecoin, gunakan filter khusus
-            if is_stablecoin:
-                # Untuk stablecoin, harga seharusnya mendekati $1
-                # Hanya terima peluang jika harga beli > 0.95 dan harga jual < 1.05
-                valid_stablecoin = (buy_price > 0.95 and sell_price < 1.05 and
-                                  # Profit untuk stablecoin biasanya kecil (0.5% - 3%)
-                                  0.5 <= profit_percentage <= 3.0 and
-                                  # Pastikan likuiditas sangat tinggi untuk stablecoin
-                                  (opp.get("liquidity", 0) > 100000 or
-                                   (opp.get("buy_liquidity", 0) > 100000 and opp.get("sell_liquidity", 0) > 100000)) and
-                                  # Pastikan token memiliki alamat yang valid
-                                  opp.get("token_address", "") != "" and
-                                  # Pastikan platform beli dan jual dikenal
-                                  opp.get("buy_platform", "") != "unknown" and
-                                  opp.get("sell_platform", "") != "unknown")
-
-                if valid_stablecoin:
-                    # Tambahkan flag untuk menandai ini peluang stablecoin terverifikasi
-                    opp["verified_stablecoin"] = True
-                    valid_opportunity = True
-                else:
-                    valid_opportunity = False
-            else:
-                # Untuk token non-stablecoin
-                valid_opportunity = (
-                    # Profit harus realistis (antara 0.5% dan 15%)
-                    0.5 <= profit_percentage <= 15.0 and
-                    # Harga beli harus cukup signifikan untuk menghindari token sampah
-                    buy_price > 0.01 and
-                    # Pastikan rasio harga jual/beli tidak terlalu ekstrim (max 20% perbedaan)
-                    (sell_price / buy_price) < 1.2 and
-                    # Pastikan likuiditas cukup untuk transaksi yang menguntungkan
-                    (opp.get("liquidity", 0) > 50000 or
-                     (opp.get("buy_liquidity", 0) > 50000 and opp.get("sell_liquidity", 0) > 50000)) and
-                    # Pastikan token memiliki alamat yang valid
-                    opp.get("token_address", "") != "" and
-                    # Pastikan platform beli dan jual dikenal
-                    opp.get("buy_platform", "") != "unknown" and
-                    opp.get("sell_platform", "") != "unknown")
-
-            if valid_opportunity:
-                filtered_opps.append(opp)
-        filtered_results[scenario] = filtered_opps
-
-    # Tambahkan ringkasan
-    total_opportunities_original = sum(len(opps) for opps in results.values())
-    total_opportunities_filtered = sum(len(opps) for opps in filtered_results.values())
-    message += f"📊 *Ringkasan:* {total_opportunities_filtered} peluang arbitrase valid ditemukan dari total {total_opportunities_original}\n\n"
-
-    # Tambahkan top 5 peluang dari semua skenario
-    all_opportunities = []
-    for scenario, opportunities in filtered_results.items():
-        for opp in opportunities:
-            opp["scenario_num"] = scenario
-            all_opportunities.append(opp)
-
-    # Urutkan berdasarkan profit_percentage (descending)
-    all_opportunities.sort(key=lambda x: x["profit_percentage"], reverse=True)
-
-    # Ambil top 5
-    top_opportunities = all_opportunities[:5]
-
-    if top_opportunities:
-        message += "🔥 *TOP 5 PELUANG ARBITRASE* 🔥\n\n"
-
-        for i, opp in enumerate(top_opportunities, 1):
-            scenario = opp["scenario_num"]
-            token = opp["token"]
-            buy_platform = opp["buy_platform"]
-            sell_platform = opp["sell_platform"]
-            buy_price = opp["buy_price"]
-            sell_price = opp["sell_price"]
-            profit_percentage = opp["profit_percentage"]
-
-            # Tambahkan emoji berdasarkan profit dan status verifikasi
-            if opp.get("verified_stablecoin", False):
-                emoji = "💰 ✅ *TERVERIFIKASI*"
-            elif profit_percentage > 5.0:
-                emoji = "💰💰💰 ⚠️ *VERIFIKASI DIPERLUKAN*"
-            elif profit_percentage > 2.0:
-                emoji = "💰💰 ⚠️ *VERIFIKASI DIPERLUKAN*"
-            elif profit_percentage > 1.0:
-                emoji = "💰 ⚠️ *VERIFIKASI DIPERLUKAN*"
-            else:
-                emoji = "💸 ⚠️ *VERIFIKASI DIPERLUKAN*"
-
-            # Hitung simulasi keuntungan dalam Rupiah
-            is_stablecoin = token.upper() in ["USDT", "USDC", "DAI", "BUSD"]
-            usd_to_idr_rate = 15500  # Kurs USD ke IDR
-
-            if is_stablecoin:
-                modal_optimal_idr = 5000000  # Rp 5 juta untuk stablecoin
-                modal_optimal_usd = modal_optimal_idr / usd_to_idr_rate
-            else:
-                modal_optimal_idr = 10000000  # Rp 10 juta untuk token lainnya
-                modal_optimal_usd = modal_optimal_idr / usd_to_idr_rate
-
-            # Hitung jumlah token yang bisa dibeli
-            token_amount = modal_optimal_usd / buy_price if buy_price > 0 else 0
-
-            # Hitung nilai jual kotor
-            sell_value_usd = token_amount * sell_price
-
-            # Hitung biaya gas dan fee
-            # Pastikan network memiliki nilai default jika tidak tersedia
-            network = opp.get("network", "ethereum")
-            network_name = network if network else "ethereum"
-            if network_name == "ethereum":
-                gas_fee_usd = 10  # $10 untuk Ethereum
-            else:  # BSC atau Polygon
-                gas_fee_usd = 0.2  # $0.2 untuk BSC/Polygon
-
-            # Trading fee (0.3% untuk setiap transaksi)
-            trading_fee_buy = modal_optimal_usd * 0.003
-            trading_fee_sell = sell_value_usd * 0.003
-
-            # Slippage (0.5% untuk setiap transaksi)
-            slippage_buy = modal_optimal_usd * 0.005
-            slippage_sell = sell_value_usd * 0.005
-
-            # Total biaya
-            total_fee_usd = gas_fee_usd + trading_fee_buy + trading_fee_sell + slippage_buy + slippage_sell
-
-            # Keuntungan bersih
-            profit_gross_usd = sell_value_usd - modal_optimal_usd
-            profit_net_usd = profit_gross_usd - total_fee_usd
-            profit_net_idr = profit_net_usd * usd_to_idr_rate
-
-            # Format untuk output
-            modal_optimal_idr_str = f"Rp {modal_optimal_idr:,.0f}"
-            profit_gross_idr_str = f"Rp {profit_gross_usd * usd_to_idr_rate:,.0f}"
-            total_fee_idr_str = f"Rp {total_fee_usd * usd_to_idr_rate:,.0f}"
-            profit_net_idr_str = f"Rp {profit_net_idr:,.0f}"
-
-            # Format pesan untuk setiap peluang
-            message += f"*{i}. {token}* {emoji}\n"
-            message += f"   Skenario: {scenario}\n"
-            message += f"   Beli: {buy_platform} (${buy_price:.6f})\n"
-            message += f"   Jual: {sell_platform} (${sell_price:.6f})\n"
-            message += f"   *Profit: {profit_percentage:.2f}%*\n"
-
-            # Tambahkan simulasi keuntungan
-            message += f"   💵 *Simulasi ({modal_optimal_idr_str}):*\n"
-            message += f"      Keuntungan Kotor: {profit_gross_idr_str}\n"
-            message += f"      Total Biaya: {total_fee_idr_str}\n"
-            message += f"      Keuntungan Bersih: {profit_net_idr_str}\n"
-
-            # Tambahkan likuiditas
-            if "buy_liquidity" in opp and "sell_liquidity" in opp:
-                min_liquidity = min(opp["buy_liquidity"], opp["sell_liquidity"])
-                message += f"   Likuiditas: ${min_liquidity:,.2f}\n"
-            elif "liquidity" in opp:
-                message += f"   Likuiditas: ${opp['liquidity']:,.2f}\n"
-
-            # Tambahkan link verifikasi
-            if "token_address" in opp:
-                # Pastikan network memiliki nilai default jika tidak tersedia
-                network = opp.get("network", "ethereum")
-                network_name = network if network else "ethereum"
-                if network_name == "ethereum":
-                    message += f"   Etherscan: https://etherscan.io/token/{opp['token_address']}\n"
-                elif network_name == "bsc":
-                    message += f"   BSCScan: https://bscscan.com/token/{opp['token_address']}\n"
-                elif network_name == "polygon":
-                    message += f"   PolygonScan: https://polygonscan.com/token/{opp['token_address']}\n"
-
-            # Tambahkan link DEX Screener
-            message += f"   DEX Screener: https://dexscreener.com/search?q={token}\n"
-
-            # Tambahkan link langsung ke DEX untuk BELI dan JUAL
-            buy_platform_name = opp["buy_platform"].split(" (")[0].lower()
-            sell_platform_name = opp["sell_platform"].split(" (")[0].lower()
-            # Pastikan network memiliki nilai default jika tidak tersedia
-            network = opp.get("network", "ethereum")
-            network_name = network if network else "ethereum"
-            token_address = opp.get('token_address', '')
-
-            # Link untuk platform pembelian (BELI)
-            message += f"   🟢 *BELI di {buy_platform_name.capitalize()}*: "
-            if buy_platform_name == "uniswap":
-                if network_name == "ethereum":
-                    message += f"https://app.uniswap.org/#/swap?inputCurrency=ETH&outputCurrency={token_address}\n"
-                elif network_name == "polygon":
-                    message += f"https://app.uniswap.org/#/swap?chain=polygon&inputCurrency=MATIC&outputCurrency={token_address}\n"
-                else:
-                    message += f"https://app.uniswap.org/#/swap\n"
-            elif buy_platform_name == "sushiswap":
-                message += f"https://www.sushi.com/swap?inputCurrency=ETH&outputCurrency={token_address}\n"
-            elif buy_platform_name == "pancakeswap":
-                if network_name == "bsc":
-                    message += f"https://pancakeswap.finance/swap?inputCurrency=BNB&outputCurrency={token_address}\n"
-                else:
-                    message += f"https://pancakeswap.finance/swap\n"
-            elif buy_platform_name == "quickswap" and network_name == "polygon":
-                message += f"https://quickswap.exchange/#/swap?inputCurrency=MATIC&outputCurrency={token_address}\n"
-            elif buy_platform_name == "balancer":
-                message += f"https://app.balancer.fi/#/trade\n"
-            elif buy_platform_name == "curve":
-                message += f"https://curve.fi/#/ethereum/swap\n"
-            else:
-                message += f"https://dexscreener.com/search?q={token}\n"
-
-            # Link untuk platform penjualan (JUAL)
-            message += f"   🔴 *JUAL di {sell_platform_name.capitalize()}*: "
-            if sell_platform_name == "uniswap":
-                if network_name == "ethereum":
-                    message += f"https://app.uniswap.org/#/swap?inputCurrency={token_address}&outputCurrency=ETH\n"
-                elif network_name == "polygon":
-                    message += f"https://app.uniswap.org/#/swap?chain=polygon&inputCurrency={token_address}&outputCurrency=MATIC\n"
-                else:
-                    message += f"https://app.uniswap.org/#/swap\n"
-            elif sell_platform_name == "sushiswap":
-                message += f"https://www.sushi.com/swap?inputCurrency={token_address}&outputCurrency=ETH\n"
-            elif sell_platform_name == "pancakeswap":
-                if network_name == "bsc":
-                    message += f"https://pancakeswap.finance/swap?inputCurrency={token_address}&outputCurrency=BNB\n"
-                else:
-                    message += f"https://pancakeswap.finance/swap\n"
-            elif sell_platform_name == "quickswap" and network_name == "polygon":
-                message += f"https://quickswap.exchange/#/swap?inputCurrency={token_address}&outputCurrency=MATIC\n"
-            elif sell_platform_name == "balancer":
-                message += f"https://app.balancer.fi/#/trade\n"
-            elif sell_platform_name == "curve":
-                message += f"https://curve.fi/#/ethereum/swap\n"
-            elif sell_platform_name == "apeswap" and network_name == "bsc":
-                message += f"https://apeswap.finance/swap?inputCurrency={token_address}&outputCurrency=BNB\n"
-            elif sell_platform_name == "biswap" and network_name == "bsc":
-                message += f"https://exchange.biswap.org/#/swap?inputCurrency={token_address}&outputCurrency=BNB\n"
-            elif sell_platform_name == "bakeryswap" and network_name == "bsc":
-                message += f"https://www.bakeryswap.org/#/swap?inputCurrency={token_address}&outputCurrency=BNB\n"
-            elif sell_platform_name == "knightswap" and network_name == "bsc":
-                message += f"https://knight.knightswap.financial/#/swap?inputCurrency={token_address}&outputCurrency=BNB\n"
-            elif sell_platform_name == "dooar" and network_name == "polygon":
-                message += f"https://app.dooar.com/swap?inputCurrency={token_address}&outputCurrency=MATIC\n"
-            else:
-                # Jika DEX tidak dikenal, berikan link ke DEX Screener dan tambahkan peringatan
-                # Pastikan network memiliki nilai default jika tidak tersedia
-                network_name = network if network else "ethereum"
-                message += f"https://dexscreener.com/{network_name}/{token_address} ⚠️ *Verifikasi manual diperlukan*\n"
-
-            # Tambahkan langkah-langkah detail untuk melakukan arbitrase
-            message += "\n   📍 *Langkah-langkah Arbitrase:*\n"
-            # Pastikan network memiliki nilai default jika tidak tersedia
-            network_name = network if network else "unknown"
-            message += f"      1. Siapkan modal {modal_optimal_idr_str} di wallet {network_name.upper()}\n"
-            message += f"      2. Buka link BELI di {buy_platform_name.capitalize()}\n"
-            message += f"      3. Connect wallet dan swap {modal_optimal_usd:.2f} USD ke {token}\n"
-            message += f"      4. Setelah transaksi selesai, buka link JUAL di {sell_platform_name.capitalize()}\n"
-            message += f"      5. Connect wallet dan swap {token_amount:.6f} {token} ke USD\n"
-            message += f"      6. Profit bersih estimasi: {profit_net_idr_str}\n"
-
-            # Tambahkan tips khusus berdasarkan DEX
-            message += "\n   💡 *Tips Khusus:*\n"
-            if buy_platform_name == "uniswap" or sell_platform_name == "uniswap":
-                message += "      • Set gas ke 'High' di Uniswap untuk eksekusi cepat\n"
-                message += "      • Gunakan fitur 'Infinite Approval' untuk transaksi cepat\n"
-            elif buy_platform_name == "pancakeswap" or sell_platform_name == "pancakeswap":
-                message += "      • Set slippage 1% di PancakeSwap untuk token stablecoin\n"
-                message += "      • Gunakan BNB Smart Chain untuk biaya gas rendah\n"
-            elif buy_platform_name == "quickswap" or sell_platform_name == "quickswap":
-                message += "      • Polygon memiliki gas fee rendah, tapi pastikan ada MATIC untuk gas\n"
-                message += "      • QuickSwap memiliki likuiditas tinggi untuk stablecoin\n"
-
-            message += "\n"
-
-    # Tambahkan peringatan dan tips verifikasi
-    message += "⚠️ *PERINGATAN & TIPS VERIFIKASI* ⚠️\n"
-    message += "1. Selalu verifikasi harga dan likuiditas secara manual sebelum melakukan transaksi\n"
-    message += "2. Periksa slippage dan biaya gas untuk memastikan transaksi tetap menguntungkan\n"
-    message += "3. Gunakan link BELI dan JUAL untuk memeriksa harga real-time di DEX\n"
-    message += "4. Peluang arbitrase biasanya hanya bertahan dalam hitungan detik\n"
-    message += "5. Pastikan token memiliki likuiditas yang cukup untuk masuk dan keluar posisi\n"
-    message += "6. Untuk DEX yang tidak memiliki link langsung, gunakan DEX Screener untuk verifikasi\n"
-    message += "7. Periksa riwayat harga token untuk memastikan bukan manipulasi harga sementara\n"
-
-    # Tambahkan panduan cara beli dan jual di berbagai DEX
-    message += "\n💳 *PANDUAN TRANSAKSI DI BERBAGAI DEX* 💳\n"
-    message += "*Uniswap (Ethereum/Polygon):*\n"
-    message += "- Beli: Connect wallet → Pilih token → Input jumlah → Set slippage (0.5-1%) → Swap\n"
-    message += "- Jual: Connect wallet → Pilih token → Reverse pair → Set slippage → Swap\n"
-    message += "- Gas fee: ~$5-20 (Ethereum), ~$0.01-0.1 (Polygon)\n\n"
-
-    message += "*PancakeSwap (BSC):*\n"
-    message += "- Beli: Connect wallet → Pilih token → Input jumlah → Set slippage (0.5-1%) → Swap\n"
-    message += "- Jual: Connect wallet → Pilih token → Reverse pair → Set slippage → Swap\n"
-    message += "- Gas fee: ~$0.10-0.30\n\n"
-
-    message += "*SushiSwap (Multi-chain):*\n"
-    message += "- Beli: Connect wallet → Pilih token → Input jumlah → Set slippage (0.5-1%) → Swap\n"
-    message += "- Jual: Connect wallet → Pilih token → Reverse pair → Set slippage → Swap\n"
-    message += "- Gas fee: Bervariasi berdasarkan chain\n\n"
-
-    message += "*QuickSwap (Polygon):*\n"
-    message += "- Beli: Connect wallet → Pilih token → Input jumlah → Set slippage (0.5-1%) → Swap\n"
-    message += "- Jual: Connect wallet → Pilih token → Reverse pair → Set slippage → Swap\n"
-    message += "- Gas fee: ~$0.01-0.1\n\n"
-
-    message += "*Curve (Ethereum):*\n"
-    message += "- Beli: Connect wallet → Pilih pool → Input jumlah → Set slippage → Swap\n"
-    message += "- Jual: Connect wallet → Pilih pool → Reverse pair → Set slippage → Swap\n"
-    message += "- Gas fee: ~$5-20\n\n"
-
-    # Tambahkan simulasi modal dan keuntungan
-    message += "\n💰 *SIMULASI MODAL & KEUNTUNGAN* 💰\n"
-    message += "*Modal Optimal:*\n"
-    message += "- Rp 5.000.000 (untuk arbitrase stablecoin)\n"
-    message += "- Rp 10.000.000 (untuk arbitrase token lainnya)\n\n"
-
-    message += "*Estimasi Keuntungan per Transaksi:*\n"
-    message += "- Stablecoin: 0.5-3% (Rp 25.000 - Rp 150.000)\n"
-    message += "- Token lainnya: 1-15% (Rp 100.000 - Rp 1.500.000)\n\n"
-
-    message += "*Biaya yang Perlu Diperhitungkan:*\n"
-    message += "- Gas fee: Rp 75.000 - Rp 300.000 (Ethereum), Rp 1.500 - Rp 4.500 (BSC/Polygon)\n"
-    message += "- Slippage: 0.5-1% dari nilai transaksi (Rp 25.000 - Rp 100.000)\n"
-    message += "- Trading fee: 0.3-1% dari nilai transaksi (Rp 15.000 - Rp 100.000)\n\n"
-
-    message += "*Keuntungan Bersih Estimasi:*\n"
-    message += "- Stablecoin: Rp 0 - Rp 50.000 per transaksi (setelah fee)\n"
-    message += "- Token lainnya: Rp 50.000 - Rp 1.000.000 per transaksi (setelah fee)\n"
-
-    return message
-
-def print_whatsapp_format(results: Dict[int, List[Dict[str, Any]]]):
+def print_whatsapp_format(results: Dict[int, List[Opportunity]], message: Optional[str] = None):
     """
     Mencetak hasil pemindaian dalam format WhatsApp.
 
     Args:
         results: Dict dengan skenario sebagai key dan daftar peluang sebagai value
+        message: Pesan WhatsApp yang sudah dirender (dirender ulang jika None)
     """
-    message = format_whatsapp_message(results)
+    from rich.panel import Panel
+    from rich.box import ROUNDED
+
+    console = get_console()
+
+    if message is None:
+        message = format_whatsapp_message(results)
 
     # Cetak pesan dengan format yang menarik
     console.print(Panel.fit(
@@ -785,20 +942,73 @@ def print_whatsapp_format(results: Dict[int, List[Dict[str, Any]]]):
     ))
     console.print("\n")
 
-def display_results(results: Dict[int, List[Dict[str, Any]]]):
+def display_results(results: Dict[int, List[Opportunity]]):
     """
     Menampilkan hasil pemindaian.
 
     Args:
         results: Dict dengan skenario sebagai key dan daftar peluang sebagai value
     """
-    print_header()
+    # Render pesan WhatsApp sekali per siklus untuk console dan file
+    message = format_whatsapp_message(results)
 
-    # Tambahkan peringatan validasi
-    add_validation_warning()
+    # Tanpa output console, rich tidak perlu diimport sama sekali
+    if config.OUTPUT_CONFIG["console_output"]:
+        print_header()
 
-    # Cetak format WhatsApp
-    print_whatsapp_format(results)
+        # Tambahkan peringatan validasi
+        add_validation_warning()
+
+        # Cetak format WhatsApp
+        print_whatsapp_format(results, message)
 
     # Simpan ke file jika diperlukan
-    save_opportunities_to_file(results)
+    save_opportunities_to_file(results, whatsapp_message=message)
+
+def display_cycles(cycles: List[Dict[str, Any]]):
+    """
+    Menampilkan siklus arbitrase multi-hop.
+
+    Args:
+        cycles: Daftar siklus dari ArbitrageScanner.scan_multi_hop
+    """
+    if not config.OUTPUT_CONFIG["console_output"]:
+        return
+
+    from rich.table import Table
+    from rich.box import ROUNDED
+
+    from price_graph import describe_cycle
+
+    console = get_console()
+
+    console.print("[header]Arbitrase Multi-Hop (Siklus Lintas Venue)[/header]")
+    console.print("\n")
+
+    if not cycles:
+        console.print("[warning]Tidak ada siklus arbitrase yang ditemukan.[/warning]")
+        console.print("\n")
+        return
+
+    table = Table(
+        show_header=True,
+        header_style="bold magenta",
+        box=ROUNDED,
+        border_style="blue"
+    )
+
+    table.add_column("No", style="dim", width=4)
+    table.add_column("Rute", style="cyan")
+    table.add_column("Hop", style="yellow")
+    table.add_column("Profit (%)", style="bold green")
+
+    for i, cycle in enumerate(cycles, 1):
+        table.add_row(
+            str(i),
+            describe_cycle(cycle),
+            str(cycle["hops"]),
+            f"{cycle['profit_percentage']:.2f}"
+        )
+
+    console.print(table)
+    console.print("\n")
@@ -0,0 +1,192 @@
+"""
+Modul indeks pair DEX yang persisten.
+
+Pool yang lolos filter likuiditas disimpan dengan key (chain, pairAddress).
+Pool yang pernah muncul dalam peluang arbitrase masuk tier "hot" dan dapat
+diperbarui lebih sering lewat endpoint multi-pair DEX Screener, tanpa
+menemukan ulang semua pair untuk setiap token.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import config
+import metrics
+
+logger = logging.getLogger("arbitrage.pair_index")
+
+class PairIndex:
+    """
+    Indeks (chain, pairAddress) dengan tier hot/cold.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Inisialisasi indeks pair.
+
+        Args:
+            path: Lokasi file indeks (default dari config.PAIR_INDEX)
+        """
+        self.path = path if path is not None else config.PAIR_INDEX["path"]
+        self.hot_ttl = config.PAIR_INDEX["hot_ttl"]
+        self.max_age = config.PAIR_INDEX["max_age"]
+        self.entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        if self.path:
+            self.load()
+
+    @staticmethod
+    def _key(chain_id: str, pair_address: str) -> Tuple[str, str]:
+        return (chain_id, pair_address.lower())
+
+    def load(self):
+        """
+        Memuat indeks dari file (jika ada).
+        """
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Gagal memuat indeks pair dari {self.path}: {str(e)}")
+            return
+
+        with self._lock:
+            for entry in data.get("pairs", []):
+                self.entries[self._key(entry["chain_id"], entry["pair_address"])] = entry
+
+        logger.info(f"Memuat {len(self.entries)} pair dari {self.path}")
+
+    def save(self):
+        """
+        Menyimpan indeks ke file jika ada perubahan.
+        """
+        if not self.path or not self._dirty:
+            return
+
+        with self._lock:
+            data = {"pairs": list(self.entries.values())}
+            self._dirty = False
+
+        # Tulis ke file sementara lalu ganti agar file tidak pernah setengah tertulis
+        temp_path = f"{self.path}.tmp"
+
+        try:
+            with open(temp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error(f"Gagal menyimpan indeks pair ke {self.path}: {str(e)}")
+
+    def add_pools(self, token_symbol: str, token_address: str, dex_prices: List[Dict[str, Any]], min_liquidity: float = 0):
+        """
+        Menambahkan atau memperbarui pool yang lolos filter likuiditas.
+
+        Args:
+            token_symbol: Simbol token
+            token_address: Alamat token
+            dex_prices: Daftar dex_info (hasil get_price_across_dexes)
+            min_liquidity: Likuiditas minimum (USD)
+        """
+        now = time.time()
+
+        with self._lock:
+            for dex_info in dex_prices:
+                pair_address = dex_info.get("pair_address")
+                liquidity = float(dex_info.get("liquidity_usd") or 0)
+
+                if not pair_address or liquidity < min_liquidity:
+                    continue
+
+                key = self._key(dex_info["chain_id"], pair_address)
+                entry = self.entries.get(key)
+                metrics.record_cache("pair_index", entry is not None)
+
+                if entry is None:
+                    entry = {
+                        "chain_id": dex_info["chain_id"],
+                        "pair_address": pair_address,
+                        "token_symbol": token_symbol,
+                        "token_address": token_address,
+                        "first_seen": now,
+                        "hot_until": 0,
+                        "opportunity_count": 0,
+                    }
+                    self.entries[key] = entry
+
+                entry["dex_id"] = dex_info.get("dex_id", "")
+                entry["liquidity_usd"] = liquidity
+                entry["last_seen"] = now
+
+            self._dirty = True
+
+    def mark_hot(self, chain_id: str, pair_addresses: List[str]):
+        """
+        Memindahkan pool ke tier hot karena muncul dalam peluang arbitrase.
+
+        Args:
+            chain_id: ID chain
+            pair_addresses: Daftar alamat pair
+        """
+        hot_until = time.time() + self.hot_ttl
+
+        with self._lock:
+            for pair_address in pair_addresses:
+                entry = self.entries.get(self._key(chain_id, pair_address))
+
+                if entry is not None:
+                    entry["hot_until"] = hot_until
+                    entry["opportunity_count"] += 1
+                    self._dirty = True
+
+    def remove(self, chain_id: str, pair_address: str):
+        """
+        Menghapus pool dari indeks (misalnya likuiditas turun di bawah minimum).
+        """
+        with self._lock:
+            if self.entries.pop(self._key(chain_id, pair_address), None) is not None:
+                self._dirty = True
+
+    def hot_pairs(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Mendapatkan pool tier hot yang dikelompokkan per chain.
+
+        Returns:
+            Dict dengan chain_id sebagai key dan daftar entri sebagai value
+        """
+        now = time.time()
+        by_chain: Dict[str, List[Dict[str, Any]]] = {}
+
+        with self._lock:
+            for entry in self.entries.values():
+                if entry["hot_until"] > now:
+                    by_chain.setdefault(entry["chain_id"], []).append(entry)
+
+        return by_chain
+
+    def prune(self):
+        """
+        Menghapus pool yang tidak terlihat lagi dalam pemindaian penuh selama max_age.
+        """
+        cutoff = time.time() - self.max_age
+
+        with self._lock:
+            stale = [key for key, entry in self.entries.items() if entry.get("last_seen", 0) < cutoff]
+
+            for key in stale:
+                del self.entries[key]
+
+            if stale:
+                self._dirty = True
+                logger.info(f"Menghapus {len(stale)} pair lama dari indeks")
+
+    def __len__(self) -> int:
+        return len(self.entries)
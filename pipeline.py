@@ -0,0 +1,190 @@
+"""
+Modul pipeline fetch/evaluasi untuk loop pemindaian sinkron.
+
+Loop pemindaian bergantian antara menunggu HTTP (termasuk jeda rate limiter)
+dan menghitung peluang, tanpa pernah menumpuk keduanya. Pipeline ini
+menjalankan tahap fetch di beberapa thread pekerja yang mengambil item kerja
+(misalnya (token, jaringan)) dari antrean, sementara tahap evaluasi di thread
+pemanggil memproses data pool segera setelah tiba.
+
+Antrean hasil fetch dibatasi, sehingga pekerja fetch berhenti sementara jika
+evaluasi tertinggal dan memori tidak tumbuh tanpa batas. Utilisasi dan waktu
+tertahan setiap tahap dicatat ke metrik untuk melihat di mana pipeline macet.
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, List
+
+import config
+import metrics
+
+logger = logging.getLogger("arbitrage.pipeline")
+
+# Tanda bahwa satu pekerja fetch sudah selesai
+_DONE = object()
+
+class StageStats:
+    """
+    Waktu sibuk dan waktu tertahan satu tahap (atau satu pekerja).
+    """
+
+    __slots__ = ("busy", "stalled", "items")
+
+    def __init__(self):
+        self.busy = 0.0
+        self.stalled = 0.0
+        self.items = 0
+
+class FetchEvaluatePipeline:
+    """
+    Pipeline produsen/konsumen: fetch di thread pekerja, evaluasi di thread pemanggil.
+    """
+
+    def __init__(self, name: str, fetch: Callable[[Any], Any], evaluate: Callable[[Any, Any], None],
+                 on_error: Callable[[Any, Exception], None],
+                 workers: int = config.SCAN_PIPELINE["fetch_workers"],
+                 queue_size: int = config.SCAN_PIPELINE["queue_size"],
+                 enabled: bool = config.SCAN_PIPELINE["enabled"]):
+        """
+        Inisialisasi pipeline.
+
+        Args:
+            name: Nama pipeline (label metrik, misalnya scenario_2)
+            fetch: Fungsi tahap fetch, menerima item kerja dan mengembalikan data
+            evaluate: Fungsi tahap evaluasi, menerima item kerja dan data hasil fetch
+            on_error: Dipanggil dengan item kerja dan exception jika fetch atau evaluasi gagal
+            workers: Jumlah thread pekerja fetch
+            queue_size: Batas data hasil fetch yang menunggu dievaluasi
+            enabled: False untuk menjalankan fetch dan evaluasi bergantian di thread pemanggil
+        """
+        self.name = name
+        self.fetch = fetch
+        self.evaluate = evaluate
+        self.on_error = on_error
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.enabled = enabled
+
+    def run(self, items: Iterable[Any]):
+        """
+        Menjalankan fetch dan evaluasi untuk semua item kerja.
+
+        Urutan evaluasi mengikuti urutan data selesai diambil, bukan urutan item.
+
+        Args:
+            items: Item kerja
+        """
+        work = queue.Queue()
+        for item in items:
+            work.put(item)
+
+        if work.empty():
+            return
+
+        if not self.enabled:
+            while not work.empty():
+                item = work.get_nowait()
+
+                try:
+                    data = self.fetch(item)
+                except Exception as e:
+                    self.on_error(item, e)
+                    continue
+
+                self._evaluate(item, data)
+            return
+
+        worker_count = min(self.workers, work.qsize())
+        results = queue.Queue(maxsize=self.queue_size)
+        fetch_stats = [StageStats() for _ in range(worker_count)]
+        evaluate_stats = StageStats()
+        start_time = time.perf_counter()
+
+        threads = [
+            threading.Thread(target=self._fetch_worker, args=(work, results, stats), name=f"{self.name}-fetch-{i}", daemon=True)
+            for i, stats in enumerate(fetch_stats)
+        ]
+        for thread in threads:
+            thread.start()
+
+        finished = 0
+        while finished < worker_count:
+            wait_start = time.perf_counter()
+            entry = results.get()
+            evaluate_start = time.perf_counter()
+            evaluate_stats.stalled += evaluate_start - wait_start
+
+            if entry is _DONE:
+                finished += 1
+                continue
+
+            item, data, error = entry
+
+            if error is not None:
+                self.on_error(item, error)
+            else:
+                self._evaluate(item, data)
+
+            evaluate_stats.busy += time.perf_counter() - evaluate_start
+            evaluate_stats.items += 1
+            metrics.PIPELINE_QUEUE_DEPTH.set(results.qsize(), pipeline=self.name)
+
+        for thread in threads:
+            thread.join()
+
+        self._record(time.perf_counter() - start_time, fetch_stats, evaluate_stats)
+
+    def _evaluate(self, item: Any, data: Any):
+        try:
+            self.evaluate(item, data)
+        except Exception as e:
+            self.on_error(item, e)
+
+    def _fetch_worker(self, work: queue.Queue, results: queue.Queue, stats: StageStats):
+        while True:
+            try:
+                item = work.get_nowait()
+            except queue.Empty:
+                break
+
+            fetch_start = time.perf_counter()
+            data = error = None
+
+            try:
+                data = self.fetch(item)
+            except Exception as e:
+                error = e
+
+            put_start = time.perf_counter()
+            stats.busy += put_start - fetch_start
+            stats.items += 1
+
+            # Menunggu di sini berarti evaluasi tertinggal (antrean penuh)
+            results.put((item, data, error))
+            stats.stalled += time.perf_counter() - put_start
+
+        results.put(_DONE)
+
+    def _record(self, elapsed: float, fetch_stats: List[StageStats], evaluate_stats: StageStats):
+        if elapsed <= 0:
+            return
+
+        fetch_busy = sum(stats.busy for stats in fetch_stats)
+        fetch_stalled = sum(stats.stalled for stats in fetch_stats)
+        fetch_utilization = fetch_busy / (elapsed * len(fetch_stats))
+        evaluate_utilization = evaluate_stats.busy / elapsed
+
+        metrics.PIPELINE_UTILIZATION.set(fetch_utilization, pipeline=self.name, stage="fetch")
+        metrics.PIPELINE_UTILIZATION.set(evaluate_utilization, pipeline=self.name, stage="evaluate")
+        metrics.PIPELINE_STALL.inc(fetch_stalled, pipeline=self.name, stage="fetch")
+        metrics.PIPELINE_STALL.inc(evaluate_stats.stalled, pipeline=self.name, stage="evaluate")
+        metrics.PIPELINE_QUEUE_DEPTH.set(0, pipeline=self.name)
+
+        logger.info(
+            f"Pipeline {self.name}: {evaluate_stats.items} item dalam {elapsed:.2f} detik, "
+            f"fetch {fetch_utilization:.0%} sibuk ({len(fetch_stats)} pekerja, tertahan {fetch_stalled:.2f} detik), "
+            f"evaluasi {evaluate_utilization:.0%} sibuk (menunggu data {evaluate_stats.stalled:.2f} detik)"
+        )
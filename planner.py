@@ -0,0 +1,328 @@
+"""
+Modul perencana pengambilan data untuk satu siklus pemindaian.
+
+Setiap skenario biasanya mengambil pair DEX Screener per (token, jaringan)
+sendiri-sendiri. Planner mengumpulkan semua (jaringan, alamat token) yang
+dibutuhkan skenario yang diminta, menghapus duplikat, lalu mengambilnya
+dengan permintaan batch /tokens/v1 (maksimal 30 alamat per permintaan).
+Hasilnya disimpan di token_pairs_cache, sehingga evaluator setiap skenario
+memakai snapshot yang sama tanpa permintaan tambahan.
+"""
+
+import logging
+import time
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import config
+from market_join import TickerIndex, cex_symbol
+from scheduler import CROSS_CHAIN
+from tracing import span
+from utils import is_token_multichain, split_binance_symbol
+
+logger = logging.getLogger("arbitrage.planner")
+
+class FetchPlan:
+    """
+    Daftar permintaan Binance dan DEX Screener untuk satu siklus pemindaian.
+    """
+
+    def __init__(self, scenarios: Sequence[int], tokens_to_check: Optional[List[str]] = None):
+        """
+        Inisialisasi rencana kosong.
+
+        Args:
+            scenarios: Skenario yang akan dipindai
+            tokens_to_check: Filter token (jika None, semua token di konfigurasi)
+        """
+        self.scenarios = list(scenarios)
+        self.tokens_to_check = tokens_to_check
+        self.top_gainers: Optional[List[Dict[str, Any]]] = None
+        self.estimated = False  # True jika top gainers belum diketahui (perkiraan maksimum)
+        self.batch_size = config.DEX_SCREENER["max_tokens_per_request"]
+        self.binance_requests: Dict[str, int] = {}
+        self.dex_tokens: Dict[str, Dict[str, str]] = {}  # jaringan -> {alamat: token}
+        self.scenario_lookups = 0  # Pengambilan pair per (skenario, token, jaringan) tanpa planner
+
+    def add_binance(self, endpoint: str, count: int = 1):
+        """
+        Menambahkan permintaan Binance ke rencana.
+
+        Args:
+            endpoint: Nama endpoint (untuk ringkasan)
+            count: Jumlah permintaan
+        """
+        self.binance_requests[endpoint] = self.binance_requests.get(endpoint, 0) + count
+
+    def add_dex_token(self, network: str, token_address: str, token: str):
+        """
+        Menambahkan pengambilan pair token di satu jaringan (duplikat digabung).
+
+        Args:
+            network: Nama jaringan
+            token_address: Alamat token
+            token: Simbol token
+        """
+        self.scenario_lookups += 1
+        self.dex_tokens.setdefault(network, {}).setdefault(token_address.lower(), token)
+
+    def dex_batches(self) -> List[Tuple[str, List[str]]]:
+        """
+        Memecah alamat token per jaringan menjadi batch permintaan.
+
+        Returns:
+            Daftar tuple (jaringan, daftar alamat)
+        """
+        batches = []
+
+        for network, tokens in self.dex_tokens.items():
+            addresses = list(tokens)
+            for i in range(0, len(addresses), self.batch_size):
+                batches.append((network, addresses[i:i + self.batch_size]))
+
+        return batches
+
+    @property
+    def binance_request_count(self) -> int:
+        return sum(self.binance_requests.values())
+
+    @property
+    def dex_request_count(self) -> int:
+        return len(self.dex_batches())
+
+    @property
+    def token_count(self) -> int:
+        return sum(len(tokens) for tokens in self.dex_tokens.values())
+
+    def describe(self, dex_interval: float, binance_interval: float) -> str:
+        """
+        Ringkasan rencana untuk --dry-run.
+
+        Args:
+            dex_interval: Jeda minimum antar permintaan DEX Screener (detik)
+            binance_interval: Jeda minimum antar permintaan Binance (detik)
+
+        Returns:
+            Teks ringkasan berisi jumlah permintaan dan perkiraan waktu rate limit
+        """
+        prefix = "maks. " if self.estimated else ""
+        tokens = ", ".join(self.tokens_to_check) if self.tokens_to_check is not None else "semua token di konfigurasi"
+
+        lines = [
+            f"Rencana pemindaian skenario {', '.join(str(scenario) for scenario in self.scenarios)} ({tokens})",
+            "",
+            "Binance:",
+        ]
+
+        if not self.binance_requests:
+            lines.append("  (tidak ada permintaan)")
+
+        for endpoint, count in self.binance_requests.items():
+            lines.append(f"  {endpoint:<32} {prefix}{count} permintaan")
+
+        lines.extend(["", "DEX Screener (/tokens/v1, batch):"])
+
+        if not self.dex_tokens:
+            lines.append("  (tidak ada permintaan)")
+
+        for network, tokens in sorted(self.dex_tokens.items()):
+            batches = -(-len(tokens) // self.batch_size)
+            lines.append(f"  {network:<32} {prefix}{len(tokens)} token -> {batches} permintaan")
+
+        dex_seconds = self.dex_request_count * dex_interval
+        binance_seconds = self.binance_request_count * binance_interval
+
+        lines.extend([
+            "",
+            f"Total: {prefix}{self.dex_request_count + self.binance_request_count} permintaan "
+            f"(DEX Screener {self.dex_request_count}, Binance {self.binance_request_count})",
+            f"Tanpa planner: {self.token_count} permintaan /token-pairs untuk (token, jaringan) unik "
+            f"({self.scenario_lookups} pengambilan per skenario)",
+            f"Perkiraan waktu rate limit: DEX Screener {dex_seconds:.1f} detik, Binance {binance_seconds:.1f} detik "
+            f"(berjalan bersamaan: ~{max(dex_seconds, binance_seconds):.1f} detik)",
+        ])
+
+        return "\n".join(lines)
+
+class ScanPlanner:
+    """
+    Menyusun dan menjalankan rencana pengambilan data untuk ArbitrageScanner.
+    """
+
+    def __init__(self, scanner, top_gainers_limit: int = 20):
+        """
+        Inisialisasi planner.
+
+        Args:
+            scanner: Instance ArbitrageScanner (provider dan penjadwal)
+            top_gainers_limit: Jumlah top gainers Skenario 1
+        """
+        self.scanner = scanner
+        self.top_gainers_limit = top_gainers_limit
+
+    def fetch_top_gainers(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Mengambil top gainers Binance untuk Skenario 1.
+
+        Returns:
+            Daftar top gainers, atau None jika gagal (Skenario 1 akan mencoba lagi sendiri)
+        """
+        try:
+            with span("fetch", source="binance"):
+                top_gainers = self.scanner.binance.get_top_gainers(limit=self.top_gainers_limit)
+            logger.info(f"Berhasil mendapatkan {len(top_gainers)} top gainers dari Binance")
+            return top_gainers
+        except Exception as e:
+            logger.error(f"Gagal mendapatkan top gainers dari Binance: {str(e)}")
+            return None
+
+    def fetch_tickers(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Mengambil semua ticker 24 jam Binance untuk join CEX-DEX Skenario 1.
+
+        Returns:
+            Daftar ticker, atau None jika gagal (Skenario 1 akan mencoba lagi sendiri)
+        """
+        try:
+            with span("fetch", source="binance"):
+                tickers = self.scanner.binance.get_all_tickers_24h()
+            logger.info(f"Berhasil mendapatkan {len(tickers)} ticker dari Binance")
+            return tickers
+        except Exception as e:
+            logger.error(f"Gagal mendapatkan ticker dari Binance: {str(e)}")
+            return None
+
+    def build(self, scenarios: Sequence[int], tokens_to_check: Optional[List[str]] = None,
+              top_gainers: Optional[List[Dict[str, Any]]] = None,
+              tickers: Optional[List[Dict[str, Any]]] = None) -> FetchPlan:
+        """
+        Menyusun rencana pengambilan data untuk skenario yang diminta.
+
+        Pasangan (token, jaringan) yang belum jatuh tempo menurut penjadwal
+        tidak dimasukkan. Jika top gainers atau ticker belum diketahui (--dry-run),
+        Skenario 1 diperkirakan dari semua token yang mungkin ikut dibandingkan.
+
+        Args:
+            scenarios: Skenario yang akan dipindai
+            tokens_to_check: Filter token (jika None, semua token di konfigurasi)
+            top_gainers: Top gainers Binance yang sudah diambil
+            tickers: Semua ticker Binance yang sudah diambil (join CEX-DEX)
+
+        Returns:
+            Instance FetchPlan
+        """
+        plan = FetchPlan(scenarios, tokens_to_check)
+        plan.top_gainers = top_gainers
+        monitored = config.TOKENS_TO_MONITOR
+
+        if 1 in scenarios and config.MARKET_JOIN["enabled"]:
+            self._add_market_join(plan, tokens_to_check, tickers)
+
+        elif 1 in scenarios:
+            plan.add_binance("ticker/24hr (top gainers)")
+
+            if top_gainers is None:
+                plan.estimated = True
+                candidates = [token for token in (tokens_to_check or monitored) if token in monitored]
+            else:
+                candidates = []
+                for gainer in top_gainers:
+                    assets = split_binance_symbol(gainer["symbol"])
+                    if assets is not None and assets[0] in monitored:
+                        candidates.append(assets[0])
+
+                if tokens_to_check is not None:
+                    candidates = [token for token in candidates if token in tokens_to_check]
+
+            orderbooks = 0
+            for token in candidates:
+                if self._add_token_networks(plan, token):
+                    orderbooks += 1
+
+            if orderbooks:
+                plan.add_binance("depth (order book)", min(orderbooks, self.top_gainers_limit))
+
+        if 2 in scenarios:
+            for token in tokens_to_check if tokens_to_check is not None else monitored:
+                self._add_token_networks(plan, token)
+
+        if 3 in scenarios:
+            if tokens_to_check is None:
+                tokens = [token for token in monitored if is_token_multichain(token)]
+            else:
+                tokens = tokens_to_check
+
+            for token in tokens:
+                if token in monitored:
+                    token_addresses = monitored[token]["address"]
+                else:
+                    # Token di luar konfigurasi hanya direncanakan jika alamatnya sudah diresolusi
+                    token_addresses = self.scanner.dex_screener.token_resolver.cached(token) or {}
+
+                if token_addresses and self.scanner._is_due(token, CROSS_CHAIN):
+                    for network, token_address in token_addresses.items():
+                        plan.add_dex_token(network, token_address, token)
+
+        return plan
+
+    def _add_market_join(self, plan: FetchPlan, tokens_to_check: Optional[List[str]],
+                         tickers: Optional[List[Dict[str, Any]]]):
+        # Semua token di konfigurasi yang punya ticker Binance; tanpa ticker, semua token (perkiraan)
+        monitored = config.TOKENS_TO_MONITOR
+        ticker_index = TickerIndex(tickers) if tickers is not None else None
+        plan.add_binance("ticker/24hr (semua simbol)")
+
+        if ticker_index is None:
+            plan.estimated = True
+
+        orderbooks = 0
+        for token in tokens_to_check if tokens_to_check is not None else monitored:
+            if token not in monitored:
+                continue
+
+            if ticker_index is not None and cex_symbol(token) not in ticker_index:
+                continue
+
+            if self._add_token_networks(plan, token):
+                orderbooks += 1
+
+        if orderbooks:
+            plan.add_binance("depth (order book)", min(orderbooks, config.MARKET_JOIN["max_candidates"]))
+
+    def _add_token_networks(self, plan: FetchPlan, token: str) -> bool:
+        # Jaringan per token yang jatuh tempo; False jika tidak ada yang perlu dipindai
+        networks = config.TOKENS_TO_MONITOR.get(token, {}).get("address", {})
+        added = False
+
+        for network, token_address in networks.items():
+            if self.scanner._is_due(token, network):
+                plan.add_dex_token(network, token_address, token)
+                added = True
+
+        return added
+
+    def execute(self, plan: FetchPlan):
+        """
+        Menjalankan permintaan DEX Screener dalam rencana dan menyimpan hasilnya di cache.
+
+        Token di batch yang gagal tidak disimpan, sehingga skenario mengambilnya
+        satu per satu seperti biasa.
+
+        Args:
+            plan: Rencana pengambilan data
+        """
+        dex_screener = self.scanner.dex_screener
+        start_time = time.perf_counter()
+        cached = 0
+
+        for network, tokens in plan.dex_tokens.items():
+            with span("plan", network=network):
+                pairs_by_token = dex_screener.get_pairs_by_tokens(network, list(tokens))
+
+            for token_address, pairs in pairs_by_token.items():
+                dex_screener.token_pairs_cache.put((network, token_address), pairs)
+                cached += 1
+
+        logger.info(
+            f"Planner: {plan.dex_request_count} permintaan DEX Screener untuk {plan.token_count} (token, jaringan), "
+            f"{cached} tersimpan di cache dalam {time.perf_counter() - start_time:.1f} detik"
+        )
@@ -0,0 +1,547 @@
+"""
+Modul graf harga lintas venue untuk deteksi arbitrase multi-hop.
+
+Setiap node adalah (venue, chain, token) dan setiap edge menyatakan konversi
+satu unit token asal menjadi token tujuan. Bobot edge adalah -log(rate * (1 - fee)),
+sehingga siklus berbobot negatif berarti rangkaian konversi yang menghasilkan
+lebih banyak token daripada modal awal.
+
+Token di DEX dan wallet diidentifikasi dengan alamat kontrak (huruf kecil),
+bukan simbol, agar dua token berbeda dengan simbol sama tidak tergabung. Node
+Binance memakai nama aset Binance.
+"""
+
+import logging
+import math
+from collections import deque
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+import config
+from cost_model import CostModel
+
+logger = logging.getLogger("arbitrage.graph")
+
+NodeKey = Tuple[str, str, str]
+
+# Venue khusus: saldo wallet di suatu chain dan akun di Binance
+WALLET_VENUE = "wallet"
+CEX_CHAIN = "cex"
+
+# Token wrapped di DEX yang setara dengan aset di Binance
+CEX_SYMBOL_ALIASES = {
+    "WETH": "ETH",
+    "WBNB": "BNB",
+    "WMATIC": "MATIC",
+    "WBTC": "BTC",
+    "BTCB": "BTC",
+}
+
+# Perubahan bobot di bawah ambang ini dianggap tidak berubah
+WEIGHT_EPSILON = 1e-12
+
+class PriceGraph:
+    """
+    Graf berarah berbobot log-harga dengan deteksi siklus negatif inkremental.
+
+    Jarak dari sumber virtual (terhubung ke semua node dengan bobot 0) disimpan
+    antar pemanggilan. Saat harga berubah, hanya edge yang berubah yang
+    direlaksasi ulang dengan SPFA, bukan seluruh graf.
+    """
+
+    def __init__(self):
+        """
+        Inisialisasi graf kosong.
+        """
+        self.node_index: Dict[NodeKey, int] = {}
+        self.node_keys: List[NodeKey] = []
+        self.out_edges: List[Dict[int, float]] = []
+        self.in_edges: List[Set[int]] = []
+        self.edge_labels: Dict[Tuple[int, int], str] = {}
+        self.token_symbols: Dict[Tuple[str, str], str] = {}  # (chain, alamat) -> simbol untuk tampilan
+
+        # State SPFA yang dipertahankan antar siklus pemindaian
+        self.dist: List[float] = []
+        self.pred: List[int] = []
+
+        # Node yang perlu direlaksasi ulang dan edge yang bobotnya naik/dihapus
+        self._dirty_nodes: Set[int] = set()
+        self._increased_edges: Set[Tuple[int, int]] = set()
+        self._blocked_last_run: Set[Tuple[int, int]] = set()
+
+    def __len__(self) -> int:
+        return len(self.node_keys)
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(edges) for edges in self.out_edges)
+
+    def add_node(self, key: NodeKey) -> int:
+        """
+        Menambahkan node jika belum ada.
+
+        Args:
+            key: Tuple (venue, chain, token)
+
+        Returns:
+            Indeks node
+        """
+        index = self.node_index.get(key)
+
+        if index is None:
+            index = len(self.node_keys)
+            self.node_index[key] = index
+            self.node_keys.append(key)
+            self.out_edges.append({})
+            self.in_edges.append(set())
+            self.dist.append(0.0)
+            self.pred.append(-1)
+
+        return index
+
+    def symbol(self, key: NodeKey) -> str:
+        """
+        Simbol token node untuk tampilan (aset Binance untuk node Binance).
+
+        Args:
+            key: Tuple (venue, chain, token)
+
+        Returns:
+            Simbol token, atau alamat jika simbol tidak diketahui
+        """
+        _, chain, token = key
+        return self.token_symbols.get((chain, token), token)
+
+    def set_edge(self, source: NodeKey, target: NodeKey, rate: float, fee_percentage: float = 0.0, label: str = ""):
+        """
+        Menambahkan atau memperbarui edge konversi.
+
+        Args:
+            source: Node asal
+            target: Node tujuan
+            rate: Jumlah token tujuan per satu token asal
+            fee_percentage: Biaya konversi dalam persen
+            label: Keterangan edge (misalnya "swap", "bridge")
+        """
+        effective_rate = rate * (1 - fee_percentage / 100)
+
+        if effective_rate <= 0:
+            self.remove_edge(source, target)
+            return
+
+        u = self.add_node(source)
+        v = self.add_node(target)
+        weight = -math.log(effective_rate)
+        old_weight = self.out_edges[u].get(v)
+
+        if old_weight is not None and abs(old_weight - weight) < WEIGHT_EPSILON:
+            return
+
+        self.out_edges[u][v] = weight
+        self.in_edges[v].add(u)
+        self.edge_labels[(u, v)] = label
+
+        if old_weight is not None and weight > old_weight:
+            self._increased_edges.add((u, v))
+        else:
+            self._dirty_nodes.add(u)
+
+    def remove_edge(self, source: NodeKey, target: NodeKey):
+        """
+        Menghapus edge jika ada.
+
+        Args:
+            source: Node asal
+            target: Node tujuan
+        """
+        u = self.node_index.get(source)
+        v = self.node_index.get(target)
+
+        if u is None or v is None or v not in self.out_edges[u]:
+            return
+
+        del self.out_edges[u][v]
+        self.in_edges[v].discard(u)
+        self.edge_labels.pop((u, v), None)
+        self._increased_edges.add((u, v))
+
+    def _invalidate_subtree(self, root: int) -> Set[int]:
+        """
+        Mengembalikan jarak node di subtree jalur terpendek ke nilai awal.
+
+        Args:
+            root: Node akar subtree
+
+        Returns:
+            Himpunan node yang direset
+        """
+        children: Dict[int, List[int]] = {}
+        for node, parent in enumerate(self.pred):
+            if parent >= 0:
+                children.setdefault(parent, []).append(node)
+
+        reset = set()
+        stack = [root]
+
+        while stack:
+            node = stack.pop()
+            if node in reset:
+                continue
+            reset.add(node)
+            stack.extend(children.get(node, []))
+
+        for node in reset:
+            self.dist[node] = 0.0
+            self.pred[node] = -1
+
+        return reset
+
+    def _extract_cycle(self, start: int) -> List[int]:
+        """
+        Mengambil siklus dari rantai predecessor yang melewati node start.
+
+        Args:
+            start: Node yang terdeteksi berada di (atau dapat dicapai dari) siklus negatif
+
+        Returns:
+            Daftar node siklus sesuai urutan konversi
+        """
+        node = start
+        for _ in range(len(self.node_keys)):
+            if self.pred[node] < 0:
+                return []
+            node = self.pred[node]
+
+        cycle = [node]
+        current = self.pred[node]
+
+        while current != node:
+            if current < 0 or len(cycle) > len(self.node_keys):
+                return []
+            cycle.append(current)
+            current = self.pred[current]
+
+        cycle.reverse()
+
+        return cycle
+
+    def find_negative_cycles(self, max_cycles: int = 20) -> List[Dict[str, Any]]:
+        """
+        Mencari siklus negatif dengan SPFA inkremental.
+
+        Hanya node yang edge keluarnya berubah sejak pemanggilan terakhir (dan
+        subtree yang jaraknya tidak lagi valid) yang masuk antrian relaksasi.
+        Setiap siklus yang ditemukan diblokir sementara agar SPFA tetap berhenti.
+
+        Args:
+            max_cycles: Jumlah siklus maksimum yang dikembalikan
+
+        Returns:
+            Daftar siklus (path node, edge, dan persentase keuntungan)
+        """
+        n = len(self.node_keys)
+        queue = deque()
+        in_queue = [False] * n
+        path_length = [0] * n
+        blocked: Set[Tuple[int, int]] = set()
+        cycles: List[Dict[str, Any]] = []
+        seen_cycles: Set[Tuple[int, ...]] = set()
+
+        def enqueue(node: int):
+            if not in_queue[node]:
+                in_queue[node] = True
+                queue.append(node)
+
+        # Edge yang naik/dihapus membuat jarak di subtree-nya tidak valid
+        dirty = set(self._dirty_nodes)
+        for u, v in self._increased_edges | self._blocked_last_run:
+            if u < n and v < n and self.pred[v] == u:
+                for node in self._invalidate_subtree(v):
+                    dirty.add(node)
+                    dirty.update(self.in_edges[node])
+            if u < n:
+                dirty.add(u)
+
+        for node in dirty:
+            enqueue(node)
+
+        self._dirty_nodes.clear()
+        self._increased_edges.clear()
+
+        relaxations = 0
+        max_relaxations = max(n, 1) * max(self.edge_count, 1)
+
+        while queue and len(cycles) < max_cycles and relaxations <= max_relaxations:
+            u = queue.popleft()
+            in_queue[u] = False
+
+            for v, weight in self.out_edges[u].items():
+                if (u, v) in blocked:
+                    continue
+
+                candidate = self.dist[u] + weight
+
+                if candidate < self.dist[v] - WEIGHT_EPSILON:
+                    relaxations += 1
+                    self.dist[v] = candidate
+                    self.pred[v] = u
+                    path_length[v] = path_length[u] + 1
+
+                    if path_length[v] >= n:
+                        cycle = self._extract_cycle(v)
+
+                        if cycle:
+                            self._record_cycle(cycle, cycles, seen_cycles)
+                            for i in range(len(cycle)):
+                                blocked.add((cycle[i], cycle[(i + 1) % len(cycle)]))
+
+                        # Jarak di sekitar siklus tidak valid lagi, hitung ulang tanpa edge yang diblokir
+                        for node in self._invalidate_subtree(v if not cycle else cycle[0]):
+                            path_length[node] = 0
+                            enqueue(node)
+                            for source in self.in_edges[node]:
+                                enqueue(source)
+                        break
+
+                    enqueue(v)
+
+        if relaxations > max_relaxations:
+            logger.warning("Batas relaksasi SPFA tercapai, hasil deteksi siklus mungkin tidak lengkap")
+
+        # Siklus yang diblokir dievaluasi ulang pada pemanggilan berikutnya
+        self._blocked_last_run = blocked
+
+        cycles.sort(key=lambda x: x["profit_percentage"], reverse=True)
+
+        return cycles
+
+    def _record_cycle(self, cycle: List[int], cycles: List[Dict[str, Any]], seen: Set[Tuple[int, ...]]):
+        """
+        Menambahkan siklus ke hasil jika belum pernah dicatat dan benar-benar negatif.
+        """
+        # Rotasi kanonik agar siklus yang sama tidak dicatat dua kali
+        start = cycle.index(min(cycle))
+        canonical = tuple(cycle[start:] + cycle[:start])
+
+        if canonical in seen:
+            return
+
+        seen.add(canonical)
+
+        total_weight = 0.0
+        edges = []
+
+        for i in range(len(canonical)):
+            u = canonical[i]
+            v = canonical[(i + 1) % len(canonical)]
+            weight = self.out_edges[u].get(v)
+
+            if weight is None:
+                return
+
+            total_weight += weight
+            edges.append({
+                "from": self.node_keys[u],
+                "to": self.node_keys[v],
+                "rate": math.exp(-weight),
+                "type": self.edge_labels.get((u, v), ""),
+            })
+
+        if total_weight >= 0:
+            return
+
+        cycles.append({
+            "path": [self.node_keys[node] for node in canonical],
+            "symbols": [self.symbol(self.node_keys[node]) for node in canonical],
+            "edges": edges,
+            "hops": len(canonical),
+            "profit_percentage": (math.exp(-total_weight) - 1) * 100,
+        })
+
+def known_token_addresses(resolver=None) -> Dict[Tuple[str, str], str]:
+    """
+    Alamat token yang identitasnya diketahui: TOKENS_TO_MONITOR dan hasil resolver.
+
+    Hanya token ini yang dihubungkan antar chain (bridge) dan ke aset Binance;
+    token lain dengan simbol sama bisa saja token palsu.
+
+    Args:
+        resolver: TokenResolver (opsional) untuk token di luar TOKENS_TO_MONITOR
+
+    Returns:
+        Dict (chain, alamat huruf kecil) -> simbol token
+    """
+    known: Dict[Tuple[str, str], str] = {}
+
+    if resolver is not None:
+        for symbol in list(resolver.entries):
+            for chain, address in (resolver.cached(symbol) or {}).items():
+                known[(chain, address.lower())] = symbol
+
+    for symbol, token_config in config.TOKENS_TO_MONITOR.items():
+        for chain, address in token_config["address"].items():
+            known[(chain, address.lower())] = symbol
+
+    return known
+
+def add_dex_pairs(graph: PriceGraph, pairs: List[Dict[str, Any]], cost_model: CostModel, min_liquidity: float = 0):
+    """
+    Menambahkan edge swap dari pair DEX Screener ke graf.
+
+    Setiap pool memberi dua edge (base -> quote dan sebaliknya) dengan biaya
+    dari model biaya (fee tier pool, sama seperti skenario), plus edge transfer
+    tanpa biaya ke node wallet token yang sama di chain yang sama.
+
+    Args:
+        graph: Graf harga
+        pairs: Data pair mentah dari DEX Screener
+        cost_model: Model biaya untuk biaya swap per pool
+        min_liquidity: Likuiditas minimum pool (USD)
+    """
+    for pair in pairs:
+        liquidity = (pair.get("liquidity") or {}).get("usd") or 0
+        price_native = pair.get("priceNative")
+
+        if not price_native or float(liquidity) < min_liquidity:
+            continue
+
+        rate = float(price_native)
+        if rate <= 0:
+            continue
+
+        chain = pair.get("chainId", "")
+        dex_id = pair.get("dexId", "")
+        base_token = pair.get("baseToken") or {}
+        quote_token = pair.get("quoteToken") or {}
+        base = str(base_token.get("address") or "").lower()
+        quote = str(quote_token.get("address") or "").lower()
+
+        if not chain or not dex_id or not base or not quote or base == quote:
+            continue
+
+        graph.token_symbols.setdefault((chain, base), str(base_token.get("symbol") or base).upper())
+        graph.token_symbols.setdefault((chain, quote), str(quote_token.get("symbol") or quote).upper())
+
+        # Venue dibedakan per pool agar dua pool di DEX yang sama tidak saling menimpa
+        venue = f"{dex_id}:{pair.get('pairAddress', '')}"
+        fee_percentage = cost_model.dex_fee(dex_id, pair.get("labels"))
+
+        graph.set_edge((venue, chain, base), (venue, chain, quote), rate, fee_percentage, "swap")
+        graph.set_edge((venue, chain, quote), (venue, chain, base), 1 / rate, fee_percentage, "swap")
+
+        for token in (base, quote):
+            graph.set_edge((venue, chain, token), (WALLET_VENUE, chain, token), 1.0, 0.0, "transfer")
+            graph.set_edge((WALLET_VENUE, chain, token), (venue, chain, token), 1.0, 0.0, "transfer")
+
+def _known_wallets(graph: PriceGraph, known: Dict[Tuple[str, str], str]) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    Node wallet dengan alamat yang diketahui, dikelompokkan per simbol token.
+    """
+    wallets: Dict[str, List[Tuple[str, str]]] = {}
+
+    for venue, chain, token in list(graph.node_keys):
+        if venue == WALLET_VENUE and (chain, token) in known:
+            wallets.setdefault(known[(chain, token)], []).append((chain, token))
+
+    return wallets
+
+def add_bridge_edges(graph: PriceGraph, known: Dict[Tuple[str, str], str]):
+    """
+    Menambahkan edge bridge antar wallet untuk token yang sama di beberapa chain.
+
+    Args:
+        graph: Graf harga
+        known: Alamat token yang diketahui (lihat known_token_addresses)
+    """
+    bridge_fees = config.ARBITRAGE_CONFIG["bridge_fees"]
+
+    for locations in _known_wallets(graph, known).values():
+        for source_chain, source_token in locations:
+            for target_chain, target_token in locations:
+                key = f"{source_chain}_to_{target_chain}"
+                if source_chain != target_chain and key in bridge_fees:
+                    graph.set_edge(
+                        (WALLET_VENUE, source_chain, source_token),
+                        (WALLET_VENUE, target_chain, target_token),
+                        1.0, bridge_fees[key], "bridge"
+                    )
+
+def add_binance_tickers(graph: PriceGraph, tickers: List[Dict[str, Any]], quote_assets: List[str],
+                        known: Dict[Tuple[str, str], str]):
+    """
+    Menambahkan edge order book Binance dan edge deposit/withdraw ke wallet.
+
+    Harga bid dipakai untuk menjual base, harga ask untuk membeli base
+    (lastPrice jika bid/ask tidak tersedia). Hanya aset yang sudah ada di sisi
+    DEX dengan alamat yang diketahui yang dimasukkan, agar graf tetap kecil dan
+    token lain dengan simbol sama tidak terhubung ke Binance.
+
+    Args:
+        graph: Graf harga
+        tickers: Data ticker 24 jam dari Binance
+        quote_assets: Daftar quote asset yang didukung (misalnya USDT, BTC)
+        known: Alamat token yang diketahui (lihat known_token_addresses)
+    """
+    taker_fee = config.ARBITRAGE_CONFIG["transaction_fees"]["binance"]["taker"]
+
+    # Wallet DEX per aset Binance
+    dex_assets: Dict[str, List[Tuple[str, str]]] = {}
+    for symbol, locations in _known_wallets(graph, known).items():
+        dex_assets.setdefault(CEX_SYMBOL_ALIASES.get(symbol, symbol), []).extend(locations)
+
+    for ticker in tickers:
+        symbol = ticker.get("symbol", "")
+        base_asset = ""
+        quote_asset = ""
+
+        for quote in quote_assets:
+            if symbol.endswith(quote) and len(symbol) > len(quote):
+                base_asset = symbol[:-len(quote)]
+                quote_asset = quote
+                break
+
+        if base_asset not in dex_assets or quote_asset not in dex_assets:
+            continue
+
+        last_price = float(ticker.get("lastPrice") or 0)
+        bid = float(ticker.get("bidPrice") or 0) or last_price
+        ask = float(ticker.get("askPrice") or 0) or last_price
+
+        if bid <= 0 or ask <= 0:
+            continue
+
+        base_node = ("binance", CEX_CHAIN, base_asset)
+        quote_node = ("binance", CEX_CHAIN, quote_asset)
+
+        graph.set_edge(base_node, quote_node, bid, taker_fee, "cex")
+        graph.set_edge(quote_node, base_node, 1 / ask, taker_fee, "cex")
+
+    # Deposit dan withdraw (biaya withdraw Binance bersifat tetap, tidak dimodelkan)
+    for cex_symbol, locations in dex_assets.items():
+        cex_node = ("binance", CEX_CHAIN, cex_symbol)
+        if cex_node not in graph.node_index:
+            continue
+
+        for chain, token in locations:
+            graph.set_edge((WALLET_VENUE, chain, token), cex_node, 1.0, 0.0, "deposit")
+            graph.set_edge(cex_node, (WALLET_VENUE, chain, token), 1.0, 0.0, "withdraw")
+
+def describe_cycle(cycle: Dict[str, Any]) -> str:
+    """
+    Membuat deskripsi singkat siklus, misalnya "USDC@uniswap(ethereum) -> ...".
+
+    Args:
+        cycle: Siklus hasil find_negative_cycles
+
+    Returns:
+        String deskripsi siklus
+    """
+    steps = []
+    symbols = cycle.get("symbols") or [token for _, _, token in cycle["path"]]
+
+    for (venue, chain, _), symbol in zip(cycle["path"], symbols):
+        venue_name = venue.split(":")[0]
+        steps.append(f"{symbol}@{venue_name}({chain})")
+
+    steps.append(steps[0])
+
+    return " -> ".join(steps)
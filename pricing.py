@@ -0,0 +1,434 @@
+"""
+Modul untuk perhitungan harga eksekusi berdasarkan kedalaman pasar.
+"""
+
+import logging
+import math
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+import config
+import metrics
+
+logger = logging.getLogger("arbitrage.pricing")
+
+class OrderBookSide:
+    """
+    Satu sisi order book (bids atau asks) dengan prefix sum kuantitas dan notional.
+
+    Prefix sum dihitung sekali saat snapshot diparse sehingga setiap evaluasi
+    kedalaman cukup memakai pencarian biner, bukan menelusuri level satu per satu.
+    """
+
+    def __init__(self, levels: List[List[Any]], descending: bool):
+        """
+        Inisialisasi sisi order book.
+
+        Args:
+            levels: Daftar level [harga, kuantitas] seperti dari endpoint /api/v3/depth
+            descending: True untuk bids (harga menurun), False untuk asks (harga naik)
+        """
+        self.descending = descending
+        self.prices = [float(level[0]) for level in levels]
+        quantities = [float(level[1]) for level in levels]
+
+        # Prefix sum dengan elemen awal 0 agar cum_x[i] = total sampai level i (eksklusif)
+        self.cum_quantity = [0.0] + list(accumulate(quantities))
+        self.cum_notional = [0.0] + list(accumulate(p * q for p, q in zip(self.prices, quantities)))
+
+        # Kunci pencarian yang selalu naik (harga dinegasikan untuk bids)
+        self._price_keys = [-p for p in self.prices] if descending else self.prices
+
+    @property
+    def total_quantity(self) -> float:
+        return self.cum_quantity[-1]
+
+    @property
+    def total_notional(self) -> float:
+        return self.cum_notional[-1]
+
+    @property
+    def best_price(self) -> float:
+        return self.prices[0] if self.prices else 0.0
+
+    def fill_notional(self, notional: float) -> Tuple[float, float, float]:
+        """
+        Menelusuri kedalaman hingga notional target terpenuhi.
+
+        Args:
+            notional: Nilai target dalam quote asset
+
+        Returns:
+            Tuple (harga rata-rata tertimbang volume, kuantitas terisi, notional terisi)
+        """
+        if not self.prices or notional <= 0:
+            return 0.0, 0.0, 0.0
+
+        # Level terakhir yang tersentuh oleh notional target
+        index = bisect_left(self.cum_notional, notional) - 1
+
+        if index >= len(self.prices):
+            # Kedalaman tidak mencukupi, isi sebanyak yang tersedia
+            filled_notional = self.total_notional
+            filled_quantity = self.total_quantity
+        else:
+            remaining = notional - self.cum_notional[index]
+            filled_notional = notional
+            filled_quantity = self.cum_quantity[index] + remaining / self.prices[index]
+
+        average_price = filled_notional / filled_quantity if filled_quantity > 0 else 0.0
+
+        return average_price, filled_quantity, filled_notional
+
+    def levels_within_price(self, limit_price: float) -> int:
+        """
+        Menghitung jumlah level yang bisa dieksekusi tanpa melewati harga batas.
+
+        Untuk asks ini adalah level dengan harga <= limit_price, untuk bids
+        level dengan harga >= limit_price.
+
+        Args:
+            limit_price: Harga batas
+
+        Returns:
+            Jumlah level dari puncak order book
+        """
+        if self.descending:
+            return bisect_right(self._price_keys, -limit_price)
+
+        return bisect_right(self._price_keys, limit_price)
+
+class OrderBookDepth:
+    """
+    Snapshot order book Binance yang sudah diparse untuk evaluasi harga eksekusi.
+    """
+
+    def __init__(self, symbol: str, orderbook: Dict[str, Any]):
+        """
+        Inisialisasi snapshot order book.
+
+        Args:
+            symbol: Simbol trading (misalnya LINKUSDT)
+            orderbook: Respons order book dengan key "bids" dan "asks"
+        """
+        self.symbol = symbol
+        self.last_update_id = orderbook.get("lastUpdateId")
+        self.bids = OrderBookSide(orderbook.get("bids", []), descending=True)
+        self.asks = OrderBookSide(orderbook.get("asks", []), descending=False)
+
+    def is_empty(self) -> bool:
+        return not self.bids.prices or not self.asks.prices
+
+    def _side_for(self, side: str) -> OrderBookSide:
+        # Membeli menelusuri asks, menjual menelusuri bids
+        if side == "buy":
+            return self.asks
+        if side == "sell":
+            return self.bids
+        raise ValueError(f"Sisi order tidak dikenal: {side}")
+
+    def vwap(self, side: str, notional: float) -> Dict[str, float]:
+        """
+        Menghitung harga rata-rata tertimbang volume untuk notional target.
+
+        Args:
+            side: "buy" atau "sell"
+            notional: Nilai target dalam quote asset
+
+        Returns:
+            Dict dengan price, quantity, notional dan flag complete
+        """
+        book_side = self._side_for(side)
+        price, quantity, filled_notional = book_side.fill_notional(notional)
+
+        return {
+            "price": price,
+            "quantity": quantity,
+            "notional": filled_notional,
+            "complete": filled_notional >= notional,
+        }
+
+    def spread_closing_size(self, side: str, counter_price: float, fee_percentage: float = 0.0) -> Dict[str, float]:
+        """
+        Mencari ukuran order di mana spread terhadap harga lawan tertutup.
+
+        Untuk side="buy" (beli di CEX, jual di tempat lain pada counter_price),
+        level ask dihitung selama ask * (1 + fee) <= counter_price. Untuk
+        side="sell" level bid dihitung selama bid * (1 - fee) >= counter_price.
+
+        Args:
+            side: "buy" atau "sell"
+            counter_price: Harga efektif di venue lawan (sudah termasuk biayanya)
+            fee_percentage: Biaya taker CEX dalam persen
+
+        Returns:
+            Dict dengan quantity (base asset) dan notional (quote asset)
+        """
+        book_side = self._side_for(side)
+        fee = fee_percentage / 100
+
+        if side == "buy":
+            limit_price = counter_price / (1 + fee)
+        else:
+            limit_price = counter_price / (1 - fee) if fee < 1 else float("inf")
+
+        levels = book_side.levels_within_price(limit_price)
+
+        return {
+            "quantity": book_side.cum_quantity[levels],
+            "notional": book_side.cum_notional[levels],
+            "limit_price": limit_price,
+        }
+
+class OrderBookCache:
+    """
+    Cache snapshot order book yang berlaku selama satu pemindaian.
+    """
+
+    def __init__(self, fetcher: Callable[[str, int], Dict[str, Any]], depth: Optional[int] = None):
+        """
+        Inisialisasi cache order book.
+
+        Args:
+            fetcher: Fungsi (symbol, limit) -> respons order book
+            depth: Jumlah level order book yang diambil
+        """
+        self.fetcher = fetcher
+        self.depth = depth or config.ARBITRAGE_CONFIG["cex_orderbook_depth"]
+        self._books: Dict[str, Optional[OrderBookDepth]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        """
+        Mengosongkan cache, dipanggil di awal setiap pemindaian.
+        """
+        self._books.clear()
+
+    def get(self, symbol: str) -> Optional[OrderBookDepth]:
+        """
+        Mendapatkan snapshot order book, diambil dari API hanya sekali per pemindaian.
+
+        Args:
+            symbol: Simbol trading
+
+        Returns:
+            Snapshot order book atau None jika gagal diambil atau kosong
+        """
+        if symbol in self._books:
+            self.hits += 1
+            metrics.record_cache("orderbook", True)
+            return self._books[symbol]
+
+        self.misses += 1
+        metrics.record_cache("orderbook", False)
+
+        try:
+            book = OrderBookDepth(symbol, self.fetcher(symbol, self.depth))
+            if book.is_empty():
+                book = None
+        except Exception as e:
+            logger.warning(f"Gagal mengambil order book {symbol}: {str(e)}")
+            book = None
+
+        self._books[symbol] = book
+
+        return book
+
+class AmmPool:
+    """
+    Model pool AMM constant-product dengan cadangan dalam unit token dan USD.
+
+    Untuk pool concentrated-liquidity (label v3), cadangan riil dikalikan dengan
+    faktor konsentrasi sehingga mendekati cadangan virtual di sekitar harga saat ini.
+    """
+
+    def __init__(self, reserve_token: float, reserve_usd: float, fee_percentage: float):
+        """
+        Inisialisasi model pool.
+
+        Args:
+            reserve_token: Cadangan token (unit token)
+            reserve_usd: Cadangan sisi quote dalam USD
+            fee_percentage: Biaya swap dalam persen
+        """
+        self.reserve_token = reserve_token
+        self.reserve_usd = reserve_usd
+        self.gamma = 1 - fee_percentage / 100
+
+    @property
+    def spot_price(self) -> float:
+        return self.reserve_usd / self.reserve_token if self.reserve_token > 0 else 0.0
+
+    @classmethod
+    def from_dex_info(cls, dex_info: Dict[str, Any], fee_percentage: float) -> Optional["AmmPool"]:
+        """
+        Membuat model pool dari data pair DEX Screener.
+
+        Cadangan token diambil dari liquidity.base jika tersedia, jika tidak
+        diasumsikan setengah dari liquidity_usd berada di sisi token.
+
+        Args:
+            dex_info: Data harga DEX (hasil get_price_across_dexes)
+            fee_percentage: Biaya swap dalam persen
+
+        Returns:
+            Instance AmmPool atau None jika data tidak mencukupi
+        """
+        price = float(dex_info.get("price_usd") or 0)
+        liquidity_usd = float(dex_info.get("liquidity_usd") or 0)
+
+        if price <= 0 or liquidity_usd <= 0:
+            return None
+
+        reserve_token = float(dex_info.get("liquidity_base") or 0)
+        if reserve_token <= 0:
+            reserve_token = liquidity_usd / 2 / price
+
+        reserve_token = min(reserve_token, liquidity_usd / price)
+
+        # Likuiditas terkonsentrasi bertindak seperti cadangan virtual yang lebih besar
+        labels = [str(label).lower() for label in dex_info.get("labels") or []]
+        if "v3" in labels or "v4" in labels or "clmm" in labels:
+            reserve_token *= config.ARBITRAGE_CONFIG["amm_concentration_factor"]
+
+        return cls(reserve_token, reserve_token * price, fee_percentage)
+
+    def as_buy_leg(self) -> Tuple[float, float, float]:
+        """
+        Cadangan (input USD, output token, gamma) untuk membeli token di pool ini.
+        """
+        return self.reserve_usd, self.reserve_token, self.gamma
+
+    def as_sell_leg(self) -> Tuple[float, float, float]:
+        """
+        Cadangan (input token, output USD, gamma) untuk menjual token di pool ini.
+        """
+        return self.reserve_token, self.reserve_usd, self.gamma
+
+def compose_legs(buy_leg: Tuple[float, float, float], sell_leg: Tuple[float, float, float],
+                 transfer_fee_percentage: float = 0.0) -> Tuple[float, float, float]:
+    """
+    Menggabungkan dua swap constant-product (beli lalu jual) menjadi satu kurva setara.
+
+    Rute USD -> token -> USD melalui dua pool kembali berbentuk x*y=k dengan
+    cadangan efektif R_in = a_in*b_in / (b_in + g_b*a_out) dan
+    R_out = g_b*a_out*b_out / (b_in + g_b*a_out), dengan gamma milik leg beli.
+    Biaya transfer (misalnya bridge) diperlakukan sebagai pengurang token di antara leg.
+
+    Args:
+        buy_leg: (cadangan input, cadangan output, gamma) leg beli
+        sell_leg: (cadangan input, cadangan output, gamma) leg jual
+        transfer_fee_percentage: Biaya transfer token antar leg dalam persen
+
+    Returns:
+        Tuple (R_in, R_out, gamma) untuk rute gabungan
+    """
+    a_in, a_out, gamma_a = buy_leg
+    b_in, b_out, gamma_b = sell_leg
+    gamma_b *= 1 - transfer_fee_percentage / 100
+
+    denominator = b_in + gamma_b * a_out
+
+    return a_in * b_in / denominator, gamma_b * a_out * b_out / denominator, gamma_a
+
+def fixed_price_leg(price: float, fee_percentage: float, side: str) -> Tuple[float, float, float]:
+    """
+    Leg dengan harga tetap (misalnya CEX) dalam bentuk kurva dengan kedalaman tak hingga.
+
+    Kurva dibentuk dengan cadangan yang sangat besar sehingga komposisinya
+    dengan pool AMM menghasilkan rumus ukuran optimal untuk satu pool vs harga tetap.
+
+    Args:
+        price: Harga eksekusi dalam USD
+        fee_percentage: Biaya taker dalam persen
+        side: "buy" (beli token di harga ini) atau "sell" (jual token di harga ini)
+
+    Returns:
+        Tuple (cadangan input, cadangan output, gamma)
+    """
+    depth = 1e30
+    gamma = 1 - fee_percentage / 100
+
+    if side == "buy":
+        return depth * price, depth, gamma
+
+    return depth, depth * price, gamma
+
+def optimal_trade_sizes(routes: List[Tuple[float, float, float]]) -> List[Dict[str, float]]:
+    """
+    Menghitung ukuran trade yang memaksimalkan profit untuk banyak rute sekaligus.
+
+    Untuk kurva out(x) = R_out*g*x / (R_in + g*x), profit out(x) - x maksimum di
+    x* = (sqrt(g*R_in*R_out) - R_in) / g. Jika x* <= 0 rute tidak menguntungkan.
+
+    Args:
+        routes: Daftar tuple (R_in, R_out, gamma) hasil compose_legs
+
+    Returns:
+        Daftar dict dengan trade_usd, output_usd, profit_usd dan price_impact_percentage
+    """
+    results = []
+
+    for r_in, r_out, gamma in routes:
+        if r_in <= 0 or r_out <= 0 or gamma <= 0:
+            results.append({"trade_usd": 0.0, "output_usd": 0.0, "profit_usd": 0.0, "price_impact_percentage": 0.0})
+            continue
+
+        trade = (math.sqrt(gamma * r_in * r_out) - r_in) / gamma
+
+        if trade <= 0:
+            results.append({"trade_usd": 0.0, "output_usd": 0.0, "profit_usd": 0.0, "price_impact_percentage": 0.0})
+            continue
+
+        output = r_out * gamma * trade / (r_in + gamma * trade)
+
+        results.append({
+            "trade_usd": trade,
+            "output_usd": output,
+            "profit_usd": output - trade,
+            "price_impact_percentage": route_price_impact((r_in, r_out, gamma), trade),
+        })
+
+    return results
+
+def route_output(route: Tuple[float, float, float], trade_usd: float) -> float:
+    """
+    Menghitung output rute untuk ukuran trade tertentu.
+
+    Args:
+        route: Tuple (R_in, R_out, gamma)
+        trade_usd: Ukuran trade dalam USD
+
+    Returns:
+        Output dalam USD
+    """
+    r_in, r_out, gamma = route
+
+    if trade_usd <= 0 or r_in <= 0:
+        return 0.0
+
+    return r_out * gamma * trade_usd / (r_in + gamma * trade_usd)
+
+def route_price_impact(route: Tuple[float, float, float], trade_usd: float) -> float:
+    """
+    Menghitung dampak harga rute untuk ukuran trade tertentu.
+
+    Dampak harga adalah slippage terhadap eksekusi tanpa dampak harga
+    (x * g * R_out / R_in); biaya swap tidak termasuk.
+
+    Args:
+        route: Tuple (R_in, R_out, gamma)
+        trade_usd: Ukuran trade dalam USD
+
+    Returns:
+        Dampak harga dalam persen
+    """
+    r_in, r_out, gamma = route
+
+    if trade_usd <= 0 or r_in <= 0 or r_out <= 0 or gamma <= 0:
+        return 0.0
+
+    # 1 - out(x) / (x * g * R_out / R_in) = g*x / (R_in + g*x)
+    return gamma * trade_usd / (r_in + gamma * trade_usd) * 100
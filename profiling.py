@@ -0,0 +1,319 @@
+"""
+Modul untuk profiling program arbitrase cryptocurrency.
+"""
+
+import builtins
+import linecache
+import sys
+import threading
+import time
+from typing import Dict, Any, List, Optional, TextIO, Tuple
+
+import config
+
+class ImportProfiler:
+    """
+    Mengukur waktu import setiap modul yang dimuat selama profiler aktif.
+
+    Waktu dicatat dua kali: inklusif (termasuk modul yang diimport oleh modul
+    tersebut) dan self (tanpa modul turunannya).
+    """
+
+    def __init__(self):
+        """
+        Inisialisasi profiler import.
+        """
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self._original_import = None
+        self._local = threading.local()
+        self._started_at = 0.0
+        self._stopped_at = 0.0
+
+    def start(self):
+        """
+        Mulai mencatat waktu import dengan membungkus builtins.__import__.
+        """
+        if self._original_import is not None:
+            return
+
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+        self._started_at = time.perf_counter()
+
+    def stop(self):
+        """
+        Berhenti mencatat waktu import dan kembalikan fungsi import asli.
+        """
+        if self._original_import is None:
+            return
+
+        builtins.__import__ = self._original_import
+        self._original_import = None
+        self._stopped_at = time.perf_counter()
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        """
+        Pengganti builtins.__import__ yang mengukur waktu import modul baru.
+        """
+        original_import = self._original_import
+
+        # Import relatif atau modul yang sudah dimuat tidak perlu diukur
+        if original_import is None or level != 0 or name in sys.modules:
+            return (original_import or builtins.__import__)(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        stack.append(0.0)
+        start = time.perf_counter()
+
+        try:
+            return original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+
+            if stack:
+                stack[-1] += elapsed
+
+            if name not in self.timings:
+                self.timings[name] = {"inclusive": elapsed, "self": elapsed - children}
+
+    def get_report(self, limit: int = 25) -> List[Dict[str, Any]]:
+        """
+        Mendapatkan daftar modul dengan waktu import terlama.
+
+        Args:
+            limit: Jumlah modul maksimum yang dikembalikan
+
+        Returns:
+            Daftar dict berisi nama modul dan waktu import (ms)
+        """
+        report = [
+            {
+                "module": name,
+                "inclusive_ms": timing["inclusive"] * 1000,
+                "self_ms": timing["self"] * 1000,
+            }
+            for name, timing in self.timings.items()
+        ]
+
+        report.sort(key=lambda x: x["inclusive_ms"], reverse=True)
+
+        return report[:limit]
+
+    def print_report(self, stream: Optional[TextIO] = None, limit: int = 25):
+        """
+        Mencetak laporan waktu import per modul dalam teks biasa.
+
+        Args:
+            stream: Stream tujuan (default: stderr)
+            limit: Jumlah modul maksimum yang dicetak
+        """
+        if stream is None:
+            stream = sys.stderr
+
+        total_self_ms = sum(timing["self"] for timing in self.timings.values()) * 1000
+        end = self._stopped_at or time.perf_counter()
+        wall_ms = (end - self._started_at) * 1000 if self._started_at else 0.0
+
+        stream.write("\nProfil startup (waktu import per modul):\n")
+        stream.write(f"{'Inklusif (ms)':>14} {'Self (ms)':>10}  Modul\n")
+
+        for entry in self.get_report(limit):
+            stream.write(f"{entry['inclusive_ms']:>14.1f} {entry['self_ms']:>10.1f}  {entry['module']}\n")
+
+        stream.write(f"Total waktu import: {total_self_ms:.1f} ms dari {len(self.timings)} modul ")
+        stream.write(f"(durasi program: {wall_ms:.1f} ms)\n")
+        stream.flush()
+
+# Kategori waktu pemindaian, diperiksa berurutan dari prioritas tertinggi.
+# Setiap aturan berisi (nama kategori, potongan path modul, nama fungsi).
+SAMPLE_CATEGORIES = [
+    ("Rate limiter (sleep)", (), ("_handle_rate_limit",)),
+    ("Dekode JSON", ("/json/",), ()),
+    ("HTTP (menunggu respons)", ("/requests/", "/urllib3/", "/http/client.py", "/socket.py", "/ssl.py"), ()),
+    ("Logging", ("/logging/",), ()),
+    ("Render rich", ("/rich/",), ()),
+]
+
+# Frame teratas di modul/fungsi ini berarti thread sedang menunggu, bukan bekerja
+IDLE_MODULES = ("/threading.py", "/selectors.py", "/socketserver.py", "/queue.py")
+
+class SamplingProfiler:
+    """
+    Profiler sampling untuk pemindaian (opsi --profile).
+
+    Thread latar belakang mengambil stack semua thread secara berkala dan
+    mengelompokkan setiap sampel ke kategori waktu (HTTP, rate limiter, JSON,
+    Decimal, rich, logging). Stack juga disimpan dalam format collapsed untuk
+    flamegraph.pl, speedscope atau inferno.
+
+    Operasi Decimal berjalan di modul C sehingga tidak muncul sebagai frame;
+    sampel dihitung sebagai Decimal jika baris yang sedang dieksekusi di frame
+    teratas memakai Decimal atau fungsinya ada di PROFILING["decimal_functions"].
+    """
+
+    def __init__(self, interval: Optional[float] = None):
+        """
+        Inisialisasi profiler sampling.
+
+        Args:
+            interval: Jarak antar sampel (detik), default dari config.PROFILING
+        """
+        self.interval = interval or config.PROFILING["sample_interval"]
+        self.decimal_functions = set(config.PROFILING["decimal_functions"])
+        self.stacks: Dict[Tuple[str, ...], int] = {}
+        self.categories: Dict[str, int] = {}
+        self.leaf_functions: Dict[str, int] = {}
+        self.samples = 0
+        self.idle_samples = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._started_at = 0.0
+        self._stopped_at = 0.0
+
+    def start(self):
+        """
+        Mulai mengambil sampel di thread latar belakang.
+        """
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Berhenti mengambil sampel.
+        """
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._stopped_at = time.perf_counter()
+
+    def _run(self):
+        own_thread = threading.get_ident()
+
+        while not self._stop_event.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_thread:
+                    self._sample(frame)
+
+    @staticmethod
+    def _label(frame) -> str:
+        return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_name}"
+
+    def _categorize(self, frames: List[Any]) -> str:
+        """
+        Menentukan kategori sampel dari daftar frame (frame teratas lebih dulu).
+        """
+        paths = [frame.f_code.co_filename.replace("\\", "/") for frame in frames]
+        names = [frame.f_code.co_name for frame in frames]
+
+        for category, modules, functions in SAMPLE_CATEGORIES:
+            for path, name in zip(paths, names):
+                if name in functions or any(module in path for module in modules):
+                    return category
+
+        # f_lineno bisa None saat frame berada di instruksi tanpa nomor baris
+        leaf = frames[0]
+        line = linecache.getline(leaf.f_code.co_filename, leaf.f_lineno or 0)
+
+        if leaf.f_code.co_name in self.decimal_functions or "Decimal" in line:
+            return "Matematika Decimal"
+
+        return "Lainnya (Python)"
+
+    def _sample(self, frame):
+        frames = []
+        while frame is not None:
+            frames.append(frame)
+            frame = frame.f_back
+
+        leaf_path = frames[0].f_code.co_filename.replace("\\", "/")
+        if any(module in leaf_path for module in IDLE_MODULES) or frames[0].f_code.co_name in config.PROFILING["idle_functions"]:
+            self.idle_samples += 1
+            return
+
+        category = self._categorize(frames)
+        stack = tuple(self._label(f) for f in reversed(frames))
+        leaf = stack[-1]
+
+        self.samples += 1
+        self.categories[category] = self.categories.get(category, 0) + 1
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        self.leaf_functions[leaf] = self.leaf_functions.get(leaf, 0) + 1
+
+    def get_report(self, limit: int = 20) -> Dict[str, Any]:
+        """
+        Mendapatkan ringkasan waktu per kategori dan fungsi teratas.
+
+        Args:
+            limit: Jumlah fungsi teratas yang dikembalikan
+
+        Returns:
+            Dict berisi samples, idle_samples, interval_ms, categories dan functions
+        """
+        total = self.samples or 1
+
+        categories = [
+            {"category": name, "samples": count, "percentage": count * 100 / total, "ms": count * self.interval * 1000}
+            for name, count in self.categories.items()
+        ]
+        categories.sort(key=lambda x: x["samples"], reverse=True)
+
+        functions = [
+            {"function": name, "samples": count, "percentage": count * 100 / total}
+            for name, count in self.leaf_functions.items()
+        ]
+        functions.sort(key=lambda x: x["samples"], reverse=True)
+
+        return {
+            "samples": self.samples,
+            "idle_samples": self.idle_samples,
+            "interval_ms": self.interval * 1000,
+            "categories": categories,
+            "functions": functions[:limit],
+        }
+
+    def write_report(self, stream: TextIO, limit: int = 20):
+        """
+        Menulis laporan profil dalam teks biasa.
+
+        Args:
+            stream: Stream tujuan
+            limit: Jumlah fungsi teratas yang ditulis
+        """
+        report = self.get_report(limit)
+        end = self._stopped_at or time.perf_counter()
+        wall_ms = (end - self._started_at) * 1000 if self._started_at else 0.0
+
+        stream.write("\nProfil pemindaian (sampling):\n")
+        stream.write(f"{report['samples']} sampel aktif, {report['idle_samples']} sampel menunggu, ")
+        stream.write(f"interval {report['interval_ms']:.1f} ms, durasi {wall_ms:.0f} ms\n\n")
+
+        stream.write(f"{'Sampel':>8} {'%':>6} {'Perkiraan (ms)':>15}  Kategori\n")
+        for entry in report["categories"]:
+            stream.write(f"{entry['samples']:>8} {entry['percentage']:>6.1f} {entry['ms']:>15.0f}  {entry['category']}\n")
+
+        stream.write(f"\n{'Sampel':>8} {'%':>6}  Fungsi teratas (self)\n")
+        for entry in report["functions"]:
+            stream.write(f"{entry['samples']:>8} {entry['percentage']:>6.1f}  {entry['function']}\n")
+
+    def write_collapsed(self, path: str):
+        """
+        Menulis stack dalam format collapsed ("frame;frame;frame jumlah") untuk flamegraph.
+
+        Args:
+            path: Lokasi file
+        """
+        with open(path, "w") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{';'.join(stack)} {count}\n")
@@ -0,0 +1,202 @@
+"""
+Modul cache resolusi simbol token ke alamat per chain.
+
+Token yang tidak ada di TOKENS_TO_MONITOR dicari lewat endpoint pencarian
+DEX Screener. Hasilnya (simbol -> {chain: alamat}) disimpan ke file, sehingga
+token yang sama tidak dicari ulang di setiap pemindaian atau setelah program
+dijalankan ulang.
+
+Untuk setiap chain, alamat dipilih berdasarkan total likuiditas pair-nya.
+Confidence adalah porsi likuiditas alamat terpilih di antara semua token
+dengan simbol yang sama di chain tersebut; chain dengan confidence rendah
+(banyak token tiruan dengan likuiditas sebanding) tidak dipakai.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Any, Callable, List, Optional
+
+import config
+import metrics
+
+logger = logging.getLogger("arbitrage.resolver")
+
+def score_candidates(symbol: str, pairs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Memilih alamat token per chain dari hasil pencarian pair.
+
+    Args:
+        symbol: Simbol token
+        pairs: Pair hasil pencarian DEX Screener
+
+    Returns:
+        Dict dengan chain_id sebagai key dan dict berisi address, liquidity_usd
+        dan confidence sebagai value
+    """
+    liquidity_by_chain: Dict[str, Dict[str, float]] = {}
+
+    for pair in pairs:
+        base_token = pair.get("baseToken") or {}
+
+        if (base_token.get("symbol") or "").upper() != symbol.upper() or not base_token.get("address"):
+            continue
+
+        chain_id = pair.get("chainId", "")
+        liquidity = float((pair.get("liquidity") or {}).get("usd") or 0)
+        addresses = liquidity_by_chain.setdefault(chain_id, {})
+        address = base_token["address"]
+        addresses[address] = addresses.get(address, 0.0) + liquidity
+
+    chains = {}
+
+    for chain_id, addresses in liquidity_by_chain.items():
+        address, liquidity = max(addresses.items(), key=lambda item: item[1])
+        total_liquidity = sum(addresses.values())
+
+        chains[chain_id] = {
+            "address": address,
+            "liquidity_usd": liquidity,
+            # Tanpa data likuiditas, confidence dibagi rata antar kandidat
+            "confidence": liquidity / total_liquidity if total_liquidity > 0 else 1 / len(addresses),
+        }
+
+    return chains
+
+class TokenResolver:
+    """
+    Cache persisten simbol token -> {chain: alamat} dengan skor confidence.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Inisialisasi cache resolusi.
+
+        Args:
+            path: Lokasi file cache (default dari config.TOKEN_RESOLVER)
+        """
+        settings = config.TOKEN_RESOLVER
+        self.path = path if path is not None else settings["path"]
+        self.refresh_after = settings["refresh_after"]
+        self.empty_ttl = settings["empty_ttl"]
+        self.min_confidence = settings["min_confidence"]
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        if self.path:
+            self.load()
+
+    def load(self):
+        """
+        Memuat cache dari file (jika ada).
+        """
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Gagal memuat cache resolusi token dari {self.path}: {str(e)}")
+            return
+
+        with self._lock:
+            self.entries.update(data.get("tokens", {}))
+
+        logger.info(f"Memuat resolusi alamat {len(self.entries)} token dari {self.path}")
+
+    def save(self):
+        """
+        Menyimpan cache ke file.
+        """
+        if not self.path:
+            return
+
+        with self._lock:
+            data = {"tokens": dict(self.entries)}
+
+        # Tulis ke file sementara lalu ganti agar file tidak pernah setengah tertulis
+        temp_path = f"{self.path}.tmp"
+
+        try:
+            with open(temp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error(f"Gagal menyimpan cache resolusi token ke {self.path}: {str(e)}")
+
+    def _is_fresh(self, entry: Dict[str, Any]) -> bool:
+        ttl = self.refresh_after if entry["chains"] else self.empty_ttl
+        return time.time() - entry["resolved_at"] < ttl
+
+    def _addresses(self, entry: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            chain_id: chain["address"]
+            for chain_id, chain in entry["chains"].items()
+            if chain["confidence"] >= self.min_confidence
+        }
+
+    def cached(self, symbol: str) -> Optional[Dict[str, str]]:
+        """
+        Alamat token per chain dari cache tanpa pencarian.
+
+        Args:
+            symbol: Simbol token
+
+        Returns:
+            Dict alamat per chain, atau None jika belum diresolusi atau sudah perlu di-refresh
+        """
+        with self._lock:
+            entry = self.entries.get(symbol.upper())
+
+        if entry is None or not self._is_fresh(entry):
+            return None
+
+        return self._addresses(entry)
+
+    def resolve(self, symbol: str, search: Callable[[str], List[Dict[str, Any]]]) -> Dict[str, str]:
+        """
+        Mendapatkan alamat token per chain, mencari hanya jika belum ada atau sudah perlu di-refresh.
+
+        Jika pencarian untuk refresh gagal, hasil lama tetap dipakai.
+
+        Args:
+            symbol: Simbol token
+            search: Fungsi pencarian pair (misalnya DexScreenerAPI.search_pairs)
+
+        Returns:
+            Dict dengan chain_id sebagai key dan alamat token sebagai value
+        """
+        key = symbol.upper()
+
+        with self._lock:
+            entry = self.entries.get(key)
+
+        if entry is not None and self._is_fresh(entry):
+            metrics.record_cache("token_resolver", True)
+            return self._addresses(entry)
+
+        metrics.record_cache("token_resolver", False)
+
+        try:
+            pairs = search(symbol)
+        except Exception as e:
+            if entry is None:
+                raise
+
+            logger.warning(f"Gagal me-refresh alamat {symbol}, memakai hasil sebelumnya: {str(e)}")
+            return self._addresses(entry)
+
+        entry = {"resolved_at": time.time(), "chains": score_candidates(symbol, pairs)}
+
+        with self._lock:
+            self.entries[key] = entry
+
+        self.save()
+
+        addresses = self._addresses(entry)
+        logger.info(f"Alamat {symbol} diresolusi di {len(addresses)} chain ({len(entry['chains']) - len(addresses)} dilewati karena confidence rendah)")
+
+        return addresses
@@ -0,0 +1,182 @@
+"""
+Modul klien JSON-RPC untuk node EVM (Ethereum, BSC, Polygon).
+"""
+
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import requests
+
+import config
+import metrics
+from tracing import traced
+from utils import retry_on_exception
+
+logger = logging.getLogger("arbitrage.rpc")
+
+class JsonRpcError(Exception):
+    """
+    Error yang dikembalikan node dalam respons JSON-RPC.
+    """
+
+    def __init__(self, method: str, error: Dict[str, Any]):
+        self.method = method
+        self.code = error.get("code")
+        self.data = error.get("data")
+        super().__init__(f"{method} gagal ({self.code}): {error.get('message', '')}")
+
+class JsonRpcClient:
+    """
+    Klien JSON-RPC sederhana dengan dukungan batch (beberapa panggilan dalam satu POST).
+    """
+
+    def __init__(self, url: str, timeout: Optional[float] = None):
+        """
+        Inisialisasi klien JSON-RPC.
+
+        Args:
+            url: URL endpoint RPC
+            timeout: Timeout permintaan HTTP (detik)
+        """
+        self.url = url
+        self.timeout = timeout or config.RPC_CONFIG["request_timeout"]
+        self.request_count = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _next_id(self) -> int:
+        with self._lock:
+            return next(self._ids)
+
+    @retry_on_exception()
+    @traced("rpc.request", "http")
+    def _post(self, payload: Any) -> Any:
+        """
+        Mengirim payload JSON-RPC ke node.
+
+        Args:
+            payload: Satu objek permintaan atau daftar permintaan (batch)
+
+        Returns:
+            Respons JSON dari node
+        """
+        self.request_count += 1
+
+        # Label endpoint berupa metode RPC (bukan URL yang bisa berisi API key)
+        calls = payload if isinstance(payload, list) else [payload]
+        endpoint = ",".join(sorted({call.get("method", "") for call in calls}))
+        start_time = time.perf_counter()
+        status = "error"
+
+        try:
+            response = requests.post(self.url, json=payload, timeout=self.timeout)
+            status = str(response.status_code)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error saat membuat permintaan RPC ke {self.url}: {str(e)}")
+            raise
+        finally:
+            metrics.observe_request("rpc", endpoint, status, time.perf_counter() - start_time)
+
+    def call(self, method: str, params: Optional[List[Any]] = None) -> Any:
+        """
+        Memanggil satu metode JSON-RPC.
+
+        Args:
+            method: Nama metode (misalnya eth_gasPrice)
+            params: Parameter metode
+
+        Returns:
+            Field result dari respons
+        """
+        results = self.batch([(method, params or [])])
+        result = results[0]
+
+        if isinstance(result, JsonRpcError):
+            raise result
+
+        return result
+
+    def batch(self, calls: List[Tuple[str, List[Any]]]) -> List[Any]:
+        """
+        Memanggil beberapa metode JSON-RPC dalam satu permintaan HTTP.
+
+        Args:
+            calls: Daftar tuple (metode, parameter)
+
+        Returns:
+            Daftar hasil sesuai urutan calls; panggilan yang gagal berisi JsonRpcError
+        """
+        if not calls:
+            return []
+
+        requests_payload = []
+
+        for method, params in calls:
+            request_id = self._next_id()
+            requests_payload.append({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+
+        response = self._post(requests_payload)
+
+        # Node yang tidak mendukung batch mengembalikan satu objek error
+        if isinstance(response, dict):
+            response = [response]
+
+        responses_by_id = {item.get("id"): item for item in response if isinstance(item, dict)}
+        results = []
+
+        for request in requests_payload:
+            item = responses_by_id.get(request["id"])
+
+            if item is None:
+                results.append(JsonRpcError(request["method"], {"message": "Tidak ada respons"}))
+            elif "error" in item and item["error"]:
+                results.append(JsonRpcError(request["method"], item["error"]))
+            else:
+                results.append(item.get("result"))
+
+        return results
+
+def is_rpc_configured(network: str) -> bool:
+    """
+    Memeriksa apakah jaringan memiliki URL RPC yang bisa digunakan.
+
+    Args:
+        network: Nama jaringan
+
+    Returns:
+        True jika URL RPC ada dan bukan URL contoh dari konfigurasi
+    """
+    rpc_url = config.NETWORKS.get(network, {}).get("rpc_url", "")
+
+    # URL contoh dari konfigurasi belum diisi API key
+    return bool(rpc_url) and "your-api-key" not in rpc_url
+
+# Klien per jaringan, dibuat saat pertama kali digunakan
+_clients: Dict[str, JsonRpcClient] = {}
+_clients_lock = threading.Lock()
+
+def get_rpc_client(network: str) -> JsonRpcClient:
+    """
+    Mendapatkan klien JSON-RPC untuk jaringan dari config.NETWORKS.
+
+    Args:
+        network: Nama jaringan (misalnya ethereum, bsc)
+
+    Returns:
+        Instance JsonRpcClient
+    """
+    with _clients_lock:
+        client = _clients.get(network)
+        url = config.NETWORKS[network]["rpc_url"]
+
+        # URL bisa diganti saat runtime (misalnya node lokal untuk pengujian)
+        if client is None or client.url != url:
+            client = JsonRpcClient(url)
+            _clients[network] = client
+
+        return client
@@ -0,0 +1,309 @@
+"""
+Modul penjadwal adaptif untuk pemindaian terus-menerus.
+
+Setiap pasangan (token, jaringan) punya interval pemindaian sendiri. Token
+dengan spread yang bergejolak atau sering menghasilkan peluang dipindai lebih
+sering, sedangkan token yang tenang (misalnya stablecoin) diperlambat secara
+bertahap. Jumlah pemindaian per siklus dibatasi oleh anggaran rate limit
+DEX Screener dan Binance.
+
+Setiap skenario dalam satu siklus mengamati pasangan yang sama; pengamatan
+digabung (spread terbesar, ada peluang atau tidak) dan dicatat sekali per
+siklus, sehingga decay interval dan hit rate tidak bergantung pada jumlah
+atau urutan skenario.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
+
+import config
+
+logger = logging.getLogger("arbitrage.scheduler")
+
+# Pseudo-jaringan untuk pemindaian lintas jaringan (Skenario 3)
+CROSS_CHAIN = "cross-chain"
+
+def opportunity_pair(scenario: int, opportunity: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Pasangan (token, jaringan) penjadwal yang menghasilkan peluang.
+
+    Args:
+        scenario: Nomor skenario
+        opportunity: Detail peluang arbitrase
+
+    Returns:
+        Tuple (token, jaringan); Skenario 3 memakai CROSS_CHAIN
+    """
+    network = CROSS_CHAIN if scenario == 3 else opportunity.get("network")
+    return opportunity.get("token"), network
+
+class TokenStats:
+    """
+    Statistik pemindaian untuk satu pasangan (token, jaringan).
+    """
+
+    __slots__ = ("spreads", "hit_rate", "interval", "last_scan", "scans", "uses_cex")
+
+    def __init__(self, interval: float, window: int):
+        self.spreads = deque(maxlen=window)
+        self.hit_rate = 0.0
+        self.interval = interval
+        self.last_scan = 0.0
+        self.scans = 0
+        self.uses_cex = False
+
+    def spread_stdev(self) -> float:
+        """
+        Standar deviasi spread (%) pada jendela pengamatan.
+        """
+        if len(self.spreads) < 2:
+            return 0.0
+
+        mean = sum(self.spreads) / len(self.spreads)
+        variance = sum((spread - mean) ** 2 for spread in self.spreads) / (len(self.spreads) - 1)
+
+        return math.sqrt(variance)
+
+    def spread_mean(self) -> float:
+        return sum(self.spreads) / len(self.spreads) if self.spreads else 0.0
+
+class AdaptiveScheduler:
+    """
+    Penjadwal pemindaian per (token, jaringan) berdasarkan volatilitas spread dan hit rate.
+    """
+
+    def __init__(self, base_interval: float):
+        """
+        Inisialisasi penjadwal.
+
+        Args:
+            base_interval: Interval pemindaian dasar (detik), biasanya --interval
+        """
+        settings = config.SCHEDULER
+
+        self.base_interval = float(base_interval)
+        self.min_interval = self.base_interval * settings["min_interval_ratio"]
+        self.max_interval = self.base_interval * settings["max_interval_ratio"]
+        self.decay_factor = settings["decay_factor"]
+        self.window = settings["window"]
+        self.hit_rate_alpha = settings["hit_rate_alpha"]
+        self.quiet_spread_stdev = settings["quiet_spread_stdev"]
+
+        # Anggaran per siklus dari rate limit (siklus = min_interval)
+        utilization = settings["budget_utilization"]
+        self.dex_budget = config.DEX_SCREENER["rate_limit"] * self.min_interval / 60 * utilization
+        self.binance_budget = config.CEX_LIST["binance"]["weight_limit"] * self.min_interval / 60 * utilization
+        self.binance_cost = settings["binance_weight_per_token"]
+
+        self.stats: Dict[Tuple[str, str], TokenStats] = {}
+        self._planned: Set[Tuple[str, str]] = set()
+        # Pengamatan siklus berjalan per pasangan: (spread terbesar, ada peluang, memakai Binance)
+        self._observations: Dict[Tuple[str, str], Tuple[float, bool, bool]] = {}
+        self._dex_spent = 0.0
+        self._binance_spent = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def tick_interval(self) -> float:
+        """
+        Jeda antar siklus penjadwalan (detik).
+        """
+        return self.min_interval
+
+    def _priority(self, stats: TokenStats, now: float) -> float:
+        """
+        Skor prioritas: hit rate, volatilitas dan besar spread, dikalikan rasio keterlambatan.
+        """
+        overdue = (now - stats.last_scan) / stats.interval if stats.interval > 0 else 1.0
+        activity = (1 + 10 * stats.hit_rate) * (1 + stats.spread_stdev() + stats.spread_mean())
+
+        return activity * overdue
+
+    def _cost(self, key: Tuple[str, str], stats: Optional[TokenStats]) -> Tuple[float, float]:
+        """
+        Perkiraan biaya (permintaan DEX Screener, weight Binance) untuk memindai satu pasangan.
+        """
+        binance_cost = self.binance_cost if stats is not None and stats.uses_cex else 0
+        return 1.0, binance_cost
+
+    @property
+    def planned(self) -> Set[Tuple[str, str]]:
+        """
+        Pasangan (token, jaringan) yang dipindai pada siklus ini, termasuk pasangan baru dari is_due.
+        """
+        with self._lock:
+            return set(self._planned)
+
+    def plan_cycle(self, exclude: Optional[Callable[[str, str], bool]] = None,
+                   reserve: Tuple[float, float] = (0.0, 0.0)) -> List[Tuple[str, str]]:
+        """
+        Memilih pasangan (token, jaringan) yang akan dipindai pada siklus ini.
+
+        Pasangan yang sudah jatuh tempo diurutkan berdasarkan prioritas dan
+        dipilih selama anggaran masih cukup. Sisanya menunggu siklus berikutnya
+        dengan prioritas yang terus naik karena rasio keterlambatan.
+
+        Args:
+            exclude: Fungsi (token, jaringan) -> True untuk pasangan yang tidak
+                dipindai dan tidak memakai anggaran (misalnya negative cache)
+            reserve: Anggaran (permintaan DEX Screener, weight Binance) untuk
+                permintaan di luar pasangan pada siklus ini (misalnya ticker
+                Binance semua simbol dan pemindaian multi-hop)
+
+        Returns:
+            Daftar pasangan yang dijadwalkan
+        """
+        now = time.time()
+
+        with self._lock:
+            due = [
+                (self._priority(stats, now), key)
+                for key, stats in self.stats.items()
+                if now - stats.last_scan >= stats.interval and not (exclude is not None and exclude(*key))
+            ]
+            due.sort(reverse=True)
+
+            self._planned = set()
+            self._dex_spent, self._binance_spent = reserve
+
+            for _, key in due:
+                dex_cost, binance_cost = self._cost(key, self.stats[key])
+
+                if self._dex_spent + dex_cost > self.dex_budget or self._binance_spent + binance_cost > self.binance_budget:
+                    continue
+
+                self._planned.add(key)
+                self._dex_spent += dex_cost
+                self._binance_spent += binance_cost
+
+            skipped = len(due) - len(self._planned)
+
+        logger.info(f"Siklus penjadwalan: {len(self._planned)} pasangan dijadwalkan, {skipped} ditunda karena anggaran, {len(self.stats) - len(due)} belum jatuh tempo")
+
+        return sorted(self._planned)
+
+    def is_due(self, token: str, network: str) -> bool:
+        """
+        Memeriksa apakah pasangan (token, jaringan) perlu dipindai pada siklus ini.
+
+        Pasangan yang belum pernah dipindai selalu dipindai selama anggaran masih ada.
+        Pasangan yang dijadwalkan tetap berlaku untuk semua skenario dalam siklus yang sama.
+
+        Args:
+            token: Simbol token
+            network: Nama jaringan (atau CROSS_CHAIN)
+
+        Returns:
+            True jika perlu dipindai
+        """
+        key = (token, network)
+
+        with self._lock:
+            if key in self._planned:
+                return True
+
+            if key in self.stats:
+                return False
+
+            dex_cost, _ = self._cost(key, None)
+            if self._dex_spent + dex_cost > self.dex_budget:
+                return False
+
+            self._dex_spent += dex_cost
+            self._planned.add(key)
+            return True
+
+    def observe(self, token: str, network: str, spread_percentage: float, found_opportunity: bool, uses_cex: bool = False):
+        """
+        Menyimpan hasil pemindaian satu skenario sampai siklus selesai (lihat end_cycle).
+
+        Args:
+            token: Simbol token
+            network: Nama jaringan (atau CROSS_CHAIN)
+            spread_percentage: Spread harga terbesar yang teramati (%)
+            found_opportunity: Apakah pemindaian menghasilkan peluang
+            uses_cex: Apakah pemindaian memakai data Binance (Skenario 1)
+        """
+        key = (token, network)
+        spread = abs(float(spread_percentage))
+
+        with self._lock:
+            previous = self._observations.get(key)
+            if previous is not None:
+                spread = max(spread, previous[0])
+                found_opportunity = found_opportunity or previous[1]
+                uses_cex = uses_cex or previous[2]
+
+            self._observations[key] = (spread, bool(found_opportunity), bool(uses_cex))
+
+    def end_cycle(self):
+        """
+        Mencatat satu pengamatan gabungan per pasangan untuk siklus yang baru selesai.
+        """
+        with self._lock:
+            observations = self._observations
+            self._observations = {}
+
+        for (token, network), (spread, found_opportunity, uses_cex) in sorted(observations.items()):
+            self.record(token, network, spread, found_opportunity, uses_cex)
+
+    def record(self, token: str, network: str, spread_percentage: float, found_opportunity: bool, uses_cex: bool = False):
+        """
+        Mencatat satu pengamatan siklus dan menyesuaikan interval pasangan.
+
+        Args:
+            token: Simbol token
+            network: Nama jaringan (atau CROSS_CHAIN)
+            spread_percentage: Spread harga terbesar yang teramati (%)
+            found_opportunity: Apakah pemindaian menghasilkan peluang
+            uses_cex: Apakah pemindaian memakai data Binance (Skenario 1)
+        """
+        key = (token, network)
+
+        with self._lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = TokenStats(self.base_interval, self.window)
+
+            stats.spreads.append(abs(float(spread_percentage)))
+            stats.hit_rate += self.hit_rate_alpha * ((1.0 if found_opportunity else 0.0) - stats.hit_rate)
+            stats.last_scan = time.time()
+            stats.scans += 1
+            stats.uses_cex = stats.uses_cex or uses_cex
+
+            # Peluang ditemukan: pindai secepat mungkin; tenang: perlambat bertahap
+            if found_opportunity:
+                stats.interval = self.min_interval
+            elif stats.spread_stdev() < self.quiet_spread_stdev and len(stats.spreads) >= 2:
+                stats.interval = min(stats.interval * self.decay_factor, self.max_interval)
+            else:
+                stats.interval = max(min(self.base_interval, stats.interval), self.min_interval)
+
+    def get_summary(self) -> List[Dict[str, Any]]:
+        """
+        Ringkasan statistik setiap pasangan, diurutkan dari interval tercepat.
+
+        Returns:
+            Daftar dict statistik
+        """
+        with self._lock:
+            summary = [
+                {
+                    "token": token,
+                    "network": network,
+                    "interval": stats.interval,
+                    "hit_rate": stats.hit_rate,
+                    "spread_mean": stats.spread_mean(),
+                    "spread_stdev": stats.spread_stdev(),
+                    "scans": stats.scans,
+                }
+                for (token, network), stats in self.stats.items()
+            ]
+
+        summary.sort(key=lambda x: x["interval"])
+
+        return summary
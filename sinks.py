@@ -0,0 +1,450 @@
+"""
+Modul pipeline output yang terpisah dari loop pemindaian.
+
+Hasil pemindaian dibungkus dalam ScanReport dan dimasukkan ke antrean setiap
+sink (console, snapshot, file teks, webhook, NDJSON). Setiap sink punya
+thread pekerja sendiri dengan antrean terbatas; jika antrean penuh, laporan
+terlama dibuang sehingga render yang lambat atau disk yang lambat tidak
+pernah menunda pemindaian berikutnya.
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+import config
+import metrics
+from opportunity import Opportunity
+from snapshot import SnapshotWriter
+from tracing import span
+
+logger = logging.getLogger("arbitrage.sinks")
+
+class ScanReport:
+    """
+    Hasil satu siklus pemindaian yang dikirim ke semua sink.
+
+    Pesan WhatsApp dirender sekali saat pertama kali dibutuhkan oleh sink,
+    lalu dipakai bersama oleh sink lainnya.
+    """
+
+    __slots__ = ("results", "cycles", "updates", "timestamp", "_message", "_lock")
+
+    def __init__(self, results: Dict[int, List[Opportunity]], cycles: Optional[List[Dict[str, Any]]] = None,
+                 updates: Optional[Dict[int, List[Opportunity]]] = None):
+        """
+        Inisialisasi laporan.
+
+        Args:
+            results: Dict dengan skenario sebagai key dan daftar peluang sebagai value
+            cycles: Siklus multi-hop (jika --multi-hop aktif)
+            updates: Peluang yang baru dinilai pada siklus ini (default results); results
+                bisa berisi peluang dari siklus sebelumnya (lihat ResultStore)
+        """
+        self.results = results
+        self.cycles = cycles
+        self.updates = results if updates is None else updates
+        self.timestamp = datetime.now()
+        self._message = None
+        self._lock = threading.Lock()
+
+    @property
+    def whatsapp_message(self) -> str:
+        """
+        Pesan WhatsApp untuk laporan ini.
+        """
+        with self._lock:
+            if self._message is None:
+                from output import format_whatsapp_message
+                self._message = format_whatsapp_message(self.results, self.timestamp)
+
+            return self._message
+
+class ResultStore:
+    """
+    Peluang terakhir yang diketahui per skenario.
+
+    Refresh cepat dan siklus penjadwal adaptif hanya menilai ulang sebagian
+    pool atau pasangan (token, jaringan), sehingga hasilnya digabung dengan
+    peluang yang tersimpan sebelum dikirim ke sink. Tanpa penggabungan,
+    snapshot dan file teks hanya berisi hasil siklus terakhir dan snapshot
+    delta mencatat peluang lainnya sebagai dihapus.
+    """
+
+    def __init__(self, max_age: Optional[float] = None):
+        """
+        Inisialisasi penyimpanan hasil.
+
+        Args:
+            max_age: Umur maksimum (detik) peluang yang tidak dinilai ulang; None tanpa batas
+        """
+        self.max_age = max_age
+        self.results: Dict[int, List[Opportunity]] = {}
+        self.cycles: Optional[List[Dict[str, Any]]] = None
+        self._entries: Dict[int, List[Tuple[float, Opportunity]]] = {}  # skenario -> (waktu disimpan, peluang)
+        self._lock = threading.Lock()
+
+    def update(self, results: Dict[int, List[Opportunity]],
+               covered: Optional[Callable[[int, Opportunity], bool]] = None) -> Dict[int, List[Opportunity]]:
+        """
+        Menggabungkan hasil baru dengan peluang yang tersimpan.
+
+        Peluang lama yang tidak dinilai ulang selama lebih dari max_age detik dibuang.
+
+        Args:
+            results: Dict dengan skenario sebagai key dan daftar peluang baru sebagai value
+            covered: Fungsi (skenario, peluang lama) -> True untuk peluang yang sudah
+                dinilai ulang dan diganti hasil baru; jika None, semua peluang lama
+                skenario di results diganti
+
+        Returns:
+            Semua peluang yang diketahui per skenario, diurutkan dari persentase keuntungan terbesar
+        """
+        now = time.time()
+
+        with self._lock:
+            for scenario, opportunities in results.items():
+                entries = [
+                    (stored_at, opp) for stored_at, opp in self._entries.get(scenario, [])
+                    if covered is not None and not covered(scenario, opp)
+                    and (self.max_age is None or now - stored_at <= self.max_age)
+                ]
+                entries.extend((now, opp) for opp in opportunities)
+                entries.sort(key=lambda entry: entry[1].profit_percentage, reverse=True)
+                self._entries[scenario] = entries
+
+            self.results = {scenario: [opp for _, opp in entries] for scenario, entries in self._entries.items()}
+            return self.results
+
+class Sink:
+    """
+    Kelas dasar sink output.
+    """
+
+    name = "sink"
+
+    def handle(self, report: ScanReport):
+        """
+        Memproses satu laporan (dipanggil dari thread pekerja sink).
+
+        Args:
+            report: Laporan hasil pemindaian
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Melepas resource sink setelah antrean kosong.
+        """
+        pass
+
+class ConsoleSink(Sink):
+    """
+    Menampilkan hasil pemindaian di console (rich).
+    """
+
+    name = "console"
+
+    def handle(self, report: ScanReport):
+        from output import add_validation_warning, display_cycles, print_header, print_whatsapp_format
+
+        print_header()
+
+        # Tambahkan peringatan validasi
+        add_validation_warning()
+
+        # Cetak format WhatsApp
+        print_whatsapp_format(report.results, report.whatsapp_message)
+
+        if report.cycles is not None:
+            display_cycles(report.cycles)
+
+class SnapshotSink(Sink):
+    """
+    Menulis snapshot peluang hasil pemindaian terakhir (lihat snapshot.SnapshotWriter).
+    """
+
+    name = "snapshot"
+
+    def __init__(self, writer: SnapshotWriter):
+        self.writer = writer
+
+    def handle(self, report: ScanReport):
+        self.writer.write(report.results, report.timestamp.isoformat())
+        logger.info(f"Peluang arbitrase berhasil disimpan ke {self.writer.path}")
+
+class TextFileSink(Sink):
+    """
+    Menulis pesan WhatsApp hasil pemindaian terakhir ke file teks.
+    """
+
+    name = "text"
+
+    def __init__(self, filename: str):
+        self.filename = filename
+
+    def handle(self, report: ScanReport):
+        from output import write_whatsapp_text
+
+        write_whatsapp_text(report.whatsapp_message, self.filename)
+        logger.info(f"Format WhatsApp berhasil disimpan ke {self.filename}")
+
+class WebhookSink(Sink):
+    """
+    Mengirim hasil pemindaian sebagai JSON (HTTP POST) ke webhook.
+    """
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = config.OUTPUT_SINKS["webhook_timeout"]):
+        import requests
+
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def handle(self, report: ScanReport):
+        import requests
+
+        payload = {
+            "timestamp": report.timestamp.isoformat(),
+            "opportunities": {
+                str(scenario): [opp.to_dict() for opp in opportunities]
+                for scenario, opportunities in report.results.items()
+            },
+            "message": report.whatsapp_message,
+        }
+
+        start = time.perf_counter()
+        status = "error"
+
+        try:
+            response = self.session.post(self.url, json=payload, timeout=self.timeout)
+            status = str(response.status_code)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning(f"Gagal mengirim hasil ke webhook {self.url}: {str(e)}")
+        finally:
+            metrics.observe_request("webhook", self.url, status, time.perf_counter() - start)
+
+    def close(self):
+        self.session.close()
+
+class NdjsonSink(Sink):
+    """
+    Menambahkan setiap peluang sebagai satu baris JSON (NDJSON) ke file stream.
+    """
+
+    name = "ndjson"
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._file = None
+
+    def handle(self, report: ScanReport):
+        if self._file is None:
+            self._file = open(self.filename, "a", encoding="utf-8")
+
+        timestamp = report.timestamp.isoformat()
+
+        # Hanya peluang yang baru dinilai, agar peluang lama tidak ditulis berulang
+        for scenario, opportunities in report.updates.items():
+            for opp in opportunities:
+                self._file.write(json.dumps(dict(opp, scenario=scenario, timestamp=timestamp)))
+                self._file.write("\n")
+
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class SinkWorker:
+    """
+    Thread pekerja dengan antrean terbatas untuk satu sink.
+    """
+
+    def __init__(self, sink: Sink, queue_size: int):
+        self.sink = sink
+        self.queue = queue.Queue(maxsize=max(1, queue_size))
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name=f"sink-{sink.name}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def offer(self, report: ScanReport):
+        """
+        Memasukkan laporan tanpa menunggu; jika antrean penuh, laporan terlama dibuang.
+
+        Args:
+            report: Laporan hasil pemindaian
+        """
+        while True:
+            try:
+                self.queue.put_nowait(report)
+                break
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    continue
+
+                self.dropped += 1
+                metrics.SINK_DROPPED.inc(sink=self.sink.name)
+                logger.debug("Sink %s tertinggal, laporan lama dibuang", self.sink.name)
+
+        metrics.SINK_QUEUE_DEPTH.set(self.queue.qsize(), sink=self.sink.name)
+
+    def _run(self):
+        while True:
+            report = self.queue.get()
+            metrics.SINK_QUEUE_DEPTH.set(self.queue.qsize(), sink=self.sink.name)
+
+            # None adalah tanda berhenti dari stop()
+            if report is None:
+                return
+
+            process(self.sink, report)
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        Menunggu antrean kosong lalu menghentikan thread.
+
+        Args:
+            timeout: Batas waktu menunggu (detik)
+
+        Returns:
+            True jika thread berhenti sebelum batas waktu
+        """
+        self.queue.put(None)
+        self._thread.join(timeout)
+
+        if self._thread.is_alive():
+            return False
+
+        self.sink.close()
+        return True
+
+def process(sink: Sink, report: ScanReport):
+    """
+    Menjalankan satu sink untuk satu laporan; error dicatat tanpa menghentikan pipeline.
+
+    Args:
+        sink: Sink output
+        report: Laporan hasil pemindaian
+    """
+    try:
+        with metrics.SINK_DURATION.time(sink=sink.name), span(sink.name, "output"):
+            sink.handle(report)
+    except Exception as e:
+        logger.error(f"Sink {sink.name} gagal memproses hasil pemindaian: {str(e)}")
+
+class OutputPipeline:
+    """
+    Mendistribusikan hasil pemindaian ke semua sink.
+    """
+
+    def __init__(self, sinks: List[Sink], threaded: bool = config.OUTPUT_SINKS["async"]):
+        """
+        Inisialisasi pipeline.
+
+        Args:
+            sinks: Daftar sink
+            threaded: True untuk menjalankan setiap sink di thread sendiri;
+                False untuk memproses sink langsung saat publish()
+        """
+        self.sinks = sinks
+        self.threaded = threaded
+        self.workers: List[SinkWorker] = []
+
+        if threaded:
+            queue_sizes = config.OUTPUT_SINKS["queue_size"]
+
+            for sink in sinks:
+                worker = SinkWorker(sink, queue_sizes.get(sink.name, 1))
+                worker.start()
+                self.workers.append(worker)
+
+    def publish(self, results: Dict[int, List[Opportunity]], cycles: Optional[List[Dict[str, Any]]] = None,
+                updates: Optional[Dict[int, List[Opportunity]]] = None):
+        """
+        Mengirim hasil pemindaian ke semua sink tanpa menunggu sink selesai.
+
+        Args:
+            results: Dict dengan skenario sebagai key dan daftar peluang sebagai value
+            cycles: Siklus multi-hop (jika ada)
+            updates: Peluang yang baru dinilai (default results, lihat ScanReport)
+        """
+        report = ScanReport(results, cycles, updates)
+
+        if not self.threaded:
+            for sink in self.sinks:
+                process(sink, report)
+            return
+
+        for worker in self.workers:
+            worker.offer(report)
+
+    def close(self, timeout: float = config.OUTPUT_SINKS["close_timeout"]):
+        """
+        Menunggu semua sink selesai memproses antrean lalu menutupnya.
+
+        Args:
+            timeout: Batas waktu menunggu per sink (detik)
+        """
+        if not self.threaded:
+            for sink in self.sinks:
+                sink.close()
+            return
+
+        for worker in self.workers:
+            if not worker.stop(timeout):
+                logger.warning(f"Sink {worker.sink.name} belum selesai setelah {timeout} detik")
+
+            if worker.dropped:
+                logger.info(f"Sink {worker.sink.name} membuang {worker.dropped} laporan karena antrean penuh")
+
+        self.workers = []
+
+def create_output_pipeline(webhook_url: Optional[str] = None, ndjson_path: Optional[str] = None) -> OutputPipeline:
+    """
+    Membuat pipeline output sesuai konfigurasi.
+
+    Args:
+        webhook_url: URL webhook (opsional)
+        ndjson_path: Lokasi file stream NDJSON (opsional)
+
+    Returns:
+        Instance OutputPipeline yang sudah berjalan
+    """
+    settings = config.OUTPUT_SINKS
+    sinks: List[Sink] = []
+
+    # Tanpa output console, rich tidak perlu diimport sama sekali
+    if config.OUTPUT_CONFIG["console_output"]:
+        sinks.append(ConsoleSink())
+
+    snapshot_settings = config.SNAPSHOT
+    sinks.append(SnapshotSink(SnapshotWriter(
+        settings["json_file"],
+        snapshot_settings["format"],
+        snapshot_settings["delta"],
+        snapshot_settings["full_every"],
+    )))
+    sinks.append(TextFileSink(settings["text_file"]))
+
+    if webhook_url:
+        sinks.append(WebhookSink(webhook_url))
+
+    if ndjson_path:
+        sinks.append(NdjsonSink(ndjson_path))
+
+    logger.info(f"Sink output aktif: {', '.join(sink.name for sink in sinks)}")
+
+    return OutputPipeline(sinks)
@@ -0,0 +1,206 @@
+"""
+Modul penulis snapshot hasil pemindaian.
+
+Snapshot ditulis ke file sementara lalu diganti dengan os.replace, sehingga
+pembaca yang memantau file tidak pernah melihat file setengah tertulis.
+Format yang didukung: JSON ringkas, NDJSON (satu peluang per baris) dan
+msgpack (jika paket msgpack terpasang).
+
+Mode delta hanya menulis peluang yang berubah sejak snapshot sebelumnya;
+snapshot lengkap tetap ditulis setiap full_every snapshot agar pembaca yang
+tertinggal bisa menyinkronkan ulang.
+"""
+
+import json
+import logging
+import os
+from typing import Dict, Any, List, Optional, Tuple
+
+import config
+from opportunity import to_serializable
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger("arbitrage.snapshot")
+
+FORMATS = ("json", "ndjson", "msgpack")
+
+# Ekstensi file per format
+EXTENSIONS = {
+    "json": ".json",
+    "ndjson": ".ndjson",
+    "msgpack": ".msgpack",
+}
+
+def atomic_write(path: str, data: bytes):
+    """
+    Menulis data ke file secara atomik (file sementara lalu rename).
+
+    Args:
+        path: Lokasi file
+        data: Isi file
+    """
+    temp_path = f"{path}.tmp"
+
+    with open(temp_path, "wb") as f:
+        f.write(data)
+
+    os.replace(temp_path, path)
+
+def snapshot_path(path: str, fmt: str) -> str:
+    """
+    Mengganti ekstensi lokasi snapshot sesuai format.
+
+    Args:
+        path: Lokasi file snapshot (misalnya arbitrage_opportunities.json)
+        fmt: Format snapshot
+
+    Returns:
+        Lokasi file dengan ekstensi format (misalnya arbitrage_opportunities.ndjson)
+    """
+    return os.path.splitext(path)[0] + EXTENSIONS[fmt]
+
+# Field identitas peluang (setelah nomor skenario). Pool berbeda untuk token dan
+# platform yang sama (misalnya dua pool uniswap di jaringan lain) tetap terpisah.
+KEY_FIELDS = ("token", "network", "token_address", "buy_platform", "sell_platform", "buy_pair_address", "sell_pair_address")
+
+OpportunityKey = Tuple[str, ...]
+
+def opportunity_key(scenario: int, opp: Dict[str, Any]) -> OpportunityKey:
+    """
+    Identitas peluang untuk perbandingan antar snapshot.
+
+    Field yang tidak dimiliki skenario (misalnya alamat pair pada Skenario 1)
+    diisi string kosong.
+
+    Args:
+        scenario: Nomor skenario
+        opp: Detail peluang arbitrase
+
+    Returns:
+        Tuple (skenario, lalu nilai KEY_FIELDS)
+    """
+    return (str(scenario),) + tuple(str(opp.get(field) or "") for field in KEY_FIELDS)
+
+def encode_json(document: Dict[str, Any]) -> bytes:
+    """
+    Encode dokumen sebagai JSON ringkas (tanpa indentasi dan spasi).
+    """
+    return json.dumps(document, separators=(",", ":"), default=to_serializable).encode("utf-8")
+
+class SnapshotWriter:
+    """
+    Penulis snapshot atomik dengan dukungan delta.
+    """
+
+    def __init__(self, path: str, fmt: str = config.SNAPSHOT["format"], delta: bool = config.SNAPSHOT["delta"],
+                 full_every: int = config.SNAPSHOT["full_every"]):
+        """
+        Inisialisasi penulis snapshot.
+
+        Args:
+            path: Lokasi file snapshot
+            fmt: Format snapshot (json, ndjson, msgpack)
+            delta: True untuk hanya menulis perubahan sejak snapshot sebelumnya
+            full_every: Tulis snapshot lengkap setiap N snapshot pada mode delta
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Format snapshot tidak dikenal: {fmt} (pilihan: {', '.join(FORMATS)})")
+
+        if fmt == "msgpack" and msgpack is None:
+            logger.warning("Paket msgpack tidak terpasang, snapshot ditulis sebagai JSON")
+            fmt = "json"
+
+        self.format = fmt
+        self.path = snapshot_path(path, fmt)
+        self.delta = delta
+        self.full_every = max(1, full_every)
+        self.sequence = 0
+        self._previous: Dict[OpportunityKey, Dict[str, Any]] = {}
+
+    def write(self, results: Dict[int, List[Dict[str, Any]]], timestamp: Optional[str] = None):
+        """
+        Menulis snapshot (lengkap atau delta) dari hasil pemindaian.
+
+        Args:
+            results: Dict dengan skenario sebagai key dan daftar peluang sebagai value
+            timestamp: Waktu pemindaian (ISO 8601)
+        """
+        self.sequence += 1
+
+        if not self.delta:
+            document = {str(scenario): opportunities for scenario, opportunities in results.items()}
+            atomic_write(self.path, self._encode_full(document))
+            return
+
+        current = {
+            opportunity_key(scenario, opp): opp
+            for scenario, opportunities in results.items()
+            for opp in opportunities
+        }
+
+        header = {
+            "sequence": self.sequence,
+            "timestamp": timestamp,
+        }
+
+        if self.sequence == 1 or (self.sequence - 1) % self.full_every == 0:
+            header["full"] = True
+            header["base_sequence"] = None
+            upserts = current
+            removed = []
+        else:
+            header["full"] = False
+            header["base_sequence"] = self.sequence - 1
+            upserts = {key: opp for key, opp in current.items() if self._previous.get(key) != opp}
+            removed = [key for key in self._previous if key not in current]
+
+        atomic_write(self.path, self._encode_delta(header, upserts, removed))
+        self._previous = current
+
+        logger.debug("Snapshot %s ditulis: %d diperbarui, %d dihapus", self.sequence, len(upserts), len(removed))
+
+    def _encode_full(self, document: Dict[str, List[Dict[str, Any]]]) -> bytes:
+        if self.format == "msgpack":
+            return msgpack.packb(document, default=to_serializable)
+
+        if self.format == "ndjson":
+            lines = [
+                json.dumps(dict(opp, scenario=int(scenario)), separators=(",", ":"))
+                for scenario, opportunities in document.items()
+                for opp in opportunities
+            ]
+            return ("\n".join(lines) + "\n" if lines else "").encode("utf-8")
+
+        return encode_json(document)
+
+    def _encode_delta(self, header: Dict[str, Any], upserts: Dict[OpportunityKey, Dict[str, Any]],
+                      removed: List[OpportunityKey]) -> bytes:
+        if self.format == "ndjson":
+            # Baris pertama berisi header, lalu satu baris per perubahan
+            lines = [json.dumps(dict(header, op="header"), separators=(",", ":"))]
+            lines.extend(
+                json.dumps(dict(opp, op="upsert", scenario=int(key[0])), separators=(",", ":"))
+                for key, opp in upserts.items()
+            )
+            lines.extend(
+                json.dumps(dict({"op": "remove", "scenario": int(key[0])}, **dict(zip(KEY_FIELDS, key[1:]))), separators=(",", ":"))
+                for key in removed
+            )
+            return ("\n".join(lines) + "\n").encode("utf-8")
+
+        by_scenario: Dict[str, List[Dict[str, Any]]] = {}
+        for key, opp in upserts.items():
+            by_scenario.setdefault(key[0], []).append(opp)
+
+        document = dict(header)
+        document["upserts"] = by_scenario
+        document["removed"] = [list(key) for key in removed]
+
+        if self.format == "msgpack":
+            return msgpack.packb(document, default=to_serializable)
+
+        return encode_json(document)
@@ -0,0 +1,37 @@
+"""
+Pengujian negative cache (cache.py).
+"""
+
+import unittest
+
+from cache import NegativeCache
+
+class NegativeCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = NegativeCache(path="")
+
+    def test_entry_applies_to_same_or_stricter_threshold(self):
+        self.cache.record_empty("CAKE", "bsc", 10000)
+
+        self.assertTrue(self.cache.is_suppressed("CAKE", "bsc", 10000))
+        self.assertTrue(self.cache.is_suppressed("CAKE", "bsc", 50000))
+        self.assertFalse(self.cache.is_suppressed("CAKE", "bsc", 5000))
+        self.assertFalse(self.cache.is_suppressed("CAKE", "ethereum", 10000))
+
+    def test_threshold_change_resets_backoff(self):
+        self.cache.record_empty("CAKE", "bsc", 50000)
+        self.cache.record_empty("CAKE", "bsc", 50000)
+        self.assertEqual(self.cache.entries[("CAKE", "bsc")]["misses"], 2)
+
+        self.cache.record_empty("CAKE", "bsc", 10000)
+
+        entry = self.cache.entries[("CAKE", "bsc")]
+        self.assertEqual((entry["min_liquidity"], entry["misses"]), (10000, 1))
+
+    def test_entry_without_threshold_is_ignored(self):
+        self.cache.entries[("CAKE", "bsc")] = {"token": "CAKE", "network": "bsc", "misses": 3, "checked_at": 0, "retry_at": float("inf")}
+
+        self.assertFalse(self.cache.is_suppressed("CAKE", "bsc", 10000))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Pengujian aritmetika fixed-point (fixedpoint.py).
+"""
+
+import unittest
+from decimal import Decimal
+
+import fixedpoint
+from dex_data import DexScreenerAPI
+
+class ToFixedTest(unittest.TestCase):
+    def test_decimal_longer_than_context_precision_is_exact(self):
+        value = Decimal("123456789012.123456789012345678")
+
+        self.assertEqual(fixedpoint.to_fixed(value), 123456789012123456789012345678)
+        self.assertEqual(fixedpoint.to_fixed(str(value)), 123456789012123456789012345678)
+
+    def test_rounds_half_even_to_scale(self):
+        self.assertEqual(fixedpoint.to_fixed(Decimal("0.5e-18")), 0)
+        self.assertEqual(fixedpoint.to_fixed(Decimal("1.5e-18")), 2)
+        self.assertEqual(fixedpoint.to_fixed(Decimal("1.23456789"), 6), 1234568)
+
+    def test_parse_price_matches_decimal(self):
+        for text in ("1234.5678", "0", "-0.5", "12", "1e-5", ".5", "0.0000000000000000015"):
+            price = fixedpoint.parse_price(text)
+
+            self.assertIsInstance(price, fixedpoint.Fixed)
+            self.assertEqual(price, fixedpoint.to_fixed(Decimal(text)))
+
+        # Nilai Fixed sudah dalam skala harga dan tidak dikonversi ulang
+        price = fixedpoint.parse_price("2.5")
+        self.assertIs(fixedpoint.to_fixed(price), price)
+
+class ProfitAfterFeesTest(unittest.TestCase):
+    def test_matches_decimal_formula(self):
+        buy_price, sell_price, amount = Decimal("1.2345"), Decimal("1.2567"), Decimal("0.9995")
+        buy_fee, sell_fee, gas_cost = Decimal("0.3"), Decimal("0.25"), Decimal("0.0012")
+
+        total_buy_cost = buy_price * amount * (1 + buy_fee / 100)
+        net_profit = sell_price * amount * (1 - sell_fee / 100) - total_buy_cost - gas_cost
+
+        to_fixed = fixedpoint.to_fixed
+        fixed_profit, fixed_percentage = fixedpoint.profit_after_fees(
+            to_fixed(buy_price), to_fixed(sell_price), to_fixed(amount, 6),
+            to_fixed(buy_fee), to_fixed(sell_fee), to_fixed(gas_cost), 0, 6
+        )
+
+        self.assertEqual(fixed_profit, to_fixed(net_profit))
+        self.assertEqual(fixed_percentage, to_fixed(net_profit / total_buy_cost * 100))
+
+class SpreadSearchTest(unittest.TestCase):
+    def test_fixed_prices_give_same_opportunities(self):
+        def pool(dex_id, price):
+            return {"dex_id": dex_id, "price_usd": Decimal(price), "liquidity_usd": Decimal("100000"), "base_token": {"symbol": "CAKE"}}
+
+        dex_prices = [pool("pancakeswap", "2.50"), pool("biswap", "2.56"), pool("apeswap", "2.51")]
+        fixed_prices = [dict(dex, price_usd_fixed=fixedpoint.to_price(dex["price_usd"])) for dex in dex_prices]
+
+        api = DexScreenerAPI()
+        expected = api.find_arbitrage_opportunities_same_chain("bsc", "0x01", 1.0, dex_prices)
+        actual = api.find_arbitrage_opportunities_same_chain("bsc", "0x01", 1.0, fixed_prices)
+
+        # Selisih fixed-point sama dengan Decimal sampai 18 desimal
+        self.assertEqual(
+            [(opp["buy_dex"], opp["sell_dex"], fixedpoint.to_fixed(opp["price_diff_percentage"])) for opp in actual],
+            [(opp["buy_dex"], opp["sell_dex"], fixedpoint.to_fixed(opp["price_diff_percentage"])) for opp in expected]
+        )
+        self.assertEqual(len(actual), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Pengujian oracle harga gas (gas_oracle.py) terhadap node JSON-RPC tiruan.
+"""
+
+import socket
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+import config
+from gas_oracle import GasOracle
+from rpc import get_rpc_client
+from tests.test_onchain import NETWORK, FakeChain, RpcStubTestCase
+
+GWEI = 10 ** 9
+
+class FakeGasChain(FakeChain):
+    """
+    Node tiruan yang juga melayani eth_gasPrice dan eth_feeHistory.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.gas_price = 30 * GWEI
+        self.base_fees = [10 * GWEI, 11 * GWEI, 12 * GWEI]
+        self.rewards = [[1 * GWEI], [3 * GWEI], [2 * GWEI]]
+        self.fail_gas = False
+        self.fee_history_supported = True
+        self.params = {}
+
+    def handle(self, request):
+        method = request["method"]
+
+        if method not in ("eth_gasPrice", "eth_feeHistory"):
+            return super().handle(request)
+
+        with self.lock:
+            self.methods.append(method)
+            self.params[method] = request["params"]
+
+        if self.fail_gas or (method == "eth_feeHistory" and not self.fee_history_supported):
+            return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32601, "message": "method not found"}}
+
+        if method == "eth_gasPrice":
+            return {"jsonrpc": "2.0", "id": request["id"], "result": hex(self.gas_price)}
+
+        return {"jsonrpc": "2.0", "id": request["id"], "result": {
+            "oldestBlock": hex(self.block_number - len(self.rewards)),
+            "baseFeePerGas": [hex(fee) for fee in self.base_fees],
+            "reward": [[hex(reward) for reward in rewards] for rewards in self.rewards],
+        }}
+
+class GasOracleTest(RpcStubTestCase):
+    def setUp(self):
+        super().setUp()
+        self.chain = FakeGasChain()
+        self.server.chain = self.chain
+        self.price_calls = []
+        self.oracle = GasOracle(price_fetcher=self._price_fetcher)
+
+    def _price_fetcher(self, symbol: str) -> Decimal:
+        self.price_calls.append(symbol)
+        return Decimal("2000")
+
+    def test_gas_price_and_fee_history_in_one_batch(self):
+        info = self.oracle.get_gas_info(NETWORK)
+
+        self.assertEqual(get_rpc_client(NETWORK).request_count, 1)
+        self.assertEqual(self.chain.methods, ["eth_gasPrice", "eth_feeHistory"])
+        self.assertEqual(self.chain.params["eth_feeHistory"], [
+            hex(config.GAS_ORACLE["fee_history_blocks"]), "latest", [config.GAS_ORACLE["priority_fee_percentile"]]
+        ])
+
+        # Base fee blok terakhir (12 gwei) + median priority fee (2 gwei)
+        self.assertEqual(info["source"], "rpc")
+        self.assertEqual(info["base_fee_gwei"], Decimal(12))
+        self.assertEqual(info["priority_fee_gwei"], Decimal(2))
+        self.assertEqual(info["gas_price_gwei"], Decimal(14))
+
+    def test_gas_price_without_fee_history(self):
+        self.chain.fee_history_supported = False
+
+        info = self.oracle.get_gas_info(NETWORK)
+
+        self.assertEqual(info["source"], "rpc")
+        self.assertEqual(info["gas_price_gwei"], Decimal(30))
+        self.assertIsNone(info["base_fee_gwei"])
+
+    def test_gas_cost_usd_uses_cached_native_price(self):
+        gas_limit = 150000
+
+        first = self.oracle.estimate_gas_cost_usd(NETWORK, gas_limit)
+        second = self.oracle.estimate_gas_cost_usd(NETWORK, gas_limit)
+
+        # 150000 gas * 14 gwei = 0,0021 ETH, dikali harga ETH 2000 USD
+        self.assertEqual(first, Decimal("4.2"))
+        self.assertEqual(second, first)
+        self.assertEqual(self.price_calls, ["ETHUSDT"])
+
+    def test_gas_info_cached_within_ttl(self):
+        with mock.patch("cache.time.time", return_value=1000.0):
+            self.oracle.get_gas_info(NETWORK)
+            self.chain.base_fees = [20 * GWEI]
+            cached = self.oracle.get_gas_info(NETWORK)
+
+        self.assertEqual(cached["gas_price_gwei"], Decimal(14))
+        self.assertEqual(self.chain.count("eth_gasPrice"), 1)
+
+        with mock.patch("cache.time.time", return_value=1000.0 + self.oracle.cache_ttl):
+            refreshed = self.oracle.get_gas_info(NETWORK)
+
+        self.assertEqual(refreshed["gas_price_gwei"], Decimal(22))
+        self.assertEqual(self.chain.count("eth_gasPrice"), 2)
+
+    def test_static_fallback_when_rpc_fails(self):
+        self.chain.fail_gas = True
+
+        info = self.oracle.get_gas_info(NETWORK)
+
+        self.assertEqual(info["source"], "static")
+        self.assertEqual(info["gas_price_gwei"], Decimal(str(config.ARBITRAGE_CONFIG["gas_price_gwei"][NETWORK])))
+
+    def test_static_fallback_when_node_unreachable(self):
+        # Port tanpa node: permintaan gagal di tingkat HTTP
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        config.NETWORKS[NETWORK]["rpc_url"] = "http://127.0.0.1:%d/" % port
+
+        with mock.patch("utils.time.sleep"):
+            info = self.oracle.get_gas_info(NETWORK)
+
+        self.assertEqual(info["source"], "static")
+        self.assertEqual(info["gas_price_gwei"], Decimal(str(config.ARBITRAGE_CONFIG["gas_price_gwei"][NETWORK])))
+
+if __name__ == "__main__":
+    unittest.main()
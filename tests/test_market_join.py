@@ -0,0 +1,58 @@
+"""
+Pengujian join ticker Binance dengan pool DEX (market_join.py) untuk Skenario 1.
+"""
+
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+import config
+from arbitrage import ArbitrageScanner
+from market_join import PoolIndex, TickerIndex, join
+
+CAKE = config.TOKENS_TO_MONITOR["CAKE"]["address"]["bsc"]
+WBNB = config.TOKENS_TO_MONITOR["WBNB"]["address"]["bsc"]
+
+TICKERS = [{"symbol": "CAKEUSDT", "lastPrice": "2.50", "quoteVolume": "5000000"}]
+
+def _pool(dex_id: str, pair_address: str, base_address: str, price_usd: str):
+    return {
+        "dex_id": dex_id,
+        "pair_address": pair_address,
+        "price_usd": Decimal(price_usd),
+        "liquidity_usd": Decimal("500000"),
+        "base_token": {"address": base_address},
+    }
+
+# CAKE/WBNB (CAKE di sisi base) dan WBNB/CAKE (priceUsd adalah harga WBNB)
+BASE_POOL = _pool("pancakeswap", "0x01", CAKE, "2.60")
+QUOTE_POOL = _pool("biswap", "0x02", WBNB, "600")
+
+class JoinTest(unittest.TestCase):
+    def test_quote_side_pools_are_not_joined(self):
+        pools = PoolIndex()
+        pools.add("CAKE", "bsc", CAKE, [BASE_POOL, QUOTE_POOL])
+
+        result = join(TickerIndex(TICKERS), pools)
+
+        self.assertEqual(len(result), 1)
+        self.assertAlmostEqual(result.spreads[0], 4.0)
+        self.assertEqual(result.pools_for("CAKE", "bsc"), [BASE_POOL])
+        self.assertEqual(result.pools_for("CAKE", "ethereum"), [])
+
+class JoinMarketsTest(unittest.TestCase):
+    def test_market_contains_only_joined_pools(self):
+        scanner = ArbitrageScanner()
+        dex_prices = {CAKE: [BASE_POOL, QUOTE_POOL]}
+
+        with mock.patch.object(scanner, "_is_due", return_value=True), \
+                mock.patch.object(scanner, "_get_dex_prices", side_effect=lambda network, address: dex_prices.get(address, [])), \
+                mock.patch.object(scanner, "_record_pools"), \
+                mock.patch.object(scanner, "_record_scan"):
+            markets = scanner._join_markets(TICKERS, ["CAKE"])
+
+        self.assertEqual(len(markets), 1)
+        self.assertEqual(markets[0]["dex_prices"], {"bsc": [BASE_POOL]})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,316 @@
+"""
+Pengujian pembacaan pool on-chain (onchain.py) dan klien JSON-RPC (rpc.py)
+terhadap node JSON-RPC tiruan yang berjalan di http.server lokal.
+"""
+
+import json
+import threading
+import unittest
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import config
+from onchain import (
+    AGGREGATE3_SELECTOR, DECIMALS_SELECTOR, GET_RESERVES_SELECTOR, SLOT0_SELECTOR, TOKEN0_SELECTOR, TOKEN1_SELECTOR,
+    OnchainPoolReader, OnchainPriceFeed, decode_aggregate3, encode_aggregate3, price_token0_in_token1,
+)
+from rpc import JsonRpcClient, JsonRpcError
+
+NETWORK = "ethereum"
+MULTICALL = config.ONCHAIN["multicall_address"].lower()
+
+TOKEN = "0x1111111111111111111111111111111111111111"
+USDC = config.NETWORKS[NETWORK]["stable_coins"][1].lower()
+WETH = config.NETWORKS[NETWORK]["wrapped_native"].lower()
+
+V2_POOL = "0x2222222222222222222222222222222222222222"  # TOKEN/USDC
+V3_POOL = "0x3333333333333333333333333333333333333333"  # WETH/TOKEN
+UNKNOWN_POOL = "0x4444444444444444444444444444444444444444"
+
+def _word(value: int) -> bytes:
+    return value.to_bytes(32, "big")
+
+def _address_word(address: str) -> bytes:
+    return bytes(12) + bytes.fromhex(address[2:])
+
+def _read_word(data: bytes, offset: int) -> int:
+    return int.from_bytes(data[offset:offset + 32], "big")
+
+def decode_aggregate3_calls(data: bytes):
+    """
+    Decode calldata aggregate3 (sisi node) menjadi daftar (target, allowFailure, calldata).
+    """
+    assert data[:4] == AGGREGATE3_SELECTOR
+    data = data[4:]
+    array_offset = _read_word(data, 0)
+    count = _read_word(data, array_offset)
+    heads = array_offset + 32
+    calls = []
+
+    for i in range(count):
+        tuple_offset = heads + _read_word(data, heads + 32 * i)
+        target = "0x" + data[tuple_offset + 12:tuple_offset + 32].hex()
+        allow_failure = _read_word(data, tuple_offset + 32) != 0
+        bytes_offset = tuple_offset + _read_word(data, tuple_offset + 64)
+        length = _read_word(data, bytes_offset)
+        calls.append((target, allow_failure, data[bytes_offset + 32:bytes_offset + 32 + length]))
+
+    return calls
+
+def encode_aggregate3_results(results) -> bytes:
+    """
+    Encode Result[] (success, returnData) seperti yang dikembalikan Multicall3.
+    """
+    encoded_results = []
+
+    for success, return_data in results:
+        padding = bytes(-len(return_data) % 32)
+        encoded_results.append(_word(int(success)) + _word(0x40) + _word(len(return_data)) + return_data + padding)
+
+    offsets = []
+    position = 32 * len(encoded_results)
+
+    for encoded in encoded_results:
+        offsets.append(_word(position))
+        position += len(encoded)
+
+    return _word(0x20) + _word(len(encoded_results)) + b"".join(offsets) + b"".join(encoded_results)
+
+class FakeChain:
+    """
+    State kontrak tiruan: dua pool (v2 dan v3) dan desimal token.
+    """
+
+    def __init__(self):
+        self.block_number = 100
+        self.reserves = (1000 * 10 ** 18, 2000 * 10 ** 6)  # 1000 TOKEN / 2000 USDC
+        self.sqrt_price_x96 = 2 ** 96 * 3  # 1 WETH = 9 TOKEN
+        self.decimals = {TOKEN: 18, USDC: 6, WETH: 18}
+        self.fail_eth_call = False
+        self.methods = []
+        self.lock = threading.Lock()
+
+    def execute(self, target: str, call_data: bytes):
+        selector = call_data[:4]
+
+        if target == V2_POOL:
+            if selector == TOKEN0_SELECTOR:
+                return True, _address_word(TOKEN)
+            if selector == TOKEN1_SELECTOR:
+                return True, _address_word(USDC)
+            if selector == GET_RESERVES_SELECTOR:
+                return True, _word(self.reserves[0]) + _word(self.reserves[1]) + _word(1700000000)
+
+        if target == V3_POOL:
+            if selector == TOKEN0_SELECTOR:
+                return True, _address_word(WETH)
+            if selector == TOKEN1_SELECTOR:
+                return True, _address_word(TOKEN)
+            if selector == SLOT0_SELECTOR:
+                return True, _word(self.sqrt_price_x96) + _word(0) * 6
+
+        if target in self.decimals and selector == DECIMALS_SELECTOR:
+            return True, _word(self.decimals[target])
+
+        return False, b""
+
+    def handle(self, request):
+        method = request["method"]
+
+        with self.lock:
+            self.methods.append(method)
+
+        if method == "eth_blockNumber":
+            return {"jsonrpc": "2.0", "id": request["id"], "result": hex(self.block_number)}
+
+        if method == "eth_call":
+            if self.fail_eth_call:
+                return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32000, "message": "execution reverted"}}
+
+            call, _ = request["params"]
+            assert call["to"].lower() == MULTICALL
+            calls = decode_aggregate3_calls(bytes.fromhex(call["data"][2:]))
+            results = [self.execute(target, call_data) for target, _, call_data in calls]
+            return {"jsonrpc": "2.0", "id": request["id"], "result": "0x" + encode_aggregate3_results(results).hex()}
+
+        return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32601, "message": "method not found"}}
+
+    def count(self, method: str) -> int:
+        with self.lock:
+            return self.methods.count(method)
+
+class _RpcHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+        if isinstance(payload, list):
+            response = [self.server.chain.handle(request) for request in payload]
+        else:
+            response = self.server.chain.handle(payload)
+
+        body = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class RpcStubTestCase(unittest.TestCase):
+    """
+    Menjalankan node JSON-RPC tiruan dan mengarahkan rpc_url jaringan ke node tersebut.
+    """
+
+    def setUp(self):
+        self.chain = FakeChain()
+        self.server = HTTPServer(("127.0.0.1", 0), _RpcHandler)
+        self.server.chain = self.chain
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        self.url = "http://127.0.0.1:%d/" % self.server.server_address[1]
+        self._rpc_url = config.NETWORKS[NETWORK]["rpc_url"]
+        config.NETWORKS[NETWORK]["rpc_url"] = self.url
+
+    def tearDown(self):
+        config.NETWORKS[NETWORK]["rpc_url"] = self._rpc_url
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+class Aggregate3CodecTest(unittest.TestCase):
+    def test_encode_round_trip(self):
+        calls = [
+            (V2_POOL, GET_RESERVES_SELECTOR),
+            (V3_POOL, SLOT0_SELECTOR + _word(7)),
+            (TOKEN, DECIMALS_SELECTOR + b"\x01\x02\x03"),
+        ]
+
+        decoded = decode_aggregate3_calls(encode_aggregate3(calls))
+
+        self.assertEqual(decoded, [(target, True, call_data) for target, call_data in calls])
+
+    def test_decode_results(self):
+        results = [(True, _word(18)), (False, b""), (True, b"\xab" * 45)]
+
+        self.assertEqual(decode_aggregate3(encode_aggregate3_results(results)), results)
+
+class JsonRpcClientTest(RpcStubTestCase):
+    def test_batch_returns_errors_in_order(self):
+        client = JsonRpcClient(self.url)
+
+        results = client.batch([("eth_blockNumber", []), ("eth_unknown", [])])
+
+        self.assertEqual(results[0], "0x64")
+        self.assertIsInstance(results[1], JsonRpcError)
+        self.assertEqual(results[1].code, -32601)
+        self.assertEqual(client.request_count, 1)
+
+class OnchainPoolReaderTest(RpcStubTestCase):
+    def setUp(self):
+        super().setUp()
+        self.reader = OnchainPoolReader(NETWORK, JsonRpcClient(self.url))
+        self.reader.block_poll_interval = 0
+
+    def test_get_reserves_decoding(self):
+        state = self.reader.read_pools([V2_POOL])[V2_POOL]
+
+        self.assertEqual(state["kind"], "v2")
+        self.assertEqual(state["block_number"], 100)
+        self.assertEqual((state["token0"], state["token1"]), (TOKEN, USDC))
+        self.assertEqual((state["decimals0"], state["decimals1"]), (18, 6))
+        self.assertEqual((state["reserve0"], state["reserve1"]), self.chain.reserves)
+        self.assertEqual(price_token0_in_token1(state), Decimal("2"))
+
+    def test_slot0_decoding(self):
+        state = self.reader.read_pools([V3_POOL])[V3_POOL]
+
+        self.assertEqual(state["kind"], "v3")
+        self.assertEqual((state["token0"], state["token1"]), (WETH, TOKEN))
+        self.assertEqual(state["sqrt_price_x96"], self.chain.sqrt_price_x96)
+        self.assertEqual(price_token0_in_token1(state), Decimal("9"))
+
+    def test_unsupported_pool_is_skipped(self):
+        states = self.reader.read_pools([UNKNOWN_POOL, V2_POOL])
+
+        self.assertEqual(list(states), [V2_POOL])
+        self.assertIsNone(self.reader.pools[UNKNOWN_POOL]["kind"])
+
+    def test_state_cached_per_block(self):
+        self.reader.read_pools([V2_POOL, V3_POOL])
+        eth_calls = self.chain.count("eth_call")
+
+        # Blok yang sama: tidak ada eth_call baru
+        self.chain.reserves = (1000 * 10 ** 18, 3000 * 10 ** 6)
+        state = self.reader.read_pools([V2_POOL])[V2_POOL]
+
+        self.assertEqual(self.chain.count("eth_call"), eth_calls)
+        self.assertEqual(state["reserve1"], 2000 * 10 ** 6)
+
+        # Blok baru: state dibaca ulang dalam satu eth_call, metadata tidak
+        self.chain.block_number = 101
+        state = self.reader.read_pools([V2_POOL])[V2_POOL]
+
+        self.assertEqual(self.chain.count("eth_call"), eth_calls + 1)
+        self.assertEqual(state["block_number"], 101)
+        self.assertEqual(state["reserve1"], 3000 * 10 ** 6)
+        self.assertEqual(price_token0_in_token1(state), Decimal("3"))
+
+class OnchainPriceFeedTest(RpcStubTestCase):
+    def setUp(self):
+        super().setUp()
+        self.feed = OnchainPriceFeed(lambda network: Decimal("3000"))
+        self.dex_prices = [
+            {
+                "dex": "uniswap",
+                "pair_address": V2_POOL,
+                "price_usd": Decimal("1.9"),
+                "price_native": Decimal("1.9"),
+                "liquidity_usd": Decimal("1000"),
+                "base_token": {"address": TOKEN},
+                "quote_token": {"address": USDC},
+            },
+            {
+                "dex": "uniswap",
+                "pair_address": V3_POOL,
+                "price_usd": Decimal("330"),
+                "price_native": Decimal("0.11"),
+                "liquidity_usd": Decimal("5000"),
+                "base_token": {"address": TOKEN},
+                "quote_token": {"address": WETH},
+            },
+        ]
+
+    def test_prices_from_pool_state(self):
+        v2, v3 = self.feed.get_dex_prices(NETWORK, TOKEN, lambda: self.dex_prices)
+
+        self.assertEqual(v2["price_source"], "onchain")
+        self.assertEqual(v2["price_usd"], Decimal("2"))
+        self.assertEqual(v2["liquidity_base"], Decimal("1000"))
+        self.assertEqual(v2["liquidity_usd"], Decimal("4000"))
+
+        # TOKEN adalah token1 pool v3: 1 TOKEN = 1/9 WETH
+        self.assertEqual(v3["price_native"], 1 / Decimal("9"))
+        self.assertEqual(v3["price_usd"], Decimal("3000") / Decimal("9"))
+        self.assertEqual(v3["liquidity_usd"], Decimal("5000"))
+
+    def test_falls_back_to_dex_screener_when_rpc_fails(self):
+        self.chain.fail_eth_call = True
+
+        result = self.feed.get_dex_prices(NETWORK, TOKEN, lambda: self.dex_prices)
+
+        self.assertIs(result, self.dex_prices)
+        self.assertGreater(self.chain.count("eth_call"), 0)
+
+    def test_unconfigured_network_uses_dex_screener(self):
+        config.NETWORKS[NETWORK]["rpc_url"] = "https://eth-mainnet.alchemyapi.io/v2/your-api-key"
+
+        result = self.feed.apply(NETWORK, self.dex_prices)
+
+        self.assertIs(result, self.dex_prices)
+        self.assertEqual(self.chain.methods, [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Pengujian graf harga multi-hop (price_graph.py).
+"""
+
+import unittest
+
+import config
+from cost_model import CostModel
+from price_graph import (
+    CEX_CHAIN, WALLET_VENUE, PriceGraph, add_binance_tickers, add_bridge_edges, add_dex_pairs,
+    describe_cycle, known_token_addresses
+)
+
+USDT = config.TOKENS_TO_MONITOR["USDT"]["address"]["bsc"].lower()
+WBNB = config.TOKENS_TO_MONITOR["WBNB"]["address"]["bsc"].lower()
+
+def _pair(pair_address: str, base: str, base_symbol: str, quote: str, quote_symbol: str, price: float,
+          dex_id: str = "pancakeswap", labels=None):
+    return {
+        "chainId": "bsc",
+        "dexId": dex_id,
+        "pairAddress": pair_address,
+        "labels": labels or [],
+        "baseToken": {"address": base, "symbol": base_symbol},
+        "quoteToken": {"address": quote, "symbol": quote_symbol},
+        "priceNative": str(price),
+        "liquidity": {"usd": 1000000},
+    }
+
+class PriceGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.cost_model = CostModel(gas_oracle=None)
+        self.known = known_token_addresses()
+
+    def test_same_symbol_tokens_are_not_merged(self):
+        # PEPE asli dan PEPE palsu dengan harga jauh berbeda bukan peluang arbitrase
+        graph = PriceGraph()
+        add_dex_pairs(graph, [
+            _pair("0xp1", "0xreal", "PEPE", USDT, "USDT", 1.0),
+            _pair("0xp2", "0xfake", "PEPE", USDT, "USDT", 0.01, dex_id="biswap"),
+        ], self.cost_model)
+        add_bridge_edges(graph, self.known)
+
+        self.assertIn((WALLET_VENUE, "bsc", "0xreal"), graph.node_index)
+        self.assertIn((WALLET_VENUE, "bsc", "0xfake"), graph.node_index)
+        self.assertEqual(graph.find_negative_cycles(10), [])
+
+    def test_binance_links_only_known_addresses(self):
+        graph = PriceGraph()
+        add_dex_pairs(graph, [
+            _pair("0xp1", WBNB, "WBNB", USDT, "USDT", 600.0),
+            _pair("0xp2", "0xfake", "WBNB", USDT, "USDT", 1.0, dex_id="biswap"),
+        ], self.cost_model)
+        add_binance_tickers(graph, [
+            {"symbol": "BNBUSDT", "lastPrice": "600", "bidPrice": "600", "askPrice": "600.1"},
+        ], ["USDT"], self.known)
+
+        cex_node = graph.node_index[("binance", CEX_CHAIN, "BNB")]
+        linked = {graph.node_keys[node] for node in graph.in_edges[cex_node]}
+
+        self.assertIn((WALLET_VENUE, "bsc", WBNB), linked)
+        self.assertNotIn((WALLET_VENUE, "bsc", "0xfake"), linked)
+        self.assertEqual(graph.find_negative_cycles(10), [])
+
+    def test_swap_fee_uses_pool_fee_tier(self):
+        graph = PriceGraph()
+        add_dex_pairs(graph, [
+            _pair("0xp1", WBNB, "WBNB", USDT, "USDT", 600.0, labels=["v3", "0.01%"]),
+            _pair("0xp2", WBNB, "WBNB", USDT, "USDT", 600.3, dex_id="biswap", labels=["v3", "0.01%"]),
+        ], self.cost_model)
+
+        # Selisih 0,05% hanya menguntungkan dengan fee tier 0,01%, bukan biaya default DEX
+        cycles = graph.find_negative_cycles(10)
+
+        self.assertEqual(len(cycles), 1)
+        self.assertIn("WBNB@biswap(bsc)", describe_cycle(cycles[0]))
+
+if __name__ == "__main__":
+    unittest.main()
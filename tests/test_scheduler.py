@@ -0,0 +1,97 @@
+"""
+Pengujian penjadwal adaptif (scheduler.py).
+"""
+
+import unittest
+
+from scheduler import AdaptiveScheduler
+
+class AdaptiveSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = AdaptiveScheduler(60)
+
+        for token in ("CAKE", "LINK", "UNI"):
+            self.scheduler.record(token, "bsc", 0.5, False, uses_cex=True)
+            self.scheduler.stats[(token, "bsc")].last_scan = 0.0
+
+    def test_plan_cycle_schedules_due_pairs(self):
+        planned = self.scheduler.plan_cycle()
+
+        self.assertEqual(len(planned), 3)
+        self.assertEqual(self.scheduler.planned, set(planned))
+
+    def test_reserve_is_charged_to_budget(self):
+        # Weight Binance yang tersisa hanya cukup untuk satu token Skenario 1
+        reserve = self.scheduler.binance_budget - self.scheduler.binance_cost
+
+        planned = self.scheduler.plan_cycle(reserve=(0.0, reserve))
+
+        self.assertEqual(len(planned), 1)
+
+    def test_exhausted_budget_blocks_new_pairs(self):
+        self.scheduler.plan_cycle(reserve=(self.scheduler.dex_budget, 0.0))
+
+        self.assertFalse(self.scheduler.is_due("AAVE", "ethereum"))
+        self.assertEqual(self.scheduler.planned, set())
+
+class IntervalAdaptationTest(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = AdaptiveScheduler(60)
+
+    def test_quiet_pair_decays_to_max_interval(self):
+        intervals = []
+        for _ in range(8):
+            self.scheduler.record("USDC", "bsc", 0.05, False)
+            intervals.append(self.scheduler.stats[("USDC", "bsc")].interval)
+
+        self.assertEqual(intervals[:4], [60, 90, 135, 202.5])
+        self.assertEqual(intervals[-1], self.scheduler.max_interval)
+
+    def test_opportunity_resets_to_min_interval(self):
+        for _ in range(4):
+            self.scheduler.record("CAKE", "bsc", 0.5, False)
+
+        self.scheduler.record("CAKE", "bsc", 0.5, True)
+
+        self.assertEqual(self.scheduler.stats[("CAKE", "bsc")].interval, self.scheduler.min_interval)
+
+    def test_volatile_spread_returns_to_base_interval(self):
+        for _ in range(3):
+            self.scheduler.record("CAKE", "bsc", 0.5, False)
+
+        self.scheduler.record("CAKE", "bsc", 2.0, False)
+
+        self.assertEqual(self.scheduler.stats[("CAKE", "bsc")].interval, self.scheduler.base_interval)
+
+class CycleObservationTest(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = AdaptiveScheduler(60)
+
+    def test_scenarios_are_recorded_once_per_cycle(self):
+        # Skenario 1 (CEX-DEX) dan 2 (DEX-DEX) mengamati pasangan yang sama
+        self.scheduler.observe("CAKE", "bsc", -0.2, False, uses_cex=True)
+        self.scheduler.observe("CAKE", "bsc", 1.0, True)
+        self.scheduler.end_cycle()
+
+        stats = self.scheduler.stats[("CAKE", "bsc")]
+        self.assertEqual(stats.scans, 1)
+        self.assertEqual(list(stats.spreads), [1.0])
+        self.assertAlmostEqual(stats.hit_rate, self.scheduler.hit_rate_alpha)
+        self.assertTrue(stats.uses_cex)
+        self.assertEqual(stats.interval, self.scheduler.min_interval)
+
+    def test_decay_does_not_depend_on_scenario_count(self):
+        for _ in range(3):
+            self.scheduler.observe("USDC", "bsc", 0.05, False)
+            self.scheduler.observe("USDC", "bsc", 0.02, False)
+            self.scheduler.end_cycle()
+
+        self.assertEqual(self.scheduler.stats[("USDC", "bsc")].interval, 135)
+
+    def test_end_cycle_without_observations_is_noop(self):
+        self.scheduler.end_cycle()
+
+        self.assertEqual(self.scheduler.stats, {})
+
+if __name__ == "__main__":
+    unittest.main()
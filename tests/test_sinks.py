@@ -0,0 +1,84 @@
+"""
+Pengujian penggabungan hasil pemindaian (sinks.ResultStore).
+"""
+
+import unittest
+from unittest import mock
+
+from opportunity import Opportunity
+from scheduler import opportunity_pair
+from sinks import ResultStore
+
+def _opportunity(token: str, profit_percentage: float, buy_pair: str = "0x01", sell_pair: str = "0x02",
+                 network: str = "bsc") -> Opportunity:
+    return Opportunity(
+        scenario=2,
+        token=token,
+        buy_platform="pancakeswap",
+        buy_price=1.0,
+        sell_platform="biswap",
+        sell_price=1.0 + profit_percentage / 100,
+        price_diff_percentage=profit_percentage,
+        buy_fee_percentage=0.25,
+        sell_fee_percentage=0.25,
+        gas_cost=0.1,
+        net_profit=profit_percentage,
+        profit_percentage=profit_percentage,
+        timestamp="2024-01-01T00:00:00",
+        network=network,
+        token_address="0x" + token.lower(),
+        buy_liquidity=100000,
+        sell_liquidity=100000,
+        buy_pair_address=buy_pair,
+        sell_pair_address=sell_pair,
+    )
+
+class ResultStoreTest(unittest.TestCase):
+    def test_update_without_covered_replaces_scenario(self):
+        store = ResultStore()
+        store.update({1: [], 2: [_opportunity("CAKE", 1.0)]})
+
+        results = store.update({2: [_opportunity("LINK", 2.0)]})
+
+        self.assertEqual([opp.token for opp in results[2]], ["LINK"])
+        self.assertEqual(results[1], [])
+
+    def test_update_keeps_opportunities_not_covered(self):
+        store = ResultStore()
+        store.update({2: [_opportunity("CAKE", 1.0), _opportunity("LINK", 2.0, "0x03", "0x04")]})
+
+        # Refresh hanya menilai ulang pool 0x01 dan 0x02: peluang CAKE hilang, LINK tetap
+        refreshed = {"0x01", "0x02"}
+        results = store.update(
+            {2: [_opportunity("UNI", 3.0, "0x01", "0x05")]},
+            lambda scenario, opp: opp.buy_pair_address in refreshed and opp.sell_pair_address in refreshed,
+        )
+
+        self.assertEqual([opp.token for opp in results[2]], ["UNI", "LINK"])
+        self.assertEqual(store.results, results)
+
+    def test_update_keeps_pairs_not_scanned_by_scheduler(self):
+        store = ResultStore()
+        store.update({2: [_opportunity("CAKE", 1.0), _opportunity("LINK", 2.0)], 3: []})
+
+        scanned = {("CAKE", "bsc")}
+        results = store.update({2: [], 3: []}, lambda scenario, opp: opportunity_pair(scenario, opp) in scanned)
+
+        self.assertEqual([opp.token for opp in results[2]], ["LINK"])
+
+    def test_expired_opportunities_are_dropped(self):
+        store = ResultStore(max_age=60)
+
+        with mock.patch("sinks.time.time", return_value=1000.0):
+            store.update({2: [_opportunity("CAKE", 1.0)]})
+
+        with mock.patch("sinks.time.time", return_value=1030.0):
+            store.update({2: [_opportunity("LINK", 2.0)]}, lambda scenario, opp: False)
+
+        with mock.patch("sinks.time.time", return_value=1070.0):
+            results = store.update({2: []}, lambda scenario, opp: False)
+
+        self.assertEqual([opp.token for opp in results[2]], ["LINK"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Pengujian snapshot delta (snapshot.py).
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from snapshot import SnapshotWriter, opportunity_key
+
+def _opportunity(**fields):
+    opp = {
+        "token": "CAKE",
+        "network": "bsc",
+        "token_address": "0x0e09fabb73bd3ade0a17ecc321fd13a19e81ce82",
+        "buy_platform": "pancakeswap",
+        "sell_platform": "biswap",
+        "buy_pair_address": "0x01",
+        "sell_pair_address": "0x02",
+        "net_profit": 1.5,
+    }
+    opp.update(fields)
+    return opp
+
+class OpportunityKeyTest(unittest.TestCase):
+    def test_distinct_pools_have_distinct_keys(self):
+        base = _opportunity()
+
+        keys = {
+            opportunity_key(2, base),
+            opportunity_key(2, _opportunity(network="ethereum")),
+            opportunity_key(2, _opportunity(buy_pair_address="0x03")),
+            opportunity_key(2, _opportunity(sell_pair_address="0x04")),
+            opportunity_key(1, base),
+        }
+
+        self.assertEqual(len(keys), 5)
+        self.assertEqual(opportunity_key(2, base), opportunity_key(2, dict(base, net_profit=2.0)))
+
+class SnapshotDeltaTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_ndjson_remove_record_identifies_pool(self):
+        writer = SnapshotWriter(os.path.join(self.directory, "snapshot.json"), fmt="ndjson", delta=True, full_every=10)
+        kept = _opportunity()
+        dropped = _opportunity(buy_pair_address="0x03")
+
+        writer.write({2: [kept, dropped]}, "t1")
+        writer.write({2: [kept]}, "t2")
+
+        with open(writer.path) as f:
+            records = [json.loads(line) for line in f]
+
+        self.assertEqual([record["op"] for record in records], ["header", "remove"])
+        self.assertEqual(records[1], {
+            "op": "remove",
+            "scenario": 2,
+            "token": "CAKE",
+            "network": "bsc",
+            "token_address": dropped["token_address"],
+            "buy_platform": "pancakeswap",
+            "sell_platform": "biswap",
+            "buy_pair_address": "0x03",
+            "sell_pair_address": "0x02",
+        })
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,275 @@
+"""
+Modul tracing ringan untuk jalur panas pemindaian.
+
+Span dicatat sebagai event "complete" (ph: X) format Chrome Trace Event,
+sehingga file hasil ekspor bisa dibuka di chrome://tracing atau Perfetto.
+Saat tracing tidak aktif, span() mengembalikan objek no-op bersama sehingga
+biayanya hanya satu pemeriksaan atribut.
+
+Atribut token dan network diwariskan ke span anak di thread yang sama, sehingga
+permintaan HTTP di dalam tahap fetch tetap tercatat untuk token yang dipindai.
+"""
+
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from functools import wraps
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+
+import config
+
+logger = logging.getLogger("arbitrage.tracing")
+
+# Atribut yang diwariskan dari span induk
+INHERITED_ATTRIBUTES = ("token", "network")
+
+class _NoopSpan:
+    """
+    Span kosong yang dipakai saat tracing tidak aktif.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+class Span:
+    """
+    Satu rentang waktu yang diukur, dengan atribut seperti token dan jaringan.
+    """
+
+    __slots__ = ("tracer", "name", "category", "attributes", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.attributes = attributes
+        self.start = 0.0
+
+    def __enter__(self):
+        stack = self.tracer._stack()
+
+        if stack:
+            parent = stack[-1].attributes
+            for key in INHERITED_ATTRIBUTES:
+                if key not in self.attributes and key in parent:
+                    self.attributes[key] = parent[key]
+
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        self.tracer._stack().pop()
+
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        self.tracer._record(self, end)
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+class Tracer:
+    """
+    Pengumpul span untuk diekspor ke file trace JSON.
+    """
+
+    def __init__(self):
+        """
+        Inisialisasi tracer (tidak aktif sampai start() dipanggil).
+        """
+        self.enabled = False
+        self.max_events = config.TRACING["max_events"]
+        self.events: List[Dict[str, Any]] = []
+        self.dropped = 0
+        self._thread_names: Dict[int, str] = {}
+        self._origin = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def start(self):
+        """
+        Mulai mencatat span.
+        """
+        with self._lock:
+            self.events = []
+            self.dropped = 0
+            self._thread_names = {}
+            self._origin = time.perf_counter()
+            self.enabled = True
+
+    def stop(self):
+        """
+        Berhenti mencatat span (event yang sudah tercatat tetap disimpan).
+        """
+        self.enabled = False
+
+    def span(self, name: str, category: str = "scan", **attributes) -> Any:
+        """
+        Membuat span untuk dipakai sebagai context manager.
+
+        Args:
+            name: Nama span (misalnya fetch, spread, fees)
+            category: Kategori span (scan, provider, http)
+            **attributes: Atribut span (misalnya token, network)
+
+        Returns:
+            Span, atau span no-op jika tracing tidak aktif
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+
+        return Span(self, name, category, attributes)
+
+    def _record(self, span: Span, end: float):
+        thread = threading.current_thread()
+
+        event = {
+            "name": span.name,
+            "cat": span.category,
+            "ph": "X",
+            "ts": (span.start - self._origin) * 1e6,
+            "dur": (end - span.start) * 1e6,
+            "pid": os.getpid(),
+            "tid": thread.ident,
+            "args": {key: value if isinstance(value, (int, float, bool)) else str(value) for key, value in span.attributes.items()},
+        }
+
+        with self._lock:
+            if len(self.events) >= self.max_events:
+                self.dropped += 1
+                return
+
+            self.events.append(event)
+            self._thread_names[thread.ident] = thread.name
+
+    def export(self, path: str):
+        """
+        Menulis trace ke file JSON format Chrome Trace Event.
+
+        Args:
+            path: Lokasi file trace
+        """
+        with self._lock:
+            events = list(self.events)
+            thread_names = dict(self._thread_names)
+
+        pid = os.getpid()
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in thread_names.items()
+        ]
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+
+        if self.dropped:
+            logger.warning(f"{self.dropped} span tidak dicatat karena batas {self.max_events} event tercapai")
+
+        logger.info(f"Trace dengan {len(events)} span disimpan ke {path}")
+
+    def get_breakdown(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Ringkasan waktu per (token, jaringan) dan per tahap, diurutkan dari yang paling lama.
+
+        Hanya span yang memiliki atribut token yang dihitung. Total dihitung dari
+        span kategori scan saja, karena span provider dan http berada di dalamnya.
+
+        Args:
+            limit: Jumlah (token, jaringan) yang dikembalikan
+
+        Returns:
+            Daftar dict berisi token, network, total_ms dan stages (ms per tahap)
+        """
+        totals: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+        with self._lock:
+            for event in self.events:
+                token = event["args"].get("token")
+                if token is None:
+                    continue
+
+                key = (token, event["args"].get("network", ""))
+                item = totals.get(key)
+                if item is None:
+                    item = totals[key] = {"total_ms": 0.0, "stages": {}}
+
+                duration_ms = event["dur"] / 1000
+                item["stages"][event["name"]] = item["stages"].get(event["name"], 0.0) + duration_ms
+
+                if event["cat"] == "scan":
+                    item["total_ms"] += duration_ms
+
+        breakdown = [
+            {"token": token, "network": network, "total_ms": item["total_ms"], "stages": item["stages"]}
+            for (token, network), item in totals.items()
+        ]
+        breakdown.sort(key=lambda x: x["total_ms"], reverse=True)
+
+        return breakdown[:limit]
+
+# Tracer global untuk seluruh program
+tracer = Tracer()
+
+def span(name: str, category: str = "scan", **attributes) -> Any:
+    """
+    Membuat span pada tracer global (lihat Tracer.span).
+    """
+    if not tracer.enabled:
+        return _NOOP_SPAN
+
+    return Span(tracer, name, category, attributes)
+
+def traced(name: str, category: str = "provider", attributes: Sequence[str] = ()) -> Callable:
+    """
+    Decorator untuk membungkus setiap panggilan fungsi dalam span.
+
+    Args:
+        name: Nama span
+        category: Kategori span
+        attributes: Nama parameter fungsi yang dicatat sebagai atribut span
+
+    Returns:
+        Decorator function
+    """
+    def decorator(func: Callable) -> Callable:
+        parameters = list(inspect.signature(func).parameters)
+        positions = [(attribute, parameters.index(attribute)) for attribute in attributes]
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+
+            span_attributes = {}
+            for attribute, position in positions:
+                if attribute in kwargs:
+                    span_attributes[attribute] = kwargs[attribute]
+                elif position < len(args):
+                    span_attributes[attribute] = args[position]
+
+            with Span(tracer, name, category, span_attributes):
+                return func(*args, **kwargs)
+
+        return wrapper
+    return decorator
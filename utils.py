@@ -3,27 +3,213 @@ Fungsi utilitas untuk program arbitrase cryptocurrency.
 """
 
 import time
+import atexit
 import logging
+import logging.handlers
+import queue
+import threading
 import requests
 from typing import Dict, Any, Optional, Callable, Union, List, Tuple
 from decimal import Decimal, getcontext
 from functools import wraps
 import config
+import fixedpoint
+import metrics
 
 # Set presisi desimal untuk perhitungan yang akurat
 getcontext().prec = 28
 
-# Setup logging
-logging.basicConfig(
-    level=getattr(logging, config.OUTPUT_CONFIG["log_level"]),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler(config.OUTPUT_CONFIG["log_file"]),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger("arbitrage")
 
+# Handler logging baru dipasang saat setup_logging() dipanggil, bukan saat import
+_logging_configured = False
+_log_writer = None
+
+class _BatchFlushMixin:
+    """
+    Menunda flush stream sampai satu batch record selesai ditulis.
+    """
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()
+
+class _BatchStreamHandler(_BatchFlushMixin, logging.StreamHandler):
+    pass
+
+class _BatchRotatingFileHandler(_BatchFlushMixin, logging.handlers.RotatingFileHandler):
+    pass
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler yang menunda pemformatan pesan ke thread penulis log.
+
+    QueueHandler bawaan memformat pesan di thread pemanggil. Di sini hanya
+    traceback yang diubah menjadi teks, karena objek traceback menahan frame
+    yang sudah selesai. Argumen pesan harus nilai yang tidak berubah setelah
+    dicatat (str, angka, Decimal).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class SamplingFilter(logging.Filter):
+    """
+    Meloloskan 1 dari setiap N record DEBUG per (logger, template pesan).
+
+    Rasio diambil dari nama logger terdekat di konfigurasi, misalnya
+    "arbitrage.dex" juga berlaku untuk "arbitrage.dex.pairs".
+    """
+
+    # Batas jumlah template yang dihitung (pesan f-string selalu unik)
+    MAX_TEMPLATES = 10000
+
+    def __init__(self, rates: Dict[str, int]):
+        """
+        Inisialisasi filter sampling.
+
+        Args:
+            rates: Dict nama logger -> N (1 dari N record DEBUG diloloskan)
+        """
+        super().__init__()
+        self.rates = rates
+        self._counts: Dict[Tuple[str, Any], int] = {}
+        self._lock = threading.Lock()
+
+    def _rate(self, name: str) -> int:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return 1
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+
+        rate = self._rate(record.name)
+        if rate <= 1:
+            return True
+
+        key = (record.name, record.msg)
+
+        with self._lock:
+            if len(self._counts) >= self.MAX_TEMPLATES:
+                self._counts.clear()
+
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+
+        return count % rate == 0
+
+class _LogWriter:
+    """
+    Thread latar belakang yang menulis record dari antrean ke handler secara batch.
+    """
+
+    def __init__(self, log_queue: queue.Queue, handlers: List[logging.Handler], batch_size: int):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+
+            for record in batch:
+                # None adalah tanda berhenti dari stop()
+                if record is None:
+                    stop = True
+                    continue
+
+                for handler in self.handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+
+            for handler in self.handlers:
+                handler.flush_batch()
+
+            if stop:
+                return
+
+    def stop(self):
+        self.queue.put(None)
+        self._thread.join()
+
+        for handler in self.handlers:
+            handler.close()
+
+def setup_logging() -> None:
+    """
+    Mengonfigurasi logging (file dengan rotasi dan console) satu kali.
+
+    Record dimasukkan ke antrean dan ditulis oleh thread latar belakang secara
+    batch, sehingga pemindaian tidak menunggu I/O log. Handler file dibuat
+    dengan delay=True sehingga file log baru dibuka saat pesan pertama
+    benar-benar ditulis.
+    """
+    global _logging_configured, _log_writer
+
+    if _logging_configured:
+        return
+
+    settings = config.OUTPUT_CONFIG
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    handlers = [
+        _BatchRotatingFileHandler(
+            settings["log_file"],
+            maxBytes=settings["log_max_bytes"],
+            backupCount=settings["log_backup_count"],
+            delay=True
+        ),
+        _BatchStreamHandler(),
+    ]
+
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue()
+    queue_handler = _DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(settings["log_sampling"]))
+
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, settings["log_level"]))
+    root.addHandler(queue_handler)
+
+    _log_writer = _LogWriter(log_queue, handlers, settings["log_batch_size"])
+    _log_writer.start()
+    atexit.register(shutdown_logging)
+
+    _logging_configured = True
+
+def shutdown_logging() -> None:
+    """
+    Menulis sisa record di antrean lalu menghentikan thread penulis log.
+    """
+    global _log_writer
+
+    if _log_writer is not None:
+        _log_writer.stop()
+        _log_writer = None
+
 def retry_on_exception(
     max_retries: int = config.ERROR_HANDLING["max_retries"],
     retry_delay: int = config.ERROR_HANDLING["retry_delay"],
@@ -58,6 +244,7 @@ def retry_on_exception(
                         raise
                     
                     logger.warning(f"Percobaan {retries}/{max_retries} untuk {func.__name__} gagal: {str(e)}. Mencoba lagi dalam {current_delay} detik.")
+                    metrics.RETRIES.inc(function=func.__qualname__)
                     time.sleep(current_delay)
                     
                     if exponential_backoff:
@@ -67,6 +254,44 @@ def retry_on_exception(
     
     return decorator
 
+class RateLimiter:
+    """
+    Pembatas jarak minimum antar permintaan yang aman dipakai bersama oleh beberapa thread.
+
+    Setiap pemanggil memesan slot waktu berikutnya di bawah lock, lalu menunggu
+    di luar lock sehingga thread lain bisa langsung memesan slot setelahnya.
+    """
+
+    def __init__(self, min_interval: float, client: str):
+        """
+        Inisialisasi pembatas laju.
+
+        Args:
+            min_interval: Jarak minimum antar permintaan (detik)
+            client: Nama klien API (label metrik)
+        """
+        self.min_interval = min_interval
+        self.client = client
+        self.request_count = 0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """
+        Menunggu sampai slot permintaan berikutnya tersedia.
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_time)
+            self._next_time = slot + self.min_interval
+            self.request_count += 1
+
+        delay = slot - now
+
+        if delay > 0:
+            time.sleep(delay)
+            metrics.RATE_LIMIT_WAIT.inc(delay, client=self.client)
+
 def format_price(price: Union[float, Decimal], decimals: int = 8) -> str:
     """
     Format harga dengan jumlah desimal yang tepat.
@@ -83,6 +308,29 @@ def format_price(price: Union[float, Decimal], decimals: int = 8) -> str:
     
     return f"{price:.{decimals}f}"
 
+def calculation_value(
+    value: Union[float, Decimal],
+    fixed_value: Optional[int] = None
+) -> Union[float, Decimal, int]:
+    """
+    Nilai (harga atau biaya USD) untuk calculate_price_difference_percentage dan calculate_profit_after_fees.
+    
+    Jika FIXED_POINT aktif, nilai fixed-point yang sudah tersedia (misalnya
+    price_usd_fixed yang di-parse saat data diterima) dipakai langsung, atau
+    nilai dikonversi sekali; jika tidak, nilai dipakai apa adanya.
+    
+    Args:
+        value: Nilai asli
+        fixed_value: Nilai yang sama dalam fixed-point, jika sudah ada
+        
+    Returns:
+        Nilai untuk perhitungan
+    """
+    if not config.FIXED_POINT["enabled"]:
+        return value
+    
+    return fixed_value if fixed_value is not None else fixedpoint.to_price(value)
+
 def calculate_price_difference_percentage(
     price1: Union[float, Decimal], 
     price2: Union[float, Decimal]
@@ -97,6 +345,11 @@ def calculate_price_difference_percentage(
     Returns:
         Persentase perbedaan
     """
+    if config.FIXED_POINT["enabled"]:
+        return fixedpoint.to_decimal(
+            fixedpoint.price_difference_percentage(fixedpoint.to_fixed(price1), fixedpoint.to_fixed(price2))
+        )
+    
     if isinstance(price1, float):
         price1 = Decimal(str(price1))
     if isinstance(price2, float):
@@ -114,7 +367,8 @@ def calculate_profit_after_fees(
     buy_fee_percentage: Union[float, Decimal],
     sell_fee_percentage: Union[float, Decimal],
     gas_cost: Union[float, Decimal] = Decimal('0'),
-    other_fees: Union[float, Decimal] = Decimal('0')
+    other_fees: Union[float, Decimal] = Decimal('0'),
+    token_decimals: int = fixedpoint.PRICE_DECIMALS
 ) -> Tuple[Decimal, Decimal]:
     """
     Menghitung keuntungan setelah biaya.
@@ -127,10 +381,25 @@ def calculate_profit_after_fees(
         sell_fee_percentage: Persentase biaya jual
         gas_cost: Biaya gas (dalam mata uang dasar)
         other_fees: Biaya lainnya (dalam mata uang dasar)
+        token_decimals: Desimal token; jumlah dibulatkan ke unit terkecil token (fixed-point)
         
     Returns:
         Tuple (keuntungan bersih, persentase keuntungan)
     """
+    if config.FIXED_POINT["enabled"]:
+        to_fixed = fixedpoint.to_fixed
+        net_profit, profit_percentage = fixedpoint.profit_after_fees(
+            to_fixed(buy_price),
+            to_fixed(sell_price),
+            to_fixed(amount, token_decimals),
+            to_fixed(buy_fee_percentage),
+            to_fixed(sell_fee_percentage),
+            to_fixed(gas_cost),
+            to_fixed(other_fees) if other_fees else 0,
+            token_decimals
+        )
+        return fixedpoint.to_decimal(net_profit), fixedpoint.to_decimal(profit_percentage)
+    
     # Konversi ke Decimal jika perlu
     if isinstance(buy_price, float):
         buy_price = Decimal(str(buy_price))
@@ -268,19 +537,41 @@ def get_networks_for_token(token_symbol: str) -> List[str]:
     
     return []
 
-def estimate_gas_cost(network: str, gas_limit: int = 200000) -> Decimal:
+# Quote asset Binance yang dikenali, diperiksa berurutan
+BINANCE_QUOTE_ASSETS = ("USDT", "BUSD", "BTC", "ETH", "BNB")
+
+def split_binance_symbol(symbol: str) -> Optional[Tuple[str, str]]:
+    """
+    Memisahkan simbol Binance menjadi base asset dan quote asset.
+    
+    Args:
+        symbol: Simbol Binance (misalnya ETHUSDT)
+        
+    Returns:
+        Tuple (base asset, quote asset), atau None jika quote asset tidak dikenali
+    """
+    for quote in BINANCE_QUOTE_ASSETS:
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return symbol[:-len(quote)], quote
+    
+    return None
+
+def estimate_gas_cost(network: str, gas_limit: int = 200000, gas_price_gwei: Optional[Decimal] = None) -> Decimal:
     """
     Memperkirakan biaya gas untuk transaksi di jaringan tertentu.
     
     Args:
         network: Nama jaringan
         gas_limit: Batas gas untuk transaksi
+        gas_price_gwei: Harga gas (gwei); jika None, gunakan nilai statis dari konfigurasi
         
     Returns:
-        Perkiraan biaya gas dalam mata uang asli jaringan
+        Perkiraan biaya gas dalam mata uang asli jaringan (lihat gas_oracle untuk nilai USD)
     """
-    if network in config.ARBITRAGE_CONFIG["gas_price_gwei"]:
+    if gas_price_gwei is None and network in config.ARBITRAGE_CONFIG["gas_price_gwei"]:
         gas_price_gwei = Decimal(str(config.ARBITRAGE_CONFIG["gas_price_gwei"][network]))
+    
+    if gas_price_gwei is not None:
         # Konversi dari gwei ke wei (1 gwei = 10^9 wei)
         gas_price_wei = gas_price_gwei * Decimal('1000000000')
         # Biaya gas = gas_limit * gas_price